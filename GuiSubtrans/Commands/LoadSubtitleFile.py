@@ -24,9 +24,12 @@ class LoadSubtitleFile(Command):
             raise CommandError(_("No file path specified"), command=self)
 
         try:
-            project = SubtitleProject(persistent=self.options.use_project_file)
+            project = SubtitleProject(persistent=self.options.use_project_file, journaled=self.options.get_bool('project_journal'), compressed=self.options.get_bool('compress_project'), lazy_load=True)
             project.InitialiseProject(self.filepath, reload_subtitles=self.reload_subtitles)
 
+            if project.use_project_file and self.options.get_bool('background_save'):
+                project.StartBackgroundWriter(self.options.get_float('save_delay') or 0.0)
+
             if not project.subtitles:
                 raise CommandError(_("Unable to load subtitles from {file}").format(file=self.filepath), command=self)
 
@@ -28,6 +28,6 @@ class SaveProjectFile(Command):
         if current_filepath != self.project.projectfile or current_outputpath != self.project.subtitles.outputpath:
             self.project.needs_writing = True
 
-        self.project.SaveProject()
+        self.project.RequestSave()
 
         return True
@@ -10,5 +10,5 @@ class SaveTranslationFile(Command):
         self.mark_project_dirty = False
 
     def execute(self) -> bool:
-        self.project.SaveTranslation(self.filepath)
+        self.project.RequestSaveTranslation(self.filepath)
         return True
\ No newline at end of file
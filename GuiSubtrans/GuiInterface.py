@@ -120,6 +120,9 @@ class GuiInterface(QObject):
         """
         Set the data model
         """
+        if self.datamodel and self.datamodel.project and (not datamodel or datamodel.project is not self.datamodel.project):
+            self.datamodel.project.StopBackgroundWriter()
+
         self.datamodel = datamodel
         self.action_handler.SetDataModel(datamodel)
         self.dataModelChanged.emit(datamodel)
@@ -259,6 +262,7 @@ class GuiInterface(QObject):
 
         if self.datamodel and self.datamodel.project:
             self.datamodel.project.SaveProject()
+            self.datamodel.project.StopBackgroundWriter()
 
     def LoadProject(self, filepath : str, reload_subtitles : bool = False) -> None:
         """
@@ -128,7 +128,7 @@ class ProjectActions(QObject):
         initial_path = self.last_used_path or os.getcwd()
         shift_pressed = self._is_shift_pressed()
 
-        extensions = sorted(set(SubtitleFormatRegistry.enumerate_formats()).union(['.subtrans']))
+        extensions = sorted(set(SubtitleFormatRegistry.enumerate_formats()).union(['.subtrans', '.subtransz']))
         extension_wildcards = ' '.join(f'*{ext}' for ext in extensions)
         filters = f"{_('Subtitle files')} ({extension_wildcards});;{_('All Files')} (*)"
         filepath, dummy = QFileDialog.getOpenFileName(parent=self._mainwindow, caption=_("Open File"), dir=initial_path, filter=filters) # type: ignore[unused-ignore]
@@ -158,7 +158,7 @@ class ProjectActions(QObject):
             base_name = os.path.basename(project.projectfile) if project.projectfile else "untitled.subtrans"
             filepath = os.path.join(base_path, base_name)
             if project.use_project_file:
-                filters = f"{_('Subtrans projects')} (*.subtrans);;{_('All Files')} (*)"
+                filters = f"{_('Subtrans projects')} (*.subtrans *.subtransz);;{_('All Files')} (*)"
             else:
                 filters = f"{_('Subtitle files')} (*.srt);;{_('All Files')} (*)"
 
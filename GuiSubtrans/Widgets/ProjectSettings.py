@@ -394,7 +394,7 @@ class ProjectSettings(QGroupBox):
         '''
         initial_path = self.settings.get('project_path') or self.settings.get('last_used_path')
         initial_path = initial_path if isinstance(initial_path, str) else os.getcwd()
-        filter = _("Subtrans Files (*.subtrans);;All Files (*)")
+        filter = _("Subtrans Files (*.subtrans *.subtransz);;All Files (*)")
         caption = _("Select project to copy settings from")
         file_name, dummy = QFileDialog.getOpenFileName(self, caption, dir=initial_path, filter=filter) # type: ignore[ignore-unused]
         if file_name:
@@ -5,11 +5,7 @@ from datetime import timedelta
 from typing import TextIO
 
 from PySubtrans.Helpers.Color import Color
-from PySubtrans.SubtitleFileHandler import (
-    SubtitleFileHandler,
-    default_encoding,
-    fallback_encoding,
-)
+from PySubtrans.SubtitleFileHandler import SubtitleFileHandler
 from PySubtrans.SubtitleLine import SubtitleLine
 from PySubtrans.SubtitleData import SubtitleData
 from PySubtrans.SubtitleError import SubtitleParseError
@@ -56,20 +52,6 @@ class SSAFileHandler(SubtitleFileHandler):
     
     SUPPORTED_EXTENSIONS = {'.ass': 10, '.ssa': 10}
 
-    def load_file(self, path: str) -> SubtitleData:
-        # TEST: Use .ssa extension as format hint to detect Marked lines ... this causes more problems than it fixes, let's trust pysubs2
-        # format_hint = 'ssa' if path.lower().endswith('.ssa') else None
-        format_hint = None
-        
-        try:
-            subs: pysubs2.SSAFile = pysubs2.SSAFile.load(path, encoding=default_encoding, format_=format_hint)
-            return self._parse_subs(subs)
-        except UnicodeDecodeError:
-            subs: pysubs2.SSAFile = pysubs2.SSAFile.load(path, encoding=fallback_encoding, format_=format_hint, newline='')
-            return self._parse_subs(subs)
-        except Exception as e:
-            raise e if isinstance(e, SubtitleParseError) else SubtitleParseError(_("Failed to parse subtitles: {}" ).format(str(e)), e)
-    
     def parse_file(self, file_obj: TextIO) -> SubtitleData:
         """
         Parse file content and return SubtitleData with lines and metadata.
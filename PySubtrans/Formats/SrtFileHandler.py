@@ -1,108 +1,128 @@
 import logging
+import regex
 import srt # type: ignore
 from collections.abc import Iterator
 from typing import TextIO
 
-from PySubtrans.SubtitleFileHandler import (
-    SubtitleFileHandler,
-    default_encoding,
-    fallback_encoding,
-)
+from PySubtrans.SubtitleFileHandler import SubtitleFileHandler
 from PySubtrans.SubtitleLine import SubtitleLine
 from PySubtrans.SubtitleData import SubtitleData
 from PySubtrans.SubtitleError import SubtitleParseError
 from PySubtrans.Helpers.Localization import _
+from PySubtrans.Helpers.Text import IsRightToLeftText
+
+# An index line at the start of a block
+_INDEX_LINE = regex.compile(r'\s*([0-9]+)\s*')
+
+# A timing line with optional proprietary data, e.g. "00:01:02,345 --> 00:01:04,000 X1:100"
+_TIMING_LINE = regex.compile(
+    r'([0-9]+)[,.:]([0-9]+)[,.:]([0-9]+)(?:[,.:]([0-9]*))?'
+    r' *-[ -] *> *'
+    r'([0-9]+)[,.:]([0-9]+)[,.:]([0-9]+)(?:[,.:]([0-9]*))?'
+    r' ?(.*)'
+)
+
+# The srt library treats a line that looks like an index followed by a timestamp as the start of a new block
+_BLOCK_INDEX = regex.compile(r'-?[0-9]+\.?[0-9]*\s*')
+_BLOCK_INDEX_START = frozenset('-0123456789')
+_BLOCK_TIMESTAMP = regex.compile(r'[0-9]+[,.:，．。：][0-9]+[,.:，．。：][0-9]+')
+
+_MULTIPLE_NEWLINES = regex.compile(r'\n\n+')
+
+class _UnsupportedLayout(Exception):
+    """ The file is not laid out in a way the fast parser handles, so the srt library should parse it """
 
 class SrtFileHandler(SubtitleFileHandler):
     """
     File handler for SRT subtitle format.
-    Encapsulates all SRT library usage for file I/O operations.
     SRT is a simple format with minimal metadata.
+
+    Well formed files are read and written directly. Anything unusual is parsed by the srt library,
+    which tolerates many common errors, so the results are the same either way.
     """
-    
+
     SUPPORTED_EXTENSIONS = {'.srt': 10}
 
-    def load_file(self, path: str) -> SubtitleData:
-        try:
-            with open(path, 'r', encoding=default_encoding, newline='') as f:
-                return self.parse_file(f)
-        except UnicodeDecodeError:
-            with open(path, 'r', encoding=fallback_encoding, newline='') as f:
-                return self.parse_file(f)
-    
     def parse_file(self, file_obj: TextIO) -> SubtitleData:
         """
         Parse SRT file content and return SubtitleData with lines and metadata.
         """
-        lines = list(self._parse_srt_items(file_obj))
+        lines = self._parse_srt_items(file_obj.read())
         return SubtitleData(lines=lines, metadata={}, detected_format='.srt')
-    
+
     def parse_string(self, content: str) -> SubtitleData:
         """
         Parse SRT string content and return SubtitleData with lines and metadata.
         """
-        lines = list(self._parse_srt_items(content))
+        lines = self._parse_srt_items(content)
         return SubtitleData(lines=lines, metadata={}, detected_format='.srt')
 
     def compose(self, data: SubtitleData) -> str:
         """
         Compose subtitle lines into SRT format string.
-        
+
         Args:
             data: SubtitleData containing lines and file metadata
-            
+
         Returns:
             str: SRT formatted subtitle content
         """
-        from PySubtrans.Helpers.Text import IsRightToLeftText
-        
-        # Filter out invalid lines and renumber for SRT compliance
-        output_lines = []
-        start_number = data.start_line_number or 1
-        line_number = start_number
-        
+        return ''.join(self._compose_blocks(data))
+
+    def write_file(self, data: SubtitleData, file_obj: TextIO) -> None:
+        """
+        Write subtitle lines to a file in SRT format, one block at a time
+        """
+        file_obj.writelines(self._compose_blocks(data))
+
+    def _compose_blocks(self, data: SubtitleData) -> Iterator[str]:
+        """
+        Generate an SRT block for each valid line, renumbering them for SRT compliance
+        """
+        add_rtl_markers = data.metadata.get('add_rtl_markers')
+        line_number = data.start_line_number or 1
+        written = 0
+
         for line in data.lines:
-            if line.text and line.start is not None and line.end is not None:
-                output_lines.append(SubtitleLine.Construct(
-                    line_number, line.start, line.end, line.text, line.metadata
-                ))
-                line_number += 1
-
-        # Log a warning if any lines had no text or start time
-        if len(output_lines) < len(data.lines):
-            num_invalid = len([line for line in data.lines if line.start is None])
-            if num_invalid:
-                logging.warning(_("{} lines were invalid and were not written to the output file").format(num_invalid))
+            if not line.text:
+                continue
+
+            text = line.text.strip()
+            if add_rtl_markers and text and IsRightToLeftText(text) and not text.startswith("\u202b"):
+                text = f"\u202b{text}\u202c"
+
+            # Blank lines are not allowed within an SRT block
+            if not text or text[0] == "\n" or "\n\n" in text:
+                text = _MULTIPLE_NEWLINES.sub("\n", text.strip("\n"))
+
+            proprietary = line.metadata.get('proprietary', '') if line.has_metadata else ''
+            timing = f"{_format_timestamp(line.start_us)} --> {_format_timestamp(line.end_us)}"
+            if proprietary:
+                timing = f"{timing} {proprietary}"
 
+            yield f"{line_number}\n{timing}\n{text}\n\n"
+            line_number += 1
+            written += 1
+
+        # Log a warning if any lines had no text
+        if written < len(data.lines):
             num_empty = len([line for line in data.lines if not line.text])
             if num_empty:
                 logging.warning(_("{} lines were empty and were not written to the output file").format(num_empty))
 
-        # Add RTL markers if required
-        if data.metadata.get('add_rtl_markers'):
-            for line in output_lines:
-                if line.text and IsRightToLeftText(line.text) and not line.text.startswith("\u202b"):
-                    line.text = f"\u202b{line.text}\u202c"
-        
-
-        srt_items = []
-        for line in output_lines:
-            proprietary = line.metadata.get('proprietary', '')
-            
-            srt_item = srt.Subtitle(
-                index=line.number,
-                start=line.start,
-                end=line.end,
-                content=line.text,
-                proprietary=proprietary
-            )
-            srt_items.append(srt_item)
-        
-        return srt.compose(srt_items, reindex=False)
-
-    def _parse_srt_items(self, source) -> Iterator[SubtitleLine]:
+    def _parse_srt_items(self, source : str) -> list[SubtitleLine]:
         """
-        Internal helper to parse SRT items from a file object or string and yield SubtitleLine objects.
+        Internal helper to parse SRT content into SubtitleLine objects.
+        """
+        try:
+            return list(_read_srt_blocks(source))
+
+        except _UnsupportedLayout:
+            return list(self._parse_with_srt_library(source))
+
+    def _parse_with_srt_library(self, source : str) -> Iterator[SubtitleLine]:
+        """
+        Parse SRT content with the srt library, which copes with malformed files
         """
         try:
             srt_items = list(srt.parse(source))
@@ -118,11 +138,124 @@ class SrtFileHandler(SubtitleFileHandler):
                     metadata=metadata
                 )
                 yield line
-                
+
         except UnicodeDecodeError:
             raise  # Re-raise UnicodeDecodeError for fallback handling
         except srt.SRTParseError as e:
             raise SubtitleParseError(_("Failed to parse SRT: {}" ).format(str(e)), e)
         except Exception as e:
             raise SubtitleParseError(_("Unexpected error parsing SRT: {}" ).format(str(e)), e)
-    
+
+def _read_srt_blocks(source : str) -> Iterator[SubtitleLine]:
+    """
+    Read SubtitleLines from well formed SRT content in a single pass, building the times directly from the digits.
+
+    Raises _UnsupportedLayout if the content is not laid out as index, timing and text blocks,
+    so that the srt library can apply its error recovery rules.
+    """
+    text = source.replace('\r\n', '\n')
+    if '\r' in text:
+        raise _UnsupportedLayout()
+
+    if text.startswith('\ufeff'):
+        text = text[1:]
+
+    lines = text.split('\n')
+    count = len(lines)
+    i = 0
+    timing_match = None
+    while True:
+        if timing_match is None:
+            while i < count and not lines[i].strip():
+                i += 1
+
+            if i >= count:
+                return
+
+            index = lines[i].strip()
+            if i + 1 < count and index.isdigit() and index.isascii():
+                timing_match = _TIMING_LINE.fullmatch(lines[i + 1])
+
+            if not timing_match:
+                raise _UnsupportedLayout()
+
+        number = int(lines[i])
+        h1, m1, s1, ms1, h2, m2, s2, ms2, proprietary = timing_match.groups()
+
+        # Find the end of the text, and the timing of the next block if there is one
+        first = i = i + 2
+        timing_match = None
+        while i < count:
+            line = lines[i]
+            if line and line[0] not in _BLOCK_INDEX_START:
+                # Most lines of text can be ruled out as the start of a block by their first character
+                i += 1
+                continue
+
+            if line == '':
+                # A blank line only ends the block if it is followed by another block or the end of the file
+                if i + 1 >= count:
+                    break
+
+                timing_match = _match_block_start(lines, i + 1)
+                if timing_match:
+                    break
+
+                if _BLOCK_TIMESTAMP.match(lines[i + 1]):
+                    raise _UnsupportedLayout()
+
+            else:
+                timing_match = _match_block_start(lines, i)
+                if timing_match:
+                    if i == first:
+                        # The srt library treats the next block as the content of this one
+                        raise _UnsupportedLayout()
+                    break
+
+            i += 1
+
+        start_us = ((int(h1) * 60 + int(m1)) * 60 + int(s1)) * 1_000_000 + int(ms1 or 0) * 1000
+        end_us = ((int(h2) * 60 + int(m2)) * 60 + int(s2)) * 1_000_000 + int(ms2 or 0) * 1000
+        content = '\n'.join(lines[first:i])
+        metadata = {"proprietary": proprietary} if proprietary else None
+
+        yield SubtitleLine.ConstructFromMicroseconds(number, start_us, end_us, content, metadata)
+
+        if timing_match and lines[i] == '':
+            i += 1
+
+def _match_block_start(lines : list[str], i : int) -> regex.Match|None:
+    """
+    Check whether a line is an index followed by a timestamp, which the srt library would treat as a new block.
+    Returns the match for the timing line, or raises _UnsupportedLayout if the block is not laid out as expected.
+    """
+    line = lines[i]
+    if not line or line[0] not in _BLOCK_INDEX_START:
+        return None
+
+    index = line.rstrip()
+    if index.isdigit() and index.isascii() and i + 1 < len(lines):
+        timing_match = _TIMING_LINE.fullmatch(lines[i + 1])
+        if timing_match:
+            return timing_match
+
+    if not _BLOCK_INDEX.fullmatch(line):
+        return None
+
+    i += 1
+    while i < len(lines) and not lines[i].strip():
+        i += 1
+
+    if i < len(lines) and _BLOCK_TIMESTAMP.match(lines[i]):
+        raise _UnsupportedLayout()
+
+    return None
+
+def _format_timestamp(time_us : int) -> str:
+    """
+    Format a time in microseconds as an SRT timestamp
+    """
+    seconds, microseconds = divmod(time_us, 1_000_000)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{microseconds // 1000:03d}"
@@ -2,11 +2,7 @@ import regex
 from datetime import timedelta
 from typing import TextIO
 
-from PySubtrans.SubtitleFileHandler import (
-    SubtitleFileHandler,
-    default_encoding,
-    fallback_encoding,
-)
+from PySubtrans.SubtitleFileHandler import SubtitleFileHandler
 from PySubtrans.SubtitleLine import SubtitleLine
 from PySubtrans.SubtitleData import SubtitleData
 from PySubtrans.SubtitleError import SubtitleParseError
@@ -31,14 +27,6 @@ class VttFileHandler(SubtitleFileHandler):
     _STYLE_BLOCK_START = regex.compile(r'^\s*STYLE\s*$')
     _NOTE_BLOCK_START = regex.compile(r'^\s*NOTE(?:\s.*)?$')
 
-    def load_file(self, path: str) -> SubtitleData:
-        try:
-            with open(path, 'r', encoding=default_encoding) as f:
-                return self.parse_file(f)
-        except UnicodeDecodeError:
-            with open(path, 'r', encoding=fallback_encoding) as f:
-                return self.parse_file(f)
-    
     def parse_file(self, file_obj: TextIO) -> SubtitleData:
         """Parse file content and return SubtitleData with lines and metadata."""
         try:
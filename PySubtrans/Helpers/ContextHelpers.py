@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+from bisect import bisect_left
+import threading
 from typing import Any, TYPE_CHECKING
 
 from PySubtrans.Helpers.Parse import ParseNames
 from PySubtrans.SubtitleError import SubtitleError
 
 if TYPE_CHECKING:
+    from PySubtrans.SubtitleBatch import SubtitleBatch
+    from PySubtrans.SubtitleScene import SubtitleScene
     from PySubtrans.Subtitles import Subtitles
 
 
 
-def GetBatchContext(subtitles: Subtitles, scene_number: int, batch_number: int, max_lines: int|None = None) -> dict[str, Any]:
+def GetBatchContext(subtitles: Subtitles, scene_number: int, batch_number: int, max_lines: int|None = None, history: SummaryHistory|None = None) -> dict[str, Any]:
     """
-    Get context for a batch of subtitles, by extracting summaries from previous scenes and batches
+    Get context for a batch of subtitles, by extracting summaries from previous scenes and batches.
+    If a history index is provided it is used instead of scanning the earlier scenes.
     """
     with subtitles.lock:
         scene = subtitles.GetScene(scene_number)
@@ -39,7 +44,10 @@ def GetBatchContext(subtitles: Subtitles, scene_number: int, batch_number: int,
         if 'names' in subtitles.settings:
             context['names'] = ParseNames(subtitles.settings.get('names', []))
 
-        history_lines = GetHistory(subtitles, scene_number, batch_number, max_lines)
+        if history is not None:
+            history_lines = history.GetHistory(scene_number, batch_number, max_lines)
+        else:
+            history_lines = GetHistory(subtitles, scene_number, batch_number, max_lines)
 
         if history_lines:
             context['history'] = history_lines
@@ -70,3 +78,119 @@ def GetHistory(subtitles: Subtitles, scene_number: int, batch_number: int, max_l
         history_lines = history_lines[-max_lines:]
 
     return history_lines
+
+
+class SummaryHistory:
+    """
+    Index of scene and batch summaries, so that the history for a batch can be found without
+    scanning every earlier scene.
+
+    Scene summaries are kept in a log ordered by scene number, with consecutive duplicates removed
+    as GetHistory does. Summaries that arrive in scene order are appended, while an update to an
+    earlier scene marks the log to be rebuilt on the next lookup.
+    """
+    def __init__(self, subtitles: Subtitles|None = None):
+        self._scene_summaries : dict[int, str] = {}
+        self._batch_summaries : dict[int, dict[int, str]] = {}
+        self._scene_log : list[tuple[int, str]] = []
+        self._scene_log_numbers : list[int] = []
+        self._latest_scene : int = 0
+        self._dirty : bool = False
+        self.lock = threading.Lock()
+
+        if subtitles is not None:
+            self.Rebuild(subtitles)
+
+    def Rebuild(self, subtitles: Subtitles) -> None:
+        """
+        Index the current summaries of every scene and batch
+        """
+        with subtitles.lock:
+            scene_summaries = { scene.number: scene.summary for scene in subtitles.scenes if scene.number and scene.summary }
+            batch_summaries = {
+                scene.number: { batch.number: batch.summary for batch in scene.batches if batch.number is not None and batch.summary }
+                for scene in subtitles.scenes if scene.number
+            }
+
+        with self.lock:
+            self._scene_summaries = scene_summaries
+            self._batch_summaries = batch_summaries
+            self._rebuild_scene_log()
+
+    def UpdateScene(self, scene: SubtitleScene) -> None:
+        """
+        Record the current summary of a scene
+        """
+        if not scene.number:
+            return
+
+        summary = scene.summary or None
+        with self.lock:
+            if self._scene_summaries.get(scene.number) == summary:
+                return
+
+            is_latest = scene.number > self._latest_scene
+
+            if summary:
+                self._scene_summaries[scene.number] = summary
+                self._latest_scene = max(self._latest_scene, scene.number)
+            else:
+                self._scene_summaries.pop(scene.number, None)
+
+            if summary and is_latest and not self._dirty:
+                self._append_scene_summary(scene.number, summary)
+            else:
+                self._dirty = True
+
+    def UpdateBatch(self, batch: SubtitleBatch) -> None:
+        """
+        Record the current summary of a batch
+        """
+        if not batch.scene or batch.number is None:
+            return
+
+        with self.lock:
+            scene_batches = self._batch_summaries.setdefault(batch.scene, {})
+            if batch.summary:
+                scene_batches[batch.number] = batch.summary
+            else:
+                scene_batches.pop(batch.number, None)
+
+    def GetHistory(self, scene_number: int, batch_number: int, max_lines: int|None = None) -> list[str]:
+        """
+        Get the historical summaries up to a given scene and batch number
+        """
+        with self.lock:
+            if self._dirty:
+                self._rebuild_scene_log()
+
+            end = bisect_left(self._scene_log_numbers, scene_number)
+            start = max(0, end - max_lines) if max_lines else 0
+
+            history_lines = [ f"scene {number}: {summary}" for number, summary in self._scene_log[start:end] ]
+            last_summary = self._scene_log[end - 1][1] if end > 0 else ""
+
+            scene_batches = self._batch_summaries.get(scene_number, {})
+            for number in sorted(number for number in scene_batches if number < batch_number):
+                summary = scene_batches[number]
+                if summary != last_summary:
+                    history_lines.append(f"scene {scene_number} batch {number}: {summary}")
+                    last_summary = summary
+
+        if max_lines:
+            history_lines = history_lines[-max_lines:]
+
+        return history_lines
+
+    def _append_scene_summary(self, scene_number: int, summary: str) -> None:
+        if not self._scene_log or self._scene_log[-1][1] != summary:
+            self._scene_log.append((scene_number, summary))
+            self._scene_log_numbers.append(scene_number)
+
+    def _rebuild_scene_log(self) -> None:
+        self._scene_log = []
+        self._scene_log_numbers = []
+        self._latest_scene = max(self._scene_summaries, default=0)
+        for scene_number in sorted(self._scene_summaries):
+            self._append_scene_summary(scene_number, self._scene_summaries[scene_number])
+        self._dirty = False
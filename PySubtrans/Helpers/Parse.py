@@ -119,6 +119,20 @@ def ParseDelayFromHeader(value : str) -> float:
         logging.error(f"Unexpected time value '{value}' ({e})")
         return 6.66
 
+def ParseRetryAfterFromHeaders(headers : Any) -> float|None:
+    """
+    Find a suggested delay before retrying in the Retry-After or x-ratelimit-reset-* headers of a response
+    """
+    if not headers or not hasattr(headers, 'get'):
+        return None
+
+    for header in ('retry-after', 'x-ratelimit-reset-requests', 'x-ratelimit-reset-tokens'):
+        value = headers.get(header) or headers.get(header.title())
+        if isinstance(value, str) and value.strip():
+            return ParseDelayFromHeader(value.strip())
+
+    return None
+
 def ParseErrorMessageFromText(value: str) -> str|None:
     """
     Try to extract a human-friendly error message from an HTTP response body.
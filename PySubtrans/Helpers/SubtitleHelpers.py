@@ -1,3 +1,4 @@
+from bisect import bisect_left
 from datetime import timedelta
 import logging
 from typing import Any
@@ -8,6 +9,26 @@ from PySubtrans.SubtitleLine import SubtitleLine
 
 _whitespace_collapse = regex.compile("\n\n+")
 
+def _line_number(line : SubtitleLine) -> int:
+    return line.number or 0
+
+def FindLineIndex(lines : list[SubtitleLine], line_number : int) -> int|None:
+    """
+    Find the index of a line in a list of lines sorted by line number, or None if it is not in the list
+    """
+    index = bisect_left(lines, line_number, key=_line_number)
+    if index < len(lines) and lines[index].number == line_number:
+        return index
+
+    return None
+
+def FindLine(lines : list[SubtitleLine], line_number : int) -> SubtitleLine|None:
+    """
+    Find a line by number in a list of lines sorted by line number
+    """
+    index = FindLineIndex(lines, line_number)
+    return lines[index] if index is not None else None
+
 def AddOrUpdateLine(lines : list[SubtitleLine], line : SubtitleLine) -> int|None:
     """
     Insert a line into a list of lines at the correct position, or replace any existing line.
@@ -16,16 +37,13 @@ def AddOrUpdateLine(lines : list[SubtitleLine], line : SubtitleLine) -> int|None
         lines.append(line)
         return len(lines) - 1
 
-    for i, item in enumerate(lines):
-        if item.number == line.number:
-            lines[i] = line
-            return i
+    index = bisect_left(lines, _line_number(line), key=_line_number)
+    if index < len(lines) and lines[index].number == line.number:
+        lines[index] = line
+    else:
+        lines.insert(index, line)
 
-        if item.number > line.number:
-            lines.insert(i, line)
-            return i
-
-    return None
+    return index
 
 def MergeSubtitles(merged_lines : list[SubtitleLine]) -> SubtitleLine:
     """
@@ -4,13 +4,11 @@ import unittest
 from typing import Any
 
 import regex
-from PySubtrans.Helpers.Tests import log_expected_result, log_info, log_input_expected_result, log_test_name
+from PySubtrans.Helpers.Tests import PrepareSubtitles, log_expected_result, log_info, log_input_expected_result, log_test_name
 from PySubtrans.Options import Options, SettingsType
 from PySubtrans.SettingsType import SettingsType
 from PySubtrans.SubtitleBatch import SubtitleBatch
 from PySubtrans.SubtitleError import TranslationError
-from PySubtrans.SubtitleFileHandler import SubtitleFileHandler
-from PySubtrans.SubtitleFormatRegistry import SubtitleFormatRegistry
 from PySubtrans.SubtitleLine import SubtitleLine
 from PySubtrans.SubtitleProject import SubtitleProject
 from PySubtrans.SubtitleScene import SubtitleScene
@@ -183,17 +181,6 @@ class SubtitleTestCase(LoggedTestCase):
         self.assertSequenceEqual([ line.end for line in batch.originals ], [ line.end for line in reference_batch.originals ])
 
 
-def PrepareSubtitles(subtitle_data : dict, key : str = 'original', file_handler: SubtitleFileHandler|None = None) -> Subtitles:
-    """
-    Prepares a SubtitleFile object from subtitle data.
-    """
-    filename = subtitle_data['filename']
-    handler = file_handler or SubtitleFormatRegistry.create_handler(filename=filename)
-    subtitles: Subtitles = Subtitles()
-    subtitles.LoadSubtitlesFromString(subtitle_data[key], file_handler=handler)
-    subtitles.UpdateSettings(SettingsType(subtitle_data))
-    return subtitles
-
 def AddTranslations(subtitles : Subtitles, subtitle_data : dict, key : str = 'translated'):
     """
     Adds translations to the subtitles.
@@ -7,6 +7,9 @@ from datetime import datetime
 from typing import Any
 
 from PySubtrans.SettingsType import SettingsType
+from PySubtrans.SubtitleBatcher import SubtitleBatcher
+from PySubtrans.SubtitleEditor import SubtitleEditor
+from PySubtrans.SubtitleFileHandler import SubtitleFileHandler
 from PySubtrans.SubtitleFormatRegistry import SubtitleFormatRegistry
 from PySubtrans.Subtitles import Subtitles
 
@@ -68,6 +71,26 @@ def log_input_expected_error(input : Any, expected_error : type[Exception], resu
     logging.info(separator)
 
 
+def PrepareSubtitles(subtitle_data : dict, key : str = 'original', file_handler: SubtitleFileHandler|None = None) -> Subtitles:
+    """
+    Prepares a SubtitleFile object from subtitle data.
+    """
+    filename = subtitle_data['filename']
+    handler = file_handler or SubtitleFormatRegistry.create_handler(filename=filename)
+    subtitles: Subtitles = Subtitles()
+    subtitles.LoadSubtitlesFromString(subtitle_data[key], file_handler=handler)
+    subtitles.UpdateSettings(SettingsType(subtitle_data))
+    return subtitles
+
+def PrepareBatchedSubtitles(subtitle_data : dict, options : SettingsType, key : str = 'original') -> Subtitles:
+    """
+    Prepares subtitles from subtitle data and divides them into scenes and batches with the batcher settings in options.
+    """
+    subtitles = PrepareSubtitles(subtitle_data, key)
+    with SubtitleEditor(subtitles) as editor:
+        editor.AutoBatch(SubtitleBatcher(options))
+    return subtitles
+
 def skip_if_debugger_attached(test_method):
     """
     Decorator to skips a test method when debugger is attached.
@@ -1,4 +1,6 @@
 import os
+import shutil
+import threading
 
 from typing import Any
 
@@ -86,7 +88,7 @@ def GetOutputPath(filepath : str|None, language : str|None = None, format_extens
 
     # Determine extension
     if not format_extension:
-        if current_extension == ".subtrans":
+        if current_extension in (".subtrans", ".subtransz"):
             raise ValueError("Extension must be provided to deduce output path from project file")
         format_extension = current_extension
 
@@ -97,6 +99,34 @@ def GetOutputPath(filepath : str|None, language : str|None = None, format_extens
     output_path = os.path.join(directory, f"{basename}{format_extension}")
     return os.path.normpath(output_path)
 
+def WriteFileAtomically(filepath : str, content : str|bytes, encoding : str = 'utf-8') -> None:
+    """
+    Write a text file via a temporary file in the same folder, replacing the target only once the content
+    is safely on disk so that an interrupted write cannot leave a truncated file.
+    """
+    temp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if isinstance(content, bytes):
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+        else:
+            with open(temp_path, 'w', encoding=encoding) as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, temp_path)
+
+        os.replace(temp_path, filepath)
+
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
 def FormatMessages(messages : list[dict[str,Any]]) -> str:
     lines : list[str] = []
     for index, message in enumerate(messages, start=1):
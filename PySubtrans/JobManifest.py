@@ -0,0 +1,243 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from enum import Enum
+from typing import Any
+
+from PySubtrans.Helpers.Localization import _
+from PySubtrans.SettingsType import SettingsType, redact_sensitive_values
+from PySubtrans.SubtitleBatch import SubtitleBatch
+from PySubtrans.SubtitleLine import SubtitleLine
+from PySubtrans.Subtitles import Subtitles
+
+# Settings that control how a translation is run rather than what it produces
+_OPERATIONAL_SETTINGS = {
+    'adaptive_concurrency', 'adaptive_max_concurrency', 'autosave', 'background_save', 'backoff_time', 'compress_project', 'firstrun',
+    'max_retries', 'max_threads', 'multithreaded_translation', 'preview', 'project_file', 'project_journal',
+    'rate_limit', 'reload', 'response_cache', 'response_cache_path', 'response_cache_size', 'retry_on_error',
+    'save_delay', 'stop_on_error', 'theme', 'timeout', 'token_rate_limit', 'translation_memory', 'translation_memory_path',
+    'ui_language', 'version', 'write_backup',
+}
+
+class FileState(Enum):
+    """ The state of a file in a job manifest """
+    InProgress = 'in_progress'
+    Completed = 'completed'
+
+class JobManifest:
+    """
+    Records the progress of a batch translation job, so that an interrupted job can be resumed.
+
+    Each file is recorded with a hash of its content, a fingerprint of the options it is being translated with
+    and its state. The translated lines of each batch are recorded as the batch completes, so a file that was
+    interrupted can be resumed from the last completed batch. Files whose content or options have changed
+    since they were recorded start again from scratch.
+
+    The manifest is stored in an SQLite database and can be shared by threads translating different files.
+    """
+    def __init__(self, path : str):
+        self.path : str = path
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                name TEXT PRIMARY KEY,
+                source_hash TEXT NOT NULL,
+                source_size INTEGER NOT NULL,
+                source_mtime INTEGER NOT NULL,
+                options_hash TEXT NOT NULL,
+                state TEXT NOT NULL,
+                destination TEXT,
+                updated REAL NOT NULL
+            )""")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS batches (
+                name TEXT NOT NULL,
+                scene INTEGER NOT NULL,
+                batch INTEGER NOT NULL,
+                first_line INTEGER,
+                last_line INTEGER,
+                summary TEXT,
+                scene_summary TEXT,
+                lines TEXT NOT NULL,
+                PRIMARY KEY (name, scene, batch)
+            )""")
+        self.connection.commit()
+
+    def GetFileState(self, name : str, source_path : str, options_hash : str) -> FileState|None:
+        """
+        Get the recorded state of a file, or None if it is not recorded or has changed since it was recorded.
+        The file is only hashed if its size or modification time do not match the manifest.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT source_hash, source_size, source_mtime, options_hash, state FROM files WHERE name = ?", (name,)).fetchone()
+
+        if row is None:
+            return None
+
+        source_hash, source_size, source_mtime, recorded_options_hash, recorded_state = row
+        if recorded_options_hash != options_hash:
+            return None
+
+        state = FileState(recorded_state)
+
+        stat = os.stat(source_path)
+        if stat.st_size == source_size and stat.st_mtime_ns == source_mtime:
+            return state
+
+        if stat.st_size != source_size or HashFile(source_path) != source_hash:
+            return None
+
+        # The file was touched but its content is the same
+        with self.lock:
+            self.connection.execute("UPDATE files SET source_mtime = ? WHERE name = ?", (stat.st_mtime_ns, name))
+            self.connection.commit()
+
+        return state
+
+    def HasFile(self, name : str) -> bool:
+        """
+        Check whether a file has been recorded, whatever its state
+        """
+        with self.lock:
+            return self.connection.execute("SELECT 1 FROM files WHERE name = ?", (name,)).fetchone() is not None
+
+    def GetDestination(self, name : str) -> str|None:
+        """
+        Get the path a completed file was written to
+        """
+        with self.lock:
+            row = self.connection.execute("SELECT destination FROM files WHERE name = ?", (name,)).fetchone()
+            return row[0] if row else None
+
+    def BeginFile(self, name : str, source_path : str, options_hash : str) -> None:
+        """
+        Record that a file is being translated. Completed batches are kept if the file and options are unchanged.
+        """
+        if self.GetFileState(name, source_path, options_hash) == FileState.InProgress:
+            return
+
+        stat = os.stat(source_path)
+        source_hash = HashFile(source_path)
+
+        with self.lock:
+            self.connection.execute("DELETE FROM batches WHERE name = ?", (name,))
+            self.connection.execute(
+                "INSERT OR REPLACE INTO files (name, source_hash, source_size, source_mtime, options_hash, state, destination, updated) VALUES (?, ?, ?, ?, ?, ?, NULL, ?)",
+                (name, source_hash, stat.st_size, stat.st_mtime_ns, options_hash, FileState.InProgress.value, time.time()))
+            self.connection.commit()
+
+    def RecordBatch(self, name : str, batch : SubtitleBatch, scene_summary : str|None = None) -> None:
+        """
+        Record the translated lines of a completed batch, with the summary of its scene so far
+        """
+        lines = [ [ line.number, line.start_us, line.end_us, line.text ] for line in batch.translated ]
+
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO batches (name, scene, batch, first_line, last_line, summary, scene_summary, lines) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (name, batch.scene, batch.number, batch.first_line_number, batch.last_line_number, batch.summary, scene_summary,
+                 json.dumps(lines, ensure_ascii=False)))
+            self.connection.execute("UPDATE files SET updated = ? WHERE name = ?", (time.time(), name))
+            self.connection.commit()
+
+    def RestoreBatches(self, name : str, subtitles : Subtitles) -> int:
+        """
+        Restore the translations of completed batches to the subtitles. Returns the number of batches restored.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT scene, batch, first_line, last_line, summary, scene_summary, lines FROM batches WHERE name = ? ORDER BY scene, batch", (name,)).fetchall()
+
+        recorded = { (row[0], row[1]) : row[2:] for row in rows }
+
+        restored = 0
+        for scene in subtitles.scenes:
+            for batch in scene.batches:
+                record = recorded.get((batch.scene, batch.number))
+                if record is None:
+                    continue
+
+                first_line, last_line, summary, scene_summary, lines = record
+                if first_line != batch.first_line_number or last_line != batch.last_line_number:
+                    logging.warning(_("Recorded translation of scene {scene} batch {batch} does not match the subtitles").format(scene=batch.scene, batch=batch.number))
+                    continue
+
+                _restore_batch(batch, json.loads(lines), summary)
+                if scene_summary:
+                    scene.summary = scene_summary
+                restored += 1
+
+        return restored
+
+    def CompleteFile(self, name : str, destination : str) -> None:
+        """
+        Record that a file has been translated and saved. The batches are no longer needed.
+        """
+        with self.lock:
+            self.connection.execute("DELETE FROM batches WHERE name = ?", (name,))
+            self.connection.execute("UPDATE files SET state = ?, destination = ?, updated = ? WHERE name = ?",
+                                    (FileState.Completed.value, destination, time.time(), name))
+            self.connection.commit()
+
+    def Close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+def _restore_batch(batch : SubtitleBatch, lines : list[list[Any]], summary : str|None) -> None:
+    """
+    Apply recorded translations to a batch
+    """
+    translated = [ SubtitleLine.ConstructFromMicroseconds(number, start_us, end_us, text) for number, start_us, end_us, text in lines ]
+    translations = { line.number : line.text for line in translated }
+
+    batch.translated = translated
+    for line in batch.originals:
+        line.translation = translations.get(line.number)
+
+    if summary and not batch.summary:
+        batch.summary = summary
+
+def HashFile(path : str) -> str:
+    """
+    Hash the content of a file
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def GetOptionsFingerprint(settings : SettingsType, ignored_keys : Iterable[str] = ()) -> str:
+    """
+    Hash the settings that affect the result of a translation.
+    Secrets are redacted and operational settings are ignored, so they can change without invalidating a job.
+    """
+    ignored = _OPERATIONAL_SETTINGS.union(ignored_keys)
+
+    def _relevant(values : dict[str, Any]) -> dict[str, Any]:
+        return { key : _relevant(value) if isinstance(value, dict) else value for key, value in values.items() if key not in ignored }
+
+    selected = SettingsType({ key : value for key, value in settings.items() if key != 'provider_settings' })
+
+    # Only the settings for the selected provider are relevant
+    provider_settings = settings.get('provider_settings') or {}
+    provider = settings.get('provider')
+    if isinstance(provider, str) and isinstance(provider_settings, dict) and provider in provider_settings:
+        selected['provider_settings'] = SettingsType(provider_settings[provider])
+
+    relevant = _relevant(redact_sensitive_values(selected))
+
+    serialised = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serialised.encode('utf-8')).hexdigest()
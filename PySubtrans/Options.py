@@ -54,11 +54,14 @@ default_settings = {
     'prompt': env_str('PROMPT', default_user_prompt),
     'instruction_file': env_str('INSTRUCTION_FILE', None),
     'target_language': env_str('TARGET_LANGUAGE', 'English'),
+    'source_language': env_str('SOURCE_LANGUAGE', None),
     'include_original': env_bool('INCLUDE_ORIGINAL', False),
     'add_right_to_left_markers': env_bool('add_right_to_left_markers', False),
     'scene_threshold': env_float('SCENE_THRESHOLD', 60.0),
     'min_batch_size': env_int('MIN_BATCH_SIZE', 10),
     'max_batch_size': env_int('MAX_BATCH_SIZE', 30),
+    'max_input_tokens': env_int('MAX_INPUT_TOKENS', None),
+    'max_output_tokens': env_int('MAX_OUTPUT_TOKENS', None),
     'max_context_summaries': env_int('MAX_CONTEXT_SUMMARIES', 10),
     'max_characters': env_int('MAX_CHARACTERS', 120),
     'max_newlines': env_int('MAX_NEWLINES', 2),
@@ -86,11 +89,27 @@ default_settings = {
     'autosplit_on_error': env_bool('AUTOSPLIT_ON_ERROR', False),
     'max_lines': env_int('MAX_LINES', None),
     'max_threads': env_int('MAX_THREADS', 4),
+    'multithreaded_translation': env_bool('MULTITHREADED_TRANSLATION', False),
+    'adaptive_concurrency': env_bool('ADAPTIVE_CONCURRENCY', True),
+    'adaptive_max_concurrency': env_int('ADAPTIVE_MAX_CONCURRENCY', 32),
+    'token_rate_limit': env_float('TOKEN_RATE_LIMIT', None),
     'max_retries': env_int('MAX_RETRIES', 1),
     'max_summary_length': env_int('MAX_SUMMARY_LENGTH', 240),
     'backoff_time': env_float('BACKOFF_TIME', 3.0),
+    'cache_friendly_prompt' : env_bool('CACHE_FRIENDLY_PROMPT', False),
+    'response_cache' : env_bool('RESPONSE_CACHE', False),
+    'response_cache_path' : env_str('RESPONSE_CACHE_PATH', None),
+    'response_cache_size' : env_int('RESPONSE_CACHE_SIZE', 256),
+    'translation_memory' : env_bool('TRANSLATION_MEMORY', False),
+    'translation_memory_path' : env_str('TRANSLATION_MEMORY_PATH', None),
+    'translation_memory_hints' : env_int('TRANSLATION_MEMORY_HINTS', 5),
+    'translation_memory_threshold' : env_float('TRANSLATION_MEMORY_THRESHOLD', 0.6),
     'project_file' : env_bool('PROJECT_FILE', True),
+    'project_journal' : env_bool('PROJECT_JOURNAL', False),
+    'compress_project' : env_bool('COMPRESS_PROJECT', False),
     'autosave': env_bool('AUTOSAVE', True),
+    'background_save': env_bool('BACKGROUND_SAVE', True),
+    'save_delay': env_float('SAVE_DELAY', 1.0),
     'preview' : False,
     'retranslate' : False,
     'reparse' : False,
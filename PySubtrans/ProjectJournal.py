@@ -0,0 +1,267 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Callable
+
+from PySubtrans.Helpers import WriteFileAtomically
+from PySubtrans.Helpers.Localization import _
+from PySubtrans.SettingsType import SettingsType
+from PySubtrans.SubtitleBatch import SubtitleBatch
+from PySubtrans.SubtitleError import SubtitleError
+from PySubtrans.SubtitleScene import SubtitleScene
+from PySubtrans.SubtitleSerialisation import EncodeProjectData, IsCompressedProjectFile, SerialiseProject
+from PySubtrans.Subtitles import Subtitles
+
+default_encoding = os.getenv('DEFAULT_ENCODING', 'utf-8')
+
+def GetJournalFilepath(projectfile : str) -> str:
+    """
+    Get the path of the journal for a project file
+    """
+    return f"{projectfile}-journal"
+
+def _hash_text(text : str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class ProjectJournal:
+    """
+    Saves a project as a full snapshot plus an append-only journal of the changes made since.
+
+    Each save compares the project against the state that was last written and appends the batches,
+    scene contexts and project settings that have changed as JSON lines. The journal is replayed over
+    the snapshot when the project is loaded. Changes to the scene or batch structure, or a journal that
+    grows larger than the snapshot, cause a new snapshot to be written and the journal to be reset.
+
+    The first line of the journal records a hash of the snapshot it applies to, so a journal that does
+    not match the snapshot (e.g. if a save was interrupted) is ignored rather than replayed.
+    """
+    def __init__(self, projectfile : str, compact_ratio : float = 1.0):
+        self.projectfile : str = os.path.normpath(projectfile)
+        self.journalfile : str = GetJournalFilepath(self.projectfile)
+
+        # Compact when the journal is larger than this proportion of the snapshot
+        self.compact_ratio : float = compact_ratio
+
+        self._snapshot_size : int = 0
+        self._journal_size : int = 0
+        self._structure : list[tuple[int, list[int]]]|None = None
+        self._project_hash : str|None = None
+        self._scene_hashes : dict[int, str] = {}
+        self._batch_hashes : dict[tuple[int, int], str] = {}
+
+    @property
+    def has_snapshot(self) -> bool:
+        """ Check whether the journal knows what was last written to the snapshot """
+        return self._structure is not None
+
+    def Save(self, subtitles : Subtitles, encoder_class : type, batches : list[SubtitleBatch]|None = None) -> bool:
+        """
+        Append any changes since the last save to the journal, writing a new snapshot if necessary.
+        If batches are specified only those batches are checked for changes.
+        Returns True if a snapshot was written.
+        """
+        write = self.PrepareSave(subtitles, encoder_class, batches)
+        return write() if write else False
+
+    def PrepareSave(self, subtitles : Subtitles, encoder_class : type, batches : list[SubtitleBatch]|None = None) -> Callable[[], bool]|None:
+        """
+        Serialise the changes since the last save, returning a function that writes them to disk (or None if nothing changed).
+        The subtitles should be locked while the changes are prepared, but need not be while they are written.
+        """
+        if not self.has_snapshot or self._structure != _get_structure(subtitles):
+            return self._prepare_snapshot(subtitles, encoder_class)
+
+        entries : list[str] = []
+
+        project_text = json.dumps(_get_project_header(subtitles), cls=encoder_class, ensure_ascii=False)
+        project_hash = _hash_text(project_text)
+        if project_hash != self._project_hash:
+            entries.append(f'{{"project": {project_text}}}')
+
+        scene_hashes : dict[int, str] = {}
+        for scene in subtitles.scenes:
+            scene_text = json.dumps(_get_scene_context(scene), cls=encoder_class, ensure_ascii=False)
+            scene_hash = _hash_text(scene_text)
+            if scene_hash != self._scene_hashes.get(scene.number):
+                entries.append(f'{{"scene": {scene.number}, "context": {scene_text}}}')
+                scene_hashes[scene.number] = scene_hash
+
+        batch_hashes : dict[tuple[int, int], str] = {}
+        batches = batches if batches is not None else [ batch for scene in subtitles.scenes for batch in scene.batches ]
+        for batch in batches:
+            batch_text = json.dumps(batch, cls=encoder_class, ensure_ascii=False)
+            batch_hash = _hash_text(batch_text)
+            if batch_hash != self._batch_hashes.get((batch.scene, batch.number)):
+                entries.append(f'{{"batch": {batch_text}}}')
+                batch_hashes[(batch.scene, batch.number)] = batch_hash
+
+        if not entries:
+            return None
+
+        data = '\n'.join(entries) + '\n'
+        if self._journal_size + len(data) > self._snapshot_size * self.compact_ratio:
+            return self._prepare_snapshot(subtitles, encoder_class)
+
+        def write_entries() -> bool:
+            try:
+                with open(self.journalfile, 'a', encoding=default_encoding) as f:
+                    f.write(data)
+
+            except Exception:
+                # The journal may be incomplete, so start again from a snapshot
+                self._structure = None
+                raise
+
+            self._journal_size += len(data)
+            self._project_hash = project_hash
+            self._scene_hashes.update(scene_hashes)
+            self._batch_hashes.update(batch_hashes)
+
+            logging.debug(f"Appended {len(entries)} changes to {self.journalfile}")
+            return False
+
+        return write_entries
+
+    def WriteSnapshot(self, subtitles : Subtitles, encoder_class : type) -> None:
+        """
+        Write the full project to the snapshot file and start a new journal
+        """
+        self._prepare_snapshot(subtitles, encoder_class)()
+
+    def Replay(self, subtitles : Subtitles, project_json : str, decoder_class : type) -> int:
+        """
+        Apply the journal to subtitles loaded from the snapshot. Returns the number of changes applied.
+        """
+        self._structure = None
+
+        if not os.path.exists(self.journalfile):
+            return 0
+
+        with open(self.journalfile, 'r', encoding=default_encoding, newline='') as f:
+            lines = f.read().split('\n')
+
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except json.JSONDecodeError:
+            header = {}
+
+        # Line endings may have been translated when the snapshot was written
+        if header.get('snapshot') != _hash_text(project_json.replace('\r\n', '\n')):
+            logging.warning(_("Project journal {} does not match the project file and will be ignored").format(self.journalfile))
+            return 0
+
+        applied = 0
+        for index, line in enumerate(lines[1:], start=2):
+            if not line.strip():
+                continue
+
+            try:
+                entry = json.loads(line, cls=decoder_class)
+
+            except json.JSONDecodeError:
+                # An interrupted write can leave a partial entry at the end of the journal
+                logging.warning(_("Ignoring incomplete entry at line {} of project journal").format(index))
+                break
+
+            if _apply_entry(subtitles, entry):
+                applied += 1
+
+        logging.info(_("Applied {} changes from project journal").format(applied))
+        return applied
+
+    def Discard(self) -> None:
+        """
+        Delete the journal file, e.g. after the project has been written without it
+        """
+        self._structure = None
+        if os.path.exists(self.journalfile):
+            os.remove(self.journalfile)
+
+    def _prepare_snapshot(self, subtitles : Subtitles, encoder_class : type) -> Callable[[], bool]:
+        """
+        Serialise the full project and the state it was written in, returning a function that writes the snapshot
+        """
+        compressed = IsCompressedProjectFile(self.projectfile)
+        project_json = SerialiseProject(subtitles, encoder_class, compact=compressed)
+        project_data = EncodeProjectData(project_json, compressed)
+        header = json.dumps({ 'snapshot': _hash_text(project_json) }) + '\n'
+
+        structure = _get_structure(subtitles)
+        project_hash = _hash_text(json.dumps(_get_project_header(subtitles), cls=encoder_class, ensure_ascii=False))
+        scene_hashes = { scene.number : _hash_text(json.dumps(_get_scene_context(scene), cls=encoder_class, ensure_ascii=False)) for scene in subtitles.scenes }
+        batch_hashes = { (batch.scene, batch.number) : _hash_text(json.dumps(batch, cls=encoder_class, ensure_ascii=False))
+                         for scene in subtitles.scenes for batch in scene.batches }
+
+        def write_snapshot() -> bool:
+            logging.info(_("Writing project data to {}").format(str(self.projectfile)))
+
+            self._structure = None
+            WriteFileAtomically(self.projectfile, project_data, encoding=default_encoding)
+            WriteFileAtomically(self.journalfile, header, encoding=default_encoding)
+
+            self._snapshot_size = len(project_json)
+            self._journal_size = len(header)
+            self._structure = structure
+            self._project_hash = project_hash
+            self._scene_hashes = scene_hashes
+            self._batch_hashes = batch_hashes
+            return True
+
+        return write_snapshot
+
+def _get_structure(subtitles : Subtitles) -> list[tuple[int, list[int]]]:
+    return [ (scene.number, [ batch.number for batch in scene.batches ]) for scene in subtitles.scenes ]
+
+def _get_project_header(subtitles : Subtitles) -> dict[str, Any]:
+    return {
+        "sourcepath": subtitles.sourcepath,
+        "outputpath": subtitles.outputpath,
+        "settings": subtitles.settings,
+        "metadata": subtitles.metadata,
+        "terminology_map": subtitles.terminology_map,
+        "format": subtitles.file_format,
+    }
+
+def _get_scene_context(scene : SubtitleScene) -> dict[str, Any]:
+    return {
+        "summary": scene.context.get('summary'),
+        "history": scene.context.get('history') or scene.context.get('summaries')
+    }
+
+def _apply_entry(subtitles : Subtitles, entry : dict[str, Any]) -> bool:
+    """
+    Apply a single journal entry to the subtitles
+    """
+    if 'project' in entry:
+        header = entry['project']
+        subtitles.sourcepath = header.get('sourcepath')
+        subtitles.outputpath = header.get('outputpath')
+        subtitles.settings = SettingsType(header.get('settings', {}))
+        subtitles.metadata = header.get('metadata', {})
+        subtitles.terminology_map = dict(header.get('terminology_map') or {})
+        subtitles.file_format = header.get('format') or subtitles.file_format
+        return True
+
+    try:
+        if 'batch' in entry:
+            batch = entry['batch']
+            if isinstance(batch, SubtitleBatch):
+                scene = subtitles.GetScene(batch.scene)
+                for index, existing in enumerate(scene.batches):
+                    if existing.number == batch.number:
+                        scene.batches = scene.batches[:index] + [batch] + scene.batches[index + 1:]
+                        return True
+
+            logging.warning(_("Project journal refers to a batch that is not in the project"))
+            return False
+
+        if 'scene' in entry:
+            scene = subtitles.GetScene(entry['scene'])
+            scene.context = dict(entry.get('context') or {})
+            return True
+
+    except SubtitleError as e:
+        logging.warning(_("Unable to apply project journal entry: {}").format(e))
+
+    return False
@@ -0,0 +1,160 @@
+from __future__ import annotations
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from PySubtrans.Helpers.Localization import _
+
+if TYPE_CHECKING:
+    from PySubtrans.SubtitleBatch import SubtitleBatch
+    from PySubtrans.SubtitleProject import SubtitleProject
+
+class ProjectWriter:
+    """
+    Saves a project on a dedicated thread, so that callers never wait for the disk.
+
+    Save requests made within save_delay seconds of the first pending request are coalesced into a single
+    write. Requests for specific batches only journal those batches, unless a full save is also pending.
+    The project is serialised under the project and subtitles locks and written outside them, via a
+    temporary file that replaces the target once it is complete. The translated subtitles can be written
+    on the same thread.
+    """
+    def __init__(self, project : SubtitleProject, save_delay : float = 1.0):
+        self.project : SubtitleProject = project
+        self.save_delay : float = max(0.0, save_delay)
+        self._condition = threading.Condition()
+        self._thread : threading.Thread|None = None
+        self._pending : bool = False
+        self._save_project : bool = False
+        self._full_save : bool = False
+        self._save_translation : bool = False
+        self._translation_path : str|None = None
+        self._batches : dict[tuple[int, int], SubtitleBatch] = {}
+        self._deadline : float = 0.0
+        self._flushing : bool = False
+        self._writing : bool = False
+        self._stopping : bool = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def has_pending_writes(self) -> bool:
+        with self._condition:
+            return self._pending or self._writing
+
+    def RequestSave(self, batches : list[SubtitleBatch]|None = None) -> bool:
+        """
+        Ask for the project to be saved, without waiting for the write.
+        If batches are given only changes to those batches are saved.
+        Returns False if the writer has been stopped.
+        """
+        with self._condition:
+            if self._stopping:
+                logging.debug("Project writer has been stopped, ignoring save request")
+                return False
+
+            self._save_project = True
+            if batches is None:
+                self._full_save = True
+            else:
+                self._batches.update({ (batch.scene, batch.number) : batch for batch in batches })
+
+            self._schedule_write()
+            return True
+
+    def RequestSaveTranslation(self, outputpath : str|None = None) -> bool:
+        """
+        Ask for the translated subtitles to be written, without waiting for the write.
+        Returns False if the writer has been stopped.
+        """
+        with self._condition:
+            if self._stopping:
+                logging.debug("Project writer has been stopped, ignoring save request")
+                return False
+
+            self._save_translation = True
+            self._translation_path = outputpath
+            self._schedule_write()
+            return True
+
+    def Flush(self, timeout : float|None = None) -> bool:
+        """
+        Write any pending save immediately and wait for it to complete. Returns False if the timeout expired.
+        """
+        with self._condition:
+            if self._pending:
+                self._flushing = True
+                self._condition.notify_all()
+
+            return self._condition.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def Stop(self, timeout : float|None = None) -> None:
+        """
+        Write any pending save and stop the writer thread
+        """
+        with self._condition:
+            self._stopping = True
+            self._flushing = True
+            self._condition.notify_all()
+            thread = self._thread
+
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._ready_to_write():
+                    if self._stopping and not self._pending:
+                        return
+
+                    timeout = max(0.0, self._deadline - time.monotonic()) if self._pending else None
+                    self._condition.wait(timeout)
+
+                save_project = self._save_project
+                batches = None if self._full_save else list(self._batches.values())
+                save_translation = self._save_translation
+                translation_path = self._translation_path
+                self._pending = False
+                self._save_project = False
+                self._full_save = False
+                self._batches = {}
+                self._save_translation = False
+                self._translation_path = None
+                self._flushing = False
+                self._writing = True
+
+            try:
+                if save_project:
+                    self.project.SaveProject(batches)
+
+                if save_translation:
+                    self.project.SaveTranslation(translation_path)
+
+            except Exception as e:
+                logging.error(_("Unable to save project: {}").format(e))
+
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _schedule_write(self) -> None:
+        if not self._pending:
+            self._pending = True
+            self._deadline = time.monotonic() + self.save_delay
+
+        if not self.is_running:
+            self._thread = threading.Thread(target=self._run, name="ProjectWriter", daemon=True)
+            self._thread.start()
+
+        self._condition.notify_all()
+
+    def _ready_to_write(self) -> bool:
+        if not self._pending:
+            return False
+
+        return self._flushing or self._stopping or time.monotonic() >= self._deadline
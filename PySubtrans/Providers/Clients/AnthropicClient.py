@@ -1,17 +1,20 @@
+import asyncio
 import logging
-import time
 from typing import Any
 
 import anthropic
 import regex
+from anthropic.types.cache_control_ephemeral_param import CacheControlEphemeralParam
 from anthropic.types.message_param import MessageParam
 from anthropic.types.model_param import ModelParam
 from anthropic.types.thinking_config_adaptive_param import ThinkingConfigAdaptiveParam
 from anthropic.types.thinking_config_enabled_param import ThinkingConfigEnabledParam
+from anthropic.types.text_block_param import TextBlockParam
 from anthropic.types.thinking_config_param import ThinkingConfigParam
 
 from PySubtrans.Helpers import FormatMessages
 from PySubtrans.Helpers.Localization import _
+from PySubtrans.Helpers.Parse import ParseRetryAfterFromHeaders
 from PySubtrans.Options import SettingsType
 from PySubtrans.SubtitleError import TranslationError, TranslationImpossibleError
 from PySubtrans.TranslationClient import TranslationClient
@@ -28,6 +31,8 @@ class AnthropicClient(TranslationClient):
     def __init__(self, settings : SettingsType):
         super().__init__(settings)
         self.client: anthropic.Anthropic|None = None
+        self.async_client: anthropic.AsyncAnthropic|None = None
+        self._async_client_loop: asyncio.AbstractEventLoop|None = None
 
         self._emit_info(_("Translating with Anthropic {model}").format(
             model=self.model or _("default model")
@@ -80,11 +85,44 @@ class AnthropicClient(TranslationClient):
         except Exception as e:
             raise TranslationImpossibleError(_("Failed to initialize Anthropic client"), error=e)
 
+        temperature = self._validate_request(request, temperature)
+
+        response = self._send_messages(request, temperature)
+
+        return self._get_translation(response)
+
+    async def _request_translation_async(self, request: TranslationRequest, temperature: float|None = None) -> Translation|None:
+        """
+        Request a translation with the async client, which is shared by requests on the same event loop
+        """
+        try:
+            if self.async_client is None or self._async_client_loop is not asyncio.get_running_loop():
+                self._async_client_loop = asyncio.get_running_loop()
+                self.async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
+
+                proxy = self.settings.get_str( 'proxy')
+                if proxy:
+                    http_client = anthropic.DefaultAsyncHttpxClient(
+                        proxy = proxy
+                    )
+                    self.async_client = self.async_client.with_options(http_client=http_client)
+
+        except Exception as e:
+            raise TranslationImpossibleError(_("Failed to initialize Anthropic client"), error=e)
+
+        temperature = self._validate_request(request, temperature)
+
+        response = await self._send_messages_async(request, temperature)
+
+        return self._get_translation(response)
+
+    def _validate_request(self, request: TranslationRequest, temperature: float|None) -> float:
+        """
+        Check that the request can be sent, returning the temperature to use
+        """
         prompt: TranslationPrompt = request.prompt
         logging.debug(f"Messages:\n{FormatMessages(prompt.messages)}")
 
-        temperature = temperature or self.temperature
-
         if prompt.system_prompt is None:
             raise TranslationError(_("System prompt is required"))
 
@@ -94,8 +132,12 @@ class AnthropicClient(TranslationClient):
         if not isinstance(prompt.content, list):
             raise TranslationError(_("Content must be a list of messages"))
 
-        response = self._send_messages(request, temperature)
+        return temperature or self.temperature
 
+    def _get_translation(self, response : dict[str, Any]|None) -> Translation|None:
+        """
+        Create a translation from the response, raising an error if the response cannot be used
+        """
         translation = Translation(response) if response else None
 
         if translation:
@@ -119,7 +161,26 @@ class AnthropicClient(TranslationClient):
         if self.aborted or not api_response:
             return None
 
-        # Process the response
+        return self._process_response(api_response)
+
+    async def _send_messages_async(self, request: TranslationRequest, temperature: float) -> dict[str, Any]|None:
+        """
+        Make a request to the LLM to provide a translation without blocking the event loop
+        """
+        if not self.async_client:
+            raise TranslationImpossibleError(_("Client is not initialized"))
+
+        api_response = await self._get_client_response_async(request, temperature)
+
+        if self.aborted or not api_response:
+            return None
+
+        return self._process_response(api_response)
+
+    def _process_response(self, api_response) -> dict[str, Any]:
+        """
+        Extract the translation and usage details from the API response
+        """
         result = {}
 
         if api_response.stop_reason == 'max_tokens':
@@ -128,8 +189,13 @@ class AnthropicClient(TranslationClient):
             result['finish_reason'] = api_response.stop_reason
 
         if api_response.usage:
-            result['prompt_tokens'] = getattr(api_response.usage, 'input_tokens')
+            # input_tokens excludes tokens read from or written to the prompt cache
+            cache_read_tokens = getattr(api_response.usage, 'cache_read_input_tokens', None) or 0
+            cache_write_tokens = getattr(api_response.usage, 'cache_creation_input_tokens', None) or 0
+            result['prompt_tokens'] = (getattr(api_response.usage, 'input_tokens') or 0) + cache_read_tokens + cache_write_tokens
             result['output_tokens'] = getattr(api_response.usage, 'output_tokens')
+            result['cached_tokens'] = cache_read_tokens
+            result['cache_write_tokens'] = cache_write_tokens
 
         for piece in api_response.content:
             if piece.type == 'thinking':
@@ -163,25 +229,70 @@ class AnthropicClient(TranslationClient):
 
                 return self._create_client_response(prompt, temperature)
 
-            except (anthropic.APITimeoutError, anthropic.RateLimitError) as e:
-                if retry < self.max_retries and not self.aborted:
-                    sleep_time = self.backoff_time * 2.0**retry
-                    self._emit_warning(_("Anthropic API error: {error}, retrying in {sleep_time} seconds...").format(
-                        error=self._get_error_message(e), sleep_time=sleep_time
-                    ))
-                    time.sleep(sleep_time)
-                    continue
+            except Exception as e:
+                retry_delay = self._get_retry_delay(e, retry)
+                if retry_delay > 0.0 and not self._wait_for_retry(request, retry_delay):
+                    return None
+
+        raise TranslationImpossibleError(_("Failed to communicate with provider after {max_retries} retries").format(
+            max_retries=self.max_retries
+        ))
+
+    async def _get_client_response_async(self, request: TranslationRequest, temperature: float):
+        """
+        Handle both streaming and non-streaming API calls with retry logic, without blocking the event loop
+        """
+        if self.model is None:
+            raise TranslationError(_("No model specified"))
+
+        for retry in range(self.max_retries + 1):
+            if self.aborted:
+                return None
 
-            except anthropic.APIError as e:
-                raise TranslationImpossibleError(self._get_error_message(e), error=e)
+            try:
+                prompt: TranslationPrompt = request.prompt
+                if prompt.system_prompt is None:
+                    raise TranslationError(_("System prompt is required"))
+
+                if request.is_streaming and self.enable_streaming:
+                    return await self._stream_client_response_async(prompt, request, temperature)
+
+                return await self._get_async_client().messages.create(**self._get_request_params(prompt, temperature))
 
             except Exception as e:
-                raise TranslationError(_("Error communicating with provider"), error=e)
+                retry_delay = self._get_retry_delay(e, retry)
+                if retry_delay > 0.0 and not await self._wait_for_retry_async(request, retry_delay):
+                    return None
 
         raise TranslationImpossibleError(_("Failed to communicate with provider after {max_retries} retries").format(
             max_retries=self.max_retries
         ))
 
+    def _get_retry_delay(self, error : Exception, retry : int) -> float:
+        """
+        Decide whether a failed request can be retried, returning the number of seconds to wait before the next attempt.
+        Raises an error if the request should not be retried.
+        """
+        # Timeouts, rate limits, server errors and overloaded (529) responses mean the provider is struggling to keep up
+        if isinstance(error, (anthropic.APITimeoutError, anthropic.RateLimitError)) or (isinstance(error, anthropic.APIStatusError) and error.status_code >= 500):
+            response = getattr(error, 'response', None)
+            retry_after = ParseRetryAfterFromHeaders(response.headers) if response is not None else None
+            self._report_throttled(retry_after)
+
+            if retry < self.max_retries and not self.aborted:
+                sleep_time = max(self.backoff_time * 2.0**retry, retry_after or 0.0)
+                self._emit_warning(_("Anthropic API error: {error}, retrying in {sleep_time} seconds...").format(
+                    error=self._get_error_message(error), sleep_time=sleep_time
+                ))
+                return sleep_time
+
+            return 0.0
+
+        if isinstance(error, anthropic.APIError):
+            raise TranslationImpossibleError(self._get_error_message(error), error=error)
+
+        raise TranslationError(_("Error communicating with provider"), error=error)
+
     def _get_error_message(self, e : anthropic.APIError) -> str:
         """ 
         Extract a user-friendly error message from the API error
@@ -196,45 +307,37 @@ class AnthropicClient(TranslationClient):
 
     def _stream_client_response(self, prompt : TranslationPrompt, request : TranslationRequest, temperature : float):
         """Stream an Anthropic response with model-specific parameters."""
-        if self._supports_temperature_parameter():
-            with self._get_client().messages.stream(
-                model=self._get_model_param(),
-                thinking=self.thinking,
-                messages=self._get_message_params(prompt),
-                system=self._get_system_prompt(prompt),
-                temperature=temperature if not self.allow_thinking else 1,
-                max_tokens=self.max_tokens
-            ) as stream:
-                return self._consume_stream(stream, request)
-
-        with self._get_client().messages.stream(
-            model=self._get_model_param(),
-            thinking=self.thinking,
-            messages=self._get_message_params(prompt),
-            system=self._get_system_prompt(prompt),
-            max_tokens=self.max_tokens
-        ) as stream:
+        with self._get_client().messages.stream(**self._get_request_params(prompt, temperature)) as stream:
             return self._consume_stream(stream, request)
 
+    async def _stream_client_response_async(self, prompt : TranslationPrompt, request : TranslationRequest, temperature : float):
+        """Stream an Anthropic response with the async client."""
+        async with self._get_async_client().messages.stream(**self._get_request_params(prompt, temperature)) as stream:
+            async for text in stream.text_stream:
+                if self.aborted:
+                    return None
+                request.ProcessStreamingDelta(text)
+
+            return await stream.get_final_message()
+
     def _create_client_response(self, prompt : TranslationPrompt, temperature : float):
         """Create an Anthropic response with model-specific parameters."""
+        return self._get_client().messages.create(**self._get_request_params(prompt, temperature))
+
+    def _get_request_params(self, prompt : TranslationPrompt, temperature : float) -> dict[str, Any]:
+        """Return the request parameters, omitting temperature for models that do not accept it."""
+        params : dict[str, Any] = {
+            'model': self._get_model_param(),
+            'thinking': self.thinking,
+            'messages': self._get_message_params(prompt),
+            'system': self._get_system_prompt(prompt),
+            'max_tokens': self.max_tokens
+        }
+
         if self._supports_temperature_parameter():
-            return self._get_client().messages.create(
-                model=self._get_model_param(),
-                thinking=self.thinking,
-                messages=self._get_message_params(prompt),
-                system=self._get_system_prompt(prompt),
-                temperature=temperature if not self.allow_thinking else 1,
-                max_tokens=self.max_tokens
-            )
+            params['temperature'] = temperature if not self.allow_thinking else 1
 
-        return self._get_client().messages.create(
-            model=self._get_model_param(),
-            thinking=self.thinking,
-            messages=self._get_message_params(prompt),
-            system=self._get_system_prompt(prompt),
-            max_tokens=self.max_tokens
-        )
+        return params
 
     def _consume_stream(self, stream, request : TranslationRequest):
         """Consume streamed response content and return the final message."""
@@ -252,12 +355,16 @@ class AnthropicClient(TranslationClient):
 
         return self.model
 
-    def _get_system_prompt(self, prompt : TranslationPrompt) -> str:
+    def _get_system_prompt(self, prompt : TranslationPrompt) -> str|list[TextBlockParam]:
         """Return the system prompt in the shape expected by Anthropic."""
         if prompt.system_prompt is None:
             raise TranslationError(_("System prompt is required"))
 
-        return prompt.system_prompt
+        if not self.cache_friendly_prompt:
+            return prompt.system_prompt
+
+        # Mark the end of the static prefix so that it is cached between batches
+        return [ TextBlockParam(type='text', text=prompt.system_prompt, cache_control=CacheControlEphemeralParam(type='ephemeral')) ]
 
     def _get_client(self) -> anthropic.Anthropic:
         """Return the initialized Anthropic client."""
@@ -266,6 +373,13 @@ class AnthropicClient(TranslationClient):
 
         return self.client
 
+    def _get_async_client(self) -> anthropic.AsyncAnthropic:
+        """Return the initialized async Anthropic client."""
+        if self.async_client is None:
+            raise TranslationImpossibleError(_("Client is not initialized"))
+
+        return self.async_client
+
     def _get_message_params(self, prompt : TranslationPrompt) -> list[MessageParam]:
         """Convert prompt content into Anthropic message params."""
         if not isinstance(prompt.content, list):
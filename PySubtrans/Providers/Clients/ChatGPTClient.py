@@ -1,5 +1,6 @@
 from typing import Any
 
+from openai import AsyncOpenAI    # type: ignore
 from openai.types.chat import ChatCompletion    # type: ignore
 
 from PySubtrans.Helpers.Localization import _
@@ -25,22 +26,31 @@ class ChatGPTClient(OpenAIClient):
         """
         Make a request to an OpenAI-compatible API to provide a translation
         """
-        response = {}
-
         if not self.client:
             raise TranslationError(_("Client is not initialized"))
 
-        if not self.model:
-            raise TranslationError(_("No model specified"))
+        messages = self._get_messages(request)
 
-        if not request.prompt.content or not isinstance(request.prompt.content, list):
-            raise TranslationError(_("No content provided for translation"))
+        assert self.model is not None
+        result : ChatCompletion = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,      # type: ignore[arg-type]
+            temperature=temperature,
+        )
+
+        if self.aborted:
+            return None
 
-        messages: list[dict] = request.prompt.content # type: ignore[arg-type]
+        return self._process_chat_completion(result)
+
+    async def _send_messages_async(self, async_client: AsyncOpenAI, request: TranslationRequest, temperature: float|None) -> dict[str, Any]|None:
+        """
+        Make a request to an OpenAI-compatible API without blocking the event loop
+        """
+        messages = self._get_messages(request)
 
-        assert self.client is not None
         assert self.model is not None
-        result : ChatCompletion = self.client.chat.completions.create(
+        result : ChatCompletion = await async_client.chat.completions.create(
             model=self.model,
             messages=messages,      # type: ignore[arg-type]
             temperature=temperature,
@@ -49,6 +59,26 @@ class ChatGPTClient(OpenAIClient):
         if self.aborted:
             return None
 
+        return self._process_chat_completion(result)
+
+    def _get_messages(self, request: TranslationRequest) -> list[dict]:
+        """
+        Get the messages to send for the request
+        """
+        if not self.model:
+            raise TranslationError(_("No model specified"))
+
+        if not request.prompt.content or not isinstance(request.prompt.content, list):
+            raise TranslationError(_("No content provided for translation"))
+
+        return request.prompt.content # type: ignore[return-value]
+
+    def _process_chat_completion(self, result : ChatCompletion) -> dict[str, Any]:
+        """
+        Extract the translation and usage details from a chat completion
+        """
+        response = {}
+
         if not isinstance(result, ChatCompletion):
             raise TranslationResponseError(_("Unexpected response type: {response_type}").format(
                 response_type=type(result).__name__
@@ -63,6 +93,9 @@ class ChatGPTClient(OpenAIClient):
             response['prompt_tokens'] = getattr(result.usage, 'prompt_tokens')
             response['output_tokens'] = getattr(result.usage, 'completion_tokens')
             response['total_tokens'] = getattr(result.usage, 'total_tokens')
+            prompt_tokens_details = getattr(result.usage, 'prompt_tokens_details', None)
+            if prompt_tokens_details:
+                response['cached_tokens'] = getattr(prompt_tokens_details, 'cached_tokens', None)
 
         if result.choices:
             choice = result.choices[0]
@@ -1,11 +1,12 @@
+import asyncio
 import json
 import logging
-import time
+import threading
 from typing import Any
 import httpx
 
 from PySubtrans.Helpers import FormatMessages
-from PySubtrans.Helpers.Parse import ParseErrorMessageFromText
+from PySubtrans.Helpers.Parse import ParseErrorMessageFromText, ParseRetryAfterFromHeaders
 from PySubtrans.Helpers.Localization import _
 from PySubtrans.Options import SettingsType
 from PySubtrans.SubtitleError import ClientResponseError, ServerResponseError, TranslationImpossibleError, TranslationResponseError
@@ -21,6 +22,10 @@ class CustomClient(TranslationClient):
     def __init__(self, settings : SettingsType):
         super().__init__(settings)
         self.client: httpx.Client|None = None
+        self.async_client: httpx.AsyncClient|None = None
+        self._async_client_loop: asyncio.AbstractEventLoop|None = None
+        self._async_requests: set[asyncio.Future] = set()
+        self._async_lock = threading.Lock()
         self.headers: dict[str, str] = {'Content-Type': 'application/json'}
         self._add_additional_headers(settings)
 
@@ -98,9 +103,32 @@ class CustomClient(TranslationClient):
 
         return translation
 
+    async def _request_translation_async(self, request: TranslationRequest, temperature: float|None = None) -> Translation|None:
+        """
+        Request a translation using a non-blocking HTTP client
+        """
+        logging.debug(f"Messages:\n{FormatMessages(request.prompt.messages)}")
+
+        temperature = temperature or self.temperature
+        response = await self._make_request_async(request, temperature)
+
+        translation = Translation(response) if response else None
+
+        return translation
+
     def _abort(self) -> None:
         if self.client:
             self.client.close()
+
+        # Cancel requests in flight on the async client
+        with self._async_lock:
+            requests = list(self._async_requests)
+
+        for task in requests:
+            loop = task.get_loop()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(task.cancel)
+
         return super()._abort()
 
     def _make_request(self, request: TranslationRequest, temperature: float|None) -> dict[str, Any]|None:
@@ -153,6 +181,7 @@ class CustomClient(TranslationClient):
                     ))
 
             except httpx.ReadTimeout as e:
+                self._report_throttled()
                 if not self.aborted:
                     self._emit_error(_("Request to server timed out: {error}").format(
                         error=str(e)
@@ -176,7 +205,8 @@ class CustomClient(TranslationClient):
             self._emit_warning(_("Retrying in {sleep_time} seconds...").format(
                 sleep_time=sleep_time
             ))
-            time.sleep(sleep_time)
+            if not self._wait_for_retry(request, sleep_time):
+                return None
 
     def _handle_non_streaming_request(self, request_body: dict[str, Any]) -> dict[str, Any]|None:
         """Handle traditional non-streaming HTTP request"""
@@ -189,16 +219,7 @@ class CustomClient(TranslationClient):
             return None
 
         if result.is_error:
-            parsed_message = ParseErrorMessageFromText(result.text)
-            summary_text = parsed_message if parsed_message else result.text
-            if result.is_client_error:
-                raise ClientResponseError(_("Client error: {status_code} {text}").format(
-                    status_code=result.status_code, text=summary_text
-                ), response=result)
-            else:
-                raise ServerResponseError(_("Server error: {status_code} {text}").format(
-                    status_code=result.status_code, text=summary_text
-                ), response=result)
+            self._raise_response_error(result, result.text)
 
         logging.debug(f"Response:\n{result.text}")
 
@@ -219,17 +240,7 @@ class CustomClient(TranslationClient):
 
             if response.is_error:
                 response.read()
-                error_text = response.text
-                parsed_message = ParseErrorMessageFromText(error_text)
-                summary_text = parsed_message if parsed_message else error_text
-                if response.is_client_error:
-                    raise ClientResponseError(_("Client error: {status_code} {text}").format(
-                        status_code=response.status_code, text=summary_text
-                    ), response=response)
-                else:
-                    raise ServerResponseError(_("Server error: {status_code} {text}").format(
-                        status_code=response.status_code, text=summary_text
-                    ), response=response)
+                self._raise_response_error(response, response.text)
 
             # Process streaming chunks
             accumulated_response = {}
@@ -244,43 +255,237 @@ class CustomClient(TranslationClient):
                     if chunk_data:
                         chunks_processed += 1
 
-                        # Handle error chunks
-                        if chunk_data.get('error'):
-                            error_msg = chunk_data['error']
-                            if isinstance(error_msg, dict):
-                                error_msg = error_msg.get('message', str(error_msg))
-                            raise TranslationResponseError(_("Streaming error: {error}").format(
-                                error=error_msg
-                            ), response=response)
-
-                        # Handle termination signal
-                        if chunk_data.get('done'):
+                        if self._handle_sse_chunk(request, response, chunk_data, accumulated_response):
                             break
 
-                        self._process_streaming_chunk(request, chunk_data, accumulated_response)
-
             except (ConnectionError, httpx.ReadTimeout) as e:
-                if chunks_processed == 0:
-                    # No data received at all, treat as connection failure
-                    raise TranslationImpossibleError(_("Failed to establish streaming connection: {error}").format(
+                self._handle_stream_interrupted(request, accumulated_response, chunks_processed, e)
+
+            return self._finalise_streaming_response(request, accumulated_response)
+
+    async def _make_request_async(self, request: TranslationRequest, temperature: float|None) -> dict[str, Any]|None:
+        """
+        Make a non-blocking request to the server to provide a translation
+        """
+        for retry in range(self.max_retries + 1):
+            if self.aborted:
+                return None
+
+            try:
+                request_body = self._generate_request_body(request, temperature)
+                logging.debug(f"Request Body:\n{request_body}")
+
+                if self.server_address is None or self.endpoint is None:
+                    raise TranslationImpossibleError(_("Server address or endpoint is not set"))
+
+                return await self._send_request_async(request, request_body)
+
+            except ServerResponseError as e:
+                if not self.aborted:
+                    self._emit_error(str(e))
+
+            except TranslationResponseError:
+                raise
+
+            except httpx.ConnectError as e:
+                if not self.aborted:
+                    self._emit_error(_("Failed to connect to server at {server_address}{endpoint}").format(
+                        server_address=self.server_address, endpoint=self.endpoint
+                    ))
+
+            except httpx.NetworkError as e:
+                if not self.aborted:
+                    self._emit_error(_("Network error communicating with server: {error}").format(
                         error=str(e)
                     ))
-                else:
-                    # Some data received, try to return partial response
-                    self._emit_warning(f"Streaming connection interrupted after {chunks_processed} chunks: {e}")
-                    if request.accumulated_text:
-                        accumulated_response['text'] = request.accumulated_text
-                        accumulated_response['finish_reason'] = 'interrupted'
 
-            # Ensure we have accumulated text as fallback
-            if not accumulated_response.get('text') and request.accumulated_text:
-                accumulated_response['text'] = request.accumulated_text
+            except httpx.ReadTimeout as e:
+                self._report_throttled()
+                if not self.aborted:
+                    self._emit_error(_("Request to server timed out: {error}").format(
+                        error=str(e)
+                    ))
+
+            except TranslationImpossibleError:
+                raise
+
+            except Exception as e:
+                raise TranslationImpossibleError(_("Unexpected error communicating with server"), error=e)
+
+            if self.aborted:
+                return None
+
+            if retry == self.max_retries:
+                raise TranslationImpossibleError(_("Failed to communicate with server after {max_retries} retries").format(
+                    max_retries=self.max_retries
+                ))
+
+            sleep_time = self.backoff_time * 2.0**retry
+            self._emit_warning(_("Retrying in {sleep_time} seconds...").format(
+                sleep_time=sleep_time
+            ))
+            if not await self._wait_for_retry_async(request, sleep_time):
+                return None
+
+    async def _send_request_async(self, request: TranslationRequest, request_body: dict[str, Any]) -> dict[str, Any]|None:
+        """
+        Send the request on the pooled client as a task that is cancelled if translation is aborted
+        """
+        client = self._get_async_client()
+        if request.is_streaming and self.enable_streaming:
+            task = asyncio.ensure_future(self._handle_streaming_request_async(client, request, request_body))
+        else:
+            task = asyncio.ensure_future(self._handle_non_streaming_request_async(client, request_body))
+
+        with self._async_lock:
+            self._async_requests.add(task)
+
+        if self.aborted:
+            task.cancel()
+
+        try:
+            return await task
+
+        except asyncio.CancelledError:
+            if self.aborted:
+                return None
+            raise
+
+        finally:
+            with self._async_lock:
+                self._async_requests.discard(task)
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled async client for the running event loop, creating it if necessary.
+        Connections cannot be shared between event loops, so each loop gets its own client.
+        """
+        assert self.server_address is not None
+
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            if self.async_client is None or self.async_client.is_closed or self._async_client_loop is not loop:
+                self.async_client = httpx.AsyncClient(
+                    base_url=self.server_address,
+                    follow_redirects=True,
+                    timeout=self.timeout,
+                    headers=self.headers,
+                    proxy=self.proxy_url
+                )
+                self._async_client_loop = loop
+
+            return self.async_client
+
+    async def _handle_non_streaming_request_async(self, client: httpx.AsyncClient, request_body: dict[str, Any]) -> dict[str, Any]|None:
+        """Handle a non-streaming HTTP request without blocking"""
+        assert self.endpoint is not None
+
+        result : httpx.Response = await client.post(self.endpoint, json=request_body)
+
+        if self.aborted:
+            return None
+
+        if result.is_error:
+            self._raise_response_error(result, result.text)
+
+        logging.debug(f"Response:\n{result.text}")
+
+        content = result.json()
+        return self._process_api_response(content, result)
+
+    async def _handle_streaming_request_async(self, client: httpx.AsyncClient, request: TranslationRequest, request_body: dict[str, Any]) -> dict[str, Any]|None:
+        """Handle a streaming HTTP request using Server-Sent Events without blocking"""
+        assert self.endpoint is not None
+
+        request_body['stream'] = True
+
+        async with client.stream('POST', self.endpoint, json=request_body) as response:
+            if self.aborted:
+                return None
 
-            # Fall back to reasoning if content is empty (e.g. Ollama thinking models)
-            if not accumulated_response.get('text') and accumulated_response.get('reasoning'):
-                accumulated_response['text'] = accumulated_response['reasoning']
+            if response.is_error:
+                await response.aread()
+                self._raise_response_error(response, response.text)
 
-            return accumulated_response
+            accumulated_response = {}
+            chunks_processed = 0
+
+            try:
+                async for line in response.aiter_lines():
+                    if self.aborted:
+                        return None
+
+                    chunk_data = self._parse_sse_chunk(line)
+                    if chunk_data:
+                        chunks_processed += 1
+
+                        if self._handle_sse_chunk(request, response, chunk_data, accumulated_response):
+                            break
+
+            except (ConnectionError, httpx.ReadTimeout) as e:
+                self._handle_stream_interrupted(request, accumulated_response, chunks_processed, e)
+
+            return self._finalise_streaming_response(request, accumulated_response)
+
+    def _raise_response_error(self, response: httpx.Response, error_text: str) -> None:
+        """Raise a client or server error for an unsuccessful response"""
+        if response.status_code == 429 or response.status_code >= 500:
+            self._report_throttled(ParseRetryAfterFromHeaders(response.headers))
+
+        parsed_message = ParseErrorMessageFromText(error_text)
+        summary_text = parsed_message if parsed_message else error_text
+        if response.is_client_error:
+            raise ClientResponseError(_("Client error: {status_code} {text}").format(
+                status_code=response.status_code, text=summary_text
+            ), response=response)
+        else:
+            raise ServerResponseError(_("Server error: {status_code} {text}").format(
+                status_code=response.status_code, text=summary_text
+            ), response=response)
+
+    def _handle_sse_chunk(self, request: TranslationRequest, response: httpx.Response, chunk_data: dict[str, Any], accumulated_response: dict[str, Any]) -> bool:
+        """Process a parsed SSE chunk, returning True when the stream is complete"""
+        # Handle error chunks
+        if chunk_data.get('error'):
+            error_msg = chunk_data['error']
+            if isinstance(error_msg, dict):
+                error_msg = error_msg.get('message', str(error_msg))
+            raise TranslationResponseError(_("Streaming error: {error}").format(
+                error=error_msg
+            ), response=response)
+
+        # Handle termination signal
+        if chunk_data.get('done'):
+            return True
+
+        self._process_streaming_chunk(request, chunk_data, accumulated_response)
+        return False
+
+    def _handle_stream_interrupted(self, request: TranslationRequest, accumulated_response: dict[str, Any], chunks_processed: int, error: Exception) -> None:
+        """Handle a streaming connection that dropped before completion"""
+        if chunks_processed == 0:
+            # No data received at all, treat as connection failure
+            raise TranslationImpossibleError(_("Failed to establish streaming connection: {error}").format(
+                error=str(error)
+            ))
+
+        # Some data received, try to return partial response
+        self._emit_warning(f"Streaming connection interrupted after {chunks_processed} chunks: {error}")
+        if request.accumulated_text:
+            accumulated_response['text'] = request.accumulated_text
+            accumulated_response['finish_reason'] = 'interrupted'
+
+    def _finalise_streaming_response(self, request: TranslationRequest, accumulated_response: dict[str, Any]) -> dict[str, Any]:
+        """Ensure the accumulated streaming response has text to return"""
+        # Ensure we have accumulated text as fallback
+        if not accumulated_response.get('text') and request.accumulated_text:
+            accumulated_response['text'] = request.accumulated_text
+
+        # Fall back to reasoning if content is empty (e.g. Ollama thinking models)
+        if not accumulated_response.get('text') and accumulated_response.get('reasoning'):
+            accumulated_response['text'] = accumulated_response['reasoning']
+
+        return accumulated_response
 
     def _parse_sse_chunk(self, line: str) -> dict[str, Any]|None:
         """Parse a Server-Sent Events chunk with robust handling of OpenRouter edge cases"""
@@ -360,6 +565,7 @@ class CustomClient(TranslationClient):
                 accumulated_response['prompt_tokens'] = usage.get('prompt_tokens')
                 accumulated_response['output_tokens'] = usage.get('completion_tokens')
                 accumulated_response['total_tokens'] = usage.get('total_tokens')
+                accumulated_response['cached_tokens'] = _get_cached_tokens(usage)
                 if 'reasoning_tokens' in usage:
                     accumulated_response['reasoning_tokens'] = usage.get('reasoning_tokens')
 
@@ -380,6 +586,7 @@ class CustomClient(TranslationClient):
         response['prompt_tokens'] = usage.get('prompt_tokens')
         response['output_tokens'] = usage.get('completion_tokens')
         response['total_tokens'] = usage.get('total_tokens')
+        response['cached_tokens'] = _get_cached_tokens(usage)
         if 'reasoning_tokens' in usage:
             response['reasoning_tokens'] = usage.get('reasoning_tokens')
 
@@ -446,3 +653,14 @@ class CustomClient(TranslationClient):
                 if isinstance(value, str):
                     self.headers[key] = value
 
+
+def _get_cached_tokens(usage : dict[str, Any]) -> int|None:
+    """
+    Extract the number of prompt tokens served from the provider's cache, if reported
+    """
+    details = usage.get('prompt_tokens_details')
+    if isinstance(details, dict) and details.get('cached_tokens') is not None:
+        return details.get('cached_tokens')
+
+    # DeepSeek reports cache hits separately
+    return usage.get('prompt_cache_hit_tokens')
@@ -1,9 +1,9 @@
 import logging
 
-import time
 from typing import Any
 
 from google import genai
+from google.genai.errors import APIError
 from google.genai.types import (
     AutomaticFunctionCallingConfig,
     Candidate,
@@ -22,6 +22,7 @@ from google.genai.types import (
 
 from PySubtrans.Helpers import FormatMessages
 from PySubtrans.Helpers.Localization import _
+from PySubtrans.Helpers.Parse import ParseRetryAfterFromHeaders
 from PySubtrans.Options import SettingsType
 from PySubtrans.SubtitleError import TranslationImpossibleError, TranslationResponseError
 from PySubtrans.Translation import Translation
@@ -75,6 +76,26 @@ class GeminiClient(TranslationClient):
         """
         Request a translation based on the provided prompt
         """
+        temperature = self._validate_request(request, temperature)
+
+        response = self._send_messages(request, temperature)
+
+        return Translation(response) if response else None
+
+    async def _request_translation_async(self, request: TranslationRequest, temperature: float|None = None) -> Translation|None:
+        """
+        Request a translation with the async Gemini client
+        """
+        temperature = self._validate_request(request, temperature)
+
+        response = await self._send_messages_async(request, temperature)
+
+        return Translation(response) if response else None
+
+    def _validate_request(self, request: TranslationRequest, temperature: float|None) -> float:
+        """
+        Check that the request can be sent, returning the temperature to use
+        """
         prompt: TranslationPrompt = request.prompt
         logging.debug(f"Messages:\n{FormatMessages(prompt.messages)}")
 
@@ -84,11 +105,7 @@ class GeminiClient(TranslationClient):
         if not isinstance(prompt.content, str) or not prompt.content.strip():
             raise TranslationImpossibleError(_("No content provided for translation"))
 
-        temperature = temperature or self.temperature
-
-        response = self._send_messages(request, temperature)
-
-        return Translation(response) if response else None
+        return temperature or self.temperature
 
     def _abort(self) -> None:
         return super()._abort()
@@ -108,57 +125,64 @@ class GeminiClient(TranslationClient):
                 raise
 
             except Exception as e:
-                if retry == self.max_retries:
-                    raise TranslationImpossibleError(_("Failed to communicate with provider after {max_retries} retries").format(
-                        max_retries=self.max_retries
-                    ))
-
-                if not self.aborted:
-                    sleep_time = self.backoff_time * 2.0**retry
-                    self._emit_warning(_("Gemini request failure {error}, retrying in {sleep_time} seconds...").format(
-                        error=str(e), sleep_time=sleep_time
-                    ))
-                    time.sleep(sleep_time)
+                retry_delay = self._get_retry_delay(e, retry)
+                if retry_delay > 0.0 and not self._wait_for_retry(request, retry_delay):
+                    return None
 
-    def _get_gemini_response(self, request: TranslationRequest, temperature: float) -> dict[str, Any]|None:
+    async def _send_messages_async(self, request: TranslationRequest, temperature: float) -> dict[str, Any]|None:
         """
-        Handle both streaming and non-streaming Gemini API calls
+        Make a request to the Gemini API to provide a translation without blocking the event loop
         """
         if not self.model:
             raise TranslationImpossibleError(_("No model specified"))
 
-        prompt: TranslationPrompt = request.prompt
-        if not isinstance(prompt.content, str):
-            raise TranslationImpossibleError(_("Content must be a string for Gemini"))
+        for retry in range(1 + self.max_retries):
+            try:
+                return await self._get_gemini_response_async(request, temperature)
 
-        # Configure http options (proxy support for both sync httpx and async aiohttp)
-        proxy = self.settings.get_str('proxy')
-        client_args = None
-        async_client_args = None
-        if proxy:
-            client_args = {'proxy': proxy}
-            async_client_args = {'proxy': proxy}
-            self._emit_info(_("Using proxy: {proxy}").format(proxy=proxy))
+            except TranslationImpossibleError:
+                raise
 
-        http_options = HttpOptions(api_version='v1beta', client_args=client_args, async_client_args=async_client_args)
+            except Exception as e:
+                retry_delay = self._get_retry_delay(e, retry)
+                if retry_delay > 0.0 and not await self._wait_for_retry_async(request, retry_delay):
+                    return None
 
-        gemini_client = genai.Client(api_key=self.api_key, http_options=http_options)
-        config = GenerateContentConfig(
-            candidate_count=1,
-            temperature=temperature,
-            system_instruction=prompt.system_prompt,
-            safety_settings=self.safety_settings,
-            thinking_config=self.thinking_config,
-            automatic_function_calling=self.automatic_function_calling,
-            max_output_tokens=None,
-            response_modalities=[]
-        )
+    def _get_retry_delay(self, error : Exception, retry : int) -> float:
+        """
+        Return the number of seconds to wait before retrying a failed request, raising an error if there are no retries left
+        """
+        retry_after = None
+        if isinstance(error, APIError) and (error.code == 429 or error.code >= 500):
+            retry_after = ParseRetryAfterFromHeaders(getattr(error.response, 'headers', None))
+            self._report_throttled(retry_after)
+
+        if retry == self.max_retries:
+            raise TranslationImpossibleError(_("Failed to communicate with provider after {max_retries} retries").format(
+                max_retries=self.max_retries
+            ))
+
+        if self.aborted:
+            return 0.0
+
+        sleep_time = max(self.backoff_time * 2.0**retry, retry_after or 0.0)
+        self._emit_warning(_("Gemini request failure {error}, retrying in {sleep_time} seconds...").format(
+            error=str(error), sleep_time=sleep_time
+        ))
+        return sleep_time
+
+    def _get_gemini_response(self, request: TranslationRequest, temperature: float) -> dict[str, Any]|None:
+        """
+        Handle both streaming and non-streaming Gemini API calls
+        """
+        gemini_client, contents, config = self._prepare_gemini_request(request, temperature)
+        assert self.model is not None
 
         if not request.is_streaming or not self.enable_streaming:
             # Non-streaming: single request
             gcr = gemini_client.models.generate_content(
                 model=self.model,
-                contents=Part.from_text(text=prompt.content),
+                contents=contents,
                 config=config
             )
 
@@ -167,61 +191,85 @@ class GeminiClient(TranslationClient):
         # Streaming: process chunks and create complete response
         stream = gemini_client.models.generate_content_stream(
             model=self.model,
-            contents=Part.from_text(text=prompt.content),
+            contents=contents,
             config=config
         )
 
-        last_chunk = None
-        last_candidate: Candidate | None = None
-        last_usage: GenerateContentResponseUsageMetadata | None = None
-        first_prompt_feedback = None  # when blocked, this can be set only on the first chunk
-        accumulated_thoughts = ""
-
+        accumulator = GeminiStreamAccumulator()
         for chunk in stream:
             if self.aborted:
                 return None
 
-            chunk_text = ""
-            for candidate in chunk.candidates or []:
-                if candidate.content and candidate.content.parts:
-                    last_candidate = candidate
-                    for part in candidate.content.parts:
-                        if part.text:
-                            if part.thought:
-                                accumulated_thoughts += part.text
-                            else:
-                                chunk_text += part.text
-
-            if chunk_text:
-                request.ProcessStreamingDelta(chunk_text)
-
-            if chunk.usage_metadata:
-                last_usage = chunk.usage_metadata
-            if chunk.prompt_feedback and first_prompt_feedback is None:
-                first_prompt_feedback = chunk.prompt_feedback
-
-        # Build a synthetic response that keeps metadata but replaces content parts with accumulated text
-        parts = [Part.from_text(text = request.accumulated_text)]
+            accumulator.AddChunk(request, chunk)
 
-        if accumulated_thoughts:
-            thought_part = Part.from_text(text = accumulated_thoughts)
-            thought_part.thought = True
-            parts.append(thought_part)
+        return self._process_gemini_response(accumulator.BuildResponse(request))
 
-        synthetic_candidate = Candidate(
-            content=Content(role="model", parts=parts),
-            finish_reason = getattr(last_candidate, "finish_reason", None) or getattr(last_chunk, "finish_reason", None),
-            safety_ratings = getattr(last_candidate, "safety_ratings", None)
-        )
+    async def _get_gemini_response_async(self, request: TranslationRequest, temperature: float) -> dict[str, Any]|None:
+        """
+        Handle both streaming and non-streaming Gemini API calls with the async client
+        """
+        gemini_client, contents, config = self._prepare_gemini_request(request, temperature)
+        assert self.model is not None
 
-        response = GenerateContentResponse(
-            candidates=[synthetic_candidate],
-            usage_metadata=last_usage,
-            prompt_feedback=first_prompt_feedback
+        if not request.is_streaming or not self.enable_streaming:
+            gcr = await gemini_client.aio.models.generate_content(
+                model=self.model,
+                contents=contents,
+                config=config
+            )
+
+            return self._process_gemini_response(gcr) if not self.aborted else None
+
+        stream = await gemini_client.aio.models.generate_content_stream(
+            model=self.model,
+            contents=contents,
+            config=config
         )
 
-        return self._process_gemini_response(response)
+        accumulator = GeminiStreamAccumulator()
+        async for chunk in stream:
+            if self.aborted:
+                return None
+
+            accumulator.AddChunk(request, chunk)
+
+        return self._process_gemini_response(accumulator.BuildResponse(request))
+
+    def _prepare_gemini_request(self, request: TranslationRequest, temperature: float) -> tuple[genai.Client, Part, GenerateContentConfig]:
+        """
+        Create the client, content and configuration for a Gemini request
+        """
+        if not self.model:
+            raise TranslationImpossibleError(_("No model specified"))
+
+        prompt: TranslationPrompt = request.prompt
+        if not isinstance(prompt.content, str):
+            raise TranslationImpossibleError(_("Content must be a string for Gemini"))
+
+        # Configure http options (proxy support for both sync httpx and async aiohttp)
+        proxy = self.settings.get_str('proxy')
+        client_args = None
+        async_client_args = None
+        if proxy:
+            client_args = {'proxy': proxy}
+            async_client_args = {'proxy': proxy}
+            self._emit_info(_("Using proxy: {proxy}").format(proxy=proxy))
+
+        http_options = HttpOptions(api_version='v1beta', client_args=client_args, async_client_args=async_client_args)
 
+        gemini_client = genai.Client(api_key=self.api_key, http_options=http_options)
+        config = GenerateContentConfig(
+            candidate_count=1,
+            temperature=temperature,
+            system_instruction=prompt.system_prompt,
+            safety_settings=self.safety_settings,
+            thinking_config=self.thinking_config,
+            automatic_function_calling=self.automatic_function_calling,
+            max_output_tokens=None,
+            response_modalities=[]
+        )
+
+        return gemini_client, Part.from_text(text=prompt.content), config
 
     def _process_gemini_response(self, gcr: GenerateContentResponse) -> dict[str, Any]:
         """
@@ -272,6 +320,7 @@ class GeminiClient(TranslationClient):
             response['prompt_tokens'] = usage_metadata.prompt_token_count
             response['output_tokens'] = usage_metadata.candidates_token_count
             response['total_tokens'] = usage_metadata.total_token_count
+            response['cached_tokens'] = usage_metadata.cached_content_token_count
 
         if not candidate or not candidate.content or not candidate.content.parts:
             raise TranslationResponseError(_("Gemini response has no valid content parts"), response=candidate)
@@ -328,3 +377,59 @@ class GeminiClient(TranslationClient):
             info_parts.append("Google content policy violation (copyright or censorship). Try another provider.")
         
         return "; ".join(info_parts) if info_parts else "Unknown blocking reason"
+
+class GeminiStreamAccumulator:
+    """
+    Accumulates streamed Gemini chunks into a complete response
+    """
+    def __init__(self):
+        self.last_candidate: Candidate|None = None
+        self.last_usage: GenerateContentResponseUsageMetadata|None = None
+        self.first_prompt_feedback = None  # when blocked, this can be set only on the first chunk
+        self.accumulated_thoughts = ""
+
+    def AddChunk(self, request: TranslationRequest, chunk: GenerateContentResponse) -> None:
+        """
+        Add a streamed chunk, passing any new text to the request
+        """
+        chunk_text = ""
+        for candidate in chunk.candidates or []:
+            if candidate.content and candidate.content.parts:
+                self.last_candidate = candidate
+                for part in candidate.content.parts:
+                    if part.text:
+                        if part.thought:
+                            self.accumulated_thoughts += part.text
+                        else:
+                            chunk_text += part.text
+
+        if chunk_text:
+            request.ProcessStreamingDelta(chunk_text)
+
+        if chunk.usage_metadata:
+            self.last_usage = chunk.usage_metadata
+        if chunk.prompt_feedback and self.first_prompt_feedback is None:
+            self.first_prompt_feedback = chunk.prompt_feedback
+
+    def BuildResponse(self, request: TranslationRequest) -> GenerateContentResponse:
+        """
+        Build a synthetic response that keeps metadata but replaces content parts with accumulated text
+        """
+        parts = [Part.from_text(text = request.accumulated_text)]
+
+        if self.accumulated_thoughts:
+            thought_part = Part.from_text(text = self.accumulated_thoughts)
+            thought_part.thought = True
+            parts.append(thought_part)
+
+        synthetic_candidate = Candidate(
+            content=Content(role="model", parts=parts),
+            finish_reason = getattr(self.last_candidate, "finish_reason", None),
+            safety_ratings = getattr(self.last_candidate, "safety_ratings", None)
+        )
+
+        return GenerateContentResponse(
+            candidates=[synthetic_candidate],
+            usage_metadata=self.last_usage,
+            prompt_feedback=self.first_prompt_feedback
+        )
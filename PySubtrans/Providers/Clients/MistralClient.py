@@ -9,6 +9,7 @@ from mistralai.client.models import ChatCompletionResponse as ChatCompletion
 
 from PySubtrans.Helpers import FormatMessages
 from PySubtrans.Helpers.Localization import _
+from PySubtrans.Helpers.Parse import ParseRetryAfterFromHeaders
 from PySubtrans.SubtitleError import TranslationError, TranslationImpossibleError
 from PySubtrans.Translation import Translation
 from PySubtrans.TranslationClient import TranslationClient
@@ -32,8 +33,9 @@ class MistralClient(TranslationClient):
         # Configure proxy if specified
         proxy_url = self.settings.get_str('proxy')
         http_client = httpx.Client(proxy=proxy_url) if proxy_url else None
+        async_http_client = httpx.AsyncClient(proxy=proxy_url) if proxy_url else None
 
-        self.client = Mistral(api_key=self.api_key, server_url=self.server_url, client=http_client)
+        self.client = Mistral(api_key=self.api_key, server_url=self.server_url, client=http_client, async_client=async_http_client)
 
     @property
     def api_key(self) -> str|None:
@@ -51,17 +53,40 @@ class MistralClient(TranslationClient):
         """
         Request a translation based on the provided prompt
         """
+        content = self._get_content(request)
+
+        temperature = temperature or self.temperature
+        response = self._send_messages(content, temperature)
+
+        return self._get_translation(response)
+
+    async def _request_translation_async(self, request: TranslationRequest, temperature: float|None = None) -> Translation|None:
+        """
+        Request a translation with the async client
+        """
+        content = self._get_content(request)
+
+        temperature = temperature or self.temperature
+        response = await self._send_messages_async(content, temperature)
+
+        return self._get_translation(response)
+
+    def _get_content(self, request: TranslationRequest) -> list:
+        """
+        Get the messages to send for the request
+        """
         logging.debug(f"Messages:\n{FormatMessages(request.prompt.messages)}")
 
         content = request.prompt.content
         if not content or not isinstance(request.prompt.content, list):
             raise TranslationImpossibleError(_("No content provided for translation"))
 
-        content = [message for message in content if message]
-
-        temperature = temperature or self.temperature
-        response = self._send_messages(content, temperature)
+        return [message for message in content if message]
 
+    def _get_translation(self, response : dict|None) -> Translation|None:
+        """
+        Create a translation from the response, raising an error if the response cannot be used
+        """
         translation = Translation(response) if response else None
 
         if translation:
@@ -77,8 +102,6 @@ class MistralClient(TranslationClient):
         """
         Make a request to an Mistralai-compatible API to provide a translation
         """
-        response = {}
-
         if not self.model:
             raise TranslationImpossibleError(_("No model specified"))
 
@@ -100,37 +123,94 @@ class MistralClient(TranslationClient):
                 if self.aborted:
                     return None
 
-                if not isinstance(result, ChatCompletion):
-                    raise TranslationResponseError(_("Unexpected response type: {response_type}").format(
-                        response_type=type(result).__name__
-                    ), response=result)
+                # Return the response if the API call succeeds
+                return self._process_completion(result)
 
-                if not getattr(result, 'choices'):
-                    raise TranslationResponseError(_("No choices returned in the response"), response=result)
+            except Exception as e:
+                #TODO: find out what specific exceptions mistralai raises
+                self._report_if_throttled(e)
+                raise TranslationImpossibleError(_("Unexpected error communicating with the provider"), error=e)
 
-                response['response_time'] = getattr(result, 'response_ms', 0)
+        raise TranslationImpossibleError(_("Failed to communicate with provider after {max_retries} retries").format(
+            max_retries=self.max_retries
+        ))
 
-                if hasattr(result, "usage"):
-                    response['prompt_tokens'] = getattr(result.usage, 'prompt_tokens')
-                    response['output_tokens'] = getattr(result.usage, 'completion_tokens')
-                    response['total_tokens'] = getattr(result.usage, 'total_tokens')
+    async def _send_messages_async(self, messages : list, temperature):
+        """
+        Make a request to an Mistralai-compatible API without blocking the event loop
+        """
+        if not self.model:
+            raise TranslationImpossibleError(_("No model specified"))
 
-                if result.choices:
-                    choice = result.choices[0]
-                    reply = result.choices[0].message
+        if not messages:
+            raise TranslationImpossibleError(_("No content provided for translation"))
 
-                    response['finish_reason'] = getattr(choice, 'finish_reason', None)
-                    response['text'] = getattr(reply, 'content', None)
-                else:
-                    raise TranslationResponseError(_("No choices returned in the response"), response=result)
+        for retry in range(self.max_retries + 1): # type: ignore[unused]
+            if self.aborted:
+                return None
 
-                # Return the response if the API call succeeds
-                return response
+            try:
+                result : ChatCompletion = await self.client.chat.complete_async(
+                    model=self.model,
+                    messages=messages, # type: ignore[arg-type]
+                    temperature=temperature,
+                    server_url=self.server_url if self.server_url else None
+                )
+
+                if self.aborted:
+                    return None
+
+                return self._process_completion(result)
 
             except Exception as e:
-                #TODO: find out what specific exceptions mistralai raises
+                self._report_if_throttled(e)
                 raise TranslationImpossibleError(_("Unexpected error communicating with the provider"), error=e)
 
         raise TranslationImpossibleError(_("Failed to communicate with provider after {max_retries} retries").format(
             max_retries=self.max_retries
         ))
+
+    def _report_if_throttled(self, error : Exception) -> None:
+        """
+        Tell the concurrency governor if the request failed because the server is rate limiting, overloaded or timed out
+        """
+        if isinstance(error, httpx.TimeoutException):
+            self._report_throttled()
+            return
+
+        status_code = getattr(error, 'status_code', None)
+        if isinstance(status_code, int) and (status_code == 429 or status_code >= 500):
+            response = getattr(error, 'raw_response', None)
+            self._report_throttled(ParseRetryAfterFromHeaders(getattr(response, 'headers', None)))
+
+    def _process_completion(self, result : ChatCompletion) -> dict:
+        """
+        Extract the translation and usage details from a chat completion
+        """
+        response = {}
+
+        if not isinstance(result, ChatCompletion):
+            raise TranslationResponseError(_("Unexpected response type: {response_type}").format(
+                response_type=type(result).__name__
+            ), response=result)
+
+        if not getattr(result, 'choices'):
+            raise TranslationResponseError(_("No choices returned in the response"), response=result)
+
+        response['response_time'] = getattr(result, 'response_ms', 0)
+
+        if hasattr(result, "usage"):
+            response['prompt_tokens'] = getattr(result.usage, 'prompt_tokens')
+            response['output_tokens'] = getattr(result.usage, 'completion_tokens')
+            response['total_tokens'] = getattr(result.usage, 'total_tokens')
+
+        if result.choices:
+            choice = result.choices[0]
+            reply = result.choices[0].message
+
+            response['finish_reason'] = getattr(choice, 'finish_reason', None)
+            response['text'] = getattr(reply, 'content', None)
+        else:
+            raise TranslationResponseError(_("No choices returned in the response"), response=result)
+
+        return response
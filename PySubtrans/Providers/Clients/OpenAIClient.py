@@ -1,6 +1,6 @@
+import asyncio
 import logging
 
-import time
 from typing import Any
 
 from json import JSONDecodeError
@@ -9,7 +9,7 @@ import httpx
 
 from PySubtrans.Helpers import FormatMessages
 from PySubtrans.Helpers.Localization import _
-from PySubtrans.Helpers.Parse import ParseDelayFromHeader
+from PySubtrans.Helpers.Parse import ParseDelayFromHeader, ParseRetryAfterFromHeaders
 from PySubtrans.Options import SettingsType
 from PySubtrans.SubtitleError import TranslationError, TranslationImpossibleError, TranslationResponseError
 from PySubtrans.Translation import Translation
@@ -37,6 +37,8 @@ class OpenAIClient(TranslationClient):
         ))
 
         self.client: openai.OpenAI|None = None
+        self.async_client: openai.AsyncOpenAI|None = None
+        self._async_client_loop: asyncio.AbstractEventLoop|None = None
 
     @property
     def api_key(self) -> str|None:
@@ -65,6 +67,24 @@ class OpenAIClient(TranslationClient):
 
         response = self._try_send_messages(request, temperature)
 
+        return self._get_translation(response)
+
+    async def _request_translation_async(self, request: TranslationRequest, temperature: float|None = None) -> Translation|None:
+        """
+        Request a translation with the async client
+        """
+        logging.debug(f"Messages:\n{FormatMessages(request.prompt.messages)}")
+
+        temperature = temperature or self.temperature
+
+        response = await self._try_send_messages_async(request, temperature)
+
+        return self._get_translation(response)
+
+    def _get_translation(self, response : dict[str, Any]|None) -> Translation|None:
+        """
+        Create a translation from the response, raising an error if the response cannot be used
+        """
         translation = Translation(response) if response else None
 
         if translation:
@@ -82,19 +102,26 @@ class OpenAIClient(TranslationClient):
         """
         raise NotImplementedError
 
+    async def _send_messages_async(self, async_client: openai.AsyncOpenAI, request: TranslationRequest, temperature: float) -> dict[str, Any]|None:
+        """
+        Communicate with the API using the async client
+        """
+        raise NotImplementedError
+
     def _abort(self) -> None:
         self.aborted = True
         if self.client:
             self.client.close()
+        if self.async_client:
+            self._close_async_client(self.async_client)
         return super()._abort()
-    
+
+
     def _try_send_messages(self, request: TranslationRequest, temperature: float) -> dict[str, Any]|None:
         for retry in range(self.max_retries + 1):
             if self.aborted:
                 return None
 
-            backoff_time = self.backoff_time * 2.0**retry
-
             try:
                 if not self.client or not self.reuse_client:
                     self._create_client()
@@ -102,79 +129,119 @@ class OpenAIClient(TranslationClient):
                 response = self._send_messages(request, temperature)
 
                 return response
-            
-            except TranslationResponseError as e:
-                if retry < self.max_retries and not self.aborted:
-                    self._emit_warning(_("Translation response error: {error}, retrying in {backoff_time} seconds...").format(
-                        error=str(e), backoff_time=backoff_time
-                    ))
-                    time.sleep(backoff_time)
-                    continue
-
-            except openai.RateLimitError as e:
-                if not self.aborted:
-                    retry_after = e.response.headers.get('x-ratelimit-reset-requests') or e.response.headers.get('Retry-After')
-                    if retry_after:
-                        backoff_time = ParseDelayFromHeader(retry_after)
-                        self._emit_warning(_("Rate limit hit, retrying in {backoff_time} seconds...").format(
-                            backoff_time=backoff_time
-                        ))
-                        time.sleep(backoff_time)
-                        continue
-                    else:
-                        raise TranslationImpossibleError(_("Account quota reached, please upgrade your plan"))
-
-            except openai.APITimeoutError as e:
-                if retry < self.max_retries and not self.aborted:
-                    self._emit_warning(_("API Timeout, retrying in {backoff_time} seconds...").format(
-                        backoff_time=backoff_time
-                    ))
-                    time.sleep(backoff_time)
-                    continue
-
-            except openai.APIStatusError as e:
-                if retry < self.max_retries and not self.aborted:
-                    logging.warning(_("API status error: {error}, retrying in {backoff_time} seconds...").format(
-                        error=str(e), backoff_time=backoff_time
-                    ))
-                    time.sleep(backoff_time)
-                    continue
-
-
-            except JSONDecodeError as e:
-                if retry < self.max_retries and not self.aborted:
-                    self._emit_warning(_("Invalid response received, retrying in {backoff_time} seconds...").format(
-                        backoff_time=backoff_time
-                    ))
-                    time.sleep(backoff_time)
-                    continue
-
-            except openai.APIConnectionError as e:
-                if not self.aborted:
-                    raise TranslationError(str(e), error=e) from e
-
-            except TranslationImpossibleError:
-                # Error that has no chance of success on retry
-                if not self.aborted:
-                    raise
-
-            except TranslationError as e:
-                # Error that is potentially recoverable
-                if retry < self.max_retries and not self.aborted:
-                    logging.warning(_("Translation error: {error}, retrying in {backoff_time} seconds...").format(
-                        error=str(e), backoff_time=backoff_time
-                    ))
-                    time.sleep(backoff_time)
-                    continue
 
             except Exception as e:
-                raise TranslationImpossibleError(_("Unexpected error communicating with the provider"), error=e) from e
+                retry_delay = self._get_retry_delay(e, retry)
+                if retry_delay > 0.0 and not self._wait_for_retry(request, retry_delay):
+                    return None
+
+        if not self.aborted:
+            raise TranslationImpossibleError(_("Failed to communicate with provider after {max_retries} retries").format(
+                max_retries=self.max_retries
+            ))
+
+    async def _try_send_messages_async(self, request: TranslationRequest, temperature: float) -> dict[str, Any]|None:
+        for retry in range(self.max_retries + 1):
+            if self.aborted:
+                return None
+
+            # Concurrent requests share the client unless a new client is wanted for each request
+            async_client = self._get_async_client() if self.reuse_client else self._create_async_client()
+            try:
+                response = await self._send_messages_async(async_client, request, temperature)
+
+                return response
+
+            except Exception as e:
+                retry_delay = self._get_retry_delay(e, retry)
+                if retry_delay > 0.0 and not await self._wait_for_retry_async(request, retry_delay):
+                    return None
+
+            finally:
+                if async_client is not self.async_client:
+                    await async_client.close()
 
         if not self.aborted:
             raise TranslationImpossibleError(_("Failed to communicate with provider after {max_retries} retries").format(
                 max_retries=self.max_retries
             ))
 
+    def _get_retry_delay(self, error : Exception, retry : int) -> float:
+        """
+        Decide whether a failed request can be retried, returning the number of seconds to wait before the next attempt.
+        Raises an error if the request should not be retried.
+        """
+        backoff_time = self.backoff_time * 2.0**retry
+        can_retry = retry < self.max_retries and not self.aborted
+
+        if isinstance(error, TranslationResponseError):
+            if can_retry:
+                self._emit_warning(_("Translation response error: {error}, retrying in {backoff_time} seconds...").format(
+                    error=str(error), backoff_time=backoff_time
+                ))
+                return backoff_time
+
+        elif isinstance(error, openai.RateLimitError):
+            retry_after = error.response.headers.get('x-ratelimit-reset-requests') or error.response.headers.get('Retry-After')
+            self._report_throttled(ParseDelayFromHeader(retry_after) if retry_after else None)
+
+            if not self.aborted:
+                if not retry_after:
+                    raise TranslationImpossibleError(_("Account quota reached, please upgrade your plan"))
+
+                backoff_time = ParseDelayFromHeader(retry_after)
+                self._emit_warning(_("Rate limit hit, retrying in {backoff_time} seconds...").format(
+                    backoff_time=backoff_time
+                ))
+                return backoff_time
+
+        elif isinstance(error, openai.APITimeoutError):
+            self._report_throttled()
+            if can_retry:
+                self._emit_warning(_("API Timeout, retrying in {backoff_time} seconds...").format(
+                    backoff_time=backoff_time
+                ))
+                return backoff_time
+
+        elif isinstance(error, openai.APIStatusError):
+            if error.status_code >= 500:
+                self._report_throttled(ParseRetryAfterFromHeaders(error.response.headers))
+
+            if can_retry:
+                logging.warning(_("API status error: {error}, retrying in {backoff_time} seconds...").format(
+                    error=str(error), backoff_time=backoff_time
+                ))
+                return backoff_time
+
+        elif isinstance(error, JSONDecodeError):
+            if can_retry:
+                self._emit_warning(_("Invalid response received, retrying in {backoff_time} seconds...").format(
+                    backoff_time=backoff_time
+                ))
+                return backoff_time
+
+        elif isinstance(error, openai.APIConnectionError):
+            if not self.aborted:
+                raise TranslationError(str(error), error=error) from error
+
+        elif isinstance(error, TranslationImpossibleError):
+            # Error that has no chance of success on retry
+            if not self.aborted:
+                raise error
+
+        elif isinstance(error, TranslationError):
+            # Error that is potentially recoverable
+            if can_retry:
+                logging.warning(_("Translation error: {error}, retrying in {backoff_time} seconds...").format(
+                    error=str(error), backoff_time=backoff_time
+                ))
+                return backoff_time
+
+        else:
+            raise TranslationImpossibleError(_("Unexpected error communicating with the provider"), error=error) from error
+
+        return 0.0
+
     def _create_client(self) -> None:
         http_client: httpx.Client|None = None
 
@@ -189,3 +256,62 @@ class OpenAIClient(TranslationClient):
             http_client = httpx.Client(base_url=self.api_base, follow_redirects=True)
 
         self.client = openai.OpenAI(api_key=openai.api_key, base_url=self.api_base or None, http_client=http_client)
+
+    def _get_async_client(self) -> openai.AsyncOpenAI:
+        """
+        Get the shared async client for the running event loop, replacing a client created on another loop
+        """
+        loop = asyncio.get_running_loop()
+        if not self.async_client or self._async_client_loop is not loop:
+            if self.async_client:
+                self._close_async_client(self.async_client)
+
+            self.async_client = self._create_async_client()
+            self._async_client_loop = loop
+
+        return self.async_client
+
+    def _create_async_client(self) -> openai.AsyncOpenAI:
+        """
+        Create an async client for the running event loop. Connections cannot be shared between event loops.
+        """
+        http_client: httpx.AsyncClient|None = None
+
+        proxy = self.settings.get_str( 'proxy')
+        if proxy:
+            http_client = httpx.AsyncClient(proxy=proxy)
+
+        elif self.settings.get_bool( 'use_httpx'):
+            if self.api_base is None:
+                raise TranslationImpossibleError(_("API base must be set when using httpx"))
+
+            http_client = httpx.AsyncClient(base_url=self.api_base, follow_redirects=True)
+
+        return openai.AsyncOpenAI(api_key=openai.api_key, base_url=self.api_base or None, http_client=http_client)
+
+    def _close_async_client(self, async_client : openai.AsyncOpenAI) -> None:
+        """
+        Close the async client on its event loop, cancelling any requests in flight
+        """
+        loop = self._async_client_loop
+        if loop and loop.is_running():
+            asyncio.run_coroutine_threadsafe(async_client.close(), loop)
+            return
+
+        if _has_running_loop():
+            # The client's connections belong to a loop that has finished and cannot be closed from this one
+            logging.warning(_("Unable to close the async client for a finished event loop, its connections may not be released"))
+            return
+
+        try:
+            asyncio.run(async_client.close())
+
+        except Exception as e:
+            logging.warning(_("Unable to close the async client, its connections may not be released: {error}").format(error=str(e)))
+
+def _has_running_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
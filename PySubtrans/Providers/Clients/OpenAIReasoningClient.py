@@ -1,6 +1,7 @@
 from openai import (
     APIConnectionError,
     APITimeoutError,
+    AsyncOpenAI,
     AuthenticationError,
     BadRequestError,
     NotFoundError,
@@ -84,11 +85,30 @@ class OpenAIReasoningClient(OpenAIClient):
             raise TranslationError(_("No model specified"))
 
         openai_response = self._get_client_response(request)
-        
+
         if self.aborted or not openai_response:
             return None
-        
-        # Build response with usage info and content
+
+        return self._process_response(openai_response)
+
+    async def _send_messages_async(self, async_client: AsyncOpenAI, request: TranslationRequest, temperature: float|None) -> dict[str, Any] | None:
+        """
+        Make a request to OpenAI Responses API for translation without blocking the event loop
+        """
+        if not self.model:
+            raise TranslationError(_("No model specified"))
+
+        openai_response = await self._get_client_response_async(async_client, request)
+
+        if self.aborted or not openai_response:
+            return None
+
+        return self._process_response(openai_response)
+
+    def _process_response(self, openai_response : responses_types.Response) -> dict[str, Any]:
+        """
+        Build the response with usage info and content
+        """
         response = self._extract_usage_info(openai_response)
         text, reasoning = self._extract_text_content(openai_response)
         
@@ -133,6 +153,34 @@ class OpenAIReasoningClient(OpenAIClient):
         except OpenAIError as error:
             self._raise_for_openai_error(error)
 
+    async def _get_client_response_async(self, async_client: AsyncOpenAI, request: TranslationRequest):
+        """
+        Handle both streaming and non-streaming API calls with the async client
+        """
+        assert self.model is not None
+        prompt : TranslationPrompt = request.prompt
+
+        if not prompt or not prompt.content or not isinstance(prompt.content, list):
+            raise TranslationImpossibleError(_("No content provided for translation"))
+
+        try:
+            if request.is_streaming:
+                return await self._handle_streaming_response_async(async_client, request)
+
+            input_params = self._convert_to_input_params(prompt.content)
+
+            return await async_client.responses.create(
+                model=self.model,
+                input=input_params,
+                instructions=request.prompt.system_prompt,
+                reasoning=Reasoning(effort=self.reasoning_effort)
+            )
+
+        except (RateLimitError, APITimeoutError, APIConnectionError):
+            raise
+        except OpenAIError as error:
+            self._raise_for_openai_error(error)
+
     def _handle_streaming_response(self, request: TranslationRequest) -> responses_types.Response|None:
         """
         Handle streaming response with delta accumulation and partial updates
@@ -161,23 +209,54 @@ class OpenAIReasoningClient(OpenAIClient):
                 if self.aborted:
                     return
 
-                # Handle relevant streaming events
-                if isinstance(event, ResponseTextDeltaEvent):
-                    request.ProcessStreamingDelta(event.delta)
+                finished, latest_response, stream_error = self._handle_stream_event(request, event)
+                if finished:
+                    break
+
+        except RateLimitError:
+            raise
+        except (APITimeoutError, APIConnectionError):
+            raise
+        except OpenAIError as error:
+            stream_error = error
+        except Exception as error:
+            stream_error = error
+            self._emit_warning(_("Error during streaming: {error}").format(error=error))
+
+        finally:
+            self._is_streaming = False
+
+        return self._finish_stream(latest_response, stream_error)
 
-                elif isinstance(event, ResponseCompletedEvent):
-                    latest_response = event.response
-                    return latest_response
+    async def _handle_streaming_response_async(self, async_client: AsyncOpenAI, request: TranslationRequest) -> responses_types.Response|None:
+        """
+        Handle streaming response with the async client
+        """
+        assert self.model is not None
+        if not isinstance(request.prompt.content, list):
+            raise TranslationImpossibleError(_("Content must be a list for streaming Responses API"))
 
-                elif isinstance(event, (ResponseFailedEvent, ResponseIncompleteEvent)):
-                    latest_response = event.response or latest_response
-                    stream_error = getattr(event, 'error', None)
-                    if not latest_response:
-                        break
-                    self._emit_warning(_("Streaming ended with an error but OpenAI returned a response: {error}").format(
-                        error=str(stream_error) if stream_error else _("unknown error")
-                    ))
-                    return latest_response
+        input_params = self._convert_to_input_params(request.prompt.content)
+
+        stream = await async_client.responses.create(
+            model=self.model,
+            input=input_params,
+            instructions=request.prompt.system_prompt,
+            reasoning=Reasoning(effort=self.reasoning_effort),
+            stream=True
+        )
+
+        self._is_streaming = True
+        latest_response : responses_types.Response|None = None
+        stream_error : Exception|None = None
+        try:
+            async for event in stream:
+                if self.aborted:
+                    return
+
+                finished, latest_response, stream_error = self._handle_stream_event(request, event)
+                if finished:
+                    break
 
         except RateLimitError:
             raise
@@ -192,6 +271,32 @@ class OpenAIReasoningClient(OpenAIClient):
         finally:
             self._is_streaming = False
 
+        return self._finish_stream(latest_response, stream_error)
+
+    def _handle_stream_event(self, request: TranslationRequest, event) -> tuple[bool, responses_types.Response|None, Exception|None]:
+        """
+        Handle a streaming event, returning whether the stream has finished with the final response and error
+        """
+        if isinstance(event, ResponseTextDeltaEvent):
+            request.ProcessStreamingDelta(event.delta)
+
+        elif isinstance(event, ResponseCompletedEvent):
+            return True, event.response, None
+
+        elif isinstance(event, (ResponseFailedEvent, ResponseIncompleteEvent)):
+            stream_error = getattr(event, 'error', None)
+            if event.response:
+                self._emit_warning(_("Streaming ended with an error but OpenAI returned a response: {error}").format(
+                    error=str(stream_error) if stream_error else _("unknown error")
+                ))
+            return True, event.response, stream_error
+
+        return False, None, None
+
+    def _finish_stream(self, latest_response : responses_types.Response|None, stream_error : Exception|None) -> responses_types.Response:
+        """
+        Return the final response from a stream, or raise the error that ended it
+        """
         if latest_response:
             return latest_response
 
@@ -297,6 +402,11 @@ class OpenAIReasoningClient(OpenAIClient):
             'response_time': getattr(openai_response, 'response_ms', 0)
         }
 
+        # Input tokens served from the provider's prompt cache
+        input_details = getattr(usage, 'input_tokens_details', None)
+        if input_details:
+            info['cached_tokens'] = getattr(input_details, 'cached_tokens', None)
+
         # Add reasoning-specific tokens from output details
         if hasattr(usage, 'output_tokens_details') and usage.output_tokens_details:
             details = usage.output_tokens_details
@@ -125,11 +125,8 @@ else:
 
             def _allow_multithreaded_translation(self) -> bool:
                 """
-                If user has set a rate limit don't attempt parallel requests to make sure we respect it
+                Parallel requests share a rate limiter, so the rate limit is still respected
                 """
-                if self.settings.get_float( 'rate_limit', 0.0) != 0.0:
-                    return False
-
                 return True
 
             def _get_claude_models(self):
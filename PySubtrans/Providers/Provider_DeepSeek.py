@@ -132,10 +132,7 @@ class DeepSeekProvider(TranslationProvider):
 
     def _allow_multithreaded_translation(self) -> bool:
         """
-        If user has set a rate limit we can't make multiple requests at once
+        DeepSeek can handle parallel requests, the rate limiter paces them if necessary
         """
-        if self.settings.get_float( 'rate_limit', 0.0) != 0.0:
-            return False
-
         return True
 
@@ -176,11 +176,8 @@ else:
 
             def _allow_multithreaded_translation(self) -> bool:
                 """
-                If user has set a rate limit don't attempt parallel requests to make sure we respect it
+                Gemini supports parallel requests, which are throttled if a rate limit is set
                 """
-                if self.settings.get_float( 'rate_limit', 0.0) != 0.0:
-                    return False
-
                 return True
 
     except ImportError:
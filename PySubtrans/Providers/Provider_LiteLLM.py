@@ -89,9 +89,6 @@ else:
                 return self.information
 
             def _allow_multithreaded_translation(self) -> bool:
-                rate_limit = self.settings.get_float('rate_limit')
-                if rate_limit is not None and rate_limit != 0.0:
-                    return False
                 return True
 
     except ImportError:
@@ -130,11 +130,8 @@ else:
 
             def _allow_multithreaded_translation(self) -> bool:
                 """
-                If user has set a rate limit we can't make multiple requests at once
+                Mistral supports parallel requests (subject to the configured rate limit)
                 """
-                if self.settings.get_float( 'rate_limit', 0.0) != 0.0:
-                    return False
-
                 return True
 
     except ImportError:
@@ -185,14 +185,11 @@ else:
 
             def _allow_multithreaded_translation(self) -> bool:
                 """
-                If user is on the free plan or has set a rate limit it is better not to try parallel requests
+                If user is on the free plan it is better not to try parallel requests
                 """
                 if self.settings.get_bool( 'free_plan'):
                     return False
 
-                if self.settings.get_float( 'rate_limit', 0.0) != 0.0:
-                    return False
-
                 return True
 
     except ImportError:
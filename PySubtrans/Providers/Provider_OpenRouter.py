@@ -202,11 +202,8 @@ class OpenRouterProvider(TranslationProvider):
 
     def _allow_multithreaded_translation(self) -> bool:
         """
-        If user has set a rate limit we can't make multiple requests at once
+        Parallel requests are paced by the shared rate limiter if a rate limit is set
         """
-        if self.settings.get_float( 'rate_limit', 0.0) != 0.0:
-            return False
-
         return True
     
     def _populate_model_cache(self):
@@ -0,0 +1,285 @@
+import hashlib
+import logging
+import threading
+import time
+
+from PySubtrans.Helpers.Localization import _
+
+# Upper bound on concurrent requests to one account when adaptive concurrency has no configured maximum
+default_max_concurrency : int = 32
+
+class TokenBucket:
+    """
+    Token bucket that refills continuously at a fixed rate per minute.
+
+    Callers reserve capacity and are told how long to wait before proceeding,
+    so the same bucket can pace blocking threads and asyncio tasks alike.
+    """
+    def __init__(self, rate_per_minute : float, capacity : float|None = None):
+        self.rate_per_minute : float = rate_per_minute
+        self.capacity : float = capacity if capacity is not None else rate_per_minute
+        self.available : float = self.capacity
+        self.last_update : float = time.monotonic()
+
+    def Reserve(self, amount : float, now : float) -> float:
+        """
+        Reserve capacity, returning the number of seconds to wait before it can be used.
+        The bucket may go into debt, which later callers will wait to be repaid.
+        """
+        self._refill(now)
+        self.available -= amount
+        if self.available >= 0.0:
+            return 0.0
+
+        return -self.available * 60.0 / self.rate_per_minute
+
+    def Adjust(self, amount : float, now : float) -> None:
+        """
+        Correct an earlier reservation once the actual usage is known
+        """
+        self._refill(now)
+        self.available = min(self.capacity, self.available - amount)
+
+    def SetRate(self, rate_per_minute : float, capacity : float|None = None) -> None:
+        """
+        Update the refill rate and capacity of the bucket
+        """
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.available = min(self.available, self.capacity)
+
+    def _refill(self, now : float) -> None:
+        elapsed = max(0.0, now - self.last_update)
+        self.available = min(self.capacity, self.available + elapsed * self.rate_per_minute / 60.0)
+        self.last_update = now
+
+class RateLimiter:
+    """
+    Limits the rate of requests and tokens sent to a provider.
+
+    Requests are paced evenly at requests_per_minute, and the estimated token usage of
+    each request is drawn from a bucket holding a minute's worth of tokens_per_minute.
+    """
+    def __init__(self, requests_per_minute : float|None = None, tokens_per_minute : float|None = None):
+        self.lock = threading.Lock()
+        self.requests : TokenBucket|None = None
+        self.tokens : TokenBucket|None = None
+        self.SetLimits(requests_per_minute, tokens_per_minute)
+
+    @property
+    def requests_per_minute(self) -> float|None:
+        return self.requests.rate_per_minute if self.requests else None
+
+    @property
+    def tokens_per_minute(self) -> float|None:
+        return self.tokens.rate_per_minute if self.tokens else None
+
+    def SetLimits(self, requests_per_minute : float|None, tokens_per_minute : float|None = None) -> None:
+        """
+        Update the limits, keeping the current state of the buckets
+        """
+        with self.lock:
+            self.requests = self._update_bucket(self.requests, requests_per_minute, capacity=1.0)
+            self.tokens = self._update_bucket(self.tokens, tokens_per_minute)
+
+    def Reserve(self, tokens : int = 0) -> float:
+        """
+        Reserve a request slot and the estimated tokens for it.
+        Returns the number of seconds the caller should wait before sending the request.
+        """
+        with self.lock:
+            now = time.monotonic()
+            delay = 0.0
+            if self.requests:
+                delay = max(delay, self.requests.Reserve(1.0, now))
+            if self.tokens and tokens > 0:
+                delay = max(delay, self.tokens.Reserve(float(tokens), now))
+            return delay
+
+    def AdjustTokens(self, tokens : int) -> None:
+        """
+        Account for the difference between estimated and actual token usage of a request
+        """
+        with self.lock:
+            if self.tokens and tokens:
+                self.tokens.Adjust(float(tokens), time.monotonic())
+
+    def _update_bucket(self, bucket : TokenBucket|None, rate_per_minute : float|None, capacity : float|None = None) -> TokenBucket|None:
+        if not rate_per_minute or rate_per_minute <= 0.0:
+            return None
+
+        if bucket is None:
+            return TokenBucket(rate_per_minute, capacity)
+
+        bucket.SetRate(rate_per_minute, capacity)
+        return bucket
+
+class ConcurrencyGovernor:
+    """
+    Adapts the number of concurrent requests to a provider using additive-increase/multiplicative-decrease.
+
+    The limit starts at initial_concurrency, grows by one for each window of successful requests up to
+    max_concurrency and is halved when the provider signals that it is overloaded (rate limits, server errors
+    or timeouts). A suggested retry delay pauses all new requests until it has passed.
+    """
+    def __init__(self, max_concurrency : int, min_concurrency : int = 1, initial_concurrency : int|None = None, decrease_interval : float = 1.0):
+        self.condition = threading.Condition()
+        self.max_concurrency : int = max(1, max_concurrency)
+        self.min_concurrency : int = max(1, min(min_concurrency, self.max_concurrency))
+        self.decrease_interval : float = decrease_interval
+        initial = initial_concurrency if initial_concurrency is not None else self.max_concurrency
+        self.limit : float = float(max(self.min_concurrency, min(initial, self.max_concurrency)))
+        self.in_flight : int = 0
+        self.resume_time : float = 0.0
+        self.last_decrease : float|None = None
+
+    @property
+    def concurrency(self) -> int:
+        """The number of requests currently allowed in flight"""
+        return max(self.min_concurrency, int(self.limit))
+
+    def SetMaxConcurrency(self, max_concurrency : int) -> None:
+        """
+        Update the upper bound on concurrent requests
+        """
+        with self.condition:
+            self.max_concurrency = max(1, max_concurrency)
+            self.min_concurrency = min(self.min_concurrency, self.max_concurrency)
+            self.limit = min(self.limit, float(self.max_concurrency))
+            self.condition.notify_all()
+
+    def Acquire(self, timeout : float|None = None) -> bool:
+        """
+        Wait for a request slot. Returns False if the timeout expired first.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if self._try_acquire(now):
+                    return True
+
+                wait_time = self._get_wait_time(now)
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0.0:
+                        return False
+                    wait_time = min(wait_time, remaining) if wait_time is not None else remaining
+
+                self.condition.wait(wait_time)
+
+    def TryAcquire(self) -> float|None:
+        """
+        Take a request slot if one is free without waiting.
+        Returns None if a slot was acquired, otherwise a suggested time to wait before trying again.
+        """
+        with self.condition:
+            now = time.monotonic()
+            if self._try_acquire(now):
+                return None
+
+            return self._get_wait_time(now) or 0.1
+
+    def Release(self) -> None:
+        """
+        Return a request slot
+        """
+        with self.condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.condition.notify_all()
+
+    def RecordSuccess(self) -> None:
+        """
+        Increase the limit gradually while the provider is responding normally
+        """
+        with self.condition:
+            if self.limit < self.max_concurrency:
+                self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+                self.condition.notify_all()
+
+    def RecordThrottle(self, retry_after : float|None = None) -> None:
+        """
+        Halve the limit when the provider is overloaded, and pause new requests if it suggested a delay
+        """
+        with self.condition:
+            now = time.monotonic()
+
+            if retry_after and retry_after > 0.0:
+                self.resume_time = max(self.resume_time, now + retry_after)
+
+            # Several in-flight requests may fail for the same reason, so only back off once per interval
+            if self.last_decrease is not None and now - self.last_decrease < self.decrease_interval:
+                return
+
+            previous = self.concurrency
+            self.limit = max(float(self.min_concurrency), self.limit / 2.0)
+            self.last_decrease = now
+
+            if self.concurrency < previous:
+                logging.info(_("Reducing concurrent requests to {concurrency}").format(concurrency=self.concurrency))
+
+    def _try_acquire(self, now : float) -> bool:
+        if now < self.resume_time or self.in_flight >= self.concurrency:
+            return False
+
+        self.in_flight += 1
+        return True
+
+    def _get_wait_time(self, now : float) -> float|None:
+        return self.resume_time - now if now < self.resume_time else None
+
+_rate_limiters : dict[str, RateLimiter] = {}
+_concurrency_governors : dict[str, ConcurrencyGovernor] = {}
+_rate_limiters_lock = threading.Lock()
+
+def GetRateLimiterKey(provider : str|None, api_key : str|None, endpoint : str|None = None) -> str:
+    """
+    Build a key identifying the account a rate limit applies to, without retaining the API key
+    """
+    key_hash = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16] if api_key else ''
+    return f"{provider or ''}|{endpoint or ''}|{key_hash}"
+
+def GetRateLimiter(key : str, requests_per_minute : float|None, tokens_per_minute : float|None = None) -> RateLimiter|None:
+    """
+    Get the process-wide rate limiter for a key, creating or updating it as needed.
+    Returns None if no limits are set.
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+
+        if not requests_per_minute and not tokens_per_minute:
+            return None
+
+        if limiter is None:
+            limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+            _rate_limiters[key] = limiter
+
+        elif limiter.requests_per_minute != requests_per_minute or limiter.tokens_per_minute != tokens_per_minute:
+            limiter.SetLimits(requests_per_minute, tokens_per_minute)
+
+        return limiter
+
+def GetConcurrencyGovernor(key : str, max_concurrency : int, initial_concurrency : int|None = None) -> ConcurrencyGovernor:
+    """
+    Get the process-wide concurrency governor for a key, creating or updating it as needed.
+    The initial concurrency only applies when the governor is created.
+    """
+    with _rate_limiters_lock:
+        governor = _concurrency_governors.get(key)
+
+        if governor is None:
+            governor = ConcurrencyGovernor(max_concurrency, initial_concurrency=initial_concurrency)
+            _concurrency_governors[key] = governor
+
+        elif governor.max_concurrency != max_concurrency:
+            governor.SetMaxConcurrency(max_concurrency)
+
+        return governor
+
+def ResetRateLimiters() -> None:
+    """
+    Discard all shared rate limiters and concurrency governors
+    """
+    with _rate_limiters_lock:
+        _rate_limiters.clear()
+        _concurrency_governors.clear()
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from PySubtrans.Helpers.Localization import _
+from PySubtrans.Helpers.Resources import config_dir
+from PySubtrans.TranslationPrompt import TranslationPrompt
+
+default_cache_path : str = os.path.join(config_dir, 'response_cache.db')
+
+# Access times only affect which entries are evicted, so they are written in batches rather than on every hit
+_ACCESS_BATCH_SIZE = 64
+
+class ResponseCache:
+    """
+    Persistent cache of translation responses, keyed by a hash of the request.
+
+    Responses are stored in an SQLite database. When the total size of the stored
+    responses exceeds max_size bytes the least recently used entries are evicted.
+    The total size is kept up to date as entries are added and removed, and access
+    times are recorded in batches.
+    """
+    def __init__(self, path : str, max_size : int = 256 * 1024 * 1024):
+        self.path : str = path
+        self.max_size : int = max_size
+        self.lock = threading.Lock()
+        self.hits : int = 0
+        self.misses : int = 0
+        self.stores : int = 0
+        self.evictions : int = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            )""")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses(last_access)")
+        self.connection.commit()
+
+        self.total_size : int = int(self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0])
+        self.pending_access : dict[str, float] = {}
+
+    @property
+    def statistics(self) -> dict[str, int]:
+        """Hit, miss, store and eviction counts since the cache was opened"""
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+            }
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the cached responses"""
+        with self.lock:
+            return self.total_size
+
+    @property
+    def count(self) -> int:
+        """Number of cached responses"""
+        with self.lock:
+            row = self.connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+            return int(row[0])
+
+    def Get(self, key : str) -> dict[str, Any]|None:
+        """
+        Retrieve the cached response content for a key, or None if it is not cached
+        """
+        with self.lock:
+            row = self.connection.execute("SELECT content, size FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            try:
+                content = json.loads(row[0])
+
+            except json.JSONDecodeError:
+                logging.warning(_("Discarding corrupt response cache entry"))
+                self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.connection.commit()
+                self.pending_access.pop(key, None)
+                self.total_size -= int(row[1])
+                self.misses += 1
+                return None
+
+            self.pending_access[key] = time.time()
+            if len(self.pending_access) >= _ACCESS_BATCH_SIZE:
+                self._write_access_times()
+                self.connection.commit()
+
+            self.hits += 1
+            return content
+
+    def Put(self, key : str, content : dict[str, Any]) -> None:
+        """
+        Store response content for a key, evicting old entries if the cache is too large
+        """
+        serialised = json.dumps(content, ensure_ascii=False, default=str)
+        size = len(serialised.encode('utf-8'))
+        if size > self.max_size:
+            return
+
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses (key, content, size, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, serialised, size, now, now))
+            self.pending_access.pop(key, None)
+            self.total_size += size - (int(row[0]) if row else 0)
+            self.stores += 1
+            self._evict()
+            self.connection.commit()
+
+    def Clear(self) -> None:
+        """
+        Remove all cached responses
+        """
+        with self.lock:
+            self.connection.execute("DELETE FROM responses")
+            self.connection.commit()
+            self.pending_access.clear()
+            self.total_size = 0
+
+    def Close(self) -> None:
+        with self.lock:
+            if self.pending_access:
+                self._write_access_times()
+                self.connection.commit()
+            self.connection.close()
+
+    def _write_access_times(self) -> None:
+        self.connection.executemany("UPDATE responses SET last_access = ? WHERE key = ?",
+                                    [ (last_access, key) for key, last_access in self.pending_access.items() ])
+        self.pending_access.clear()
+
+    def _evict(self) -> None:
+        if self.total_size <= self.max_size:
+            return
+
+        # Access times must be up to date to find the least recently used entries
+        if self.pending_access:
+            self._write_access_times()
+
+        # Drop least recently used entries until the cache fits
+        rows = self.connection.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if self.total_size <= self.max_size:
+                break
+            self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.total_size -= size
+            self.evictions += 1
+
+def GetCacheKey(provider : str|None, model : str|None, temperature : float|None, prompt : TranslationPrompt) -> str:
+    """
+    Build a content-addressed key for a translation request
+    """
+    request = {
+        'provider': provider or '',
+        'model': model or '',
+        'temperature': temperature,
+        'system_prompt': prompt.system_prompt,
+        'messages': prompt.messages,
+        'content': prompt.content if isinstance(prompt.content, str) else None,
+    }
+    serialised = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serialised.encode('utf-8')).hexdigest()
+
+_response_caches : dict[str, ResponseCache] = {}
+_response_caches_lock = threading.Lock()
+
+def GetResponseCache(path : str, max_size : int|None = None) -> ResponseCache|None:
+    """
+    Get the shared response cache stored at path, opening it if necessary
+    """
+    path = os.path.abspath(path)
+    with _response_caches_lock:
+        cache = _response_caches.get(path)
+        if cache is None:
+            try:
+                cache = ResponseCache(path, max_size) if max_size else ResponseCache(path)
+            except (sqlite3.Error, OSError) as e:
+                logging.warning(_("Unable to open response cache at {path}: {error}").format(path=path, error=str(e)))
+                return None
+
+            _response_caches[path] = cache
+
+        elif max_size:
+            cache.max_size = max_size
+
+        return cache
+
+def CloseResponseCaches() -> None:
+    """
+    Close all shared response caches
+    """
+    with _response_caches_lock:
+        for cache in _response_caches.values():
+            cache.Close()
+        _response_caches.clear()
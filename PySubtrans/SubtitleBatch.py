@@ -1,13 +1,16 @@
 from datetime import timedelta
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
 
 from PySubtrans.Substitutions import Substitutions
 from PySubtrans.TranslationPrompt import TranslationPrompt
 from PySubtrans.SubtitleError import SubtitleError
-from PySubtrans.Helpers.SubtitleHelpers import AddOrUpdateLine, MergeSubtitles
+from PySubtrans.Helpers.SubtitleHelpers import AddOrUpdateLine, FindLine, FindLineIndex, MergeSubtitles, MergeTranslations
 from PySubtrans.SubtitleLine import SubtitleLine
 from PySubtrans.Translation import Translation
 
+if TYPE_CHECKING:
+    from PySubtrans.SubtitleScene import SubtitleScene
+
 class SubtitleBatch:
     def __init__(self, dct : dict[str,Any]|None = None):
         dct = dct or {}
@@ -18,8 +21,13 @@ class SubtitleBatch:
         self.errors : list[str|SubtitleError] = dct.get('errors', [])
         self._originals : list[SubtitleLine] = dct.get('originals', []) or dct.get('subtitles', [])
         self._translated : list[SubtitleLine] = dct.get('translated', [])
-        self.translation : Translation|None = dct.get('translation')
-        self.prompt : TranslationPrompt|None = dct.get('prompt')
+        # The translation and prompt may be functions that decode them on first access, if the project was lazily loaded
+        self._translation : Translation|Callable[[], Translation]|None = dct.get('translation')
+        self._prompt : TranslationPrompt|Callable[[], TranslationPrompt]|None = dct.get('prompt')
+
+        # Translation counts are added to the totals of the scene that contains the batch
+        self._parent : 'SubtitleScene|None' = None
+        self._counts : tuple[int, ...] = self._get_counts()
 
     def __str__(self) -> str:
         return f"SubtitleBatch: {str(self.number)} in scene {str(self.scene)} with {self.size} lines"
@@ -32,6 +40,28 @@ class SubtitleBatch:
         """ Get the list of original lines in the batch """
         return self._originals
 
+    @property
+    def translation(self) -> Translation|None:
+        """ Get the translation response for the batch """
+        if callable(self._translation):
+            self._translation = self._translation()
+        return self._translation
+
+    @translation.setter
+    def translation(self, value : Translation|None):
+        self._translation = value
+
+    @property
+    def prompt(self) -> TranslationPrompt|None:
+        """ Get the prompt that was used to translate the batch """
+        if callable(self._prompt):
+            self._prompt = self._prompt()
+        return self._prompt
+
+    @prompt.setter
+    def prompt(self, value : TranslationPrompt|None):
+        self._prompt = value
+
     @property
     def size(self) -> int:
         """ Get the number of original lines in the batch """
@@ -45,7 +75,17 @@ class SubtitleBatch:
     @property
     def untranslated(self) -> list[SubtitleLine]:
         """ Get the list of lines in the batch which have no translation """
-        return [sub for sub in self.originals if not sub.translated]
+        return [sub for sub in self.originals if sub.translation is None]
+
+    @property
+    def translated_count(self) -> int:
+        """ Get the number of translated lines in the batch """
+        return len(self._translated)
+
+    @property
+    def untranslated_count(self) -> int:
+        """ Get the number of original lines in the batch without a translated line """
+        return max(0, len(self._originals) - len(self._translated))
 
     @property
     def all_translated(self) -> bool:
@@ -113,7 +153,8 @@ class SubtitleBatch:
         Update the original text for the batch
         """
         lines = [SubtitleLine(line) for line in value] if value else []
-        self._originals = [line for line in lines if line.number]
+        self._originals = sorted((line for line in lines if line.number), key=lambda line: line.number)
+        self.MarkChanged()
 
     @translated.setter
     def translated(self, value : list[SubtitleLine]|list[str]):
@@ -121,17 +162,34 @@ class SubtitleBatch:
         Update the translated text for the batch
         """
         lines = [SubtitleLine(line) for line in value] if value else []
-        self._translated = [line for line in lines if line.number]
+        self._translated = sorted((line for line in lines if line.number), key=lambda line: line.number)
+        self.MarkChanged()
+
+    def MarkChanged(self):
+        """
+        Update the translation counts after lines were added to or removed from the batch, and the totals of the scene that contains it
+        """
+        previous = self._counts
+        self._counts = self._get_counts()
+        if self._parent is not None and self._counts != previous:
+            self._parent._update_counts(previous, self._counts)
 
     def AddLine(self, line : SubtitleLine|str):
         """
         Insert a line into the batch or replace an existing line
         """
         AddOrUpdateLine(self._originals, SubtitleLine(line))
+        self.MarkChanged()
 
     def AddTranslatedLine(self, line : SubtitleLine|str):
        """ Insert a translated line into the batch or replace an existing translation """
        AddOrUpdateLine(self._translated, SubtitleLine(line))
+       self.MarkChanged()
+
+    def MergeTranslations(self, translated : list[SubtitleLine]):
+        """ Merge translated lines into the batch, replacing any existing translations of the same lines """
+        self._translated = MergeTranslations(self._translated or [], translated)
+        self.MarkChanged()
 
     def HasTranslatedLine(self, line_number : int) -> bool:
         """ Check if the batch has a translated line with the given number """
@@ -140,15 +198,15 @@ class SubtitleBatch:
         if line_number < self.first_line_number or line_number > self.last_line_number:
             return False
 
-        return any(line for line in self._translated if line.number == line_number)
+        return FindLineIndex(self._translated, line_number) is not None
 
     def GetOriginalLine(self, line_number : int) -> SubtitleLine|None:
         """ Get an original line from the batch by its number """
-        return next((line for line in self._originals if line.number == line_number), None)
+        return FindLine(self._originals, line_number)
 
     def GetTranslatedLine(self, line_number : int) -> SubtitleLine|None:
         """ Get a translated line from the batch by its number """
-        return next((line for line in self._translated if line.number == line_number), None)
+        return FindLine(self._translated, line_number)
 
     def AddContext(self, key : str, value : str|list[str]|dict[str,Any]):
         self.context[key] = value
@@ -176,6 +234,12 @@ class SubtitleBatch:
 
         return updated
 
+    def _get_counts(self) -> tuple[int, ...]:
+        """
+        Count translated and untranslated lines, and whether the batch is incomplete or has any translations
+        """
+        return (self.translated_count, self.untranslated_count, int(not self.all_translated), int(self.any_translated))
+
     def PerformInputSubstitutions(self, substitutions : Substitutions) -> dict[str,str]|None:
         """
         Perform any word/phrase substitutions on source text
@@ -233,9 +297,11 @@ class SubtitleBatch:
             last_translated_index = self.translated.index(translated_lines[-1])
             merged_translated = MergeSubtitles(translated_lines)
             self._translated = self.translated[:first_translated_index] + [ merged_translated ] + self.translated[last_translated_index + 1:]
+            self.MarkChanged()
 
             return merged, merged_translated
 
+        self.MarkChanged()
         return merged, None
 
     def DeleteLines(self, line_numbers : list[int]) -> tuple[list[SubtitleLine], list[SubtitleLine]]:
@@ -253,6 +319,7 @@ class SubtitleBatch:
 
         self._originals = originals
         self._translated = translated
+        self.MarkChanged()
 
         return deleted_originals, deleted_translated
 
@@ -278,6 +345,8 @@ class SubtitleBatch:
                     self.originals.insert(index, line)
                     break
 
+        self.MarkChanged()
+
     def InsertTranslatedLine(self, line : SubtitleLine):
         """
         Insert a translated line into the batch
@@ -300,6 +369,8 @@ class SubtitleBatch:
                     self.translated.insert(index, line)
                     break
 
+        self.MarkChanged()
+
     def InsertLines(self, originals: list[SubtitleLine], translated: list[SubtitleLine]|None = None):
         """
         Insert multiple lines into the batch, with optional translations
@@ -1,16 +1,24 @@
 from datetime import timedelta
+from itertools import accumulate
 from PySubtrans.Options import SettingsType
 from PySubtrans.SubtitleBatch import SubtitleBatch
 from PySubtrans.SubtitleScene import SubtitleScene
 from PySubtrans.SubtitleLine import SubtitleLine
+from PySubtrans.SubtitleTimings import SubtitleTimings
+from PySubtrans.TokenEstimator import TokenEstimator
 
 class SubtitleBatcher:
-    def __init__(self, settings : SettingsType):
+    def __init__(self, settings : SettingsType, token_estimator : TokenEstimator|None = None):
         """ Initialize a SubtitleBatcher helper class with settings """
         self.min_batch_size : int = settings.get_int('min_batch_size') or 1
         self.max_batch_size : int = settings.get_int('max_batch_size') or 100
         self.fix_overlaps : bool = settings.get_bool('prevent_overlapping_times', False)
 
+        # Optional token budgets for the lines in each batch
+        self.max_input_tokens : int|None = settings.get_int('max_input_tokens') or None
+        self.max_output_tokens : int|None = settings.get_int('max_output_tokens') or None
+        self.token_estimator : TokenEstimator = token_estimator or TokenEstimator()
+
         scene_threshold_seconds : float = settings.get_float('scene_threshold') or 30.0
         self.scene_threshold : timedelta = timedelta(seconds=scene_threshold_seconds)
 
@@ -19,34 +27,23 @@ class SubtitleBatcher:
             raise ValueError("min_batch_size must be less than max_batch_size.")
 
         scenes : list[SubtitleScene] = []
-        current_lines : list[SubtitleLine] = []
-        last_endtime : timedelta|None = None
-
-        for line in lines:
-            if line.start is None or line.end is None:
-                raise ValueError(f"Line {line.number} has missing start or end time.")
+        if not lines:
+            return scenes
 
-            # Fix overlapping display times (otherwise gaps can be negative)
-            if self.fix_overlaps and last_endtime and line.start < last_endtime:
-                line.start = last_endtime + timedelta(milliseconds=10)
+        timings = SubtitleTimings.FromLines(lines)
 
-            gap = line.start - last_endtime if last_endtime is not None else None
+        # Fix overlapping display times (otherwise gaps can be negative)
+        if self.fix_overlaps:
+            timings.FixOverlaps(lines, timedelta(milliseconds=10))
 
-            if gap is not None and gap > self.scene_threshold:
-                if current_lines:
-                    self.CreateNewScene(scenes, current_lines)
-                    current_lines = []
+        boundaries = [0] + timings.FindSceneBreaks(self.scene_threshold) + [len(lines)]
 
-            current_lines.append(line)
-            last_endtime = line.end
-
-        # Handle any remaining lines
-        if current_lines:
-            self.CreateNewScene(scenes, current_lines)
+        for first, last in zip(boundaries, boundaries[1:]):
+            self.CreateNewScene(scenes, lines[first:last], timings.Slice(first, last))
 
         return scenes
 
-    def CreateNewScene(self, scenes : list[SubtitleScene], current_lines : list[SubtitleLine]):
+    def CreateNewScene(self, scenes : list[SubtitleScene], current_lines : list[SubtitleLine], timings : SubtitleTimings|None = None):
         """
         Create a scene and add lines to it in batches
         """
@@ -54,45 +51,89 @@ class SubtitleBatcher:
         scenes.append(scene)
         scene.number = len(scenes)
 
-        split_lines : list[list[SubtitleLine]] = self._split_lines(current_lines)
+        split_lines : list[list[SubtitleLine]] = self._split_lines(current_lines, timings)
 
         for lines in split_lines:
             batch : SubtitleBatch = scene.AddNewBatch()
             batch._originals = lines
+            batch.MarkChanged()
 
         return scene
 
-    def _split_lines(self, lines : list[SubtitleLine]) -> list[list[SubtitleLine]]:
+    @property
+    def uses_token_budget(self) -> bool:
+        return bool(self.max_input_tokens or self.max_output_tokens)
+
+    def _split_lines(self, lines : list[SubtitleLine], timings : SubtitleTimings|None = None) -> list[list[SubtitleLine]]:
         """
-        Recursively divide the lines at the largest gap until there is no batch larger than the maximum batch size
+        Divide the lines at the largest gap until there is no batch larger than the maximum batch size
+        or over the token budget
         """
-        # If the batch is small enough, we're done
-        num_lines = len(lines)
-        if num_lines <= self.max_batch_size:
-            return [ lines ]
+        if timings is None:
+            timings = SubtitleTimings.FromLines(lines)
+
+        token_totals = self._get_token_totals(lines) if self.uses_token_budget else None
+
+        # Split ranges depth-first, left before right, so batches are produced in order
+        batches : list[list[SubtitleLine]] = []
+        pending : list[tuple[int,int]] = [ (0, len(lines)) ]
+        while pending:
+            first, last = pending.pop()
+            split_index = self._find_split_index(timings, first, last, token_totals)
+            if split_index is None:
+                batches.append(lines[first:last])
+            else:
+                pending.append((split_index, last))
+                pending.append((first, split_index))
+
+        return batches
+
+    def _find_split_index(self, timings : SubtitleTimings, first : int, last : int, token_totals : tuple[list[int],list[int]]|None) -> int|None:
+        """
+        Find where to split a range of lines, or None if it does not need to be split
+        """
+        num_lines = last - first
+        over_budget = num_lines > 1 and self._exceeds_token_budget(token_totals, first, last)
+        if num_lines <= self.max_batch_size and not over_budget:
+            return None
 
         # Find the longest gap starting from the min_batch_size index
-        longest_gap : timedelta = timedelta(seconds=0)
-        split_index : int = self.min_batch_size
-        last_split_index : int = num_lines - self.min_batch_size
+        split_index : int = first + self.min_batch_size
+        last_split_index : int = last - self.min_batch_size
+
+        if last_split_index <= split_index and num_lines <= self.max_batch_size:
+            # Too few lines to respect the minimum batch size, but the batch must be split to fit the token budget
+            split_index, last_split_index = first + 1, last
 
-        if last_split_index > split_index:
-            for i in range(split_index, last_split_index):
-                if lines[i].start is None:
-                    raise ValueError(f"Line {lines[i].number} has no start time.")
+        split_index = timings.FindLongestGap(split_index, last_split_index)
 
-                if lines[i - 1].end is None:
-                    raise ValueError(f"Line {lines[i - 1].number} has no end time.")
+        # Never produce an empty batch, even if the batch sizes are misconfigured
+        return min(max(split_index, first + 1), last - 1)
+
+    def _get_token_totals(self, lines : list[SubtitleLine]) -> tuple[list[int],list[int]]:
+        """
+        Running totals of the estimated input and output tokens for the lines, so any range can be measured directly
+        """
+        estimator = self.token_estimator
+        input_totals = list(accumulate((estimator.EstimateLineInputTokens(line) for line in lines), initial=0))
+        output_totals = list(accumulate((estimator.EstimateLineOutputTokens(line) for line in lines), initial=0))
+        return input_totals, output_totals
+
+    def _exceeds_token_budget(self, token_totals : tuple[list[int],list[int]]|None, first : int, last : int) -> bool:
+        """
+        Check whether the estimated input or output tokens for a range of lines exceed the budget
+        """
+        if not token_totals or last <= first:
+            return False
 
-                gap : timedelta = lines[i].start - lines[i - 1].end
-                if gap > longest_gap:
-                    longest_gap = gap
-                    split_index = i
+        input_totals, output_totals = token_totals
 
-        # Split the batch into two
-        left = lines[:split_index]
-        right = lines[split_index:]
+        if self.max_input_tokens and input_totals[last] - input_totals[first] > self.max_input_tokens:
+            return True
 
-        # Recursively split the batches and concatenate the lists
-        return self._split_lines(left) + self._split_lines(right)
+        if self.max_output_tokens:
+            output_tokens = self.token_estimator.response_overhead + output_totals[last] - output_totals[first]
+            if output_tokens > self.max_output_tokens:
+                return True
 
+        return False
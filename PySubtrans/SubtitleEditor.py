@@ -36,6 +36,9 @@ class SubtitleEditor:
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         if self._lock_acquired:
+            # Edits may have changed lines or batches without updating the translation totals
+            self.subtitles.UpdateTranslationCounts()
+
             self.subtitles.lock.release()
             self._lock_acquired = False
 
@@ -57,7 +60,7 @@ class SubtitleEditor:
             self.subtitles.scenes = batcher.BatchSubtitles(self.subtitles.originals)
 
     def AddScene(self, scene: SubtitleScene) -> None:
-        self.subtitles.scenes.append(scene)
+        self.subtitles.scenes = self.subtitles.scenes + [scene]
         logging.debug("Added a new scene")
 
     def UpdateScene(self, scene_number: int, update: dict[str, Any]) -> Any:
@@ -215,7 +218,7 @@ class SubtitleEditor:
         if split_index < len(self.subtitles.scenes):
             self.subtitles.scenes = self.subtitles.scenes[:split_index] + [new_scene] + self.subtitles.scenes[split_index:]
         else:
-            self.subtitles.scenes.append(new_scene)
+            self.subtitles.scenes = self.subtitles.scenes + [new_scene]
 
         self.RenumberScenes()
 
@@ -227,16 +230,20 @@ class SubtitleEditor:
             scene.batches = [batch for batch in scene.batches if batch.originals]
 
             for batch in scene.batches:
-                batch.originals = [line for line in batch.originals if line.number and line.start is not None]
-                if batch.translated:
-                    batch.translated = [line for line in batch.translated if line.number and line.start is not None ]
+                # Only replace the lines if some are invalid, since assigning them makes a copy of every line
+                originals = [line for line in batch.originals if line.number and line.start is not None]
+                if len(originals) != len(batch.originals):
+                    batch.originals = originals
+
+                translated = [line for line in batch.translated if line.number and line.start is not None]
+                if len(translated) != len(batch.translated):
+                    batch.translated = translated
 
-                original_line_numbers = [line.number for line in batch.originals]
-                translated = batch.translated or []
-                unmatched_translated = [line for line in translated if line.number not in original_line_numbers]
+                original_line_numbers = {line.number for line in batch.originals}
+                unmatched_translated = [line for line in batch.translated if line.number not in original_line_numbers]
                 if unmatched_translated:
                     logging.warning(_("Removing {} translated lines in batch ({},{}) that don't match an original line").format(len(unmatched_translated), batch.scene, batch.number))
-                    batch.translated = [line for line in translated if line not in unmatched_translated]
+                    batch.translated = [line for line in batch.translated if line.number in original_line_numbers]
 
         self.subtitles.scenes = [scene for scene in self.subtitles.scenes if scene.batches]
         self.RenumberScenes()
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import TextIO
+import codecs
 import os
 
 from PySubtrans.SubtitleData import SubtitleData
@@ -8,6 +9,42 @@ from PySubtrans.SubtitleData import SubtitleData
 default_encoding = os.getenv('DEFAULT_ENCODING', 'utf-8')
 fallback_encoding = os.getenv('FALLBACK_ENCODING', 'iso-8859-1')
 
+# Byte order marks take precedence over the default encoding (UTF-32 first, as its marks begin with UTF-16's)
+_BYTE_ORDER_MARKS : list[tuple[bytes, str]] = [
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+
+def read_subtitle_file(path : str) -> str:
+    """
+    Read a subtitle file in a single pass and decode its content
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    return decode_subtitle_bytes(data)
+
+def decode_subtitle_bytes(data : bytes) -> str:
+    """
+    Decode subtitle file content using the encoding indicated by its byte order mark, if it has one.
+    Otherwise the default encoding is used, or the fallback encoding if the content is not valid in the default.
+    Line endings are left untouched, so the handler sees the content exactly as it was written.
+    """
+    for bom, encoding in _BYTE_ORDER_MARKS:
+        if data.startswith(bom):
+            try:
+                return data[len(bom):].decode(encoding)
+            except UnicodeDecodeError:
+                break
+
+    try:
+        return data.decode(default_encoding)
+    except UnicodeDecodeError:
+        return data.decode(fallback_encoding)
+
 
 class SubtitleFileHandler(ABC):
     """
@@ -58,19 +95,27 @@ class SubtitleFileHandler(ABC):
         """
         raise NotImplementedError
 
-    @abstractmethod
+    def write_file(self, data: SubtitleData, file_obj: TextIO) -> None:
+        """
+        Compose subtitle lines and write them to an open file.
+        Handlers that can compose incrementally override this to avoid building the whole file in memory.
+        """
+        file_obj.write(self.compose(data))
+
     def load_file(self, path: str) -> SubtitleData:
         """
         Open a subtitle file and parse it.
 
+        The file is read once and decoded with read_subtitle_file, then parsed with parse_string.
+
         Returns:
             SubtitleData: Parsed subtitle lines and metadata
 
         Raises:
             SubtitleParseError: If parsing fails
-            UnicodeDecodeError: If file is in an unsupported encoding            
+            UnicodeDecodeError: If file is in an unsupported encoding
         """
-        raise NotImplementedError
+        return self.parse_string(read_subtitle_file(path))
 
     def get_file_extensions(self) -> list[str]:
         """
@@ -4,14 +4,12 @@ import os
 import pysubs2
 
 from PySubtrans.Helpers.Localization import _
-from PySubtrans.SubtitleFileHandler import (
-    SubtitleFileHandler,
-    default_encoding,
-    fallback_encoding,
-)
+from PySubtrans.SubtitleFileHandler import SubtitleFileHandler, read_subtitle_file
 from PySubtrans.SubtitleData import SubtitleData
 from PySubtrans.SubtitleError import SubtitleParseError
 
+# Formats can be identified from the start of the file, so there is no need to scan all of it
+_DETECTION_PREFIX_LENGTH = 64 * 1024
 
 class SubtitleFormatRegistry:
     """
@@ -145,24 +143,47 @@ class SubtitleFormatRegistry:
         except Exception as e:
             raise SubtitleParseError(_("Failed to detect subtitle format: {}" ).format(str(e)), e)
 
+    @classmethod
+    def load_file(cls, path: str) -> SubtitleData:
+        """
+        Read a subtitle file once and parse it with the handler for its extension,
+        detecting the format from the content if the handler cannot parse it.
+        """
+        handler = cls.create_handler(filename=path)
+        content = read_subtitle_file(path)
+
+        try:
+            return handler.parse_string(content)
+
+        except SubtitleParseError as e:
+            logging.debug(f"Error parsing file: {e}")
+            logging.info(_("Error parsing file... attempting format detection"))
+            return cls.detect_format_and_parse(content)
+
     @classmethod
     def detect_format_and_load_file(cls, path: str) -> SubtitleData:
         """
         Detect subtitle format using content and load file accordingly.
         """
-        cls._ensure_discovered()
         try:
-            try:
-                subs = pysubs2.load(path, encoding=default_encoding)
-            except UnicodeDecodeError:
-                subs = pysubs2.load(path, encoding=fallback_encoding)
+            content = read_subtitle_file(path)
         except Exception as e:
             raise SubtitleParseError(_("Failed to detect subtitle format: {}" ).format(str(e)), e)
 
-        if not subs.format:
-            raise SubtitleParseError(_("Could not detect subtitle format for file: {}" ).format(path))
+        return cls.detect_format_and_parse(content)
+
+    @classmethod
+    def detect_format_and_parse(cls, content: str) -> SubtitleData:
+        """
+        Detect subtitle format from the start of the content and parse it with the matching handler.
+        """
+        cls._ensure_discovered()
+        try:
+            detected_format = pysubs2.formats.autodetect_format(content[:_DETECTION_PREFIX_LENGTH])
+        except Exception as e:
+            raise SubtitleParseError(_("Failed to detect subtitle format: {}" ).format(str(e)), e)
 
-        detected_extension = pysubs2.formats.get_file_extension(subs.format)
+        detected_extension = pysubs2.formats.get_file_extension(detected_format)
 
         logging.info(_("Detected subtitle format '{format}'").format(format=detected_extension))
 
@@ -170,9 +191,9 @@ class SubtitleFormatRegistry:
             raise SubtitleParseError(_("Detected subtitle format '{format}' is not supported.").format(format=detected_extension))
 
         handler = cls.create_handler(detected_extension)
-        
-        data = handler.load_file(path)
-        
+
+        data = handler.parse_string(content)
+
         data.metadata['detected_format'] = detected_extension
         return data
 
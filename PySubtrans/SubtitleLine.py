@@ -18,33 +18,53 @@ SRT_PATTERN = regex.compile(
     regex.DOTALL
 )
 
+# Shared by lines without metadata - it is replaced with a dictionary of their own when accessed
+_EMPTY_METADATA : dict[str, Any] = {}
+
+_one_us = timedelta(microseconds=1)
+
+def _to_us(time : timedelta|None) -> int|None:
+    return time // _one_us if time is not None else None
+
+def _parse_us(time : Any) -> int|None:
+    # Project files store times as seconds, which can be converted without going through timedelta
+    if isinstance(time, (int, float)) and not isinstance(time, bool):
+        return round(time * 1_000_000)
+    return _to_us(GetTimeDeltaSafe(time))
+
 class SubtitleLine:
     """
     Represents a single subtitle line with timing, content, and metadata.
     This is the internal representation used throughout the application.
+
+    Times are stored as integer microseconds and exposed as timedelta properties. Metadata is only
+    copied when it is accessed, so lines without metadata or copies that never modify it share a dictionary.
     """
+    __slots__ = ('_index', '_start_us', '_end_us', '_duration_us', 'content', '_metadata', '_metadata_owned', 'translation', 'original')
+
     def __init__(self, line : SubtitleLine|str|dict|None = None, translation : str|None = None, original : str|None = None):
-        # Core subtitle properties 
+        # Core subtitle properties
         self._index: int|None = None
-        self._start: timedelta|None = None
-        self._end: timedelta|None = None
+        self._start_us: int|None = None
+        self._end_us: int|None = None
         self.content: str|None = None
-        self.metadata: dict[str, Any] = {}
-        
+        self._metadata: dict[str, Any] = _EMPTY_METADATA
+        self._metadata_owned: bool = False
+
         # Additional properties
         self.translation : str|None = translation
         self.original : str|None = original
-        self._duration : timedelta|None = None
+        self._duration_us : int|None = None
 
         if isinstance(line, SubtitleLine):
             self._index = line._index
-            self._start = line._start
-            self._end = line._end
+            self._start_us = line._start_us
+            self._end_us = line._end_us
             self.content = line.text
-            self._duration = line._duration
+            self._duration_us = line._duration_us
             self.original = original if original is not None else line.original
             self.translation = translation if translation is not None else line.translation
-            self.metadata = line.metadata.copy()
+            self._share_metadata(line)
 
         elif isinstance(line, dict):
             if 'line' in line:
@@ -53,14 +73,14 @@ class SubtitleLine:
             else:
                 # New format: use individual properties
                 self._index = int(line.get('index') or line.get('number') or 0)
-                start_time = line.get('start')
-                end_time = line.get('end')
-                self._start = GetTimeDeltaSafe(start_time)
-                self._end = GetTimeDeltaSafe(end_time)
+                self._start_us = _parse_us(line.get('start'))
+                self._end_us = _parse_us(line.get('end'))
                 self.text = line.get('content') or line.get('text') or line.get('body')
 
-            self.metadata = deepcopy(line.get('metadata', {}))
-            
+            metadata = line.get('metadata')
+            if metadata:
+                self.metadata = deepcopy(metadata)
+
             # Override with provided translation/original if specified
             self.translation = translation if translation is not None else line.get('translation')
             self.original = original if original is not None else line.get('original')
@@ -70,7 +90,7 @@ class SubtitleLine:
             self._parse_from_string(str(line))
 
     def __str__(self) -> str:
-        return f"{self.number}:{self.srt_start}-->{self.srt_end}: {self.text}" if self._start is not None and self._end is not None else "Invalid SubtitleLine"
+        return f"{self.number}:{self.srt_start}-->{self.srt_end}: {self.text}" if self._start_us is not None and self._end_us is not None else "Invalid SubtitleLine"
 
     def __repr__(self) -> str:
         return f"[Line {self.number}] {TimedeltaToText(self.start)}, {repr(self.text)}"
@@ -79,30 +99,41 @@ class SubtitleLine:
         if not isinstance(other, SubtitleLine):
             return False
         return (self.number == other.number and 
-                self.start == other.start and 
-                self.end == other.end and 
+                (self._start_us or 0) == (other._start_us or 0) and
+                (self._end_us or 0) == (other._end_us or 0) and
                 self.text == other.text)
 
     def copy(self) -> SubtitleLine:
         """Create a copy of this subtitle line."""
-        new_line = SubtitleLine()
-        new_line._index = self._index
-        new_line._start = self._start
-        new_line._end = self._end
-        new_line.content = self.content
-        new_line.translation = self.translation
-        new_line.original = self.original
-        new_line._duration = self._duration
-        new_line.metadata = deepcopy(self.metadata)
-        return new_line
+        return SubtitleLine(self)
 
     @property
     def start(self) -> timedelta:
-        return self._start or timedelta(seconds=0)
+        return timedelta(microseconds=self._start_us) if self._start_us is not None else timedelta(seconds=0)
 
     @property
     def end(self) -> timedelta:
-        return self._end or timedelta(seconds=0)
+        return timedelta(microseconds=self._end_us) if self._end_us is not None else timedelta(seconds=0)
+
+    @property
+    def start_ms(self) -> int:
+        """Start time in milliseconds"""
+        return (self._start_us or 0) // 1000
+
+    @property
+    def end_ms(self) -> int:
+        """End time in milliseconds"""
+        return (self._end_us or 0) // 1000
+
+    @property
+    def start_us(self) -> int:
+        """Start time in microseconds"""
+        return self._start_us or 0
+
+    @property
+    def end_us(self) -> int:
+        """End time in microseconds"""
+        return self._end_us or 0
 
     @property
     def key(self) -> int|str:
@@ -116,6 +147,19 @@ class SubtitleLine:
     def text(self) -> str|None:
         return self.content
 
+    @property
+    def metadata(self) -> dict[str, Any]:
+        if not self._metadata_owned:
+            # Take a private copy before it can be modified
+            self._metadata = deepcopy(self._metadata) if self._metadata else {}
+            self._metadata_owned = True
+        return self._metadata
+
+    @property
+    def has_metadata(self) -> bool:
+        """Check for metadata without taking a copy of it"""
+        return bool(self._metadata)
+
     @property
     def text_normalized(self) -> str|None:
         return self.text.replace(linesep, '\n').strip() if self.text else None
@@ -138,9 +182,12 @@ class SubtitleLine:
 
     @property
     def duration(self) -> timedelta:
-        if not self._duration:
-            self._duration = self.end - self.start if self._start is not None and self.end else timedelta(seconds=0)
-        return self._duration
+        return timedelta(microseconds=self._get_duration_us())
+
+    @property
+    def duration_ms(self) -> int:
+        """Duration in milliseconds"""
+        return self._get_duration_us() // 1000
 
     @property
     def txt_duration(self) -> str:
@@ -150,7 +197,14 @@ class SubtitleLine:
     def translated(self) -> SubtitleLine|None:
         if self.translation is None:
             return None
-        return SubtitleLine.Construct(self.number, self.start, self.end, self.translation, self.metadata)
+
+        line = SubtitleLine()
+        line._index = self._index
+        line._start_us = self._start_us if self._start_us is not None else 0
+        line._end_us = self._end_us if self._end_us is not None else 0
+        line.text = self.translation
+        line._share_metadata(self)
+        return line
 
     @number.setter
     def number(self, value : int|str|None):
@@ -160,6 +214,11 @@ class SubtitleLine:
     def text(self, text : str|None):
         self.content = str(text).strip() if text else None
 
+    @metadata.setter
+    def metadata(self, metadata : dict[str, Any]|None):
+        self._metadata = metadata if metadata is not None else {}
+        self._metadata_owned = True
+
     @start.setter
     def start(self, time : timedelta|str):
         """Set the start time, handling string conversion."""
@@ -168,8 +227,8 @@ class SubtitleLine:
         if isinstance(new_time, Exception):
             raise SubtitleError(f"Invalid start time: {time}", error=new_time)
 
-        self._start = new_time
-        self._duration = None
+        self._start_us = _to_us(new_time)
+        self._duration_us = None
 
     @end.setter
     def end(self, time : timedelta|str):
@@ -179,8 +238,8 @@ class SubtitleLine:
         if isinstance(new_time, Exception):
             raise SubtitleError(f"Invalid end time: {time}", error=new_time)
 
-        self._end = new_time
-        self._duration = None
+        self._end_us = _to_us(new_time)
+        self._duration_us = None
 
     @duration.setter
     def duration(self, duration : timedelta|str):
@@ -189,14 +248,27 @@ class SubtitleLine:
         if isinstance(tdelta, Exception):
             raise SubtitleError(f"Invalid duration", error=tdelta)
 
-        self._duration = tdelta or timedelta(seconds=0)
-        if self._start is not None:
-            self._end = self._start + self._duration
+        self._duration_us = _to_us(tdelta) or 0
+        if self._start_us is not None:
+            self._end_us = self._start_us + self._duration_us
 
     @translated.setter
     def translated(self, translated : SubtitleLine|str|None):
         self.translation = SubtitleLine(translated).text if translated else None
 
+    def _get_duration_us(self) -> int:
+        if self._duration_us:
+            return self._duration_us
+        return self._end_us - self._start_us if self._start_us is not None and self._end_us else 0
+
+    def _share_metadata(self, line : SubtitleLine) -> None:
+        """
+        Share another line's metadata until either line accesses it
+        """
+        if line._metadata:
+            self._metadata = line._metadata
+            line._metadata_owned = False
+
     def _parse_from_string(self, line_str: str) -> None:
         """
         Parse subtitle line from basic SRT format string.
@@ -214,8 +286,8 @@ class SubtitleLine:
         except ValueError as e:
             raise SubtitleError(_("Invalid subtitle line index: {}").format(match.group('index')), error=e)
         
-        self._start = GetTimeDeltaSafe(match.group('start'))
-        self._end = GetTimeDeltaSafe(match.group('end'))
+        self._start_us = _to_us(GetTimeDeltaSafe(match.group('start')))
+        self._end_us = _to_us(GetTimeDeltaSafe(match.group('end')))
             
         self.content = match.group('content').strip()
 
@@ -235,8 +307,23 @@ class SubtitleLine:
         
         line = SubtitleLine()
         line.number = number
-        line.start = t_start or timedelta(seconds=0)
-        line.end = t_end or timedelta(seconds=0)
+        line._start_us = _to_us(t_start or timedelta(seconds=0))
+        line._end_us = _to_us(t_end or timedelta(seconds=0))
         line.text = legal_text
-        line.metadata = metadata or {}
+        if metadata:
+            line.metadata = metadata
+        return line
+
+    @classmethod
+    def ConstructFromMicroseconds(cls, number : int, start_us : int, end_us : int, text : str, metadata : dict[str,Any]|None = None) -> SubtitleLine:
+        """
+        Construct a line from times that are already in microseconds, e.g. when parsing a subtitle file
+        """
+        line = SubtitleLine()
+        line._index = number
+        line._start_us = start_us
+        line._end_us = end_us
+        line.text = text.strip()
+        if metadata:
+            line.metadata = metadata
         return line
@@ -2,20 +2,33 @@ import json
 import os
 import logging
 import threading
+from typing import Any, Callable
 
-from PySubtrans.Helpers import GetOutputPath
+from PySubtrans.Helpers import GetOutputPath, WriteFileAtomically
 from PySubtrans.Helpers.Localization import _
 from PySubtrans.Helpers.Parse import ParseKeyValuePairs, ParseNames
 from PySubtrans.Substitutions import Substitutions
 from PySubtrans.Options import Options
+from PySubtrans.ProjectJournal import ProjectJournal
+from PySubtrans.ProjectWriter import ProjectWriter
 from PySubtrans.SettingsType import SettingsType
 from PySubtrans.SubtitleEditor import SubtitleEditor
 from PySubtrans.SubtitleError import SubtitleError, TranslationAbortedError
 from PySubtrans.SubtitleFormatRegistry import SubtitleFormatRegistry
 from PySubtrans.Subtitles import Subtitles
 
+from PySubtrans.SubtitleBatch import SubtitleBatch
 from PySubtrans.SubtitleScene import SubtitleScene
-from PySubtrans.SubtitleSerialisation import SubtitleDecoder, SubtitleEncoder
+from PySubtrans.SubtitleSerialisation import (
+    SubtitleDecoder,
+    SubtitleEncoder,
+    EncodeProjectData,
+    IsCompressedProjectFile,
+    ReadProjectData,
+    SerialiseProject,
+    compressed_project_extension,
+    project_extension,
+)
 from PySubtrans.SubtitleTranslator import SubtitleTranslator
 from PySubtrans.TranslationEvents import TerminologyUpdate, TranslationEvents
 
@@ -46,7 +59,7 @@ class SubtitleProject:
         'format': None,
     })
    
-    def __init__(self, persistent : bool = False):
+    def __init__(self, persistent : bool = False, journaled : bool = False, compressed : bool = False, lazy_load : bool = False):
         """
         A subtitle translation project.
 
@@ -54,6 +67,9 @@ class SubtitleProject:
         or manually configured by assigning a SubtitleFile and updating settings if necessary.
 
         :param persistent: if True, the project will be saved to disk and automatically reloaded next time
+        :param journaled: if True, saves append changes to a journal instead of rewriting the whole project file
+        :param compressed: if True, new project files are saved in the compressed .subtransz format
+        :param lazy_load: if True, batch prompts and translation responses are decoded when they are first accessed
         """
         self.subtitles : Subtitles = Subtitles(settings=self.DEFAULT_PROJECT_SETTINGS)
         self.events = TranslationEvents()
@@ -62,9 +78,23 @@ class SubtitleProject:
         self.needs_writing : bool = False
         self.lock = threading.RLock()
 
+        # Serialises writes so that they reach the disk in the order they were prepared
+        self._write_lock = threading.RLock()
+        self.writer : ProjectWriter|None = None
+
         # By default the project is not persistent, i.e. it will not be saved to a file and automatically reloaded next time
         self.use_project_file : bool = persistent
 
+        # Journaled projects write a snapshot and then append changes to a journal file
+        self.journaled : bool = journaled
+        self.journal : ProjectJournal|None = None
+
+        # Compressed projects are written as gzipped JSON with a .subtransz extension
+        self.compressed : bool = compressed
+
+        # Lazily loaded projects skip decoding the parts of a batch that are not needed to display or resume it
+        self.lazy_load : bool = lazy_load
+
         # By default the translated subtitles will be written to file
         self.write_translation = True
 
@@ -228,8 +258,8 @@ class SubtitleProject:
             extension = SubtitleFormatRegistry.get_format_from_filename(path) if path else None
             extension = extension or '.srt'
 
-        if extension == ".subtrans":
-            raise SubtitleError("Cannot use .subtrans as output format")
+        if extension in (project_extension, compressed_project_extension):
+            raise SubtitleError("Cannot use {} as output format".format(extension))
 
         outputpath = GetOutputPath(path, self.target_language, extension)
         self.subtitles.outputpath = outputpath
@@ -252,7 +282,7 @@ class SubtitleProject:
         Write output file
         """
         try:
-            with self.lock:
+            with self._write_lock:
                 self.subtitles.SaveTranslation(outputpath)
 
         except Exception as e:
@@ -274,11 +304,18 @@ class SubtitleProject:
 
     def GetProjectFilepath(self, filepath : str) -> str:
         """
-        Calculate the project file path based on the source file path
+        Calculate the project file path based on the source file path.
+        An existing project in the other format is used in preference to creating a new one.
         """
         path, ext = os.path.splitext(filepath)
-        filepath = filepath if ext == '.subtrans' else f"{path}.subtrans"
-        return os.path.normpath(filepath)
+        if ext in (project_extension, compressed_project_extension):
+            return os.path.normpath(filepath)
+
+        preferred, alternative = (compressed_project_extension, project_extension) if self.compressed else (project_extension, compressed_project_extension)
+        if not os.path.exists(f"{path}{preferred}") and os.path.exists(f"{path}{alternative}"):
+            return os.path.normpath(f"{path}{alternative}")
+
+        return os.path.normpath(f"{path}{preferred}")
 
     def GetBackupFilepath(self, filepath : str) -> str:
         """
@@ -298,51 +335,145 @@ class SubtitleProject:
 
         return self.subtitles
 
-    def SaveProject(self):
+    def SaveProject(self, batches : list[SubtitleBatch]|None = None):
+        """
+        Save the project file or translation file as needed.
+        If batches are given, only changes to those batches are appended to the journal of a journaled project.
+        """
+        with self._write_lock:
+            with self.lock:
+                if not self.needs_writing:
+                    return
+
+                if batches is not None and not self.journaled:
+                    return
+
+                write_project = self._prepare_project_file(None, batches) if self.use_project_file and self.subtitles and self.subtitles.scenes else None
+
+                # A partial save leaves the project needing a full save later
+                save_translation = batches is None and self.any_translated and self.write_translation
+                if batches is None:
+                    self.needs_writing = False
+
+            self._write_project_file(write_project)
+
+            if save_translation:
+                self.SaveTranslation()
+
+    def RequestSave(self, batches : list[SubtitleBatch]|None = None) -> None:
         """
-        Save the project file or translation file as needed
+        Save the project in the background if a writer has been started, otherwise save it now
+        """
+        writer = self._get_writer()
+        if not writer or not writer.RequestSave(batches):
+            self.SaveProject(batches)
+
+    def RequestSaveTranslation(self, outputpath : str|None = None) -> None:
+        """
+        Write the translated subtitles in the background if a writer has been started, otherwise write them now
+        """
+        writer = self._get_writer()
+        if not writer or not writer.RequestSaveTranslation(outputpath):
+            self.SaveTranslation(outputpath)
+
+    def StartBackgroundWriter(self, save_delay : float = 1.0) -> ProjectWriter:
+        """
+        Save the project on a background thread, coalescing save requests made within save_delay seconds
         """
         with self.lock:
-            if self.needs_writing:
-                if self.use_project_file:
-                    self.UpdateProjectFile()
-                if self.any_translated and self.write_translation:
-                    self.SaveTranslation()
-                self.needs_writing = False
+            if not self.writer:
+                self.writer = ProjectWriter(self, save_delay)
+            return self.writer
+
+    def StopBackgroundWriter(self) -> None:
+        """
+        Complete any pending save and stop the background writer
+        """
+        with self.lock:
+            writer = self.writer
+            self.writer = None
+
+        if writer:
+            writer.Stop()
 
     def UpdateProjectFile(self) -> None:
         """
         Save the project file if it needs updating
         """
         with self.lock:
-            if self.needs_writing and self.subtitles and self.subtitles.scenes:
-                self.SaveProjectFile()
+            if not (self.needs_writing and self.subtitles and self.subtitles.scenes):
+                return
+
+        self.SaveProjectFile()
 
     def SaveProjectFile(self, projectfile : str|None = None) -> None:
         """
         Write a set of subtitles to a project file
         """
-        with self.lock:
-            if not self.subtitles:
-                raise Exception("Can't write project file, no subtitles")
+        with self._write_lock:
+            with self.lock:
+                write_project = self._prepare_project_file(projectfile)
+                self.needs_writing = False
+
+            self._write_project_file(write_project)
+
+    def _prepare_project_file(self, projectfile : str|None, batches : list[SubtitleBatch]|None = None) -> Callable[[], Any]|None:
+        """
+        Serialise the project for writing to a project file. Must be called with the project locked.
+        Journaled projects only check the given batches for changes, if specified.
+        The subtitles are serialised under their own lock, which the translator holds while it updates batches.
+        """
+        if not self.subtitles:
+            raise Exception("Can't write project file, no subtitles")
+
+        if not isinstance(self.subtitles, Subtitles):
+            raise Exception("Can't write project file, wrong content type")
+
+        if not self.subtitles.scenes:
+            raise Exception("Can't write project file, no scenes")
+
+        if not projectfile:
+            projectfile = self.projectfile
+        elif projectfile and not self.projectfile:
+            self.projectfile = self.GetProjectFilepath(projectfile)
 
-            if not isinstance(self.subtitles, Subtitles):
-                raise Exception("Can't write project file, wrong content type")
+        if not projectfile:
+            raise Exception("No file path provided")
 
-            if not self.subtitles.scenes:
-                raise Exception("Can't write project file, no scenes")
+        if self.journaled:
+            with self.subtitles.lock:
+                return self._get_journal(projectfile).PrepareSave(self.subtitles, SubtitleEncoder, batches=batches)
 
-            if not projectfile:
-                projectfile = self.projectfile
-            elif projectfile and not self.projectfile:
-                self.projectfile = self.GetProjectFilepath(projectfile)
+        projectfile = os.path.normpath(projectfile)
+        compressed = IsCompressedProjectFile(projectfile)
+        with self.subtitles.lock:
+            project_json = SerialiseProject(self.subtitles, SubtitleEncoder, compact=compressed)
+        project_data = EncodeProjectData(project_json, compressed)
+
+        # Any journal for the file no longer applies once it has been rewritten
+        journal = self.journal if self.journal and self.journal.projectfile == projectfile else None
 
-            if not projectfile:
-                raise Exception("No file path provided")
+        def write_project_file() -> None:
+            logging.info(_("Writing project data to {}").format(str(projectfile)))
+            WriteFileAtomically(projectfile, project_data, encoding=default_encoding)
+            if journal:
+                journal.Discard()
 
-            self.WriteProjectToFile(projectfile, encoder_class=SubtitleEncoder)
+        return write_project_file
 
-            self.needs_writing = False
+    def _write_project_file(self, write_project : Callable[[], Any]|None) -> None:
+        """
+        Write a prepared project file, marking the project as needing to be written again if it fails
+        """
+        if not write_project:
+            return
+
+        try:
+            write_project()
+
+        except Exception:
+            self.needs_writing = self.use_project_file
+            raise
 
     def SaveBackupFile(self) -> None:
         """
@@ -365,8 +496,12 @@ class SubtitleProject:
             with self.lock:
                 logging.info(_("Reading project data from {}").format(str(filepath)))
 
-                with open(filepath, 'r', encoding=default_encoding, newline='') as f:
-                    self.subtitles: Subtitles = json.load(f, cls=SubtitleDecoder)
+                project_json = ReadProjectData(filepath, default_encoding)
+
+                self.subtitles: Subtitles = json.loads(project_json, cls=SubtitleDecoder, lazy=self.lazy_load)
+
+                # Apply any changes that were saved to the journal since the project file was written
+                self._get_journal(filepath).Replay(self.subtitles, project_json, SubtitleDecoder)
 
                 with SubtitleEditor(self.subtitles) as editor:
                     editor.Sanitise()
@@ -392,7 +527,7 @@ class SubtitleProject:
 
     def WriteProjectToFile(self, projectfile: str, encoder_class: type|None = None) -> None:
         """
-        Save the project settings to a JSON file
+        Save the project settings to a JSON file, compressed if the file has a .subtransz extension
         """
         if encoder_class is None:
             raise ValueError("No encoder provided")
@@ -400,10 +535,38 @@ class SubtitleProject:
         projectfile = os.path.normpath(projectfile)
         logging.info(_("Writing project data to {}").format(str(projectfile)))
 
+        compressed = IsCompressedProjectFile(projectfile)
+        with self.lock, self.subtitles.lock:
+            project_json = SerialiseProject(self.subtitles, encoder_class, compact=compressed)
+
+        WriteFileAtomically(projectfile, EncodeProjectData(project_json, compressed), encoding=default_encoding)
+
+    def _get_writer(self) -> ProjectWriter|None:
+        """
+        Get the background writer, if one has been started
+        """
         with self.lock:
-            with open(projectfile, 'w', encoding=default_encoding) as f:
-                project_json = json.dumps(self.subtitles, cls=encoder_class, ensure_ascii=False, indent=4) # type: ignore
-                f.write(project_json)
+            return self.writer
+
+    def _get_journal(self, projectfile : str) -> ProjectJournal:
+        """
+        Get the journal for a project file
+        """
+        projectfile = os.path.normpath(projectfile)
+        if not self.journal or self.journal.projectfile != projectfile:
+            self.journal = ProjectJournal(projectfile)
+        return self.journal
+
+    def _journal_batch(self, batch : SubtitleBatch) -> None:
+        """
+        Append a translated batch to the project journal so that it is saved without waiting for the next autosave
+        """
+        try:
+            if self.projectfile:
+                self.RequestSave(batches=[batch])
+
+        except Exception as e:
+            logging.error(_("Unable to update project journal: {}").format(e))
 
     def TranslateSubtitles(self, translator : SubtitleTranslator) -> None:
         """
@@ -450,6 +613,10 @@ class SubtitleProject:
                 except Exception as e:
                     logging.error(_("Failed to save project file after translation: {}").format(str(e)))
 
+            writer = self._get_writer()
+            if writer:
+                writer.Flush()
+
             translator.events.preprocessed.disconnect(self._on_preprocessed)
             translator.events.batch_translated.disconnect(self._on_batch_translated)
             translator.events.scene_translated.disconnect(self._on_scene_translated)
@@ -552,11 +719,17 @@ class SubtitleProject:
     def _on_batch_translated(self, sender, batch) -> None:
         logging.debug("Batch translated")
         self.needs_writing = self.use_project_file
+        if self.use_project_file and self.journaled:
+            self._journal_batch(batch)
         self.events.batch_translated.send(self, batch=batch)
 
     def _on_scene_translated(self, sender, scene) -> None:
         logging.debug("Scene translated")
         self.needs_writing = self.use_project_file
+        writer = self._get_writer() if self.use_project_file else None
+        if writer:
+            # Journaled projects only need the scene summary, since each batch has already been journaled
+            writer.RequestSave(batches=[] if self.journaled else None)
         self.events.scene_translated.send(self, scene=scene)
 
     def UpdateTerminologyMap(self, update : TerminologyUpdate) -> None:
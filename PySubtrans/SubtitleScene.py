@@ -1,18 +1,27 @@
+from __future__ import annotations
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from PySubtrans.SubtitleBatch import SubtitleBatch
 from PySubtrans.Helpers.SubtitleHelpers import FindBestSplitIndex, ResyncTranslatedLines
 from PySubtrans.SubtitleLine import SubtitleLine
 
+if TYPE_CHECKING:
+    from PySubtrans.Subtitles import Subtitles
+
 class SubtitleScene:
     def __init__(self, dct : dict[str,Any]|None = None):
         dct = dct or {}
         self.number : int = dct.get('scene') or dct.get('number') or 0
         self.context : dict[str,Any] = dct.get('context', {})
-        self._batches : list[SubtitleBatch] = dct.get('batches', [])
         self.errors : list[str|Exception] = dct.get('errors', [])
 
+        # Totals of the batch translation counts, which are added to the totals of the subtitles that contain the scene
+        self._parent : Subtitles|None = None
+        self._batch_counts : tuple[int, ...] = (0, 0, 0, 0)
+        self._batches : list[SubtitleBatch] = []
+        self._set_batches(dct.get('batches', []))
+
     def __str__(self) -> str:
         return f"SubtitleScene {self.number} with {self.size} batches and {self.linecount} lines"
 
@@ -54,15 +63,25 @@ class SubtitleScene:
         """ Get the last line number in the last batch of the scene """
         return self.batches[-1].last_line_number if self.batches else None
 
+    @property
+    def translated_count(self) -> int:
+        """ Get the number of translated lines in all batches """
+        return self._batch_counts[0]
+
+    @property
+    def untranslated_count(self) -> int:
+        """ Get the number of original lines without a translated line in all batches """
+        return self._batch_counts[1]
+
     @property
     def all_translated(self) -> bool:
         """ Check if all batches in the scene are fully translated """
-        return all(batch.all_translated for batch in self.batches)
+        return self._batch_counts[2] == 0
 
     @property
     def any_translated(self) -> bool:
         """ Check if any batch in the scene has translations """
-        return any(batch.any_translated for batch in self.batches)
+        return self._batch_counts[3] > 0
 
     @property
     def summary(self) -> str|None:
@@ -78,9 +97,12 @@ class SubtitleScene:
         if not isinstance(value, list) or not all(isinstance(v, SubtitleBatch) for v in value):
             raise ValueError("Batches must be a list of SubtitleBatch")
 
-        self._batches = value
+        self._set_batches(value)
 
     def GetBatch(self, batch_number : int) -> SubtitleBatch|None:
+        if 0 < batch_number <= len(self.batches) and self.batches[batch_number - 1].number == batch_number:
+            return self.batches[batch_number - 1]
+
         for batch in self.batches:
             if batch.number == batch_number:
                 return batch
@@ -89,15 +111,32 @@ class SubtitleScene:
 
     def AddBatch(self, batch : SubtitleBatch):
         self._batches.append(batch)
+        batch._parent = self
+        batch._counts = batch._get_counts()
+        self._update_counts((0, 0, 0, 0), batch._counts)
 
     def AddNewBatch(self) -> SubtitleBatch:
         batch = SubtitleBatch({
             'scene': self.number,
             'number': len(self.batches) + 1
         })
-        self._batches.append(batch)
+        self.AddBatch(batch)
         return self._batches[-1]
 
+    def UpdateTranslationCounts(self):
+        """
+        Recalculate the translation totals from the batches, e.g. after their lines were edited directly
+        """
+        previous = self._get_counts()
+        totals = [0, 0, 0, 0]
+        for batch in self._batches:
+            batch._parent = self
+            batch._counts = batch._get_counts()
+            totals = [ total + count for total, count in zip(totals, batch._counts) ]
+
+        self._batch_counts = tuple(totals)
+        self._notify_parent(previous)
+
     def AddContext(self, key : str, value : str|dict[str,str]):
         if not self.context:
             self.context = {}
@@ -133,7 +172,7 @@ class SubtitleScene:
         """
         scenes = [ self ] + merged_scenes
         self.summary = "\n".join(scene.summary for scene in scenes if scene.summary)
-        self._batches = [ batch for scene in scenes for batch in scene.batches ]
+        self._set_batches([ batch for scene in scenes for batch in scene.batches ])
 
         self._renumber_batches()
 
@@ -166,7 +205,7 @@ class SubtitleScene:
         start_index = self._batches.index(batches[0])
         end_index = self._batches.index(batches[-1])
 
-        self._batches = self._batches[:start_index] + [merged_batch] + self._batches[end_index+1:]
+        self._set_batches(self._batches[:start_index] + [merged_batch] + self._batches[end_index+1:])
 
         self._renumber_batches()
 
@@ -210,7 +249,7 @@ class SubtitleScene:
                 batch.translated = []
 
         batch_index = self._batches.index(batch)
-        self._batches = self._batches[:batch_index + 1] + [new_batch] + self._batches[batch_index + 1:]
+        self._set_batches(self._batches[:batch_index + 1] + [new_batch] + self._batches[batch_index + 1:])
 
         self._renumber_batches()
 
@@ -234,6 +273,31 @@ class SubtitleScene:
         for number, batch in enumerate(self._batches, start = 1):
             batch.number = number
 
+    def _set_batches(self, batches : list[SubtitleBatch]):
+        """ Replace the batches in the scene and recalculate the translation totals """
+        for batch in self._batches:
+            if batch._parent is self:
+                batch._parent = None
+
+        self._batches = batches
+        self.UpdateTranslationCounts()
+
+    def _get_counts(self) -> tuple[int, ...]:
+        """ Count translated and untranslated lines, and whether the scene is incomplete or has any translations """
+        return (self.translated_count, self.untranslated_count, int(not self.all_translated), int(self.any_translated))
+
+    def _update_counts(self, previous : tuple[int, ...], current : tuple[int, ...]):
+        """ Apply a change in the counts of a batch to the scene totals """
+        scene_previous = self._get_counts()
+        self._batch_counts = tuple(total + new - old for total, old, new in zip(self._batch_counts, previous, current))
+        self._notify_parent(scene_previous)
+
+    def _notify_parent(self, previous : tuple[int, ...]):
+        """ Pass a change in the scene counts on to the subtitles that contain it """
+        current = self._get_counts()
+        if self._parent is not None and current != previous:
+            self._parent._update_counts(previous, current)
+
 
 def UnbatchScenes(scenes : list[SubtitleScene]) -> tuple[list[SubtitleLine], list[SubtitleLine], list[SubtitleLine]]:
     """
@@ -1,4 +1,10 @@
+from collections import Counter
+import gzip
+from functools import partial
+import hashlib
 import json
+import os
+from typing import Any
 
 from PySubtrans.Helpers.Color import Color
 from PySubtrans.SettingsType import SettingsType
@@ -10,6 +16,15 @@ from PySubtrans.SubtitleScene import SubtitleScene
 from PySubtrans.Translation import Translation
 from PySubtrans.TranslationPrompt import TranslationPrompt
 
+project_extension = '.subtrans'
+compressed_project_extension = '.subtransz'
+
+# Compressed project files are gzipped JSON, identified by the gzip header
+_gzip_magic = b'\x1f\x8b'
+
+# Message contents at least this long that are repeated across batches are stored once per project
+_min_blob_length = 256
+
 # Serialisation helpers
 def classname(obj):
     if isinstance(obj, type):
@@ -18,6 +33,11 @@ def classname(obj):
 
 # Convert our custom types to JSON
 class SubtitleEncoder(json.JSONEncoder):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Maps repeated prompt message contents to their key in the project's blob table
+        self._blob_keys : dict[str, str] = {}
+
     def default(self, o):
         if isinstance(o, TranslationError):
             # Don't bother trying to serialise all the error types (why not?)
@@ -40,6 +60,8 @@ class SubtitleEncoder(json.JSONEncoder):
             return None
 
         if isinstance(obj, Subtitles):
+            blobs = _build_blob_table(obj)
+            self._blob_keys = { content: key for key, content in blobs.items() }
             return {
                 "sourcepath": obj.sourcepath,
                 "outputpath": obj.outputpath,
@@ -48,6 +70,7 @@ class SubtitleEncoder(json.JSONEncoder):
                 "metadata": getattr(obj, 'metadata', {}),
                 "terminology_map": obj.terminology_map,
                 "format": obj.file_format,
+                "blobs": blobs or None,
                 "scenes": obj.scenes,
             }
         elif isinstance(obj, SubtitleScene):
@@ -77,7 +100,7 @@ class SubtitleEncoder(json.JSONEncoder):
                     "history": obj.context.get('history') or obj.context.get('summaries')
                 },
                 "translation": obj.translation,
-                "prompt": obj.prompt
+                "prompt": self._serialise_lazy_prompt(obj) or obj.prompt
             }
         elif isinstance(obj, SubtitleLine):
             return {
@@ -85,7 +108,7 @@ class SubtitleEncoder(json.JSONEncoder):
                 "start": obj.start.total_seconds() if obj.start else None,
                 "end": obj.end.total_seconds() if obj.end else None,
                 "content": obj.content,
-                "metadata": getattr(obj, 'metadata'),
+                "metadata": obj._metadata,
                 "translation": getattr(obj, 'translation'),
                 "original": getattr(obj, 'original')
             }
@@ -94,14 +117,7 @@ class SubtitleEncoder(json.JSONEncoder):
                 "content": obj.content
             }
         elif isinstance(obj, TranslationPrompt):
-            return {
-                "user_prompt": obj.user_prompt,
-                "batch_prompt": obj.batch_prompt,
-                "messages": obj.messages,
-                "supports_system_messages": obj.supports_system_messages,
-                "supports_system_prompt": obj.supports_system_prompt,
-                "conversation": obj.conversation,
-            }
+            return self._serialise_prompt(vars(obj), obj.messages)
         elif isinstance(obj, Color):
             return { "hex": obj.to_hex() }
         elif hasattr(obj, "name"):
@@ -109,15 +125,84 @@ class SubtitleEncoder(json.JSONEncoder):
 
         return super().default(obj)
 
+    def _serialise_prompt(self, values : dict[str, Any], messages : list[dict[str, str]]) -> dict[str, Any]:
+        return {
+            "user_prompt": values.get('user_prompt'),
+            "batch_prompt": values.get('batch_prompt'),
+            "messages": self._intern_messages(messages),
+            "supports_system_messages": values.get('supports_system_messages'),
+            "supports_system_prompt": values.get('supports_system_prompt'),
+            "conversation": values.get('conversation'),
+        }
+
+    def _serialise_lazy_prompt(self, batch : SubtitleBatch) -> dict[str, Any]|None:
+        """
+        Serialise a batch prompt that has not been decoded since the project was lazily loaded, without decoding it
+        """
+        lazy_prompt = _get_lazy_prompt(batch)
+        if lazy_prompt is None:
+            return None
+
+        dct, messages = lazy_prompt
+        properties = self._serialise_prompt(dct, messages)
+        return { "_class": _prompt_class, **{k: v for k, v in properties.items() if v is not None} }
+
+    def _intern_messages(self, messages : list[dict[str, str]]) -> list[dict[str, str]]:
+        """
+        Replace message contents that are in the blob table with a reference to the blob
+        """
+        if not self._blob_keys or not messages:
+            return messages
+
+        interned = []
+        for message in messages:
+            key = self._blob_keys.get(message.get('content')) if isinstance(message.get('content'), str) else None
+            if key:
+                message = { k: v for k, v in message.items() if k != 'content' }
+                message['blob'] = key
+            interned.append(message)
+        return interned
+
 class SubtitleDecoder(json.JSONDecoder):
-    def __init__(self, *args, **kwargs):
-        super().__init__(object_hook=_object_hook, *args, **kwargs)
+    """
+    Reconstructs subtitles from project JSON.
+
+    In lazy mode batch prompts and translations are left undecoded until they are first accessed,
+    since they are not needed to display or resume a project.
+    """
+    def __init__(self, *args, lazy : bool = False, **kwargs):
+        super().__init__(object_hook=self._lazy_object_hook if lazy else _object_hook, *args, **kwargs)
+
+        # Filled in when the project is decoded, before any deferred prompt can be accessed
+        self._blobs : dict[str, str] = {}
+
+    def _lazy_object_hook(self, dct):
+        class_name = dct.get('_class')
+        if class_name in _translation_classes:
+            del dct['_class']
+            return partial(_decode_translation, dct)
+        elif class_name == _prompt_class:
+            del dct['_class']
+            return partial(_decode_prompt, dct, self._blobs)
+        elif class_name in _subtitles_classes:
+            self._blobs.update(dct.pop('blobs', None) or {})
+
+        return _object_hook(dct)
+
+_subtitles_classes = { classname(Subtitles), "SubtitleFile" }     # Backward compatibility
+_scene_class = classname(SubtitleScene)
+_batch_class = classname(SubtitleBatch)
+_line_classes = { classname(SubtitleLine), "Subtitle" }           # TEMP backward compatibility
+_translation_classes = { classname(Translation), "GPTTranslation" }
+_prompt_class = classname(TranslationPrompt)
+_color_class = classname(Color)
+_error_class = classname(TranslationError)
 
 def _object_hook(dct):
     # Reconstruct our custom types from JSON
     if '_class' in dct:
         class_name = dct.pop('_class')
-        if class_name in {classname(Subtitles), "SubtitleFile"}:      # Backward compatibility
+        if class_name in _subtitles_classes:
             sourcepath = dct.get('sourcepath')
             outpath = dct.get('outputpath') or dct.get('filename')
             obj = Subtitles(sourcepath, outpath)
@@ -127,50 +212,145 @@ def _object_hook(dct):
             terminology = dct.get('terminology_map', {})
             obj.terminology_map = {str(k): str(v) for k, v in terminology.items()} if isinstance(terminology, dict) else {}
             obj.scenes = dct.get('scenes', [])
+            blobs = dct.get('blobs')
+            if blobs:
+                _expand_blobs(obj.scenes, blobs)
             return obj
-        elif class_name == classname(SubtitleScene):
+        elif class_name == _scene_class:
             obj = SubtitleScene(dct)
             return obj
-        elif class_name == classname(SubtitleBatch):
+        elif class_name == _batch_class:
             obj = SubtitleBatch(dct)
             return obj
-        elif class_name == classname(SubtitleLine) or class_name == "Subtitle": # TEMP backward compatibility
+        elif class_name in _line_classes:
             return SubtitleLine(dct)
-        elif class_name == classname(Translation) or class_name == "GPTTranslation":
-            content = dct.get('content') or {
-                'text' : dct.get('text'),
-                'finish_reason' : dct.get('finish_reason'),
-                'response_time' : dct.get('response_time'),
-                'prompt_tokens' : dct.get('prompt_tokens'),
-                'output_tokens' : dct.get('completion_tokens'),
-                'reasoning_tokens' : dct.get('reasoning_tokens'),
-                'accepted_prediction_tokens' : dct.get('accepted_prediction_tokens'),
-                'rejected_prediction_tokens' : dct.get('rejected_prediction_tokens'),
-                'total_tokens' : dct.get('total_tokens'),
-                'summary': dct.get('summary'),
-                'scene': dct.get('scene'),
-                'synopsis': dct.get('synopsis'),
-                'names': dct.get('names') or dct.get('characters')
-                }
-
-            if isinstance(content['text'], list):
-                # This shouldn't happen, but try to recover if it does
-                content['text'] = '\n'.join(content['text'])
-
-            obj = Translation(content)
-            return obj
-        elif class_name == classname(TranslationPrompt):
-            user_prompt = dct.get('user_prompt')
-            conversation = dct.get('conversation')
-            obj = TranslationPrompt(user_prompt, conversation)
-            obj.supports_system_messages = dct.get('supports_system_messages')
-            obj.supports_system_prompt = dct.get('supports_system_prompt')
-            obj.batch_prompt = dct.get('batch_prompt')
-            obj.messages = dct.get('messages')
-            return obj
-        elif class_name == classname(Color):
+        elif class_name in _translation_classes:
+            return _decode_translation(dct)
+        elif class_name == _prompt_class:
+            return _decode_prompt(dct)
+        elif class_name == _color_class:
             return Color.from_hex(dct.get('hex', '#00000000'))
-        elif class_name == classname(TranslationError):
+        elif class_name == _error_class:
             return TranslationError(dct.get('message'))
 
     return dct
+
+def _decode_translation(dct : dict[str, Any]) -> Translation:
+    content = dct.get('content') or {
+        'text' : dct.get('text'),
+        'finish_reason' : dct.get('finish_reason'),
+        'response_time' : dct.get('response_time'),
+        'prompt_tokens' : dct.get('prompt_tokens'),
+        'output_tokens' : dct.get('completion_tokens'),
+        'reasoning_tokens' : dct.get('reasoning_tokens'),
+        'accepted_prediction_tokens' : dct.get('accepted_prediction_tokens'),
+        'rejected_prediction_tokens' : dct.get('rejected_prediction_tokens'),
+        'total_tokens' : dct.get('total_tokens'),
+        'summary': dct.get('summary'),
+        'scene': dct.get('scene'),
+        'synopsis': dct.get('synopsis'),
+        'names': dct.get('names') or dct.get('characters')
+        }
+
+    if isinstance(content['text'], list):
+        # This shouldn't happen, but try to recover if it does
+        content['text'] = '\n'.join(content['text'])
+
+    return Translation(content)
+
+def _decode_prompt(dct : dict[str, Any], blobs : dict[str, str]|None = None) -> TranslationPrompt:
+    user_prompt = dct.get('user_prompt')
+    conversation = dct.get('conversation')
+    obj = TranslationPrompt(user_prompt, conversation)
+    obj.supports_system_messages = dct.get('supports_system_messages')
+    obj.supports_system_prompt = dct.get('supports_system_prompt')
+    obj.batch_prompt = dct.get('batch_prompt')
+    obj.messages = dct.get('messages')
+    if blobs and obj.messages:
+        _expand_messages(obj.messages, blobs)
+    return obj
+
+def _build_blob_table(subtitles : Subtitles) -> dict[str, str]:
+    """
+    Find long prompt message contents (usually the instructions) that are repeated across batches
+    """
+    counts = Counter(message.get('content')
+                     for scene in subtitles.scenes for batch in scene.batches
+                     for message in _get_prompt_messages(batch)
+                     if isinstance(message.get('content'), str) and len(message['content']) >= _min_blob_length)
+
+    repeated = [ content for content, count in counts.items() if count > 1 ]
+    return { hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]: content for content in repeated }
+
+def _get_lazy_prompt(batch : SubtitleBatch) -> tuple[dict[str, Any], list[dict[str, str]]]|None:
+    """
+    Get the undecoded data and messages of a batch prompt that was lazily loaded, restoring message contents from the blob table
+    """
+    prompt = batch._prompt
+    if not isinstance(prompt, partial) or prompt.func is not _decode_prompt:
+        return None
+
+    dct, blobs = prompt.args
+    messages = [ { **{ k: v for k, v in message.items() if k != 'blob' }, 'content': blobs.get(message['blob'], '') } if 'blob' in message else message
+                 for message in dct.get('messages') or [] ]
+    return dct, messages
+
+def _get_prompt_messages(batch : SubtitleBatch) -> list[dict[str, str]]:
+    """
+    Get the messages of a batch prompt, without decoding it if it was lazily loaded
+    """
+    lazy_prompt = _get_lazy_prompt(batch)
+    if lazy_prompt is not None:
+        return lazy_prompt[1]
+
+    return batch.prompt.messages if batch.prompt else []
+
+def _expand_blobs(scenes : list[SubtitleScene], blobs : dict[str, str]) -> None:
+    """
+    Restore prompt message contents that were stored in the blob table, sharing one copy of each
+    """
+    for scene in scenes:
+        for batch in scene.batches:
+            if batch.prompt and batch.prompt.messages:
+                _expand_messages(batch.prompt.messages, blobs)
+
+def _expand_messages(messages : list[dict[str, str]], blobs : dict[str, str]) -> None:
+    for message in messages:
+        if 'blob' in message:
+            message['content'] = blobs.get(message.pop('blob'), '')
+
+def IsCompressedProjectFile(filepath : str) -> bool:
+    """
+    Check whether a project file (or a backup of one) should be written in the compressed format
+    """
+    return os.path.splitext(filepath)[1].startswith(compressed_project_extension)
+
+def SerialiseProject(subtitles : Subtitles, encoder_class : type = SubtitleEncoder, compact : bool = False) -> str:
+    """
+    Serialise subtitles to project JSON, indented for readability unless compact is requested
+    """
+    if compact:
+        return json.dumps(subtitles, cls=encoder_class, ensure_ascii=False, separators=(',', ':'))
+
+    return json.dumps(subtitles, cls=encoder_class, ensure_ascii=False, indent=4)
+
+def EncodeProjectData(project_json : str, compressed : bool) -> str|bytes:
+    """
+    Prepare project JSON for writing to disk, compressing it if required
+    """
+    if compressed:
+        return gzip.compress(project_json.encode('utf-8'), compresslevel=6, mtime=0)
+
+    return project_json
+
+def ReadProjectData(filepath : str, encoding : str = 'utf-8') -> str:
+    """
+    Read the JSON from a project file, decompressing it if it is in the compressed format
+    """
+    with open(filepath, 'rb') as f:
+        data = f.read()
+
+    if data.startswith(_gzip_magic):
+        return gzip.decompress(data).decode('utf-8')
+
+    return data.decode(encoding)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+from array import array
+from datetime import timedelta
+import operator
+
+from PySubtrans.SubtitleLine import SubtitleLine
+
+class SubtitleTimings:
+    """
+    Columnar view of the start and end times of a sequence of lines, as integer microseconds.
+
+    Gaps between lines are computed once for the whole sequence, so scene detection and batch
+    splitting can work on index ranges without repeated timedelta arithmetic.
+    """
+    def __init__(self, starts : array|None = None, ends : array|None = None):
+        self.starts : array = starts if starts is not None else array('q')
+        self.ends : array = ends if ends is not None else array('q')
+        self._gaps : array|None = None
+
+    @classmethod
+    def FromLines(cls, lines : list[SubtitleLine]) -> SubtitleTimings:
+        """
+        Build the timing arrays for a list of lines
+        """
+        return cls(array('q', [ line.start_us for line in lines ]), array('q', [ line.end_us for line in lines ]))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def gaps(self) -> array:
+        """
+        Gap before each line, measured from the end of the previous line (zero for the first line)
+        """
+        if self._gaps is None:
+            if not self.starts:
+                self._gaps = array('q')
+            else:
+                self._gaps = array('q', [0]) + array('q', map(operator.sub, self.starts[1:], self.ends))
+        return self._gaps
+
+    def FixOverlaps(self, lines : list[SubtitleLine], separation : timedelta) -> int:
+        """
+        Move the start of any line that overlaps the previous line to just after it ends.
+        Returns the number of lines that were adjusted.
+        """
+        starts, ends = self.starts, self.ends
+        separation_us = separation // timedelta(microseconds=1)
+
+        overlapping = [ index for index, (start, previous_end) in enumerate(zip(starts[1:], ends), start=1) if previous_end and start < previous_end ]
+
+        for index in overlapping:
+            starts[index] = ends[index - 1] + separation_us
+            lines[index].start = timedelta(microseconds=starts[index])
+
+        if overlapping:
+            self._gaps = None
+
+        return len(overlapping)
+
+    def FindSceneBreaks(self, threshold : timedelta) -> list[int]:
+        """
+        Indices of lines that follow a gap longer than the threshold
+        """
+        threshold_us = threshold // timedelta(microseconds=1)
+        return [ index for index, gap in enumerate(self.gaps[1:], start=1) if gap > threshold_us ]
+
+    def FindLongestGap(self, first : int, last : int) -> int:
+        """
+        Index of the first line in [first, last) with the longest positive gap before it, or first if there is none
+        """
+        if last <= first:
+            return first
+
+        gaps = self.gaps[first:last]
+        longest = max(gaps)
+        return first + gaps.index(longest) if longest > 0 else first
+
+    def Slice(self, first : int, last : int) -> SubtitleTimings:
+        """
+        Timings for a contiguous range of lines
+        """
+        return SubtitleTimings(self.starts[first:last], self.ends[first:last])
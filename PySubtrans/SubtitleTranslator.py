@@ -1,11 +1,16 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
 from os import linesep
 import logging
 import threading
 from typing import Any
 
-from PySubtrans.Helpers.ContextHelpers import GetBatchContext
+from blinker import Signal
+
+from PySubtrans.Helpers.ContextHelpers import GetBatchContext, SummaryHistory
 from PySubtrans.Helpers.Parse import FormatKeyValuePairs
-from PySubtrans.Helpers.SubtitleHelpers import FindBestSplitIndex, MergeTranslations
+from PySubtrans.Helpers.SubtitleHelpers import FindBestSplitIndex
 from PySubtrans.Helpers.Localization import _
 from PySubtrans.Helpers.Text import CompressWhitespace, Linearise, SanitiseSummary
 from PySubtrans.Instructions import DEFAULT_TASK_TYPE, Instructions
@@ -15,7 +20,7 @@ from PySubtrans.SubtitleProcessor import SubtitleProcessor
 from PySubtrans.SubtitleValidator import SubtitleValidator
 from PySubtrans.Translation import Translation
 from PySubtrans.TranslationClient import TranslationClient
-from PySubtrans.TranslationParser import TranslationParser
+from PySubtrans.TranslationParser import StreamingTranslationParser, TranslationParser
 from PySubtrans.Options import Options, SettingsType
 from PySubtrans.SubtitleBatch import SubtitleBatch
 
@@ -24,10 +29,16 @@ from PySubtrans.Helpers import FormatErrorMessages
 from PySubtrans.Subtitles import Subtitles
 from PySubtrans.SubtitleScene import SubtitleScene, UnbatchScenes
 from PySubtrans.TranslationEvents import TerminologyUpdate, TranslationEvents
+from PySubtrans.TranslationMemory import GetTranslationMemory, TranslationMemory, default_memory_path
 from PySubtrans.TranslationPrompt import TranslationPrompt
 from PySubtrans.TranslationProvider import TranslationProvider
 from PySubtrans.TranslationRequest import StreamingCallback
 
+DeferredEvents = list[tuple[Signal, dict[str,Any]]]
+
+# Events raised by scene workers are collected here so they can be replayed in scene order
+_deferred_events : ContextVar[DeferredEvents|None] = ContextVar('deferred_events', default=None)
+
 class SubtitleTranslator:
     """
     Processes subtitles into scenes and batches and sends them for translation
@@ -42,8 +53,13 @@ class SubtitleTranslator:
         self.aborted : bool = False
         self.errors : list[str|SubtitleError] = []
         self.lines_processed : int = 0
+        self.history : SummaryHistory|None = None
+
+        # Batches are updated under the lock of the subtitles being translated, so they are never saved half-updated
+        self.subtitles_lock = threading.RLock()
 
         self.max_lines = settings.get_int('max_lines')
+        self.max_threads = settings.get_int('max_threads') or 1
         self.max_history = settings.get_int('max_context_summaries')
         self.stop_on_error = settings.get_bool('stop_on_error')
         self.retry_on_error = settings.get_bool('retry_on_error')
@@ -96,9 +112,27 @@ class SubtitleTranslator:
 
         self.client.SetEvents(self.events)
 
+        self.multithreaded : bool = settings.get_bool('multithreaded_translation') and self.max_threads > 1 and self.translation_provider.allow_multithreaded_translation
+
         self.postprocessor = SubtitleProcessor(settings) if settings.get('postprocess_translation') else None
         self.validator = SubtitleValidator(settings)
 
+        self.translation_memory : TranslationMemory|None = None
+        if settings.get_bool('translation_memory'):
+            self.translation_memory = GetTranslationMemory(settings.get_str('translation_memory_path') or default_memory_path)
+
+        self.memory_hints : int = settings.get_int('translation_memory_hints') or 0
+        self.memory_threshold : float = settings.get_float('translation_memory_threshold') or 0.0
+        self.source_language : str = settings.get_str('source_language') or ''
+        self.target_language : str = settings.get_str('target_language') or ''
+        self.lines_reused : int = 0
+
+        # Lines in each batch that were filled in from the translation memory rather than sent to the translator
+        self.memory_lines : dict[tuple[int, int], set[int]] = {}
+
+        # Lines included in the prompt for each batch that would be sent to the translator, so that previews can be estimated
+        self.prompt_lines : dict[tuple[int, int], list[SubtitleLine]] = {}
+
     def StopTranslating(self):
         self.aborted = True
         self.client.AbortTranslation()
@@ -107,6 +141,29 @@ class SubtitleTranslator:
         """
         Translate a SubtitleFile
         """
+        self._begin_translation(subtitles)
+
+        if self.multithreaded:
+            self._translate_scenes_concurrently(subtitles)
+        else:
+            self._translate_scenes_sequentially(subtitles)
+
+        self._finish_translation(subtitles)
+
+    async def TranslateSubtitlesAsync(self, subtitles : Subtitles, max_concurrency : int|None = None):
+        """
+        Translate a SubtitleFile on the running event loop, translating up to max_concurrency scenes at once
+        """
+        self._begin_translation(subtitles)
+
+        await self._translate_scenes_async(subtitles, max_concurrency or self.max_threads)
+
+        self._finish_translation(subtitles)
+
+    def _begin_translation(self, subtitles : Subtitles):
+        """
+        Check that the subtitles can be translated and notify observers
+        """
         if not subtitles:
             raise TranslationImpossibleError(_("No subtitles to translate"))
 
@@ -116,30 +173,26 @@ class SubtitleTranslator:
         if not subtitles.scenes:
             raise TranslationImpossibleError(_("Subtitles must be batched before translation"))
 
-        self._emit_info(_("Translating {linecount} lines in {scenecount} scenes").format(linecount=subtitles.linecount, scenecount=subtitles.scenecount))
-
-        self.events.preprocessed.send(self, scenes=subtitles.scenes)
+        self.subtitles_lock = subtitles.lock
 
-        # Iterate over each subtitle scene and request translation
-        for scene in subtitles.scenes:
-            if self.aborted:
-                break
+        with self.lock:
+            self.prompt_lines.clear()
 
-            if self.max_lines and self.lines_processed >= self.max_lines:
-                break
+        self._emit_info(_("Translating {linecount} lines in {scenecount} scenes").format(linecount=subtitles.linecount, scenecount=subtitles.scenecount))
 
-            if self.resume and scene.all_translated:
-                self._emit_info(_("Scene {scene} already translated {linecount} lines...").format(scene=scene.number, linecount=scene.linecount))
-                continue
+        # Index the summaries once, then keep the index up to date as batches and scenes are translated
+        self.history = SummaryHistory(subtitles)
 
-            logging.debug(f"Translating scene {scene.number} of {subtitles.scenecount}")
-            batch_numbers =[ batch.number for batch in scene.batches if not batch.translated ] if self.resume else None
+        self.events.preprocessed.send(self, scenes=subtitles.scenes)
 
-            self.TranslateScene(subtitles, scene, batch_numbers=batch_numbers)
+    def _finish_translation(self, subtitles : Subtitles):
+        """
+        Report the outcome of the translation and update the subtitles with the results
+        """
+        self.history = None
 
-            if self.errors and self.stop_on_error:
-                self._emit_error(_("Failed to translate scene {scene}... stopping translation").format(scene=scene.number))
-                return
+        if self.errors and self.stop_on_error:
+            return
 
         if self.aborted:
             self._emit_info(_("Translation aborted"))
@@ -151,6 +204,9 @@ class SubtitleTranslator:
         if translations:
             self._emit_info(_("Successfully translated {count} lines!").format(count=len(translations)))
 
+        if self.lines_reused:
+            self._emit_info(_("Reused {count} lines from the translation memory").format(count=self.lines_reused))
+
         if untranslated and not self.max_lines and not self.preview:
             logging.warning(_("Failed to translate {count} lines:").format(count=len(untranslated)))
             for line in untranslated:
@@ -163,20 +219,17 @@ class SubtitleTranslator:
         """
         Send a scene for translation
         """
+        self.subtitles_lock = subtitles.lock
         try:
             batches = [ batch for batch in scene.batches if batch.number in batch_numbers ] if batch_numbers else scene.batches
+            history = self.history or SummaryHistory(subtitles)
             context = {}
 
             for batch in batches:
-                context = GetBatchContext(subtitles, scene.number, batch.number, self.max_history)
-
-                with self.lock:
-                    terminology_snapshot = dict(self.terminology_map) if self.terminology_map else None
+                if self._reached_max_lines():
+                    break
 
-                if terminology_snapshot:
-                    formatted = FormatKeyValuePairs(terminology_snapshot)
-                    context['terminology'] = formatted
-                    batch.AddContext('terminology', formatted)
+                context = self._get_batch_context(subtitles, scene, batch, history)
 
                 try:
                     self.TranslateBatch(batch, line_numbers, context)
@@ -194,67 +247,75 @@ class SubtitleTranslator:
                 if self.aborted:
                     return
 
-                # Notify observers the batch was translated
-                self.events.batch_translated.send(self, batch=batch)
-
-                if self.build_terminology_map:
-                    self._update_terminology_map(batch)
-
-                if batch.errors:
-                    self._emit_warning(_("Errors encountered translating scene {scene} batch {batch}").format(scene=batch.scene, batch=batch.number))
-                    scene.errors.extend(batch.errors)
-                    self.errors.extend(batch.errors)
+                history.UpdateBatch(batch)
+                self._complete_batch(scene, batch)
 
                 if batch.errors and self.stop_on_error:
                     return
 
-                if self.max_lines and self.lines_processed >= self.max_lines:
+                if self._reached_max_lines():
                     self._emit_info(_("Reached max_lines limit of ({lines} lines)... finishing").format(lines=self.max_lines))
                     break
 
-            # Update the scene summary based on the best available information (we hope)
-            scene.summary = self._get_best_summary([scene.summary, context.get('scene'), context.get('summary')])
-
-            # Notify observers the scene was translated
-            self.events.scene_translated.send(self, scene=scene)
+            self._complete_scene(scene, context)
+            history.UpdateScene(scene)
 
         except (TranslationAbortedError, TranslationImpossibleError) as e:
             raise
 
-    def TranslateBatch(self, batch : SubtitleBatch, line_numbers : list[int]|None, context : dict[str,Any]|None):
+    async def TranslateSceneAsync(self, subtitles : Subtitles, scene : SubtitleScene, batch_numbers = None, line_numbers = None):
         """
-        Send batches of subtitles for translation, building up context.
+        Send a scene for translation without blocking the event loop
         """
-        if self.aborted:
-            return
+        self.subtitles_lock = subtitles.lock
+        batches = [ batch for batch in scene.batches if batch.number in batch_numbers ] if batch_numbers else scene.batches
+        history = self.history or SummaryHistory(subtitles)
+        context = {}
 
-        if self.reparse and batch.translation:
-            self._emit_info(_("Reparsing scene {scene} batch {batch} with {count} lines...").format(scene=batch.scene, batch=batch.number, count=len(batch.originals)))
-            self.ProcessBatchTranslation(batch, batch.translation, line_numbers)
-            return
+        for batch in batches:
+            if self._reached_max_lines():
+                break
 
-        if self.resume and not self.retranslate and batch.all_translated:
-            self._emit_info(_("Scene {scene} batch {batch} already translated {lines} lines...").format(scene=batch.scene, batch=batch.number, lines=batch.size))
-            return
+            context = self._get_batch_context(subtitles, scene, batch, history)
 
-        originals, context = self.PreprocessBatch(batch, context)
+            try:
+                await self.TranslateBatchAsync(batch, line_numbers, context)
 
-        logging.debug(f"Translating scene {batch.scene} batch {batch.number} with {len(originals)} lines...")
+            except TranslationImpossibleError as e:
+                if batch.any_translated:
+                    self.validator.ValidateBatch(batch)
+                raise
 
-        # Build summaries context
-        context['batch'] = f"Scene {batch.scene} batch {batch.number}"
-        if batch.summary:
-            context['summary'] = batch.summary
+            except TranslationError as e:
+                self._emit_warning(_("Error translating scene {scene} batch {batch}: {error}").format(scene=batch.scene, batch=batch.number, error=str(e)))
+                batch.errors.append(e)
 
-        instructions = self.system_instructions
-        if not instructions:
-            raise TranslationImpossibleError(_("No instructions provided for translation"))
+            if self.aborted:
+                return
 
-        batch.prompt = self.client.BuildTranslationPrompt(self.user_prompt, instructions, originals, context)
+            history.UpdateBatch(batch)
+            self._complete_batch(scene, batch)
 
-        if self.preview:
+            if batch.errors and self.stop_on_error:
+                return
+
+            if self._reached_max_lines():
+                self._emit_info(_("Reached max_lines limit of ({lines} lines)... finishing").format(lines=self.max_lines))
+                break
+
+        self._complete_scene(scene, context)
+        history.UpdateScene(scene)
+
+    def TranslateBatch(self, batch : SubtitleBatch, line_numbers : list[int]|None, context : dict[str,Any]|None):
+        """
+        Send batches of subtitles for translation, building up context.
+        """
+        prepared = self._prepare_batch(batch, line_numbers, context)
+        if not prepared or not batch.prompt:
             return
 
+        instructions, context = prepared
+
         # Ask the client to do the translation
         streaming_callback = self._create_streaming_callback(batch, line_numbers) if self.client.enable_streaming else None
         translation : Translation|None = self.client.RequestTranslation(batch.prompt, streaming_callback=streaming_callback)
@@ -274,7 +335,7 @@ class SubtitleTranslator:
             # If no split was performed, retry without context when the token limit was reached with errors
             if not split_performed and batch.errors and translation.reached_token_limit:
                 logging.warning(_("Hit API token limit with errors, retrying batch without context..."))
-                batch.prompt.GenerateMessages(instructions, batch.originals, {})
+                batch.prompt.GenerateMessages(instructions, self._get_lines_to_translate(batch), {})
                 translation = self.client.RequestTranslation(batch.prompt, streaming_callback=streaming_callback)
                 if translation and not self.aborted:
                     self.ProcessBatchTranslation(batch, translation, line_numbers)
@@ -284,13 +345,45 @@ class SubtitleTranslator:
                 logging.warning(_("Scene {scene} batch {batch} failed validation, requesting retranslation").format(scene=batch.scene, batch=batch.number))
                 self.RequestRetranslation(batch, line_numbers=line_numbers, context=context)
 
-            # Update the context, unless it's a retranslation pass
-            if translation and not self.retranslate and not self.aborted:
-                context['summary'] = self._get_best_summary([translation.summary, batch.summary])
-                context['scene'] = self._get_best_summary([translation.scene, context.get('scene')])
-                context['synopsis'] = translation.synopsis or context.get('synopsis', "")
-                #context['names'] = translation.names or context.get('names', []) or options.get('names')
-                batch.UpdateContext(context)
+            self._update_batch_context(batch, translation, context)
+
+    async def TranslateBatchAsync(self, batch : SubtitleBatch, line_numbers : list[int]|None, context : dict[str,Any]|None):
+        """
+        Send a batch of subtitles for translation without blocking the event loop
+        """
+        prepared = self._prepare_batch(batch, line_numbers, context)
+        if not prepared or not batch.prompt:
+            return
+
+        instructions, context = prepared
+
+        streaming_callback = self._create_streaming_callback(batch, line_numbers) if self.client.enable_streaming else None
+        translation : Translation|None = await self.client.RequestTranslationAsync(batch.prompt, streaming_callback=streaming_callback)
+
+        if self.aborted:
+            return
+
+        if not translation:
+            raise TranslationError(_("Unable to translate scene {scene} batch {batch}").format(scene=batch.scene, batch=batch.number))
+
+        self.ProcessBatchTranslation(batch, translation, line_numbers)
+
+        split_performed = False
+        if batch.errors and self.split_on_error and len(batch.originals) >= 2:
+            split_performed = await self._translate_split_batch_async(batch, line_numbers, context or {}, original_translation=translation)
+
+        if not split_performed and batch.errors and translation.reached_token_limit:
+            logging.warning(_("Hit API token limit with errors, retrying batch without context..."))
+            batch.prompt.GenerateMessages(instructions, self._get_lines_to_translate(batch), {})
+            translation = await self.client.RequestTranslationAsync(batch.prompt, streaming_callback=streaming_callback)
+            if translation and not self.aborted:
+                self.ProcessBatchTranslation(batch, translation, line_numbers)
+
+        if not split_performed and batch.errors and self.retry_on_error:
+            logging.warning(_("Scene {scene} batch {batch} failed validation, requesting retranslation").format(scene=batch.scene, batch=batch.number))
+            await self.RequestRetranslationAsync(batch, line_numbers=line_numbers)
+
+        self._update_batch_context(batch, translation, context)
 
     def PreprocessBatch(self, batch : SubtitleBatch, context : dict[str,Any]|None = None) -> tuple[list[SubtitleLine], dict[str, Any]]:
         """
@@ -303,16 +396,22 @@ class SubtitleTranslator:
                 context[key] = value
 
         # Apply any substitutions to the input
-        replacements = batch.PerformInputSubstitutions(self.substitutions)
+        with self.subtitles_lock:
+            replacements = batch.PerformInputSubstitutions(self.substitutions)
+            replaced : list[str] = [f"{Linearise(k)} -> {Linearise(v)}" for k,v in replacements.items()] if replacements else []
+            if replaced:
+                batch.AddContext('replacements', replaced)
 
-        if replacements:
-            replaced : list[str] = [f"{Linearise(k)} -> {Linearise(v)}" for k,v in replacements.items()]
+        if replaced:
             self._emit_info(_("Made substitutions in input:\n{replaced}").format(replaced=linesep.join(replaced)))
-            batch.AddContext('replacements', replaced)
 
         # Filter out empty lines
         originals = [ line for line in batch.originals if line.text and line.text.strip() ]
 
+        # Reuse previous translations of the same lines, and suggest previous translations of similar lines
+        if self.translation_memory and not self.retranslate:
+            originals = self._apply_translation_memory(batch, originals, context)
+
         # Apply the max_lines limit
         with self.lock:
             line_count = min(self.max_lines - self.lines_processed, len(originals)) if self.max_lines else len(originals)
@@ -341,39 +440,44 @@ class SubtitleTranslator:
         parser.ProcessTranslation(translation)
 
         # Try to match the translations with the original lines
-        translated, unmatched = parser.MatchTranslations(batch.originals)
+        translated, unmatched = parser.MatchTranslations(self._get_lines_to_translate(batch))
 
         # Assign the translated lines to the batch
         if line_numbers:
             translated = [line for line in translated if line.number in line_numbers]
 
-        batch._translated = MergeTranslations(batch.translated or [], translated)
+        with self.subtitles_lock:
+            batch.MergeTranslations(translated)
+
+            batch.translation = translation
+            batch.errors = [err for err in parser.errors if isinstance(err, str) or isinstance(err, SubtitleError)]
 
-        batch.translation = translation
-        batch.errors = [err for err in parser.errors if isinstance(err, str) or isinstance(err, SubtitleError)]
+            any_untranslated = bool(batch.untranslated) and not self.max_lines
+            if any_untranslated:
+                batch.AddContext('untranslated_lines', [f"{item.number}. {item.text}" for item in batch.untranslated])
+
+            # Apply any word/phrase substitutions to the translation
+            replacements = batch.PerformOutputSubstitutions(self.substitutions)
+
+            # Perform substitutions on the output
+            translation.PerformSubstitutions(self.substitutions)
+
+            # Post-process the translation
+            if self.postprocessor:
+                batch.translated = self.postprocessor.PostprocessSubtitles(batch.translated)
 
         # Emit any warnings from the parser
         for warning in parser.warnings:
             self._emit_warning(warning)
 
-        if batch.untranslated and not self.max_lines:
+        if any_untranslated:
             self._emit_warning(_("Unable to match {count} lines with a source line").format(count=len(unmatched)))
-            batch.AddContext('untranslated_lines', [f"{item.number}. {item.text}" for item in batch.untranslated])
-
-        # Apply any word/phrase substitutions to the translation
-        replacements = batch.PerformOutputSubstitutions(self.substitutions)
 
         if replacements:
             replaced = [f"{k} -> {v}" for k,v in replacements.items()]
             self._emit_info(_("Made substitutions in output:\n{replaced}").format(replaced=linesep.join(replaced)))
 
-        # Perform substitutions on the output
-        translation.PerformSubstitutions(self.substitutions)
-
-        # Post-process the translation
         if self.postprocessor:
-            batch._translated = self.postprocessor.PostprocessSubtitles(batch.translated)
-
             self._emit_info(_("Scene {scene} batch {batch}: {translated} lines and {untranslated} untranslated.").format(
                 scene=batch.scene, 
                 batch=batch.number, 
@@ -388,6 +492,40 @@ class SubtitleTranslator:
         """
         Ask the client to retranslate the input and correct errors
         """
+        retry = self._prepare_retranslation(batch)
+        if not retry:
+            return
+
+        prompt, retry_temperature = retry
+
+        retranslation : Translation|None = self.client.RequestTranslation(prompt, retry_temperature)
+
+        if self.aborted:
+            return None
+
+        self._process_retranslation(batch, retranslation, line_numbers)
+
+    async def RequestRetranslationAsync(self, batch : SubtitleBatch, line_numbers : list[int]|None = None):
+        """
+        Ask the client to retranslate the input and correct errors without blocking the event loop
+        """
+        retry = self._prepare_retranslation(batch)
+        if not retry:
+            return
+
+        prompt, retry_temperature = retry
+
+        retranslation : Translation|None = await self.client.RequestTranslationAsync(prompt, retry_temperature)
+
+        if self.aborted:
+            return None
+
+        self._process_retranslation(batch, retranslation, line_numbers)
+
+    def _prepare_retranslation(self, batch : SubtitleBatch) -> tuple[TranslationPrompt, float]|None:
+        """
+        Generate a retry prompt asking the translator to correct errors in the batch
+        """
         translation : Translation|None = batch.translation
         if not translation:
             raise TranslationError(_("No translation to retranslate"))
@@ -412,11 +550,12 @@ class SubtitleTranslator:
         temperature = self.client.temperature or 0.0
         retry_temperature = min(temperature + 0.1, 1.0)
 
-        retranslation : Translation|None = self.client.RequestTranslation(prompt, retry_temperature)
-
-        if self.aborted:
-            return None
+        return prompt, retry_temperature
 
+    def _process_retranslation(self, batch : SubtitleBatch, retranslation : Translation|None, line_numbers : list[int]|None):
+        """
+        Apply a retranslation to the batch and report whether it passed validation
+        """
         if not isinstance(retranslation, Translation):
             raise TranslationError(_("Retranslation is not the expected type"), translation=retranslation)
 
@@ -437,38 +576,67 @@ class SubtitleTranslator:
         gleaned from the half responses (priority: original → first half → second half).
         Returns True if a split was attempted, False if no split could be performed.
         """
-        originals = batch.originals
+        prompts = self._prepare_split_batch(batch, context)
+        if not prompts:
+            return False
+
+        # Phase 1: collect raw translations from each half without processing
+        half_translations : list[Translation|None] = []
+
+        for prompt in prompts:
+            if self.aborted:
+                return False
+
+            half_translations.append(self.client.RequestTranslation(prompt))
+
+        return self._merge_split_translations(batch, line_numbers, half_translations, original_translation)
+
+    async def _translate_split_batch_async(self, batch : SubtitleBatch, line_numbers : list[int]|None, context : dict[str,Any], original_translation : Translation|None = None) -> bool:
+        """
+        Split the batch in half and request translations of both halves concurrently
+        """
+        prompts = self._prepare_split_batch(batch, context)
+        if not prompts:
+            return False
+
+        half_translations : list[Translation|None] = list(await asyncio.gather(*[self.client.RequestTranslationAsync(prompt) for prompt in prompts]))
+
+        if self.aborted:
+            return False
+
+        return self._merge_split_translations(batch, line_numbers, half_translations, original_translation)
+
+    def _prepare_split_batch(self, batch : SubtitleBatch, context : dict[str,Any]) -> list[TranslationPrompt]|None:
+        """
+        Build translation prompts for each half of the batch, or None if it cannot be split
+        """
+        originals = self._get_lines_to_translate(batch)
 
         split_index = FindBestSplitIndex(originals)
         if split_index is None:
-            return False
+            return None
 
         instructions = self.system_instructions
         if not instructions:
-            return False
+            return None
 
         self._emit_info(_("Splitting scene {scene} batch {batch} into two halves for retranslation...").format(
             scene=batch.scene, batch=batch.number))
 
-        # Phase 1: collect raw translations from each half without processing
-        half_translations : list[Translation] = []
-        api_errors : list[str|SubtitleError] = []
+        return [ self.client.BuildTranslationPrompt(self.user_prompt, instructions, half_originals, context)
+                 for half_originals in [originals[:split_index], originals[split_index:]] ]
 
-        for half_originals in [originals[:split_index], originals[split_index:]]:
-            if self.aborted:
-                return False
-
-            prompt = self.client.BuildTranslationPrompt(self.user_prompt, instructions, half_originals, context)
-            half_translation : Translation|None = self.client.RequestTranslation(prompt)
-
-            if not half_translation:
-                api_errors.append(TranslationError(_("No translation returned for batch half")))
-            else:
-                half_translations.append(half_translation)
+    def _merge_split_translations(self, batch : SubtitleBatch, line_numbers : list[int]|None, responses : list[Translation|None], original_translation : Translation|None) -> bool:
+        """
+        Merge the translations of each half of a split batch and process them as a single translation
+        """
+        half_translations : list[Translation] = [ translation for translation in responses if translation ]
+        api_errors : list[str|SubtitleError] = [ TranslationError(_("No translation returned for batch half")) for translation in responses if not translation ]
 
         # Phase 2: merge translation texts and delegate all output handling to ProcessBatchTranslation
         if not half_translations:
-            batch.errors = api_errors
+            with self.subtitles_lock:
+                batch.errors = api_errors
             return False
 
         merged_text = "\n".join(t.text for t in half_translations if t.text)
@@ -483,11 +651,13 @@ class SubtitleTranslator:
         try:
             self.ProcessBatchTranslation(batch, merged_translation, line_numbers)
         except TranslationError as e:
-            batch.errors = (batch.errors or []) + [e] + api_errors
+            with self.subtitles_lock:
+                batch.errors = (batch.errors or []) + [e] + api_errors
             return False
 
         if api_errors:
-            batch.errors = (batch.errors or []) + api_errors
+            with self.subtitles_lock:
+                batch.errors = (batch.errors or []) + api_errors
 
         # Phase 3: enrich the original translation's context with values from the halves,
         # preserving any context the original already had (original → half1 → half2)
@@ -528,13 +698,16 @@ class SubtitleTranslator:
         """
         Create a streaming callback that processes partial translations and emits batch_updated events
         """
+        parser : StreamingTranslationParser = self.client.GetStreamingParser(self.task_type)
+        originals : dict[int|str, SubtitleLine] = { line.key: line for line in batch.originals }
+
         def streaming_callback(partial_translation : Translation):
             if self.aborted or not partial_translation:
                 return
 
             try:
                 # Process the partial translation (without validation)
-                self._process_partial_translation(batch, partial_translation, line_numbers)
+                self._process_partial_translation(batch, parser, originals, partial_translation, line_numbers)
 
                 # Emit batch_updated event with the updated batch
                 self.events.batch_updated.send(self, batch=batch)
@@ -544,31 +717,421 @@ class SubtitleTranslator:
 
         return streaming_callback
 
-    def _process_partial_translation(self, batch : SubtitleBatch, translation : Translation, line_numbers : list[int]|None):
+    def _process_partial_translation(self, batch : SubtitleBatch, parser : StreamingTranslationParser, originals : dict[int|str, SubtitleLine], translation : Translation, line_numbers : list[int]|None):
         """
-        Process a partial translation without validation (streaming updates only)
+        Process a partial translation without validation (streaming updates only).
+        Only line blocks completed since the last update are parsed and added to the batch.
         """
         if not translation or not translation.has_translation:
             return
 
-        parser = self.client.GetParser(self.task_type)
         try:
-            parser.ProcessTranslation(translation, validate=False)
+            new_lines = parser.ProcessStreamingText(translation.text or "")
 
-            translated, _ = parser.MatchTranslations(batch.originals)
+            translated = parser.MatchStreamingTranslations(new_lines, originals)
 
             if line_numbers:
                 translated = [line for line in translated if line.number in line_numbers]
 
-            # Merge with existing translations (MergeTranslations is already imported at top)
-            # Todo: we should use a SubtitleEditor to merge changes 
-            batch.translated = MergeTranslations(batch.translated or [], translated)
+            # Todo: we should use a SubtitleEditor to merge changes
+            with self.subtitles_lock:
+                for line in translated:
+                    batch.AddTranslatedLine(line)
 
             # Note: We don't set errors for partial translations to avoid false validation failures
 
         except Exception:
             pass
 
+    def _translate_scenes_sequentially(self, subtitles : Subtitles):
+        """
+        Translate each scene in turn, building up context as we go
+        """
+        for scene in subtitles.scenes:
+            if self.aborted:
+                break
+
+            if self._reached_max_lines():
+                break
+
+            if self.resume and scene.all_translated:
+                self._emit_info(_("Scene {scene} already translated {linecount} lines...").format(scene=scene.number, linecount=scene.linecount))
+                continue
+
+            logging.debug(f"Translating scene {scene.number} of {subtitles.scenecount}")
+            batch_numbers =[ batch.number for batch in scene.batches if not batch.translated ] if self.resume else None
+
+            self.TranslateScene(subtitles, scene, batch_numbers=batch_numbers)
+
+            if self.errors and self.stop_on_error:
+                self._emit_error(_("Failed to translate scene {scene}... stopping translation").format(scene=scene.number))
+                return
+
+    def _translate_scenes_concurrently(self, subtitles : Subtitles):
+        """
+        Translate scenes in parallel on a pool of worker threads.
+
+        Batch and scene events are collected by each worker and replayed in scene order,
+        so observers see the same sequence of notifications as a sequential translation.
+        """
+        scenes = self._get_scenes_to_translate(subtitles)
+
+        logging.debug(f"Translating {len(scenes)} scenes with {self.max_threads} threads")
+
+        halt = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="SubtitleTranslator") as executor:
+            futures : list[tuple[SubtitleScene, Future]] = [
+                (scene, executor.submit(self._translate_scene_worker, subtitles, scene, halt)) for scene in scenes
+            ]
+
+            try:
+                for scene, future in futures:
+                    events, failed, error = future.result()
+                    if not self._replay_scene_events(scene, events, failed, error):
+                        return
+
+            finally:
+                # Stop the workers and drop queued scenes, so that nothing more is sent if translation ended early
+                halt.set()
+                for _scene, future in futures:
+                    future.cancel()
+
+    async def _translate_scenes_async(self, subtitles : Subtitles, max_concurrency : int):
+        """
+        Translate scenes as concurrent tasks on the event loop, replaying their events in scene order
+        """
+        scenes = self._get_scenes_to_translate(subtitles)
+
+        logging.debug(f"Translating {len(scenes)} scenes with up to {max_concurrency} concurrent requests")
+
+        halt = asyncio.Event()
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        tasks : list[tuple[SubtitleScene, asyncio.Task]] = [
+            (scene, asyncio.create_task(self._translate_scene_async_worker(subtitles, scene, halt, semaphore))) for scene in scenes
+        ]
+
+        try:
+            for scene, task in tasks:
+                events, failed, error = await task
+                if not self._replay_scene_events(scene, events, failed, error):
+                    halt.set()
+                    return
+
+        finally:
+            # Stop queued scenes and cancel any in flight, so that nothing more is sent once translation ends early or is cancelled
+            halt.set()
+            for _scene, task in tasks:
+                if not task.done():
+                    task.cancel()
+
+            await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
+
+    def _get_scenes_to_translate(self, subtitles : Subtitles) -> list[SubtitleScene]:
+        """
+        Get the scenes that need translating, skipping completed scenes when resuming
+        """
+        scenes : list[SubtitleScene] = []
+        for scene in subtitles.scenes:
+            if self.resume and scene.all_translated:
+                self._emit_info(_("Scene {scene} already translated {linecount} lines...").format(scene=scene.number, linecount=scene.linecount))
+                continue
+            scenes.append(scene)
+
+        return scenes
+
+    def _replay_scene_events(self, scene : SubtitleScene, events : DeferredEvents, failed : bool, error : Exception|None) -> bool:
+        """
+        Send the events collected while translating a scene. Returns False if translation should stop.
+        """
+        for signal, kwargs in events:
+            signal.send(self, **kwargs)
+
+        if error:
+            raise error
+
+        if failed and self.stop_on_error:
+            self._emit_error(_("Failed to translate scene {scene}... stopping translation").format(scene=scene.number))
+            return False
+
+        return True
+
+    def _translate_scene_worker(self, subtitles : Subtitles, scene : SubtitleScene, halt : threading.Event) -> tuple[DeferredEvents, bool, Exception|None]:
+        """
+        Translate a single scene on a worker thread, deferring batch and scene events
+        """
+        events : DeferredEvents = []
+        if halt.is_set() or self.aborted or self._reached_max_lines():
+            return events, False, None
+
+        token = _deferred_events.set(events)
+        error_count = len(scene.errors)
+        try:
+            logging.debug(f"Translating scene {scene.number} of {subtitles.scenecount}")
+            batch_numbers =[ batch.number for batch in scene.batches if not batch.translated ] if self.resume else None
+
+            self.TranslateScene(subtitles, scene, batch_numbers=batch_numbers)
+
+        except (TranslationAbortedError, TranslationImpossibleError) as e:
+            halt.set()
+            return events, True, e
+
+        except Exception:
+            # Stop queued scenes before this thread is free to start one
+            halt.set()
+            raise
+
+        finally:
+            _deferred_events.reset(token)
+
+        failed = len(scene.errors) > error_count
+        if failed and self.stop_on_error:
+            halt.set()
+
+        return events, failed, None
+
+    async def _translate_scene_async_worker(self, subtitles : Subtitles, scene : SubtitleScene, halt : asyncio.Event, semaphore : asyncio.Semaphore) -> tuple[DeferredEvents, bool, Exception|None]:
+        """
+        Translate a single scene as an asyncio task, deferring batch and scene events
+        """
+        async with semaphore:
+            events : DeferredEvents = []
+            if halt.is_set() or self.aborted or self._reached_max_lines():
+                return events, False, None
+
+            # Each task runs in a copy of the context, so the deferred events are isolated per scene
+            _deferred_events.set(events)
+            error_count = len(scene.errors)
+            try:
+                logging.debug(f"Translating scene {scene.number} of {subtitles.scenecount}")
+                batch_numbers =[ batch.number for batch in scene.batches if not batch.translated ] if self.resume else None
+
+                await self.TranslateSceneAsync(subtitles, scene, batch_numbers=batch_numbers)
+
+            except (TranslationAbortedError, TranslationImpossibleError) as e:
+                halt.set()
+                return events, True, e
+
+            except (Exception, asyncio.CancelledError):
+                # Stop queued scenes before the semaphore is released to one of them
+                halt.set()
+                raise
+
+            failed = len(scene.errors) > error_count
+            if failed and self.stop_on_error:
+                halt.set()
+
+            return events, failed, None
+
+    def _get_batch_context(self, subtitles : Subtitles, scene : SubtitleScene, batch : SubtitleBatch, history : SummaryHistory|None = None) -> dict[str,Any]:
+        """
+        Build the context for a batch, including a snapshot of the terminology map
+        """
+        context = GetBatchContext(subtitles, scene.number, batch.number, self.max_history, history)
+
+        with self.lock:
+            terminology_snapshot = dict(self.terminology_map) if self.terminology_map else None
+
+        if terminology_snapshot:
+            formatted = FormatKeyValuePairs(terminology_snapshot)
+            context['terminology'] = formatted
+            with self.subtitles_lock:
+                batch.AddContext('terminology', formatted)
+
+        return context
+
+    def _prepare_batch(self, batch : SubtitleBatch, line_numbers : list[int]|None, context : dict[str,Any]|None) -> tuple[str, dict[str,Any]]|None:
+        """
+        Preprocess the batch and build its translation prompt.
+        Returns None if the batch does not need to be sent to the translator.
+        """
+        if self.aborted:
+            return None
+
+        if self.reparse and batch.translation:
+            self._emit_info(_("Reparsing scene {scene} batch {batch} with {count} lines...").format(scene=batch.scene, batch=batch.number, count=len(batch.originals)))
+            self.ProcessBatchTranslation(batch, batch.translation, line_numbers)
+            return None
+
+        if self.resume and not self.retranslate and batch.all_translated:
+            self._emit_info(_("Scene {scene} batch {batch} already translated {lines} lines...").format(scene=batch.scene, batch=batch.number, lines=batch.size))
+            return None
+
+        originals, context = self.PreprocessBatch(batch, context)
+
+        if not originals and (batch.scene, batch.number) in self.memory_lines:
+            self._emit_info(_("Scene {scene} batch {batch} translated from the translation memory").format(scene=batch.scene, batch=batch.number))
+            return None
+
+        logging.debug(f"Translating scene {batch.scene} batch {batch.number} with {len(originals)} lines...")
+
+        # Build summaries context
+        context['batch'] = f"Scene {batch.scene} batch {batch.number}"
+        if batch.summary:
+            context['summary'] = batch.summary
+
+        instructions = self.system_instructions
+        if not instructions:
+            raise TranslationImpossibleError(_("No instructions provided for translation"))
+
+        prompt = self.client.BuildTranslationPrompt(self.user_prompt, instructions, originals, context)
+        with self.subtitles_lock:
+            batch.prompt = prompt
+
+        with self.lock:
+            self.prompt_lines[(batch.scene, batch.number)] = originals
+
+        if self.preview:
+            return None
+
+        return instructions, context
+
+    def _update_batch_context(self, batch : SubtitleBatch, translation : Translation|None, context : dict[str,Any]):
+        """
+        Update the context with information from the translation, unless it's a retranslation pass
+        """
+        if translation and not self.retranslate and not self.aborted:
+            context['summary'] = self._get_best_summary([translation.summary, batch.summary])
+            context['scene'] = self._get_best_summary([translation.scene, context.get('scene')])
+            context['synopsis'] = translation.synopsis or context.get('synopsis', "")
+            #context['names'] = translation.names or context.get('names', []) or options.get('names')
+            with self.subtitles_lock:
+                batch.UpdateContext(context)
+
+    def _complete_batch(self, scene : SubtitleScene, batch : SubtitleBatch):
+        """
+        Notify observers that a batch was translated and record any errors
+        """
+        self._send_event(self.events.batch_translated, batch=batch)
+
+        if self.build_terminology_map:
+            self._update_terminology_map(batch)
+
+        if self.translation_memory and not batch.errors and not self.preview:
+            self._store_translation_memory(batch)
+
+        if batch.errors:
+            self._emit_warning(_("Errors encountered translating scene {scene} batch {batch}").format(scene=batch.scene, batch=batch.number))
+            with self.subtitles_lock:
+                scene.errors.extend(batch.errors)
+            with self.lock:
+                self.errors.extend(batch.errors)
+
+    def _complete_scene(self, scene : SubtitleScene, context : dict[str,Any]):
+        """
+        Update the scene summary and notify observers that the scene was translated
+        """
+        # Update the scene summary based on the best available information (we hope)
+        summary = self._get_best_summary([scene.summary, context.get('scene'), context.get('summary')])
+        with self.subtitles_lock:
+            scene.summary = summary
+
+        self._send_event(self.events.scene_translated, scene=scene)
+
+    def _apply_translation_memory(self, batch : SubtitleBatch, originals : list[SubtitleLine], context : dict[str,Any]) -> list[SubtitleLine]:
+        """
+        Fill in lines that are in the translation memory and add previous translations of similar lines to the context.
+        Returns the lines that still need to be translated.
+        """
+        memory = self.translation_memory
+        if not memory:
+            return originals
+
+        found = memory.Lookup(self.source_language, self.target_language, [ line.text or '' for line in originals ])
+
+        reused : list[tuple[SubtitleLine, SubtitleLine]] = []
+        remaining : list[SubtitleLine] = []
+        for line in originals:
+            translation = found.get(line.text or '')
+            if translation is None:
+                remaining.append(line)
+                continue
+
+            translated = SubtitleLine.ConstructFromMicroseconds(line.number, line.start_us, line.end_us, translation, line.metadata if line.has_metadata else None)
+            translated.original = line.text
+            reused.append((line, translated))
+
+        with self.lock:
+            if reused:
+                self.memory_lines[(batch.scene, batch.number)] = { line.number for line, translated in reused }
+                self.lines_reused += len(reused)
+            else:
+                self.memory_lines.pop((batch.scene, batch.number), None)
+
+        # Previews show what would be sent without changing the subtitles
+        if reused and not self.preview:
+            with self.subtitles_lock:
+                for line, translated in reused:
+                    line.translation = translated.text
+
+                batch.MergeTranslations([ translated for line, translated in reused ])
+
+        if reused:
+            self._emit_info(_("Reused {count} lines from the translation memory in scene {scene} batch {batch}").format(count=len(reused), scene=batch.scene, batch=batch.number))
+
+        if remaining and self.memory_hints > 0:
+            hints : dict[str, str] = {}
+            for line in remaining:
+                for source, translation, _similarity in memory.FindSimilar(self.source_language, self.target_language, line.text or '', self.memory_threshold):
+                    hints.setdefault(source, Linearise(translation))
+
+                if len(hints) >= self.memory_hints:
+                    break
+
+            if hints:
+                formatted = FormatKeyValuePairs(hints)
+                context['previous_translations'] = formatted
+                with self.subtitles_lock:
+                    batch.AddContext('previous_translations', formatted)
+
+        return remaining
+
+    def _get_lines_to_translate(self, batch : SubtitleBatch) -> list[SubtitleLine]:
+        """
+        Get the lines of the batch that were sent to the translator, excluding any filled in from the translation memory
+        """
+        with self.lock:
+            memory_lines = self.memory_lines.get((batch.scene, batch.number))
+
+        if not memory_lines:
+            return batch.originals
+
+        return [ line for line in batch.originals if line.number not in memory_lines ]
+
+    def _store_translation_memory(self, batch : SubtitleBatch):
+        """
+        Add the lines translated in the batch to the translation memory
+        """
+        if not self.translation_memory:
+            return
+
+        with self.lock:
+            memory_lines = self.memory_lines.get((batch.scene, batch.number)) or set()
+
+        originals = { line.number : line.text for line in batch.originals if line.text }
+        translations = [ (originals[line.number], line.text) for line in batch.translated
+                         if line.text and line.number in originals and line.number not in memory_lines ]
+
+        if translations:
+            self.translation_memory.Store(self.source_language, self.target_language, translations)
+
+    def _send_event(self, signal : Signal, **kwargs):
+        """
+        Send an event immediately, or defer it if running as a scene worker
+        """
+        deferred = _deferred_events.get()
+        if deferred is not None:
+            deferred.append((signal, kwargs))
+        else:
+            signal.send(self, **kwargs)
+
+    def _reached_max_lines(self) -> bool:
+        """
+        Check whether the max_lines limit has been reached
+        """
+        return bool(self.max_lines) and self.lines_processed >= self.max_lines
+
     def _update_terminology_map(self, batch : SubtitleBatch):
         """
         Merge terminology returned by a batch translation into self.terminology_map.
@@ -1,11 +1,13 @@
-from PySubtrans.Options import Options
+from collections.abc import Mapping
+
+from PySubtrans.SettingsType import SettingsType, SettingType
 from PySubtrans.SubtitleBatch import SubtitleBatch
 from PySubtrans.SubtitleError import EmptyLinesError, LineTooLongError, TooManyNewlinesError, UnmatchedLinesError, UntranslatedLinesError
 from PySubtrans.SubtitleLine import SubtitleLine
 
 class SubtitleValidator:
-    def __init__(self, options : Options) -> None:
-        self.options : Options = options
+    def __init__(self, options : Mapping[str, SettingType]) -> None:
+        self.options : SettingsType = options if isinstance(options, SettingsType) else SettingsType(options)
 
     def ValidateBatch(self, batch : SubtitleBatch):
         """
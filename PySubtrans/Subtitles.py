@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from copy import deepcopy
 import os
 import logging
@@ -11,7 +12,8 @@ from PySubtrans.Options import Options
 from PySubtrans.SettingsType import SettingsType
 from PySubtrans.SubtitleBatch import SubtitleBatch
 from PySubtrans.SubtitleError import SubtitleError, SubtitleParseError
-from PySubtrans.Helpers import GetInputPath, GetOutputPath
+from PySubtrans.Helpers import GetInputPath, GetOutputPath, WriteFileAtomically
+from PySubtrans.Helpers.SubtitleHelpers import FindLine
 from PySubtrans.SubtitleFileHandler import SubtitleFileHandler, default_encoding
 from PySubtrans.SubtitleFormatRegistry import SubtitleFormatRegistry
 from PySubtrans.SubtitleScene import SubtitleScene, UnbatchScenes
@@ -28,6 +30,7 @@ class Subtitles:
         self.translated : list[SubtitleLine]|None = None
         self.start_line_number : int = 1
         self._scenes : list[SubtitleScene] = []
+        self._scene_counts : tuple[int, ...] = (0, 0, 0, 0)
         self.lock = threading.RLock()
 
         self.sourcepath : str|None = GetInputPath(filepath)
@@ -45,13 +48,21 @@ class Subtitles:
 
     @property
     def any_translated(self) -> bool:
-        with self.lock:
-            return any(scene.any_translated for scene in self.scenes) if self.scenes else False
+        return self._scene_counts[3] > 0
 
     @property
     def all_translated(self) -> bool:
-        with self.lock:
-            return all(scene.all_translated for scene in self.scenes) if self.scenes else False
+        return bool(self._scenes) and self._scene_counts[2] == 0
+
+    @property
+    def translated_count(self) -> int:
+        """ Get the number of translated lines in all scenes """
+        return self._scene_counts[0]
+
+    @property
+    def untranslated_count(self) -> int:
+        """ Get the number of original lines without a translated line in all scenes """
+        return self._scene_counts[1]
 
     @property
     def linecount(self) -> int:
@@ -70,7 +81,12 @@ class Subtitles:
     @scenes.setter
     def scenes(self, scenes: list[SubtitleScene]):
         with self.lock:
+            for scene in self._scenes:
+                if scene._parent is self:
+                    scene._parent = None
+
             self._scenes = scenes
+            self._count_scenes()
             self.originals, self.translated, dummy = UnbatchScenes(scenes) # type: ignore[unused-ignore]
             self.start_line_number = (self.originals[0].number if self.originals else 1) or 1
 
@@ -82,6 +98,10 @@ class Subtitles:
             raise SubtitleError(_("Subtitles have not been batched"))
 
         with self.lock:
+            # Scenes are normally numbered in sequence, so check the expected position first
+            if 0 < scene_number <= len(self.scenes) and self.scenes[scene_number - 1].number == scene_number:
+                return self.scenes[scene_number - 1]
+
             matches = [ scene for scene in self.scenes if scene.number == scene_number ]
 
         if not matches:
@@ -98,6 +118,9 @@ class Subtitles:
         """
         with self.lock:
             scene = self.GetScene(scene_number)
+            if 0 < batch_number <= len(scene.batches) and scene.batches[batch_number - 1].number == batch_number:
+                return scene.batches[batch_number - 1]
+
             for batch in scene.batches:
                 if batch.number == batch_number:
                     return batch
@@ -110,7 +133,7 @@ class Subtitles:
         """
         if self.originals:
             with self.lock:
-                return next((line for line in self.originals if line.number == line_number), None)
+                return FindLine(self.originals, line_number)
 
     def GetTranslatedLine(self, line_number : int) -> SubtitleLine|None:
         """
@@ -118,7 +141,7 @@ class Subtitles:
         """
         if self.translated:
             with self.lock:
-                return next((line for line in self.translated if line.number == line_number), None)
+                return FindLine(self.translated, line_number)
 
     def GetBatchContainingLine(self, line_number: int) -> SubtitleBatch|None:
         """
@@ -127,6 +150,16 @@ class Subtitles:
         if not self.scenes:
             raise SubtitleError("Subtitles have not been batched yet")
 
+        # Scenes and batches are ordered by line number, so try a binary search first
+        scene_index = bisect_right(self.scenes, line_number, key=lambda scene: scene.first_line_number or 0) - 1
+        if scene_index >= 0:
+            scene = self.scenes[scene_index]
+            batch_index = bisect_right(scene.batches, line_number, key=lambda batch: batch.first_line_number or 0) - 1
+            if batch_index >= 0:
+                batch = scene.batches[batch_index]
+                if batch.last_line_number is not None and batch.last_line_number >= line_number:
+                    return batch
+
         for scene in self.scenes:
             if scene.first_line_number is not None and scene.first_line_number > line_number:
                 break
@@ -194,15 +227,7 @@ class Subtitles:
         if not self.sourcepath:
             raise ValueError("No source path set for subtitles")
 
-        try:
-            file_handler: SubtitleFileHandler = SubtitleFormatRegistry.create_handler(filename=self.sourcepath)
-
-            data = file_handler.load_file(self.sourcepath)
-
-        except SubtitleParseError as e:
-            logging.debug(f"Error parsing file: {e}")
-            logging.info(_("Error parsing file... attempting format detection"))
-            data = SubtitleFormatRegistry.detect_format_and_load_file(self.sourcepath)
+        data = SubtitleFormatRegistry.load_file(self.sourcepath)
 
         with self.lock:
             self._renumber_if_needed(data.lines)
@@ -240,9 +265,8 @@ class Subtitles:
             if originals:
                 file_handler = SubtitleFormatRegistry.create_handler(filename=path)
                 data = SubtitleData(lines=originals, metadata=self.metadata, start_line_number=self.start_line_number)
-                subtitle_file = file_handler.compose(data)
                 with open(path, 'w', encoding=default_encoding) as f:
-                    f.write(subtitle_file)
+                    file_handler.write_file(data, f)
             else:
                 logging.warning(_("No original subtitles to save to {}").format(str(path)))
 
@@ -293,9 +317,11 @@ class Subtitles:
             data.metadata['add_rtl_markers'] = self.settings.get('add_right_to_left_markers', False)
 
             subtitle_file = file_handler.compose(data)
-            with open(outputpath, 'w', encoding=default_encoding) as f:
-                f.write(subtitle_file)
 
+        # Write the file outside the lock so translation is not held up by the disk
+        WriteFileAtomically(outputpath, subtitle_file, encoding=default_encoding)
+
+        with self.lock:
             self.translated = translated
             self.outputpath = outputpath
 
@@ -309,14 +335,50 @@ class Subtitles:
         with self.lock:
             self.settings.update(settings)
 
+    def UpdateTranslationCounts(self) -> None:
+        """
+        Recalculate the translation totals for every scene, e.g. after the scenes or batches were edited
+        """
+        with self.lock:
+            for scene in self._scenes:
+                scene.UpdateTranslationCounts()
+
+            self._count_scenes()
+
+    def _count_scenes(self) -> None:
+        """
+        Add up the translation counts of the scenes
+        """
+        totals = [0, 0, 0, 0]
+        for scene in self._scenes:
+            scene._parent = self
+            totals = [ total + count for total, count in zip(totals, scene._get_counts()) ]
+
+        self._scene_counts = tuple(totals)
+
+    def _update_counts(self, previous : tuple[int, ...], current : tuple[int, ...]) -> None:
+        """
+        Apply a change in the counts of a scene to the totals
+        """
+        self._scene_counts = tuple(total + new - old for total, old, new in zip(self._scene_counts, previous, current))
+
     def _renumber_if_needed(self, lines : list[SubtitleLine]|None) -> None:
         """
-        Renumber subtitle lines if any have number 0 (indicating missing/invalid indices)
+        Renumber subtitle lines if any have number 0 (indicating missing/invalid indices) or are out of order,
+        since lines are looked up by binary search on their number
         """
-        if lines and any(line.number == 0 for line in lines):
+        if not lines:
+            return
+
+        if any(line.number == 0 for line in lines):
             logging.warning(_("Renumbering subtitle lines due to missing indices"))
-            for line_number, line in enumerate(lines, start=1):
-                line.number = line_number
+        elif any(previous.number >= line.number for previous, line in zip(lines, lines[1:])):
+            logging.warning(_("Renumbering subtitle lines because indices are out of order"))
+        else:
+            return
+
+        for line_number, line in enumerate(lines, start=1):
+            line.number = line_number
 
 
     def _merge_original_and_translated(self, originals: list[SubtitleLine], translated: list[SubtitleLine]) -> list[SubtitleLine]:
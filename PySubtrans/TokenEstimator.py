@@ -0,0 +1,65 @@
+import math
+
+import regex
+
+from PySubtrans.SubtitleLine import SubtitleLine
+from PySubtrans.TranslationPrompt import TranslationPrompt
+
+# Scripts that tokenizers typically encode at around one token per character
+dense_script_pattern = regex.compile(r'[\p{Han}\p{Hiragana}\p{Katakana}\p{Hangul}\p{Thai}]')
+
+class TokenEstimator:
+    """
+    Estimates token counts locally, without calling the provider.
+
+    The default heuristic counts characters from scripts that tokenize densely (Chinese, Japanese,
+    Korean, Thai) as one token each and other text as characters_per_token characters per token.
+    Subclass and override EstimateTokens to use a model-specific tokenizer instead.
+    """
+    def __init__(self, characters_per_token : float = 4.0, line_overhead : int = 8, output_ratio : float = 2.0, response_overhead : int = 100):
+        # Approximate number of characters per token for non-dense scripts
+        self.characters_per_token : float = characters_per_token
+
+        # Tokens used by the line number and Original>/Translation> markers for each line
+        self.line_overhead : int = line_overhead
+
+        # Expected output tokens per source token - responses repeat the original text before the translation
+        self.output_ratio : float = output_ratio
+
+        # Tokens for the summary and scene tags included in each response
+        self.response_overhead : int = response_overhead
+
+    def EstimateTokens(self, text : str|None) -> int:
+        """
+        Estimate the number of tokens in a piece of text
+        """
+        if not text:
+            return 0
+
+        dense_characters = len(dense_script_pattern.findall(text))
+        other_characters = len(text) - dense_characters
+        return dense_characters + math.ceil(other_characters / self.characters_per_token)
+
+    def EstimatePromptTokens(self, prompt : TranslationPrompt) -> int:
+        """
+        Estimate the number of tokens that will be sent for a prompt, including the system prompt
+        """
+        content = prompt.content if prompt.content is not None else prompt.messages
+        if isinstance(content, str):
+            text = content
+        else:
+            text = ''.join(str(item.get('content', '')) if isinstance(item, dict) else str(item) for item in content or [])
+
+        return self.EstimateTokens(prompt.system_prompt) + self.EstimateTokens(text)
+
+    def EstimateLineInputTokens(self, line : SubtitleLine) -> int:
+        """
+        Estimate the prompt tokens needed to send a line for translation
+        """
+        return self.line_overhead + self.EstimateTokens(line.text)
+
+    def EstimateLineOutputTokens(self, line : SubtitleLine) -> int:
+        """
+        Estimate the response tokens needed for the translation of a line
+        """
+        return self.line_overhead + math.ceil(self.EstimateTokens(line.text) * self.output_ratio)
@@ -80,6 +80,18 @@ class Translation:
     def response_time(self) -> float|str|None:
         return self.content.get('response_time')
 
+    @property
+    def prompt_tokens(self) -> int|None:
+        return self.content.get('prompt_tokens')
+
+    @property
+    def output_tokens(self) -> int|None:
+        return self.content.get('output_tokens')
+
+    @property
+    def cached_tokens(self) -> int|None:
+        return self.content.get('cached_tokens')
+
     @property
     def reached_token_limit(self) -> bool:
         return self.finish_reason == "length"
@@ -1,12 +1,19 @@
+import asyncio
 import logging
+import threading
 import time
+from types import MappingProxyType
 
+from PySubtrans.Helpers.Localization import _
 from PySubtrans.Instructions import DEFAULT_TASK_TYPE
 from PySubtrans.Options import Options, SettingsType
-from PySubtrans.SettingsType import SettingsType
+from PySubtrans.ResponseCache import GetCacheKey, GetResponseCache, ResponseCache, default_cache_path
+from PySubtrans.RateLimiter import ConcurrencyGovernor, GetConcurrencyGovernor, default_max_concurrency, GetRateLimiter, GetRateLimiterKey, RateLimiter
+from PySubtrans.SettingsType import SettingsType, SettingType
 from PySubtrans.SubtitleError import TranslationError
 from PySubtrans.SubtitleLine import SubtitleLine
-from PySubtrans.TranslationParser import TranslationParser
+from PySubtrans.TokenEstimator import TokenEstimator
+from PySubtrans.TranslationParser import StreamingTranslationParser, TranslationParser
 from PySubtrans.TranslationPrompt import TranslationPrompt, default_prompt_template
 from PySubtrans.Translation import Translation
 from PySubtrans.TranslationRequest import TranslationRequest, StreamingCallback
@@ -29,9 +36,32 @@ class TranslationClient:
         self.aborted: bool = False
         self.events: TranslationEvents|None = None
 
+        # Options for parsing responses are built on first use and shared by every parser the client creates
+        self._parser_options: MappingProxyType[str, SettingType]|None = None
+        self._parser_options_lock = threading.Lock()
+
         if not self.instructions:
             raise TranslationError("No instructions provided for the translator")
 
+        # Rate limits apply to the account, so clients for the same provider and API key share a limiter
+        rate_limiter_key = GetRateLimiterKey(settings.get_str('provider'), settings.get_str('api_key'), settings.get_str('api_base') or settings.get_str('server_address'))
+        self.rate_limiter: RateLimiter|None = GetRateLimiter(rate_limiter_key, self.rate_limit, self.token_rate_limit)
+        self.token_estimator: TokenEstimator = TokenEstimator()
+
+        # Responses can be cached on disk so that identical requests are not paid for twice
+        self.response_cache: ResponseCache|None = None
+        if settings.get_bool('response_cache'):
+            cache_size = settings.get_int('response_cache_size')
+            self.response_cache = GetResponseCache(settings.get_str('response_cache_path') or default_cache_path, cache_size * 1024 * 1024 if cache_size else None)
+
+        # Concurrent requests to the same account are adjusted in response to rate limit feedback,
+        # starting from max_threads and rising while the provider keeps up
+        self.governor: ConcurrencyGovernor|None = None
+        if settings.get_bool('adaptive_concurrency', True):
+            initial_concurrency = settings.get_int('max_threads') or 1
+            max_concurrency = max(initial_concurrency, settings.get_int('adaptive_max_concurrency') or default_max_concurrency)
+            self.governor = GetConcurrencyGovernor(rate_limiter_key, max_concurrency, initial_concurrency)
+
     @property
     def supports_conversation(self) -> bool:
         return self.settings.get_bool('supports_conversation', False)
@@ -60,6 +90,14 @@ class TranslationClient:
     def rate_limit(self) -> float|None:
         return self.settings.get_float('rate_limit')
 
+    @property
+    def token_rate_limit(self) -> float|None:
+        return self.settings.get_float('token_rate_limit')
+
+    @property
+    def cache_friendly_prompt(self) -> bool:
+        return self.settings.get_bool('cache_friendly_prompt')
+
     @property
     def temperature(self) -> float:
         return self.settings.get_float('temperature') or 0.0
@@ -76,6 +114,16 @@ class TranslationClient:
     def supports_streaming(self) -> bool:
         return self.settings.get_bool('supports_streaming', False)
 
+    @property
+    def parser_options(self) -> MappingProxyType[str, SettingType]:
+        """
+        Read-only view of the options shared by the client's parsers
+        """
+        with self._parser_options_lock:
+            if self._parser_options is None:
+                self._parser_options = MappingProxyType(Options(self.settings))
+            return self._parser_options
+
     def BuildTranslationPrompt(self, user_prompt : str, instructions : str, lines : list[SubtitleLine], context : dict) -> TranslationPrompt:
         """
         Generate a translation prompt for the context
@@ -86,6 +134,7 @@ class TranslationClient:
         prompt.supports_system_messages_for_retry = self.supports_system_messages_for_retry
         prompt.system_role = self.system_role
         prompt.prompt_template = self.prompt_template
+        prompt.cache_friendly = self.cache_friendly_prompt
         prompt.GenerateMessages(instructions, lines, context)
         return prompt
 
@@ -93,7 +142,20 @@ class TranslationClient:
         """
         Generate the messages to request a translation
         """
-        start_time = time.monotonic()
+        if self.aborted:
+            return None
+
+        # Check whether an identical request has been made before
+        cache_key = self._get_cache_key(prompt, temperature)
+        cached_translation = self._get_cached_translation(cache_key)
+        if cached_translation:
+            return cached_translation
+
+        # Wait for the shared rate limiter to allow the request
+        sleep_time, estimated_tokens = self._reserve_rate_limit(prompt)
+        if sleep_time > 0.0:
+            logging.debug(f"Sleeping for {sleep_time:.2f} seconds to respect rate limit")
+            time.sleep(sleep_time)
 
         if self.aborted:
             return None
@@ -101,8 +163,20 @@ class TranslationClient:
         # Create a translation request to encapsulate the operation
         request = TranslationRequest(prompt, streaming_callback)
 
-        # Perform the translation
-        translation = self._request_translation(request, temperature)
+        # Wait for the concurrency governor to allow another request in flight
+        if not self._acquire_request_slot(request):
+            return None
+
+        try:
+            # Perform the translation
+            translation = self._request_translation(request, temperature)
+
+            self._record_request_success(translation)
+
+        finally:
+            self._release_request_slot(request)
+
+        self._record_token_usage(translation, estimated_tokens)
 
         if self.aborted or translation is None:
             return None
@@ -110,16 +184,52 @@ class TranslationClient:
         if translation.text:
             logging.debug(f"Response:\n{translation.text}")
 
-        # If a rate limit is replied ensure a minimum duration for each request
-        rate_limit = self.rate_limit
-        if rate_limit and rate_limit > 0.0:
-            minimum_duration = 60.0 / rate_limit
+        self._store_cached_translation(cache_key, translation)
+
+        return translation
+
+    async def RequestTranslationAsync(self, prompt : TranslationPrompt, temperature : float|None = None, streaming_callback : StreamingCallback = None) -> Translation|None:
+        """
+        Request a translation without blocking the event loop
+        """
+        if self.aborted:
+            return None
+
+        cache_key = self._get_cache_key(prompt, temperature)
+        cached_translation = self._get_cached_translation(cache_key)
+        if cached_translation:
+            return cached_translation
 
-            elapsed_time = time.monotonic() - start_time
-            if elapsed_time < minimum_duration:
-                sleep_time = minimum_duration - elapsed_time
-                logging.debug(f"Sleeping for {sleep_time:.2f} seconds to respect rate limit")
-                time.sleep(sleep_time)
+        sleep_time, estimated_tokens = self._reserve_rate_limit(prompt)
+        if sleep_time > 0.0:
+            logging.debug(f"Sleeping for {sleep_time:.2f} seconds to respect rate limit")
+            await asyncio.sleep(sleep_time)
+
+        if self.aborted:
+            return None
+
+        request = TranslationRequest(prompt, streaming_callback)
+
+        if not await self._acquire_request_slot_async(request):
+            return None
+
+        try:
+            translation = await self._request_translation_async(request, temperature)
+
+            self._record_request_success(translation)
+
+        finally:
+            self._release_request_slot(request)
+
+        self._record_token_usage(translation, estimated_tokens)
+
+        if self.aborted or translation is None:
+            return None
+
+        if translation.text:
+            logging.debug(f"Response:\n{translation.text}")
+
+        self._store_cached_translation(cache_key, translation)
 
         return translation
 
@@ -127,7 +237,13 @@ class TranslationClient:
         """
         Return a parser that can process the provider's response
         """
-        return TranslationParser(task_type, Options(self.settings))
+        return TranslationParser(task_type, self.parser_options)
+
+    def GetStreamingParser(self, task_type: str = DEFAULT_TASK_TYPE) -> StreamingTranslationParser:
+        """
+        Return a parser that can process the provider's response incrementally as it is streamed
+        """
+        return StreamingTranslationParser(task_type, self.parser_options)
 
     def AbortTranslation(self) -> None:
         self.aborted = True
@@ -165,6 +281,160 @@ class TranslationClient:
         _ = request, temperature  # Mark as accessed to avoid lint warnings
         raise NotImplementedError
 
+    async def _request_translation_async(self, request: TranslationRequest, temperature: float|None = None) -> Translation|None:
+        """
+        Make an asynchronous request to the API to provide a translation.
+        Clients without a native async implementation run the blocking request on a worker thread.
+        """
+        return await asyncio.to_thread(self._request_translation, request, temperature)
+
+    def _get_cache_key(self, prompt : TranslationPrompt, temperature : float|None) -> str|None:
+        """
+        Generate the response cache key for a request, if the cache is enabled
+        """
+        if not self.response_cache:
+            return None
+
+        return GetCacheKey(self.settings.get_str('provider'), self.settings.get_str('model'), temperature or self.temperature, prompt)
+
+    def _get_cached_translation(self, cache_key : str|None) -> Translation|None:
+        """
+        Look up a cached response for the request. Retranslation always bypasses the cache.
+        """
+        if not self.response_cache or not cache_key or self.settings.get_bool('retranslate'):
+            return None
+
+        content = self.response_cache.Get(cache_key)
+        if not content:
+            return None
+
+        logging.debug("Using cached translation response")
+        content['cached_response'] = True
+        return Translation(content)
+
+    def _store_cached_translation(self, cache_key : str|None, translation : Translation) -> None:
+        """
+        Cache a successful response so an identical request can reuse it
+        """
+        if not self.response_cache or not cache_key:
+            return
+
+        if not translation.has_translation or translation.reached_token_limit or translation.quota_reached:
+            return
+
+        try:
+            self.response_cache.Put(cache_key, translation.content)
+        except Exception as e:
+            logging.warning(_("Unable to store response in cache: {error}").format(error=str(e)))
+
+    def _report_throttled(self, retry_after : float|None = None) -> None:
+        """
+        Tell the concurrency governor that the provider is overloaded (rate limited, server error or timeout)
+        """
+        if self.governor:
+            self.governor.RecordThrottle(retry_after)
+
+    def _acquire_request_slot(self, request : TranslationRequest) -> bool:
+        """
+        Wait for the concurrency governor to allow a request. Returns False if translation was aborted.
+        """
+        if not self.governor:
+            return not self.aborted
+
+        while not self.governor.Acquire(timeout=1.0):
+            if self.aborted:
+                return False
+
+        request.holds_request_slot = True
+        return not self._release_if_aborted(request)
+
+    async def _acquire_request_slot_async(self, request : TranslationRequest) -> bool:
+        """
+        Wait for the concurrency governor to allow a request without blocking the event loop
+        """
+        if not self.governor:
+            return not self.aborted
+
+        while (wait_time := self.governor.TryAcquire()) is not None:
+            if self.aborted:
+                return False
+            await asyncio.sleep(min(wait_time, 1.0))
+
+        request.holds_request_slot = True
+        return not self._release_if_aborted(request)
+
+    def _release_if_aborted(self, request : TranslationRequest) -> bool:
+        if self.aborted:
+            self._release_request_slot(request)
+            return True
+        return False
+
+    def _release_request_slot(self, request : TranslationRequest) -> None:
+        if self.governor and request.holds_request_slot:
+            request.holds_request_slot = False
+            self.governor.Release()
+
+    def _wait_for_retry(self, request : TranslationRequest, delay : float) -> bool:
+        """
+        Give up the request slot while waiting to retry a failed request, then wait for the governor to allow it again,
+        so that backing off does not hold up other requests. Returns False if translation was aborted.
+        """
+        if not request.holds_request_slot:
+            time.sleep(delay)
+            return not self.aborted
+
+        self._release_request_slot(request)
+        time.sleep(delay)
+        return self._acquire_request_slot(request)
+
+    async def _wait_for_retry_async(self, request : TranslationRequest, delay : float) -> bool:
+        """
+        Give up the request slot while waiting to retry a failed request without blocking the event loop
+        """
+        if not request.holds_request_slot:
+            await asyncio.sleep(delay)
+            return not self.aborted
+
+        self._release_request_slot(request)
+        await asyncio.sleep(delay)
+        return await self._acquire_request_slot_async(request)
+
+    def _record_request_success(self, translation : Translation|None) -> None:
+        if self.governor and translation and not self.aborted:
+            self.governor.RecordSuccess()
+
+    def _reserve_rate_limit(self, prompt : TranslationPrompt) -> tuple[float, int]:
+        """
+        Reserve capacity for a request with the shared rate limiter.
+        Returns the time to wait before sending and the estimated tokens reserved.
+        """
+        if not self.rate_limiter:
+            return 0.0, 0
+
+        estimated_tokens = self._estimate_prompt_tokens(prompt) if self.rate_limiter.tokens else 0
+        return self.rate_limiter.Reserve(estimated_tokens), estimated_tokens
+
+    def _record_token_usage(self, translation : Translation|None, estimated_tokens : int) -> None:
+        """
+        Correct the rate limiter's token reservation with the actual usage reported by the provider
+        """
+        if not self.rate_limiter or not translation:
+            return
+
+        prompt_tokens = translation.prompt_tokens
+        output_tokens = translation.output_tokens
+        if prompt_tokens is None and output_tokens is None:
+            return
+
+        actual_tokens = (prompt_tokens or 0) + (output_tokens or 0)
+        self.rate_limiter.AdjustTokens(actual_tokens - estimated_tokens)
+
+    def _estimate_prompt_tokens(self, prompt : TranslationPrompt) -> int:
+        """
+        Roughly estimate the number of tokens in a prompt
+        """
+        return max(1, self.token_estimator.EstimatePromptTokens(prompt))
+
     def _abort(self) -> None:
         # Try to terminate ongoing requests
         self.aborted = True
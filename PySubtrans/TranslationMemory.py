@@ -0,0 +1,258 @@
+import hashlib
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+from collections.abc import Iterable
+
+from PySubtrans.Helpers.Localization import _
+from PySubtrans.Helpers.Resources import config_dir
+from PySubtrans.Helpers.Text import CompressWhitespace
+
+default_memory_path : str = os.path.join(config_dir, 'translation_memory.db')
+
+# Near matches are found with MinHash signatures of character trigrams, split into bands for locality-sensitive hashing.
+# Lines with a similarity of 0.7 share at least one band about 96% of the time, lines with a similarity of 0.3 about 20%.
+_SHINGLE_SIZE = 3
+_BANDS = 8
+_BAND_ROWS = 3
+_MERSENNE_PRIME = (1 << 61) - 1
+
+_random = random.Random(20240601)
+_PERMUTATIONS = [ (_random.randrange(1, _MERSENNE_PRIME), _random.randrange(0, _MERSENNE_PRIME)) for _i in range(_BANDS * _BAND_ROWS) ]
+
+# Very short lines match too many unrelated lines to be useful hints
+_MIN_SIMILAR_LENGTH = 8
+
+# SQLite limits the number of parameters in a query
+_MAX_QUERY_PARAMETERS = 500
+
+class TranslationMemory:
+    """
+    Persistent store of translated lines, keyed by source language, target language and normalised source text.
+
+    Lines that have been translated before can be reused without sending them to the translator again,
+    and lines that are similar to previous translations can be offered to the translator as examples.
+    Entries are stored in an SQLite database so that they can be shared by every file in a series.
+    """
+    def __init__(self, path : str):
+        self.path : str = path
+        self.lock = threading.Lock()
+        self.lookups : int = 0
+        self.hits : int = 0
+        self.similar : int = 0
+        self.stores : int = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                source_language TEXT NOT NULL,
+                target_language TEXT NOT NULL,
+                source TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                updated REAL NOT NULL,
+                UNIQUE (source_language, target_language, source)
+            )""")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS bands (
+                entry_id INTEGER NOT NULL,
+                band_hash INTEGER NOT NULL
+            )""")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS bands_hash ON bands(band_hash)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS bands_entry ON bands(entry_id)")
+        self.connection.commit()
+
+    @property
+    def statistics(self) -> dict[str, int|float]:
+        """Lookup, hit, similar match and store counts since the memory was opened"""
+        with self.lock:
+            return {
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'similar': self.similar,
+                'stores': self.stores,
+                'hit_rate': self.hits / self.lookups if self.lookups else 0.0,
+            }
+
+    @property
+    def count(self) -> int:
+        """Number of stored translations"""
+        with self.lock:
+            row = self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+            return int(row[0])
+
+    def Lookup(self, source_language : str, target_language : str, texts : Iterable[str]) -> dict[str, str]:
+        """
+        Find stored translations for lines of source text. Returns a dictionary of text to translation for the lines that were found.
+        """
+        keys : dict[str, list[str]] = {}
+        for text in texts:
+            keys.setdefault(NormaliseSourceText(text), []).append(text)
+
+        keys.pop('', None)
+
+        found : dict[str, str] = {}
+        with self.lock:
+            normalised = list(keys)
+            for start in range(0, len(normalised), _MAX_QUERY_PARAMETERS):
+                chunk = normalised[start:start + _MAX_QUERY_PARAMETERS]
+                rows = self.connection.execute(
+                    f"SELECT source, translation FROM entries WHERE source_language = ? AND target_language = ? AND source IN ({','.join('?' * len(chunk))})",
+                    (source_language, target_language, *chunk)).fetchall()
+
+                for source, translation in rows:
+                    for text in keys.get(source, []):
+                        found[text] = translation
+
+            self.lookups += sum(len(lines) for lines in keys.values())
+            self.hits += sum(len(lines) for lines in keys.values() if lines[0] in found)
+
+        return found
+
+    def FindSimilar(self, source_language : str, target_language : str, text : str, threshold : float, limit : int = 1) -> list[tuple[str, str, float]]:
+        """
+        Find stored translations of lines similar to the text, returning (source, translation, similarity) for the closest matches.
+        Similarity is the proportion of character trigrams the lines have in common.
+        """
+        normalised = NormaliseSourceText(text)
+        if len(normalised) < _MIN_SIMILAR_LENGTH:
+            return []
+
+        shingles = _get_shingles(normalised)
+        band_hashes = _get_band_hashes(shingles)
+
+        with self.lock:
+            rows = self.connection.execute(
+                f"""SELECT DISTINCT entries.source, entries.translation FROM bands JOIN entries ON entries.id = bands.entry_id
+                    WHERE bands.band_hash IN ({','.join('?' * len(band_hashes))}) AND entries.source_language = ? AND entries.target_language = ?""",
+                (*band_hashes, source_language, target_language)).fetchall()
+
+        matches : list[tuple[str, str, float]] = []
+        for source, translation in rows:
+            if source == normalised:
+                continue
+
+            candidate = _get_shingles(source)
+            similarity = len(shingles & candidate) / len(shingles | candidate)
+            if similarity >= threshold:
+                matches.append((source, translation, similarity))
+
+        matches.sort(key=lambda match: match[2], reverse=True)
+        matches = matches[:limit]
+
+        if matches:
+            with self.lock:
+                self.similar += 1
+
+        return matches
+
+    def Store(self, source_language : str, target_language : str, translations : Iterable[tuple[str, str]]) -> None:
+        """
+        Store translations of lines of source text, replacing any previous translation of the same text
+        """
+        entries = { NormaliseSourceText(source) : translation.strip() for source, translation in translations }
+        entries = { source : translation for source, translation in entries.items() if source and translation }
+        if not entries:
+            return
+
+        now = time.time()
+        with self.lock:
+            for source, translation in entries.items():
+                row = self.connection.execute(
+                    "SELECT id, translation FROM entries WHERE source_language = ? AND target_language = ? AND source = ?",
+                    (source_language, target_language, source)).fetchone()
+
+                if row is None:
+                    cursor = self.connection.execute(
+                        "INSERT INTO entries (source_language, target_language, source, translation, updated) VALUES (?, ?, ?, ?, ?)",
+                        (source_language, target_language, source, translation, now))
+                    self.connection.executemany("INSERT INTO bands (entry_id, band_hash) VALUES (?, ?)",
+                                                [ (cursor.lastrowid, band_hash) for band_hash in _get_band_hashes(_get_shingles(source)) ])
+
+                elif row[1] != translation:
+                    self.connection.execute("UPDATE entries SET translation = ?, updated = ? WHERE id = ?", (translation, now, row[0]))
+
+            self.stores += len(entries)
+            self.connection.commit()
+
+    def Clear(self) -> None:
+        """
+        Remove all stored translations
+        """
+        with self.lock:
+            self.connection.execute("DELETE FROM bands")
+            self.connection.execute("DELETE FROM entries")
+            self.connection.commit()
+
+    def Close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+def NormaliseSourceText(text : str) -> str:
+    """
+    Normalise a line of source text so that differences in whitespace and character forms are ignored
+    """
+    return CompressWhitespace(unicodedata.normalize('NFKC', text or '')).strip()
+
+def _get_shingles(normalised : str) -> set[int]:
+    """
+    Hash the overlapping character trigrams of a line, ignoring case
+    """
+    text = normalised.casefold()
+    if len(text) <= _SHINGLE_SIZE:
+        return { zlib.crc32(text.encode('utf-8')) }
+
+    return { zlib.crc32(text[i:i + _SHINGLE_SIZE].encode('utf-8')) for i in range(len(text) - _SHINGLE_SIZE + 1) }
+
+def _get_band_hashes(shingles : set[int]) -> list[int]:
+    """
+    Compute the MinHash signature of a set of shingles and hash each band of the signature
+    """
+    signature = [ min((a * shingle + b) % _MERSENNE_PRIME for shingle in shingles) for a, b in _PERMUTATIONS ]
+
+    band_hashes = []
+    for band in range(_BANDS):
+        rows = signature[band * _BAND_ROWS:(band + 1) * _BAND_ROWS]
+        digest = hashlib.blake2b(repr((band, rows)).encode('ascii'), digest_size=8).digest()
+        band_hashes.append(int.from_bytes(digest, 'big', signed=True))
+
+    return band_hashes
+
+_translation_memories : dict[str, TranslationMemory] = {}
+_translation_memories_lock = threading.Lock()
+
+def GetTranslationMemory(path : str) -> TranslationMemory|None:
+    """
+    Get the shared translation memory stored at path, opening it if necessary
+    """
+    path = os.path.abspath(path)
+    with _translation_memories_lock:
+        memory = _translation_memories.get(path)
+        if memory is None:
+            try:
+                memory = TranslationMemory(path)
+            except (sqlite3.Error, OSError) as e:
+                logging.warning(_("Unable to open translation memory at {path}: {error}").format(path=path, error=str(e)))
+                return None
+
+            _translation_memories[path] = memory
+
+        return memory
+
+def CloseTranslationMemories() -> None:
+    """
+    Close all shared translation memories
+    """
+    with _translation_memories_lock:
+        for memory in _translation_memories.values():
+            memory.Close()
+        _translation_memories.clear()
@@ -1,10 +1,12 @@
+from collections.abc import Mapping
 from datetime import timedelta
 import logging
+import threading
 from typing import Any
 import regex
 
 from PySubtrans.Instructions import DEFAULT_TASK_TYPE
-from PySubtrans.Options import Options
+from PySubtrans.SettingsType import SettingType
 from PySubtrans.Helpers.Localization import _
 from PySubtrans.Helpers.SubtitleHelpers import MergeTranslations
 from PySubtrans.Helpers.Text import IsTextContentEqual
@@ -30,12 +32,37 @@ fallback_patterns = [
     r"#(?P<number>\d+)(?:[\s\r\n]+(?P<body>[\s\S]*?))?(?:(?=\n{2,})|\Z)"  # Just the number and translation
     ]
 
+# Start of a line block in a response, e.g. "#12"
+block_start_pattern = regex.compile(r"^#\d+", regex.MULTILINE)
+
+# Marker that a block has reached its translation
+translation_marker_pattern = regex.compile(r"Translation[>:]")
+
+_pattern_cache : dict[str, list[regex.Pattern[Any]]] = {}
+_pattern_cache_lock = threading.Lock()
+
+def GetTranslationPatterns(task_type : str = DEFAULT_TASK_TYPE) -> list[regex.Pattern[Any]]:
+    """
+    Get the compiled patterns for a task type, compiling them on first use.
+    The list is shared between parsers so it must not be modified.
+    """
+    with _pattern_cache_lock:
+        patterns = _pattern_cache.get(task_type)
+        if patterns is None:
+            # Use the current default pattern, and fall back on alternative/older patterns if no matches are found
+            patterns = [
+                regex.compile(pattern.replace(DEFAULT_TASK_TYPE, task_type), regex.MULTILINE) for pattern in [default_pattern] + fallback_patterns
+                ]
+            _pattern_cache[task_type] = patterns
+
+        return patterns
+
 class TranslationParser:
     """
     Extract translated subtitles from the AI translation response
     """
-    def __init__(self, task_type : str, options : Options):
-        self.options : Options = options
+    def __init__(self, task_type : str, options : Mapping[str, SettingType]):
+        self.options : Mapping[str, SettingType] = options
         self.text : str|None = None
         self.translations : dict[int|str, SubtitleLine] = {}
         self.translated : list[SubtitleLine] = []
@@ -49,12 +76,7 @@ class TranslationParser:
         """
         Returns a list of regular expressions to try for extracting translations
         """
-        # Use the current default pattern, and fall back on alternative/older patterns if no matches are found
-        patterns = [
-            regex.compile(
-                pattern.replace(DEFAULT_TASK_TYPE, task_type), regex.MULTILINE) for pattern in [default_pattern] + fallback_patterns
-            ]
-        return patterns
+        return GetTranslationPatterns(task_type)
 
     def ProcessTranslation(self, translation : Translation, validate : bool = True) -> list[SubtitleLine]|None:
         """
@@ -125,17 +147,7 @@ class TranslationParser:
         for item in originals:
             translation : SubtitleLine|None = self.translations.get(item.key)
             if translation:
-                translation.number = item.number
-                translation.start = item.start or timedelta(seconds=0)
-                translation.end = item.end or timedelta(seconds=0)
-                translation.metadata = item.metadata
-
-                if translation.original and IsTextContentEqual(translation.text, item.text):
-                    # Check for swapped original & translation
-                    translation.text = translation.original
-                    translation.original = item.text
-
-                item.translation = translation.text
+                self._match_translation(translation, item)
                 matched.append(translation)
 
             else:
@@ -150,6 +162,22 @@ class TranslationParser:
 
         return matched, unmatched
 
+    def _match_translation(self, translation : SubtitleLine, item : SubtitleLine) -> None:
+        """
+        Copy the timing and metadata of the original line to its translation
+        """
+        translation.number = item.number
+        translation.start = item.start or timedelta(seconds=0)
+        translation.end = item.end or timedelta(seconds=0)
+        translation.metadata = item.metadata
+
+        if translation.original and IsTextContentEqual(translation.text, item.text):
+            # Check for swapped original & translation
+            translation.text = translation.original
+            translation.original = item.text
+
+        item.translation = translation.text
+
     def TryFuzzyMatches(self, unmatched : list [SubtitleLine]) -> None:
         """
         Try to match translations to their source lines using heuristics
@@ -206,3 +234,81 @@ class TranslationParser:
                 last_line.text = last_line.text[:match.start()]
                 break
             
+
+class StreamingTranslationParser(TranslationParser):
+    """
+    Extract translated subtitles from a response as it is streamed.
+
+    A cursor marks the end of the last completed line block, so each update only parses
+    blocks that have been completed since the previous one rather than the whole response.
+    """
+    def __init__(self, task_type : str, options : Mapping[str, SettingType]):
+        super().__init__(task_type, options)
+        self.cursor : int = 0
+        self.boundary : str = ""
+
+    def Reset(self) -> None:
+        """
+        Discard the parsing state, e.g. when a request is retried
+        """
+        self.cursor = 0
+        self.boundary = ""
+        self.translations = {}
+
+    def ProcessStreamingText(self, text : str) -> list[SubtitleLine]:
+        """
+        Parse line blocks that have been completed since the last update.
+        text is the response received so far, and should end at a line group boundary.
+        """
+        if self.cursor > len(text) or text[max(0, self.cursor - len(self.boundary)):self.cursor] != self.boundary:
+            # The text does not continue the response we have seen, so start again
+            self.Reset()
+
+        starts = [ match.start() for match in block_start_pattern.finditer(text, self.cursor) ]
+        if not starts:
+            return []
+
+        # A block is complete once the next block has started
+        block_ends = starts[1:]
+
+        # The final block is complete if it has a translation followed by a blank line
+        last_block = text[starts[-1]:]
+        if last_block.endswith("\n\n") and translation_marker_pattern.search(last_block):
+            block_ends.append(len(text))
+
+        new_lines : list[SubtitleLine] = []
+        for start, end in zip(starts, block_ends):
+            new_lines.extend(self._parse_block(text[start:end]))
+
+        if block_ends:
+            self.cursor = block_ends[-1]
+            self.boundary = text[max(0, self.cursor - 16):self.cursor]
+
+        return new_lines
+
+    def MatchStreamingTranslations(self, lines : list[SubtitleLine], originals : dict[int|str, SubtitleLine]) -> list[SubtitleLine]:
+        """
+        Match newly parsed lines with the original lines, keyed by line number
+        """
+        matched : list[SubtitleLine] = []
+        for translation in lines:
+            item = originals.get(translation.key)
+            if item is not None:
+                self._match_translation(translation, item)
+                matched.append(translation)
+
+        return matched
+
+    def _parse_block(self, block : str) -> list[SubtitleLine]:
+        """
+        Parse a single line block, trying each pattern in turn
+        """
+        for template in self.regex_patterns:
+            matches = self.FindMatches(f"{block.rstrip()}\n\n", template)
+            if matches:
+                lines = [ SubtitleLine(match) for match in matches ]
+                for line in lines:
+                    self.translations[line.key] = line
+                return lines
+
+        return []
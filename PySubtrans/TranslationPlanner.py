@@ -0,0 +1,243 @@
+import heapq
+import json
+import logging
+
+from PySubtrans.Helpers.Localization import _
+from PySubtrans.Options import SettingsType
+from PySubtrans.SubtitleError import TranslationError
+from PySubtrans.SubtitleLine import SubtitleLine
+from PySubtrans.SubtitleTranslator import SubtitleTranslator
+from PySubtrans.Subtitles import Subtitles
+from PySubtrans.TokenEstimator import TokenEstimator
+
+class ModelPricing:
+    """
+    Cost of a model in currency units per million tokens
+    """
+    def __init__(self, input_cost : float, output_cost : float):
+        self.input_cost : float = input_cost
+        self.output_cost : float = output_cost
+
+    def GetCost(self, input_tokens : int, output_tokens : int) -> float:
+        return (input_tokens * self.input_cost + output_tokens * self.output_cost) / 1_000_000
+
+def LoadPricingTable(path : str) -> dict[str, ModelPricing]:
+    """
+    Load a pricing table from a JSON file mapping model names to input and output costs per million tokens, e.g.
+    { "gpt-5-mini": { "input": 0.25, "output": 2.0 } }
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    if not isinstance(data, dict):
+        raise ValueError(_("Pricing table must be a JSON object mapping model names to prices"))
+
+    table : dict[str, ModelPricing] = {}
+    for model, prices in data.items():
+        if not isinstance(prices, dict) or 'input' not in prices or 'output' not in prices:
+            logging.warning(_("Ignoring invalid pricing for {model}").format(model=model))
+            continue
+
+        table[model] = ModelPricing(float(prices['input']), float(prices['output']))
+
+    return table
+
+def GetModelPricing(table : dict[str, ModelPricing], model : str|None) -> ModelPricing|None:
+    """
+    Find the pricing for a model, falling back to the longest entry that the model name starts with (e.g. for dated model versions)
+    """
+    if not model:
+        return None
+
+    if model in table:
+        return table[model]
+
+    matches = [ name for name in table if model.startswith(name) ]
+    return table[max(matches, key=len)] if matches else None
+
+class BatchPlan:
+    """
+    Estimated requirements for translating a single batch
+    """
+    def __init__(self, scene : int, batch : int, lines : int, input_tokens : int, output_tokens : int, duration : float):
+        self.scene : int = scene
+        self.batch : int = batch
+        self.lines : int = lines
+        self.input_tokens : int = input_tokens
+        self.output_tokens : int = output_tokens
+        self.duration : float = duration
+
+    def __str__(self) -> str:
+        return f"Scene {self.scene} batch {self.batch}: {self.lines} lines, ~{self.input_tokens} tokens in / ~{self.output_tokens} tokens out, ~{self.duration:.1f}s"
+
+class TranslationPlan:
+    """
+    Estimated requirements for translating one or more subtitle files
+    """
+    def __init__(self, name : str|None = None, batches : list[BatchPlan]|None = None, duration : float = 0.0, cost : float|None = None, files : int = 1):
+        self.name : str|None = name
+        self.batches : list[BatchPlan] = batches or []
+        self.duration : float = duration
+        self.cost : float|None = cost
+        self.files : int = files
+
+    @property
+    def requests(self) -> int:
+        return len(self.batches)
+
+    @property
+    def lines(self) -> int:
+        return sum(batch.lines for batch in self.batches)
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(batch.input_tokens for batch in self.batches)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(batch.output_tokens for batch in self.batches)
+
+    def Add(self, plan : 'TranslationPlan') -> None:
+        """
+        Accumulate another plan into this one, as if the files were translated one after another
+        """
+        self.batches.extend(plan.batches)
+        self.duration += plan.duration
+        self.files += plan.files
+        if plan.cost is not None:
+            self.cost = (self.cost or 0.0) + plan.cost
+
+    def FormatSummary(self) -> str:
+        """
+        Describe the plan in a single line
+        """
+        parts = [
+            f"{self.requests} requests",
+            f"{self.lines} lines",
+            f"~{self.input_tokens} input tokens",
+            f"~{self.output_tokens} output tokens",
+        ]
+
+        if self.cost is not None:
+            parts.append(f"~${self.cost:.2f}")
+
+        parts.append(f"~{_format_duration(self.duration)}")
+
+        prefix = f"{self.name}: " if self.name else ""
+        return prefix + ", ".join(parts)
+
+class TranslationPlanner:
+    """
+    Estimates the tokens, cost and time needed to translate subtitles without calling the provider.
+
+    Prompts are built by running the translator in preview mode, so the estimates reflect the actual
+    instructions, context and batching that would be used. Request durations are estimated from a fixed
+    latency plus the expected output tokens, and scenes are scheduled across the available concurrency
+    subject to the configured rate limits.
+    """
+    def __init__(self, settings : SettingsType, pricing : ModelPricing|None = None, token_estimator : TokenEstimator|None = None,
+                 request_latency : float = 2.0, output_tokens_per_second : float = 50.0):
+        self.pricing : ModelPricing|None = pricing
+        self.token_estimator : TokenEstimator = token_estimator or TokenEstimator()
+        self.request_latency : float = request_latency
+        self.output_tokens_per_second : float = output_tokens_per_second
+        self.requests_per_minute : float|None = settings.get_float('rate_limit')
+        self.tokens_per_minute : float|None = settings.get_float('token_rate_limit')
+
+        max_threads = settings.get_int('max_threads') or 1
+        self.concurrency : int = max(1, max_threads) if settings.get_bool('multithreaded_translation') else 1
+
+    def PlanTranslation(self, translator : SubtitleTranslator, subtitles : Subtitles, name : str|None = None) -> TranslationPlan:
+        """
+        Build the prompts for every batch with a preview translation and estimate the requirements
+        """
+        if not translator.preview:
+            raise TranslationError(_("Translation planning requires preview mode"))
+
+        translator.TranslateSubtitles(subtitles)
+
+        concurrency = translator.max_threads if translator.multithreaded else 1
+
+        with translator.lock:
+            prompt_lines = dict(translator.prompt_lines)
+
+        return self.PlanSubtitles(subtitles, name, concurrency=concurrency, prompt_lines=prompt_lines)
+
+    def PlanSubtitles(self, subtitles : Subtitles, name : str|None = None, concurrency : int|None = None,
+                      prompt_lines : dict[tuple[int, int], list[SubtitleLine]]|None = None) -> TranslationPlan:
+        """
+        Estimate the requirements for batched subtitles, using the batch prompts if they have been built.
+        If prompt_lines is provided only the batches and lines it contains are sent, otherwise batches that are already translated are skipped.
+        """
+        batches : list[BatchPlan] = []
+        scene_durations : list[float] = []
+
+        for scene in subtitles.scenes:
+            scene_duration = 0.0
+            for batch in scene.batches:
+                if prompt_lines is not None:
+                    lines = prompt_lines.get((scene.number, batch.number))
+                    if lines is None:
+                        continue
+                elif batch.all_translated:
+                    continue
+                else:
+                    lines = batch.originals
+
+                if batch.prompt:
+                    input_tokens = self.token_estimator.EstimatePromptTokens(batch.prompt)
+                else:
+                    input_tokens = sum(self.token_estimator.EstimateLineInputTokens(line) for line in lines)
+
+                output_tokens = self.token_estimator.response_overhead + sum(self.token_estimator.EstimateLineOutputTokens(line) for line in lines)
+                duration = self.request_latency + output_tokens / self.output_tokens_per_second
+
+                batches.append(BatchPlan(scene.number, batch.number, len(lines), input_tokens, output_tokens, duration))
+                scene_duration += duration
+
+            scene_durations.append(scene_duration)
+
+        plan = TranslationPlan(name, batches)
+        plan.duration = self._estimate_duration(plan, scene_durations, concurrency or self.concurrency)
+        plan.cost = self.pricing.GetCost(plan.input_tokens, plan.output_tokens) if self.pricing else None
+        return plan
+
+    def CombinePlans(self, plans : list[TranslationPlan], name : str|None = None, jobs : int = 1) -> TranslationPlan:
+        """
+        Combine the plans for several files, translating up to jobs files at once under the shared rate limits
+        """
+        total = TranslationPlan(name, files=0)
+        for plan in plans:
+            total.Add(plan)
+
+        total.duration = self._estimate_duration(total, [ plan.duration for plan in plans ], jobs)
+        return total
+
+    def _estimate_duration(self, plan : TranslationPlan, durations : list[float], concurrency : int) -> float:
+        """
+        Schedule scenes (or files) across the available workers in order, then apply the rate limits as lower bounds
+        """
+        workers : list[float] = [0.0] * min(max(1, concurrency), max(1, len(durations)))
+        for item_duration in durations:
+            heapq.heappush(workers, heapq.heappop(workers) + item_duration)
+
+        duration = max(workers)
+
+        if self.requests_per_minute and plan.requests > 1:
+            duration = max(duration, (plan.requests - 1) * 60.0 / self.requests_per_minute)
+
+        if self.tokens_per_minute:
+            # The token bucket starts with a minute's worth of tokens
+            excess_tokens = plan.input_tokens - self.tokens_per_minute
+            duration = max(duration, excess_tokens * 60.0 / self.tokens_per_minute)
+
+        return duration
+
+def _format_duration(seconds : float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
@@ -7,7 +7,8 @@ from PySubtrans.SubtitleLine import SubtitleLine
 default_prompt_template: str = "<context>\n{context}\n</context>\n\n{prompt}\n\n<summary>Summary of the batch</summary>\n<scene>Summary of the scene</scene>\n"
 default_line_template: str = "#{number}\nOriginal>\n{text}\nTranslation>\n"
 default_tag_template: str = "<{tag}>{content}</{tag}>"
-default_context_tags: list[str] = ['description', 'names', 'terminology', 'history', 'scene', 'summary', 'batch']
+default_context_tags: list[str] = ['description', 'names', 'terminology', 'previous_translations', 'history', 'scene', 'summary', 'batch']
+default_static_context_tags: list[str] = ['description', 'names']
 
 class TranslationPrompt:
     """
@@ -41,6 +42,11 @@ class TranslationPrompt:
         self.tag_template: str = default_tag_template
         self.context_tags: list[str] = default_context_tags
 
+        # Flag controlling whether context that is the same for every batch is placed with the instructions,
+        # so that the prompt starts with an identical prefix that providers can cache
+        self.cache_friendly: bool = False
+        self.static_context_tags: list[str] = default_static_context_tags
+
         self.system_prompt: str|None = None
         self.batch_prompt: str|None = None
         self.content: str|list[str]|list[dict[str, str]]|None = None
@@ -61,6 +67,11 @@ class TranslationPrompt:
 
         self.batch_prompt = self.GenerateBatchPrompt(lines, context=context)
 
+        if self.cache_friendly and context:
+            static_context = _generate_tag_lines(context, self.static_context_tags, self.tag_template)
+            if static_context:
+                instructions = f"{instructions.strip()}\n\n{static_context}" if instructions else static_context
+
         if not instructions:
             self.messages.append({'role': user_role, 'content': self.batch_prompt})
         elif self.supports_system_prompt:
@@ -97,7 +108,7 @@ class TranslationPrompt:
         if self.user_prompt:
             prompt = f"{self.user_prompt}\n\n{prompt}\n"
 
-        tag_lines = _generate_tag_lines(context, self.context_tags, self.tag_template) if context else ""
+        tag_lines = _generate_tag_lines(context, self._get_batch_context_tags(), self.tag_template) if context else ""
 
         if tag_lines:
             prompt = self.prompt_template.format(prompt=prompt, context=tag_lines)
@@ -140,6 +151,13 @@ class TranslationPrompt:
         self.messages = messages
         self._generate_content()
 
+    def _get_batch_context_tags(self) -> list[str]:
+        """ Context tags to include in the batch prompt - static context is moved to the instructions in cache-friendly mode """
+        if not self.cache_friendly:
+            return self.context_tags
+
+        return [ tag for tag in self.context_tags if tag not in self.static_context_tags ]
+
     def _wrap_system_message(self, message : str) -> str:
         separator = "--------"
         return '\n'.join( [ separator, "SYSTEM", separator, message.strip(), separator])
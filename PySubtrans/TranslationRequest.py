@@ -20,6 +20,9 @@ class TranslationRequest:
         # Additional context storage
         self.context : dict[str, Any] = {}
 
+        # Whether the request currently holds a slot from the concurrency governor
+        self.holds_request_slot : bool = False
+
     @property
     def is_streaming(self) -> bool:
         """Check if this is a streaming request"""
@@ -174,6 +174,8 @@ def init_subtitles(
             min_batch_size=options.get_int('min_batch_size') or 1,
             max_batch_size=options.get_int('max_batch_size') or 100,
             prevent_overlap=options.get_bool('prevent_overlapping_times'),
+            max_input_tokens=options.get_int('max_input_tokens'),
+            max_output_tokens=options.get_int('max_output_tokens'),
         )
 
     return subtitles
@@ -237,6 +239,7 @@ def init_translator(
     settings : Options|SettingsType,
     translation_provider : TranslationProvider|None = None,
     terminology_map : dict[str,str]|None = None,
+    resume : bool = False,
 ) -> SubtitleTranslator:
     """
     Return a ready-to-use :class:`SubtitleTranslator` using the specified settings.
@@ -250,6 +253,8 @@ def init_translator(
     terminology_map : dict[str, str] or None, optional
         Seed terminology map used to guide consistent term translation.  The translator builds on this map as translation proceeds;
         subscribe to the ``terminology_updated`` event to receive snapshots after each batch.
+    resume : bool, optional
+        If True, batches that are already translated are skipped rather than translated again.
 
     Exceptions
     ----------
@@ -294,7 +299,7 @@ def init_translator(
 
     options.provider = translation_provider.name
 
-    return SubtitleTranslator(options, translation_provider, terminology_map=terminology_map)
+    return SubtitleTranslator(options, translation_provider, resume=resume, terminology_map=terminology_map)
 
 
 def init_project(
@@ -389,6 +394,8 @@ def init_project(
                     min_batch_size=options.get_int('min_batch_size') or 1,
                     max_batch_size=options.get_int('max_batch_size') or 100,
                     prevent_overlap=options.get_bool('prevent_overlapping_times'),
+                    max_input_tokens=options.get_int('max_input_tokens'),
+                    max_output_tokens=options.get_int('max_output_tokens'),
                 )
 
     return project
@@ -426,6 +433,8 @@ def batch_subtitles(
     max_batch_size: int,
     *,
     prevent_overlap: bool = False,
+    max_input_tokens: int|None = None,
+    max_output_tokens: int|None = None,
 ) -> list[SubtitleScene]:
     """
     Divide subtitles into scenes and batches using :class:`SubtitleBatcher`.
@@ -442,6 +451,10 @@ def batch_subtitles(
         Maximum number of lines per batch.
     prevent_overlap : bool, optional
         If True, adjust overlapping subtitle times while batching.
+    max_input_tokens : int, optional
+        Maximum estimated prompt tokens for the lines in each batch.
+    max_output_tokens : int, optional
+        Maximum estimated response tokens for each batch.
 
     Returns
     -------
@@ -459,6 +472,8 @@ def batch_subtitles(
         'min_batch_size': min_batch_size,
         'max_batch_size': max_batch_size,
         'prevent_overlapping_times': prevent_overlap,
+        'max_input_tokens': max_input_tokens,
+        'max_output_tokens': max_output_tokens,
     }))
 
     with SubtitleEditor(subtitles) as editor:
@@ -19,6 +19,11 @@ Important options:
 - instruction_file: Path to a file containing detailed custom instructions for the translator (examples can be downloaded from the LLM-Subtrans repository)
 - output_format: (optionally) write all translated subtitles using a specific file format (e.g. ".srt")
 - preview: Exercise the workflow without making any API calls to the translation provider
+- plan: Estimate the tokens, cost and time needed to translate the files without making any API calls
+- pricing_file: JSON file of model prices per million tokens, used to estimate costs when planning
+- jobs: Number of files to translate concurrently (requests to the provider are still bounded by adaptive_max_concurrency and the rate limits)
+- manifest_file: Database recording the progress of the job, so that an interrupted run can be resumed
+- translation_memory: Reuse translations of lines that have been translated before (e.g. opening songs and recaps in a series)
 
 Options can be specified by:
 - Passing command line arguments
@@ -34,16 +39,31 @@ EXAMPLES:
     python scripts/batch-translate.py ./subtitles ./translated --language="French" \\
         --provider="OpenAI" --model="gpt-5-mini" --apikey="sk-..."
 
+    # Estimate the cost and time to translate a directory before committing to it
+    python scripts/batch-translate.py ./subtitles ./translated --plan --pricing ./pricing.json
+
+    # Translate four files at a time
+    python scripts/batch-translate.py ./subtitles ./translated --jobs 4 --option max_threads=8
+
+    # Record progress so that rerunning the same command resumes where it left off
+    python scripts/batch-translate.py ./subtitles ./translated --manifest ./translated/batch-manifest.db
+
+    # Reuse translations of lines that repeat across the episodes of a series
+    python scripts/batch-translate.py ./season1 ./translated --translation-memory --option translation_memory_path=./season1-memory.db
+
 There are many more options available, some of which are provider-specific. 
 See Options.py or the documentation at https://github.com/machinewrapped/llm-subtrans/ for more details.
 """
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
 import logging
+import os
 import pathlib
 import sys
+import threading
 
 from PySubtrans import init_options, init_subtitles, init_translator, init_translation_provider
 from PySubtrans import Options, SettingsType, SubtitleError
@@ -53,7 +73,11 @@ from PySubtrans import SubtitleFormatRegistry
 
 from PySubtrans.Helpers import GetOutputPath
 from PySubtrans.Helpers.Parse import FormatKeyValuePairs, ParseKeyValuePairs
+from PySubtrans.JobManifest import FileState, GetOptionsFingerprint, JobManifest
+from PySubtrans.ResponseCache import CloseResponseCaches, GetResponseCache, default_cache_path
+from PySubtrans.TranslationMemory import GetTranslationMemory, default_memory_path
 from PySubtrans.SettingsType import redact_sensitive_values
+from PySubtrans.TranslationPlanner import GetModelPricing, LoadPricingTable, ModelPricing, TranslationPlan, TranslationPlanner
 
 # Default configuration options for batch processing.
 # These can be overridden by command line arguments.
@@ -75,10 +99,18 @@ DEFAULT_OPTIONS = SettingsType({
     'postprocess_translation': True,                # Whether to apply postprocessing steps to the translated subtitles
     'log_path': './batch-translate.log',
     'preview': False,                               # Set to True to exercise the workflow without calling the API to execute translations.
+    'plan': False,                                  # Set to True to estimate tokens, cost and time for the translation without calling the API
+    'pricing_file': None,                           # JSON file of model prices per million tokens, e.g. {"gpt-5-mini": {"input": 0.25, "output": 2.0}}
     'build_terminology_map': False,                 # Build a terminology map across files for consistent name/term translation
     'terminology_file': None,                       # File to persist the terminology map between runs (key::value per line)
+    'jobs': 1,                                      # Number of files to translate concurrently
+    'manifest_file': None,                          # Database recording the progress of the job so that it can be resumed
+    'translation_memory': False,                    # Reuse translations of repeated lines and suggest translations of similar lines
 })
 
+# Options that only affect how the batch is run, so changing them does not invalidate the manifest
+BATCH_OPTIONS = { 'source_path', 'destination_path', 'log_path', 'jobs', 'plan', 'pricing_file', 'terminology_file', 'manifest_file' }
+
 class BatchJobConfig:
     """
     Container for batch translation configuration
@@ -100,6 +132,10 @@ class BatchJobConfig:
         self.instruction_file = self.options.get_str('instruction_file')
         self.build_terminology_map = self.options.get_bool('build_terminology_map')
         self.terminology_file = self.options.get_str('terminology_file')
+        self.plan = self.options.get_bool('plan')
+        self.pricing_file = self.options.get_str('pricing_file')
+        self.jobs = max(1, self.options.get_int('jobs') or 1)
+        self.manifest_file = self.options.get_str('manifest_file')
 
 class BatchProcessor:
     """Coordinate discovery and translation of subtitle files."""
@@ -110,6 +146,13 @@ class BatchProcessor:
         self.logger = logging.getLogger(__name__)
         self.progress_display = ProgressDisplay()
         self.translation_provider = self._initialise_provider()
+        self.planner : TranslationPlanner|None = TranslationPlanner(self.options, pricing=self._load_pricing()) if config.plan else None
+        self.file_plans : list[TranslationPlan] = []
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._active_translators : set[SubtitleTranslator] = set()
+        self.manifest : JobManifest|None = None
+        self.options_hash : str = GetOptionsFingerprint(self.options, BATCH_OPTIONS)
         self._terminology_map : dict[str, str] = {}
         if config.build_terminology_map and config.terminology_file:
             self._terminology_map = self._load_terminology_file(config.terminology_file)
@@ -153,101 +196,296 @@ class BatchProcessor:
 
         self.logger.info("Translating %d subtitle file(s) from %s to %s", len(files), source_root, destination_root)
 
-        for index, source_file in enumerate(files, start=1):
-            relative_name = source_file.relative_to(source_root)
-            output_base = destination_root / relative_name
+        # Progress is not recorded when previewing, as nothing is translated
+        if self.config.manifest_file and not self.options.get_bool('preview'):
+            self.manifest = JobManifest(self.config.manifest_file)
+            self.logger.info("Recording progress in %s", self.config.manifest_file)
+
+        try:
+            jobs = min(self.config.jobs, len(files))
+            if jobs > 1:
+                self._process_files_concurrently(files, source_root, destination_root, jobs, stats)
+            else:
+                for index, source_file in enumerate(files, start=1):
+                    stats.record(self._process_file(index, len(files), source_file, source_root, destination_root))
+
+        finally:
+            if self.manifest:
+                self.manifest.Close()
+                self.manifest = None
+
+        if self.planner:
+            # Files are translated up to jobs at a time, so the total time is scheduled rather than summed
+            plan_total = self.planner.CombinePlans(self.file_plans, "Total", jobs=self.config.jobs)
+            self.logger.info("Plan for %d file(s) - %s", plan_total.files, plan_total.FormatSummary())
+
+        if self.options.get_bool('translation_memory'):
+            self._log_translation_memory_statistics()
 
-            self.logger.info("[%d/%d] Loading %s", index, len(files), source_file)
+        if self.options.get_bool('response_cache'):
+            self._log_response_cache_statistics()
+
+        return stats
+
+    def _log_translation_memory_statistics(self) -> None:
+        """Report how many lines were served from the translation memory instead of being sent to the provider."""
+        memory = GetTranslationMemory(self.options.get_str('translation_memory_path') or default_memory_path)
+        if not memory:
+            return
+
+        statistics = memory.statistics
+        self.logger.info(
+            "Translation memory: reused %d of %d lines (%.0f%%), suggested similar translations for %d lines, %d entries stored",
+            statistics['hits'], statistics['lookups'], statistics['hit_rate'] * 100, statistics['similar'], memory.count)
+
+    def _log_response_cache_statistics(self) -> None:
+        """Report how many requests were answered from the response cache instead of the provider."""
+        cache = GetResponseCache(self.options.get_str('response_cache_path') or default_cache_path)
+        if not cache:
+            return
+
+        statistics = cache.statistics
+        self.logger.info(
+            "Response cache: %d hits, %d misses, %d responses stored, %d evicted",
+            statistics['hits'], statistics['misses'], statistics['stores'], statistics['evictions'])
+
+    def _process_files_concurrently(
+        self,
+        files : list[pathlib.Path],
+        source_root : pathlib.Path,
+        destination_root : pathlib.Path,
+        jobs : int,
+        stats : BatchStatistics
+    ) -> None:
+        """
+        Translate several files at once with a shared provider.
+
+        Every translator's client draws on the same process-wide rate limiter and concurrency governor for the
+        account, so the total number of requests in flight is adapted to the provider's feedback, up to
+        adaptive_max_concurrency and within the rate limits, rather than being capped at max_threads.
+        """
+        self.logger.info("Translating up to %d files concurrently", jobs)
+
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="BatchJob") as executor:
+            futures : list[Future[str]] = [
+                executor.submit(self._process_file, index, len(files), source_file, source_root, destination_root)
+                for index, source_file in enumerate(files, start=1)
+            ]
 
             try:
-                subtitles = init_subtitles(filepath=str(source_file), options=self.options)
-                if self.config.build_terminology_map:
+                for future in as_completed(futures):
+                    stats.record(future.result())
+
+            except BaseException:
+                # A fatal error or an interruption stops the whole batch, so abandon files that have not started
+                # and stop the ones in progress rather than waiting for them to finish.
+                self._stopping.set()
+                for future in futures:
+                    future.cancel()
+                self._stop_active_translators()
+                raise
+
+    def _process_file(
+        self,
+        index : int,
+        count : int,
+        source_file : pathlib.Path,
+        source_root : pathlib.Path,
+        destination_root : pathlib.Path
+    ) -> str:
+        """
+        Load, translate and save a single file. Returns the outcome ('translated', 'previewed', 'skipped' or 'failed').
+        Raises SubtitleError if the batch should not continue.
+        """
+        relative_name = source_file.relative_to(source_root)
+        output_base = destination_root / relative_name
+        manifest_name = relative_name.as_posix()
+
+        if self.manifest and self.manifest.GetFileState(manifest_name, str(source_file), self.options_hash) == FileState.Completed:
+            destination = self.manifest.GetDestination(manifest_name)
+            if destination and os.path.exists(destination):
+                self.logger.info("[%d/%d] Skipping %s because it has not changed since it was translated", index, count, source_file)
+                return 'skipped'
+
+        self.logger.info("[%d/%d] Loading %s", index, count, source_file)
+
+        try:
+            subtitles = init_subtitles(filepath=str(source_file), options=self.options)
+            if self.config.build_terminology_map:
+                with self._lock:
                     subtitles.terminology_map = dict(self._terminology_map)
 
-            except SubtitleError as exc:
-                self.logger.error("Failed to load %s: %s", source_file, exc)
-                stats.failed_files += 1
-                continue
+        except SubtitleError as exc:
+            self.logger.error("Failed to load %s: %s", source_file, exc)
+            return 'failed'
 
-            self.logger.debug("Detected format %s", subtitles.file_format or "unknown")
+        self.logger.debug("Detected format %s", subtitles.file_format or "unknown")
 
-            try:
-                # Determine the final output path so language suffixes and format overrides are applied consistently.
-                destination_file = self._prepare_destination(output_base, subtitles.file_format)
+        try:
+            # Determine the final output path so language suffixes and format overrides are applied consistently.
+            destination_file = self._prepare_destination(output_base, subtitles.file_format)
 
-            except SubtitleError as exc:
-                self.logger.error("Unable to determine output path for %s: %s", source_file, exc)
-                stats.failed_files += 1
-                continue
+        except SubtitleError as exc:
+            self.logger.error("Unable to determine output path for %s: %s", source_file, exc)
+            return 'failed'
 
-            if not self.options.get_bool('preview') and destination_file.exists():
-                self.logger.info("Skipping %s because %s already exists", source_file, destination_file)
-                stats.skipped_files += 1
-                continue
+        # Files in the manifest are translated again if they have changed, otherwise existing translations are kept
+        if self.manifest and self.manifest.HasFile(manifest_name):
+            resume = self._resume_file(manifest_name, source_file, subtitles)
 
-            try:
+        elif not self.options.get_bool('preview') and destination_file.exists():
+            self.logger.info("Skipping %s because %s already exists", source_file, destination_file)
+            return 'skipped'
+
+        else:
+            resume = self._resume_file(manifest_name, source_file, subtitles) if self.manifest else False
+
+        try:
+            # Translators for concurrent files are created one at a time, as providers are not required to be thread safe
+            with self._lock:
                 translator : SubtitleTranslator = init_translator(
                     self.options,
                     translation_provider=self.translation_provider,
                     terminology_map=self._terminology_map if self.config.build_terminology_map else None,
+                    resume=resume,
                 )
 
-                # Connect the batch script logger to translation events
-                translator.events.connect_logger(self.logger)
+            # Connect the batch script logger to translation events
+            translator.events.connect_logger(self.logger)
 
-            except SubtitleError as exc:
-                raise SubtitleError(f"Unable to initialise translator: {exc}") from exc
+        except SubtitleError as exc:
+            raise SubtitleError(f"Unable to initialise translator: {exc}") from exc
 
-            if self.config.build_terminology_map:
-                translator.events.terminology_updated.connect(self._on_terminology_updated)
+        if self.config.build_terminology_map:
+            translator.events.terminology_updated.connect(self._on_terminology_updated)
 
+        if self.manifest:
+            manifest = self.manifest
+            def record_batch(_sender, batch) -> None:
+                # Only batches that are complete can be skipped when the file is resumed
+                if batch.all_translated and not batch.errors:
+                    manifest.RecordBatch(manifest_name, batch, subtitles.GetScene(batch.scene).summary)
+
+            # The receiver only lives as long as the translator, so it is held strongly
+            translator.events.batch_translated.connect(record_batch, weak=False)
+
+        if not self._register_translator(translator):
+            return 'failed'
+
+        try:
             # ProgressDisplay.track hooks into SubtitleTranslator events to provide
             # a concise console progress indicator while the batches are being processed.
             with self.progress_display.track(translator, source_file, translator.preview):
                 try:
-                    # TranslateSubtitles drives the end-to-end translation process,
-                    # raising SubtitleError if the provider reports a problem.
-                    translator.TranslateSubtitles(subtitles)
+                    if self.planner:
+                        # Build the prompts without calling the provider and estimate what the translation would need
+                        self._plan_translation(self.planner, translator, subtitles, str(relative_name))
+                    else:
+                        # TranslateSubtitles drives the end-to-end translation process,
+                        # raising SubtitleError if the provider reports a problem.
+                        translator.TranslateSubtitles(subtitles)
 
                 except SubtitleError as exc:
                     self.logger.error("Translation failed for %s: %s", source_file, exc)
-                    stats.failed_files += 1
-                    continue
+                    return 'failed'
                 except Exception:
                     self.logger.exception("Unexpected error translating %s", source_file)
-                    stats.failed_files += 1
-                    continue
-
-            if self.config.build_terminology_map and not translator.preview:
-                prev_count = len(self._terminology_map)
-                self._terminology_map = dict(translator.terminology_map)
-                new_count = len(self._terminology_map)
-                if new_count != prev_count:
-                    self.logger.info("Terminology map now has %d term(s) (+%d)", new_count, new_count - prev_count)
-                if self._terminology_map and self.config.terminology_file:
-                    self._save_terminology_file(self.config.terminology_file, self._terminology_map)
-
-            if translator.preview:
-                self.logger.info("Preview mode enabled - skipping save for %s", source_file)
-                stats.previewed_files += 1
-                continue
+                    return 'failed'
 
-            try:
-                # Save the translated subtitles. Format is deduced from the filename.
-                subtitles.SaveTranslation(str(destination_file))
+        finally:
+            self._unregister_translator(translator)
 
-            except (SubtitleError, OSError) as exc:
-                # A failure to write the result should abort the batch
-                # to avoid incurring further costs if we cannot save the translations.
-                raise SubtitleError(f"Failed to save translation for {source_file}: {exc}") from exc
+        if self._stopping.is_set():
+            self.logger.warning("Batch stopped before %s was saved", source_file)
+            return 'failed'
 
-            if translator.errors:
-                self.logger.warning("Translation completed with %d error(s) for %s", len(translator.errors), source_file)
+        if self.config.build_terminology_map and not translator.preview:
+            self._merge_terminology(translator.terminology_map)
 
-            stats.translated_files += 1
-            self.logger.info("Saved translation to %s", destination_file)
+        if translator.preview:
+            self.logger.info("Preview mode enabled - skipping save for %s", source_file)
+            return 'previewed'
 
-        return stats
+        try:
+            # Save the translated subtitles. Format is deduced from the filename.
+            subtitles.SaveTranslation(str(destination_file))
+
+        except (SubtitleError, OSError) as exc:
+            # A failure to write the result should abort the batch
+            # to avoid incurring further costs if we cannot save the translations.
+            raise SubtitleError(f"Failed to save translation for {source_file}: {exc}") from exc
+
+        if translator.errors:
+            self.logger.warning("Translation completed with %d error(s) for %s", len(translator.errors), source_file)
+
+        elif self.manifest:
+            self.manifest.CompleteFile(manifest_name, str(destination_file))
+
+        self.logger.info("Saved translation to %s", destination_file)
+        return 'translated'
+
+    def _resume_file(self, manifest_name : str, source_file : pathlib.Path, subtitles) -> bool:
+        """
+        Record that a file is being translated and restore any batches that were completed by a previous run.
+        Returns True if the translation should be resumed.
+        """
+        if not self.manifest:
+            return False
+
+        self.manifest.BeginFile(manifest_name, str(source_file), self.options_hash)
+        restored = self.manifest.RestoreBatches(manifest_name, subtitles)
+        if restored:
+            self.logger.info("Resuming %s with %d batch(es) already translated", source_file, restored)
+
+        return restored > 0
+
+    def _register_translator(self, translator : SubtitleTranslator) -> bool:
+        """Keep track of a translator so that it can be stopped. Returns False if the batch is stopping."""
+        with self._lock:
+            if self._stopping.is_set():
+                return False
+            self._active_translators.add(translator)
+            return True
+
+    def _unregister_translator(self, translator : SubtitleTranslator) -> None:
+        with self._lock:
+            self._active_translators.discard(translator)
+
+    def _stop_active_translators(self) -> None:
+        """Ask any translations in progress to stop."""
+        with self._lock:
+            translators = list(self._active_translators)
+
+        for translator in translators:
+            translator.StopTranslating()
+
+    def _plan_translation(self, planner : TranslationPlanner, translator : SubtitleTranslator, subtitles, name : str) -> None:
+        """Estimate the requirements for translating a file and record them for the total."""
+        plan = planner.PlanTranslation(translator, subtitles, name)
+        for batch_plan in plan.batches:
+            self.logger.debug("%s", batch_plan)
+
+        self.logger.info("Plan - %s", plan.FormatSummary())
+        with self._lock:
+            self.file_plans.append(plan)
+
+    def _load_pricing(self) -> ModelPricing|None:
+        """Look up the price of the selected model in the pricing file, if one was provided."""
+        if not self.config.pricing_file:
+            return None
+
+        try:
+            pricing_table = LoadPricingTable(self.config.pricing_file)
+        except (OSError, ValueError) as exc:
+            self.logger.warning("Could not load pricing file %s: %s", self.config.pricing_file, exc)
+            return None
+
+        model = self.translation_provider.selected_model or self.config.model
+        pricing = GetModelPricing(pricing_table, model)
+        if not pricing:
+            self.logger.warning("No pricing found for model %s in %s", model, self.config.pricing_file)
+
+        return pricing
 
     def _discover_files(
         self,
@@ -286,13 +524,33 @@ class BatchProcessor:
         return destination_file
 
     def _on_terminology_updated(self, _sender, update) -> None:
-        self._terminology_map = dict(update.terminology_map)
+        # Files translated concurrently each discover terms, so new terms are merged into the shared map rather than replacing it
+        with self._lock:
+            for term, translation in update.new_terms.items():
+                self._terminology_map.setdefault(term, translation)
+            term_count = len(self._terminology_map)
+
         if update.new_terms:
             sample = ', '.join(f"{k}::{v}" for k, v in list(update.new_terms.items())[:5])
             self.logger.info("Scene %s batch %s: added %d new term(s): %s", update.scene, update.batch, len(update.new_terms), sample)
         if update.conflict_terms:
             self.logger.debug("Scene %s batch %s: %d conflicting term(s) skipped", update.scene, update.batch, len(update.conflict_terms))
-        self.progress_display.update_terminology_count(len(update.terminology_map))
+        self.progress_display.update_terminology_count(term_count)
+
+    def _merge_terminology(self, terminology_map : dict[str, str]) -> None:
+        """Merge the terms from a completed translation into the shared map and save it."""
+        with self._lock:
+            prev_count = len(self._terminology_map)
+            for term, translation in terminology_map.items():
+                self._terminology_map.setdefault(term, translation)
+
+            new_count = len(self._terminology_map)
+            if new_count != prev_count:
+                self.logger.info("Terminology map now has %d term(s) (+%d)", new_count, new_count - prev_count)
+
+            # The file is written under the lock so that concurrent files cannot interleave their saves
+            if self._terminology_map and self.config.terminology_file:
+                self._save_terminology_file(self.config.terminology_file, self._terminology_map)
 
     def _load_terminology_file(self, path : str) -> dict[str, str]:
         try:
@@ -357,10 +615,20 @@ def build_config(args : argparse.Namespace) -> BatchJobConfig:
         settings['instruction_file'] = args.instruction_file
     if args.preview is not None:
         settings['preview'] = args.preview
+    if args.plan is not None:
+        settings['plan'] = args.plan
+    if args.pricing_file is not None:
+        settings['pricing_file'] = args.pricing_file
     if args.build_terminology_map is not None:
         settings['build_terminology_map'] = args.build_terminology_map
     if args.terminology_file is not None:
         settings['terminology_file'] = args.terminology_file
+    if args.jobs is not None:
+        settings['jobs'] = args.jobs
+    if args.manifest_file is not None:
+        settings['manifest_file'] = args.manifest_file
+    if args.translation_memory is not None:
+        settings['translation_memory'] = args.translation_memory
 
     for override in args.option:
         if '=' not in override:
@@ -368,6 +636,10 @@ def build_config(args : argparse.Namespace) -> BatchJobConfig:
         key, value = override.split('=', 1)
         settings[key] = value
 
+    # Planning builds the prompts in preview mode so that nothing is sent to the provider
+    if settings.get_bool('plan'):
+        settings['preview'] = True
+
     # Initialize an Options instance with the combined settings
     options = init_options(**settings)
 
@@ -390,6 +662,17 @@ class BatchStatistics:
         self.skipped_files = skipped_files
         self.failed_files = failed_files
 
+    def record(self, outcome : str) -> None:
+        """Count the outcome of processing a file."""
+        if outcome == 'translated':
+            self.translated_files += 1
+        elif outcome == 'previewed':
+            self.previewed_files += 1
+        elif outcome == 'skipped':
+            self.skipped_files += 1
+        else:
+            self.failed_files += 1
+
     def as_message(self) -> str:
         """Return a human readable summary string."""
         return (
@@ -401,24 +684,37 @@ class BatchStatistics:
         )
 
 
+class FileProgress:
+    """Translation progress for a single file."""
+
+    def __init__(self, file_path : pathlib.Path, preview : bool):
+        self.file_path : pathlib.Path = file_path
+        self.preview : bool = preview
+        self.total_batches : int = 0
+        self.completed_batches : int = 0
+        self.total_scenes : int = 0
+        self.completed_scenes : int = 0
+        self.total_lines : int = 0
+        self.processed_lines : int = 0
+        self.last_batch_label : str = ""
+        self.last_batch_summary : str = ""
+        self.last_scene_label : str = ""
+        self.last_scene_summary : str = ""
+
+
 class ProgressDisplay:
-    """Render incremental translation progress on a single console line."""
+    """
+    Render incremental translation progress on a single console line.
+
+    When several files are translated at once their progress is combined into one line,
+    and each file's final progress is written on its own line when it completes.
+    """
 
     def __init__(self, stream = None):
         self.stream = stream or sys.stdout
-        self._current_file : pathlib.Path|None = None
-        self._preview : bool = False
-        self._total_batches : int = 0
-        self._completed_batches : int = 0
-        self._total_scenes : int = 0
-        self._completed_scenes : int = 0
-        self._total_lines : int = 0
-        self._processed_lines : int = 0
+        self._lock = threading.Lock()
+        self._files : dict[SubtitleTranslator, FileProgress] = {}
         self._last_message_length : int = 0
-        self._last_batch_label : str = ""
-        self._last_batch_summary : str = ""
-        self._last_scene_label : str = ""
-        self._last_scene_summary : str = ""
         self._terminology_count : int = 0
 
     @contextmanager
@@ -431,20 +727,12 @@ class ProgressDisplay:
             self._detach(translator)
 
     def _attach(self, translator : SubtitleTranslator, file_path : pathlib.Path, preview : bool) -> None:
-        self._current_file = file_path
-        self._preview = preview
-        self._total_batches = 0
-        self._completed_batches = 0
-        self._total_scenes = 0
-        self._completed_scenes = 0
-        self._total_lines = 0
-        self._processed_lines = 0
-        self._last_message_length = 0
-        self._last_batch_label = ""
-        self._last_batch_summary = ""
-        self._last_scene_label = ""
-        self._last_scene_summary = ""
-        self._terminology_count = 0
+        with self._lock:
+            self._files[translator] = FileProgress(file_path, preview)
+            if len(self._files) == 1:
+                self._last_message_length = 0
+                self._terminology_count = 0
+
         translator.events.preprocessed.connect(self._on_preprocessed)
         translator.events.batch_translated.connect(self._on_batch_translated)
         translator.events.scene_translated.connect(self._on_scene_translated)
@@ -454,50 +742,66 @@ class ProgressDisplay:
         translator.events.batch_translated.disconnect(self._on_batch_translated)
         translator.events.scene_translated.disconnect(self._on_scene_translated)
 
-        self._render(final=True)
-        self._current_file = None
-        self._preview = False
-
-    def _on_preprocessed(self, _sender, scenes : list) -> None:
-        self._total_scenes = len(scenes)
-        self._total_batches = sum(len(scene.batches) for scene in scenes)
-        self._total_lines = sum(scene.linecount for scene in scenes)
-        self._render()
-
-    def _on_batch_translated(self, _sender, batch) -> None:
-        self._completed_batches += 1
-        self._processed_lines += batch.size
-        self._last_batch_label = f"{batch.scene}.{batch.number}"
-        self._last_batch_summary = batch.summary or ""
-        logging.info("Translated batch %s: %s", self._last_batch_label, batch.summary or "no summary")
-        self._render()
-
-    def _on_scene_translated(self, _sender, scene) -> None:
-        self._completed_scenes += 1
-        self._last_scene_label = str(scene.number)
-        self._last_scene_summary = scene.summary or ""
-        logging.info("Completed scene %s: %s", self._last_scene_label, scene.summary or "no summary")
-        self._render()
-
-    def _render(self, final : bool = False) -> None:
-        if not self._current_file:
+        with self._lock:
+            progress = self._files.pop(translator, None)
+            if progress:
+                self._render([progress], final=True)
+            self._render(list(self._files.values()))
+
+    def _on_preprocessed(self, sender, scenes : list) -> None:
+        with self._lock:
+            progress = self._files.get(sender)
+            if not progress:
+                return
+            progress.total_scenes = len(scenes)
+            progress.total_batches = sum(len(scene.batches) for scene in scenes)
+            progress.total_lines = sum(scene.linecount for scene in scenes)
+            self._render(list(self._files.values()))
+
+    def _on_batch_translated(self, sender, batch) -> None:
+        with self._lock:
+            progress = self._files.get(sender)
+            if not progress:
+                return
+            progress.completed_batches += 1
+            progress.processed_lines += batch.size
+            progress.last_batch_label = f"{batch.scene}.{batch.number}"
+            progress.last_batch_summary = batch.summary or ""
+            logging.info("Translated batch %s of %s: %s", progress.last_batch_label, progress.file_path.name, batch.summary or "no summary")
+            self._render(list(self._files.values()))
+
+    def _on_scene_translated(self, sender, scene) -> None:
+        with self._lock:
+            progress = self._files.get(sender)
+            if not progress:
+                return
+            progress.completed_scenes += 1
+            progress.last_scene_label = str(scene.number)
+            progress.last_scene_summary = scene.summary or ""
+            logging.info("Completed scene %s of %s: %s", progress.last_scene_label, progress.file_path.name, scene.summary or "no summary")
+            self._render(list(self._files.values()))
+
+    def _render(self, files : list[FileProgress], final : bool = False) -> None:
+        """Write the combined progress of the files. Must be called with the lock held."""
+        if not files:
             return
-        scene_total = self._total_scenes if self._total_scenes else 0
-        batch_total = self._total_batches if self._total_batches else 0
+        scene_total = sum(progress.total_scenes for progress in files)
+        batch_total = sum(progress.total_batches for progress in files)
+        line_total = sum(progress.total_lines for progress in files)
         parts = [
-            f"Translating {self._current_file.name}",
-            f"scenes {self._completed_scenes}/{scene_total}",
-            f"batches {self._completed_batches}/{batch_total}",
+            f"Translating {files[0].file_path.name}" if len(files) == 1 else f"Translating {len(files)} files",
+            f"scenes {sum(progress.completed_scenes for progress in files)}/{scene_total}",
+            f"batches {sum(progress.completed_batches for progress in files)}/{batch_total}",
         ]
-        if self._total_lines:
-            parts.append(f"lines {self._processed_lines}/{self._total_lines}")
+        if line_total:
+            parts.append(f"lines {sum(progress.processed_lines for progress in files)}/{line_total}")
         if self._terminology_count:
             parts.append(f"terms {self._terminology_count}")
-        # if self._last_batch_summary:
-        #     parts.append(f"last batch {self._last_batch_label}: {self._shorten(self._last_batch_summary)}")
-        #if self._last_scene_summary:
-        #    parts.append(f"scene {self._last_scene_label}: {self._shorten(self._last_scene_summary)}")
-        if self._preview:
+        # if len(files) == 1 and files[0].last_batch_summary:
+        #     parts.append(f"last batch {files[0].last_batch_label}: {self._shorten(files[0].last_batch_summary)}")
+        #if len(files) == 1 and files[0].last_scene_summary:
+        #    parts.append(f"scene {files[0].last_scene_label}: {self._shorten(files[0].last_scene_summary)}")
+        if any(progress.preview for progress in files):
             parts.append("preview")
         message = " | ".join(parts)
         padding = ""
@@ -506,12 +810,13 @@ class ProgressDisplay:
         end = "\n" if final else "\r"
         self.stream.write(message + padding + end)
         self.stream.flush()
-        self._last_message_length = len(message)
+        self._last_message_length = 0 if final else len(message)
 
     def update_terminology_count(self, count : int) -> None:
         """Update the running term count and re-render the progress line."""
-        self._terminology_count = count
-        self._render()
+        with self._lock:
+            self._terminology_count = count
+            self._render(list(self._files.values()))
 
     def _shorten(self, text : str, limit : int = 60) -> str:
         summary = text.strip()
@@ -564,13 +869,23 @@ def parse_args(argv : list[str]|None = None) -> argparse.Namespace:
     parser.add_argument("--log-file", dest="log_file", help="Path to write the detailed log file")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose console logging")
     parser.add_argument("--preview", dest="preview", action="store_true", help="Enable preview mode")
+    parser.add_argument("--plan", dest="plan", action="store_true",
+                        help="Estimate the tokens, cost and time needed to translate the files without calling the provider")
+    parser.add_argument("--pricing", dest="pricing_file",
+                        help="JSON file of model prices per million tokens, used to estimate costs with --plan")
     parser.add_argument("--build-terminology-map", dest="build_terminology_map", action="store_true",
                         help="Build a shared terminology map across all files for consistent name/term translation")
     parser.add_argument("--terminology-file", dest="terminology_file",
                         help="File to persist the terminology map between runs (key::value per line)")
+    parser.add_argument("--jobs", dest="jobs", type=int,
+                        help="Number of files to translate concurrently (requests are still limited by adaptive_max_concurrency and the rate limits)")
+    parser.add_argument("--manifest", dest="manifest_file",
+                        help="Database recording the progress of the job, so that an interrupted run can be resumed")
+    parser.add_argument("--translation-memory", dest="translation_memory", action="store_true",
+                        help="Reuse translations of lines that have been translated before, and suggest translations of similar lines")
     parser.add_argument("--option", action="append", default=[], metavar="KEY=VALUE",
                         help="Override additional Options settings (repeatable)")
-    parser.set_defaults(preview=None, build_terminology_map=None)
+    parser.set_defaults(preview=None, plan=None, build_terminology_map=None, translation_memory=None)
     return parser.parse_args(argv)
 
 
@@ -623,6 +938,9 @@ def main(argv : list[str]|None = None) -> int:
         logging.exception("An error occurred: %s", message)
         return 1
 
+    finally:
+        CloseResponseCaches()
+
     return 0 if stats.failed_files == 0 else 1
 
 
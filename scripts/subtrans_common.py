@@ -11,6 +11,7 @@ from PySubtrans.Helpers.Localization import _
 from PySubtrans.Helpers.Parse import FormatKeyValuePairs, ParseKeyValuePairsOrFiles, ParseNames
 from PySubtrans import batch_subtitles, init_options, init_translator, preprocess_subtitles
 from PySubtrans.Options import Options, config_dir
+from PySubtrans.ResponseCache import CloseResponseCaches, GetResponseCache, default_cache_path
 from PySubtrans.SubtitleTranslator import SubtitleTranslator
 from PySubtrans.Substitutions import Substitutions
 from PySubtrans.SubtitleFormatRegistry import SubtitleFormatRegistry
@@ -27,11 +28,15 @@ class TokenUsage():
     """Accumulated token usage across all translated batches."""
     prompt_tokens: int = field(default=0)
     output_tokens: int = field(default=0)
+    cached_tokens: int = field(default=0)
 
     def Add(self, content : dict) -> None:
         """Add token counts from a translation response content dict."""
+        if content.get('cached_response'):
+            return
         self.prompt_tokens += content.get('prompt_tokens') or 0
         self.output_tokens += content.get('output_tokens') or 0
+        self.cached_tokens += content.get('cached_tokens') or 0
 
     @property
     def has_data(self) -> bool:
@@ -189,7 +194,11 @@ def CreateArgParser(description : str) -> ArgumentParser:
     parser.add_argument('--matchpartialwords', action='store_true', help="Allow substitutions that do not match not on word boundaries")
     parser.add_argument('--maxbatchsize', type=int, default=None, help="Maximum number of lines before starting a new batch is compulsory")
     parser.add_argument('--maxlines', type=int, default=None, help="Maximum number of lines(subtitles) to process in this run")
+    parser.add_argument('--maxthreads', type=int, default=None, help="Maximum number of scenes to translate in parallel when multithreaded translation is enabled")
+    parser.add_argument('--multithreaded', action='store_true', default=None, help="Translate scenes in parallel if the provider supports it")
     parser.add_argument('--maxsummaries', type=int, default=None, help="Maximum number of context summaries to provide with each batch")
+    parser.add_argument('--maxinputtokens', type=int, default=None, help="Maximum estimated prompt tokens for the subtitle lines in a batch")
+    parser.add_argument('--maxoutputtokens', type=int, default=None, help="Maximum estimated response tokens for a batch")
     parser.add_argument('--minbatchsize', type=int, default=None, help="Minimum number of lines to consider starting a new batch")
     parser.add_argument('--moviename', type=str, default=None, help="Optionally specify the name of the movie to help the translator")
     parser.add_argument('--name', action='append', type=str, default=None, help="A name to use verbatim in the translation")
@@ -197,11 +206,19 @@ def CreateArgParser(description : str) -> ArgumentParser:
     parser.add_argument('--postprocess', action='store_true', default=None, help="Postprocess the subtitles after translation")
     parser.add_argument('--preprocess', action='store_true', default=None, help="Preprocess the subtitles before translation")
     parser.add_argument('--project', action='store_true', help="Create a persistent project file to allow resuming translation")
+    parser.add_argument('--journal', action='store_true', default=None, help="Append changes to a journal alongside the project file instead of rewriting the whole project on every save")
+    parser.add_argument('--compressproject', action='store_true', default=None, help="Save the project in the compressed .subtransz format")
     parser.add_argument('--preview', action='store_true', help="Create a project and preview the translation flow without calling the translation provider")
     parser.add_argument('--retranslate', action='store_true', help="Retranslate all subtitles, ignoring existing translations in the project file")
     parser.add_argument('--reparse', action='store_true', help="Reparse previous translation responses, reconstructing the translated subtitles")
     parser.add_argument('--reload', action='store_true', help="Reload the subtitles from the original file, ignoring existing subtitles in the project file")
     parser.add_argument('--ratelimit', type=int, default=None, help="Maximum number of batches per minute to process")
+    parser.add_argument('--tokenratelimit', type=float, default=None, help="Maximum number of tokens per minute to send to the provider")
+    parser.add_argument('--promptcache', action='store_true', default=None, help="Arrange prompts so that the provider can cache the instructions and static context between batches")
+    parser.add_argument('--cache', action='store_true', default=None, help="Cache translation responses on disk and reuse them for identical requests")
+    parser.add_argument('--cachepath', type=str, default=None, help="Path to the response cache database")
+    parser.add_argument('--memory', action='store_true', default=None, help="Reuse translations of lines that have been translated before, and suggest translations of similar lines")
+    parser.add_argument('--memorypath', type=str, default=None, help="Path to the translation memory database")
     parser.add_argument('--proxy', type=str, default=None, help="Proxy URL (e.g., http://127.0.0.1:8888 or socks5://127.0.0.1:1080)")
     parser.add_argument('--proxycert', type=str, default=None, help="Path to a custom certificate bundle (PEM) to use for SSL verification")
     parser.add_argument('--scenethreshold', type=float, default=None, help="Number of seconds between lines to consider a new scene")
@@ -239,19 +256,31 @@ def CreateOptions(args: Namespace, provider: str, **kwargs) -> Options:
         'instruction_file': args.instructionfile or "instructions.txt",
         'substitution_mode': "Partial Words" if args.matchpartialwords else "Auto",
         'max_batch_size': args.maxbatchsize,
+        'max_input_tokens': getattr(args, 'maxinputtokens', None),
+        'max_output_tokens': getattr(args, 'maxoutputtokens', None),
         'max_context_summaries': args.maxsummaries,
         'max_lines': args.maxlines,
+        'max_threads': getattr(args, 'maxthreads', None),
+        'multithreaded_translation': getattr(args, 'multithreaded', None),
         'min_batch_size': args.minbatchsize,
         'movie_name': args.moviename or os.path.splitext(os.path.basename(args.input))[0],
         'names': ParseNames(args.names or args.name),
         'postprocess_translation': args.postprocess,
         'preprocess_subtitles': args.preprocess,
         'project_file': args.project or args.reparse or args.retranslate or args.reload,
+        'project_journal': getattr(args, 'journal', None),
+        'compress_project': getattr(args, 'compressproject', None),
         'preview': args.preview,
         'reparse': args.reparse,
         'retranslate': args.retranslate,
         'reload': args.reload,
         'rate_limit': args.ratelimit,
+        'token_rate_limit': getattr(args, 'tokenratelimit', None),
+        'cache_friendly_prompt': getattr(args, 'promptcache', None),
+        'response_cache': getattr(args, 'cache', None),
+        'response_cache_path': getattr(args, 'cachepath', None),
+        'translation_memory': getattr(args, 'memory', None),
+        'translation_memory_path': getattr(args, 'memorypath', None),
         'proxy': getattr(args, 'proxy', None),
         'scene_threshold': args.scenethreshold,
         'substitutions': Substitutions.Parse(args.substitution),
@@ -273,7 +302,10 @@ def CreateProject(options : Options, args: Namespace) -> SubtitleProject:
     """
     Initialise a subtitle project with the provided arguments
     """
-    project = SubtitleProject(persistent=options.use_project_file)
+    project = SubtitleProject(persistent=options.use_project_file, journaled=options.get_bool('project_journal'), compressed=options.get_bool('compress_project'), lazy_load=True)
+
+    if options.use_project_file and options.get_bool('background_save'):
+        project.StartBackgroundWriter(options.get_float('save_delay') or 0.0)
 
     project.InitialiseProject(args.input, args.output)
 
@@ -323,6 +355,8 @@ def CreateProject(options : Options, args: Namespace) -> SubtitleProject:
             scene_threshold=scene_threshold,
             min_batch_size=min_batch_size,
             max_batch_size=max_batch_size,
+            max_input_tokens=options.get_int('max_input_tokens'),
+            max_output_tokens=options.get_int('max_output_tokens'),
         )
 
     scene_count = subtitles.scenecount
@@ -373,7 +407,8 @@ def LogTranslationStatus(project : SubtitleProject, preview : bool = False, has_
         logging.error(f"Translation status: failed (0/{total_lines} lines translated)")
 
     if token_usage and token_usage.has_data:
-        logging.info(f"Token usage: {token_usage.prompt_tokens} in / {token_usage.output_tokens} out ({token_usage.total_tokens} total)")
+        cached_info = f", {token_usage.cached_tokens} input tokens cached" if token_usage.cached_tokens else ""
+        logging.info(f"Token usage: {token_usage.prompt_tokens} in / {token_usage.output_tokens} out ({token_usage.total_tokens} total{cached_info})")
 
 def _save_terminology_file(path : str, terminology_map : dict[str, str]) -> None:
     """Write terminology map to a key::value text file."""
@@ -386,6 +421,16 @@ def _save_terminology_file(path : str, terminology_map : dict[str, str]) -> None
     except Exception as e:
         logging.warning(_("Unable to save terminology file '{path}': {error}").format(path=path, error=e))
 
+def _log_response_cache_statistics(options : Options) -> None:
+    """Report how many requests were answered from the response cache instead of the provider."""
+    if not options.get_bool('response_cache'):
+        return
+
+    cache = GetResponseCache(options.get_str('response_cache_path') or default_cache_path)
+    if cache:
+        statistics = cache.statistics
+        logging.info(f"Response cache: {statistics['hits']} hits, {statistics['misses']} misses, {statistics['stores']} responses stored, {statistics['evictions']} evicted")
+
 def TranslateProject(project : SubtitleProject, options : Options, verbose : bool = False, preview : bool = False) -> None:
     """
     Translate a prepared project, logging progress and final status.
@@ -414,3 +459,8 @@ def TranslateProject(project : SubtitleProject, options : Options, verbose : boo
         LogTranslationStatus(project, preview=preview, has_error=True, token_usage=progress_logger.token_usage)
         raise
 
+    finally:
+        project.StopBackgroundWriter()
+        _log_response_cache_statistics(options)
+        CloseResponseCaches()
+
@@ -1,6 +1,8 @@
 import importlib.util
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+
+import httpx
 
 from PySubtrans.Helpers.TestCases import LoggedTestCase
 from PySubtrans.SettingsType import SettingsType
@@ -10,6 +12,7 @@ from PySubtrans.TranslationRequest import TranslationRequest
 HAS_ANTHROPIC = importlib.util.find_spec("anthropic") is not None
 
 if HAS_ANTHROPIC:
+    import anthropic
     from PySubtrans.Providers.Clients.AnthropicClient import AnthropicClient
 
 
@@ -87,3 +90,23 @@ class TestAnthropicClientRequestParameters(LoggedTestCase):
 
         self.assertLoggedEqual("thinking type", 'adaptive', thinking.get('type'))
         self.assertLoggedNotIn("budget tokens omitted", 'budget_tokens', thinking)
+
+
+@unittest.skipUnless(HAS_ANTHROPIC, "anthropic SDK is not installed")
+class TestAnthropicClientRetries(LoggedTestCase):
+    """Tests for retrying requests when the provider is overloaded."""
+
+    def test_server_errors_reported_and_retried(self) -> None:
+        """Server errors and overloaded responses are reported to the concurrency governor and retried after the suggested delay."""
+        client = AnthropicClient(_create_test_settings('claude-sonnet-4-5'))
+        request = httpx.Request('POST', 'https://api.anthropic.com/v1/messages')
+
+        for status_code in (500, 529):
+            response = httpx.Response(status_code, headers={'retry-after': '30'}, request=request)
+            error = anthropic.InternalServerError("Overloaded", response=response, body=None)
+
+            with patch.object(client, '_report_throttled') as report_throttled, self.assertLogs(level='WARNING'):
+                retry_delay = client._get_retry_delay(error, 0)
+
+            report_throttled.assert_called_once_with(30.0)
+            self.assertLoggedGreaterEqual(f"retry delay for status {status_code}", retry_delay, 30.0)
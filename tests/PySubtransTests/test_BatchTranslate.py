@@ -1,9 +1,16 @@
+import io
 import logging
+import os
 import pathlib
 import runpy
 import tempfile
+from unittest.mock import patch
 
-from PySubtrans.Helpers.TestCases import LoggedTestCase
+from PySubtrans.Helpers.TestCases import DummyProvider, DummyTranslationClient, LoggedTestCase
+from PySubtrans.Subtitles import Subtitles
+from PySubtrans.TranslationMemory import CloseTranslationMemories, GetTranslationMemory
+
+from ..TestData.chinese_dinner import chinese_dinner_data
 
 
 class TestBatchTranslateTerminologyPersistence(LoggedTestCase):
@@ -38,3 +45,135 @@ class TestBatchTranslateTerminologyPersistence(LoggedTestCase):
                 "Dragon::Drache\nHero::Held",
                 saved_content,
             )
+
+
+class TestBatchTranslateConcurrentJobs(LoggedTestCase):
+    """Tests for translating several files at once in batch-translate."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        repo_root = pathlib.Path(__file__).resolve().parents[2]
+        script_path = repo_root / 'scripts' / 'batch-translate.py'
+        cls.script = runpy.run_path(str(script_path))
+
+    def _run_batch(self, source : pathlib.Path, destination : pathlib.Path, jobs : int, extra_args : list[str]|None = None) -> tuple[object, str]:
+        """Translate the source directory with the dummy provider, returning the statistics and progress output."""
+        args = self.script['parse_args']([
+            str(source), str(destination),
+            '--provider', 'Dummy Provider',
+            '--jobs', str(jobs),
+            '--instructions', '',
+            '--option', 'preprocess_subtitles=false',
+            '--option', 'postprocess_translation=false',
+            '--option', 'min_batch_size=10',
+            '--option', 'max_batch_size=100',
+            *(extra_args or []),
+        ])
+        config = self.script['build_config'](args)
+        processor_class = self.script['BatchProcessor']
+
+        # The dummy provider checks that the movie details are passed to the translator
+        original_load = Subtitles.LoadSubtitles
+        def load_with_movie_details(subtitles, filepath=None):
+            original_load(subtitles, filepath)
+            subtitles.settings.update({
+                'movie_name': chinese_dinner_data.get_str('movie_name'),
+                'description': chinese_dinner_data.get_str('description'),
+                'names': chinese_dinner_data.get('names'),
+            })
+
+        with patch.object(processor_class, '_initialise_provider', return_value=DummyProvider(data=chinese_dinner_data)), \
+             patch.object(Subtitles, 'LoadSubtitles', autospec=True, side_effect=load_with_movie_details):
+            processor = processor_class(config)
+            processor.progress_display.stream = io.StringIO()
+            stats = processor.run()
+
+        return stats, processor.progress_display.stream.getvalue()
+
+    def test_concurrent_jobs_match_sequential(self):
+        """Files translated concurrently are counted, reported and saved the same as files translated one at a time."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = pathlib.Path(temp_dir)
+            source = root / 'source'
+            source.mkdir()
+            for episode in range(1, 5):
+                (source / f"episode{episode}.srt").write_text(chinese_dinner_data.get_str('original') or '', encoding='utf-8')
+
+            sequential_stats, _ = self._run_batch(source, root / 'sequential', jobs=1)
+            concurrent_stats, progress = self._run_batch(source, root / 'concurrent', jobs=3)
+
+            self.assertLoggedEqual("sequential summary", "Processed 4 file(s): 4 translated, 0 previewed, 0 skipped, 0 failed", sequential_stats.as_message())
+            self.assertLoggedEqual("concurrent summary", sequential_stats.as_message(), concurrent_stats.as_message())
+
+            final_lines = [ line for line in progress.replace('\r', '\n').split('\n') if line.startswith("Translating episode") and "batches 4/4" in line ]
+            for episode in range(1, 5):
+                self.assertLoggedTrue(f"progress reported for episode {episode}", any(f"episode{episode}.srt" in line for line in final_lines))
+
+            sequential_files = sorted(path.name for path in (root / 'sequential').iterdir())
+            concurrent_files = sorted(path.name for path in (root / 'concurrent').iterdir())
+            self.assertLoggedEqual("output files", sequential_files, concurrent_files)
+            self.assertLoggedEqual("file count", 4, len(concurrent_files))
+
+            for name in concurrent_files:
+                expected = (root / 'sequential' / name).read_text(encoding='utf-8')
+                self.assertLoggedEqual(f"translation of {name}", expected, (root / 'concurrent' / name).read_text(encoding='utf-8'))
+
+    def test_manifest_skips_unchanged_files(self):
+        """A rerun with a manifest skips files that have not changed and translates files whose options changed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = pathlib.Path(temp_dir)
+            source = root / 'source'
+            source.mkdir()
+            for episode in range(1, 3):
+                (source / f"episode{episode}.srt").write_text(chinese_dinner_data.get_str('original') or '', encoding='utf-8')
+
+            destination = root / 'translated'
+            manifest_args = [ '--manifest', str(root / 'manifest.db') ]
+
+            stats, _ = self._run_batch(source, destination, jobs=1, extra_args=manifest_args)
+            self.assertLoggedEqual("first run", "Processed 2 file(s): 2 translated, 0 previewed, 0 skipped, 0 failed", stats.as_message())
+
+            # Touching a file does not change its content, so it is still skipped
+            os.utime(source / "episode1.srt", (0, 0))
+            stats, _ = self._run_batch(source, destination, jobs=1, extra_args=manifest_args)
+            self.assertLoggedEqual("unchanged rerun", "Processed 2 file(s): 0 translated, 0 previewed, 2 skipped, 0 failed", stats.as_message())
+
+            # Files are translated again when the destination is missing or the options change
+            translated = sorted(destination.iterdir())
+            translated[0].unlink()
+            stats, _ = self._run_batch(source, destination, jobs=1, extra_args=manifest_args)
+            self.assertLoggedEqual("missing destination", "Processed 2 file(s): 1 translated, 0 previewed, 1 skipped, 0 failed", stats.as_message())
+
+            stats, _ = self._run_batch(source, destination, jobs=1, extra_args=[ *manifest_args, '--option', 'temperature=0.5' ])
+            self.assertLoggedEqual("changed options", "Processed 2 file(s): 2 translated, 0 previewed, 0 skipped, 0 failed", stats.as_message())
+
+    def test_translation_memory_reused_across_files(self):
+        """Lines repeated across the files of a series are translated once and reused from the translation memory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = pathlib.Path(temp_dir)
+            source = root / 'source'
+            source.mkdir()
+            for episode in range(1, 3):
+                (source / f"episode{episode}.srt").write_text(chinese_dinner_data.get_str('original') or '', encoding='utf-8')
+
+            memory_path = root / 'memory.db'
+            memory_args = [ '--translation-memory', '--option', f'translation_memory_path={memory_path}' ]
+
+            try:
+                with patch.object(DummyTranslationClient, '_request_translation', autospec=True, side_effect=DummyTranslationClient._request_translation) as request:
+                    stats, _ = self._run_batch(source, root / 'translated', jobs=1, extra_args=memory_args)
+
+                memory = GetTranslationMemory(str(memory_path))
+                self.assertLoggedIsNotNone("memory opened", memory)
+                if memory:
+                    self.assertLoggedEqual("second file reused", 0.5, memory.statistics['hit_rate'])
+
+            finally:
+                CloseTranslationMemories()
+
+            self.assertLoggedEqual("summary", "Processed 2 file(s): 2 translated, 0 previewed, 0 skipped, 0 failed", stats.as_message())
+            self.assertLoggedEqual("requests for the first file only", 4, request.call_count)
+
+            first, second = sorted((root / 'translated').iterdir())
+            self.assertLoggedEqual("same translation", first.read_text(encoding='utf-8'), second.read_text(encoding='utf-8'))
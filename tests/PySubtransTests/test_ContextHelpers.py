@@ -0,0 +1,66 @@
+from PySubtrans.Helpers.ContextHelpers import GetBatchContext, GetHistory, SummaryHistory
+from PySubtrans.Helpers.TestCases import SubtitleTestCase
+from PySubtrans.Helpers.Tests import PrepareBatchedSubtitles
+from PySubtrans.Subtitles import Subtitles
+
+from ..TestData.chinese_dinner import chinese_dinner_data
+
+class SummaryHistoryTests(SubtitleTestCase):
+    def __init__(self, methodName):
+        super().__init__(methodName, custom_options={
+            'min_batch_size': 2,
+            'max_batch_size': 6,
+        })
+
+    def _assert_matches_scan(self, subtitles : Subtitles, history : SummaryHistory, max_lines : int|None):
+        for scene in subtitles.scenes:
+            for batch in scene.batches:
+                expected = GetHistory(subtitles, scene.number, batch.number, max_lines)
+                actual = history.GetHistory(scene.number, batch.number, max_lines)
+                self.assertLoggedSequenceEqual(f"scene {scene.number} batch {batch.number} history", expected, actual)
+
+    def test_incremental_updates_match_scan(self):
+        """Summaries recorded as scenes are translated give the same history as scanning the subtitles"""
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        history = SummaryHistory(subtitles)
+
+        for scene in subtitles.scenes:
+            for batch in scene.batches:
+                batch.summary = f"Batch {batch.number} of scene {scene.number}"
+                history.UpdateBatch(batch)
+
+            # Consecutive scenes with the same summary are only listed once
+            scene.summary = f"Summary of scene {(scene.number + 1) // 2}"
+            history.UpdateScene(scene)
+
+        self._assert_matches_scan(subtitles, history, None)
+        self._assert_matches_scan(subtitles, history, 2)
+
+    def test_out_of_order_updates(self):
+        """Updating an earlier scene after later ones still gives the correct history"""
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        history = SummaryHistory(subtitles)
+
+        for scene in reversed(subtitles.scenes):
+            scene.summary = f"Summary of scene {scene.number}"
+            history.UpdateScene(scene)
+
+        first_scene = subtitles.scenes[0]
+        first_scene.summary = "Revised summary"
+        history.UpdateScene(first_scene)
+
+        self._assert_matches_scan(subtitles, history, 10)
+
+    def test_batch_context_uses_history(self):
+        """GetBatchContext gives the same context with or without the index"""
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        for scene in subtitles.scenes:
+            scene.summary = f"Summary of scene {scene.number}"
+
+        history = SummaryHistory(subtitles)
+        last_scene = subtitles.scenes[-1]
+        expected = GetBatchContext(subtitles, last_scene.number, 1, 10)
+        actual = GetBatchContext(subtitles, last_scene.number, 1, 10, history)
+
+        self.assertLoggedEqual("same context", expected, actual)
+        self.assertLoggedEqual("history for earlier scenes", last_scene.number - 1, len(actual.get('history', [])))
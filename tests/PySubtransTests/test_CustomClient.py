@@ -1,7 +1,11 @@
+import asyncio
 import json
+import threading
 from typing import Any
 from unittest.mock import MagicMock, patch
 
+import httpx
+
 from PySubtrans.Helpers.TestCases import LoggedTestCase
 from PySubtrans.Helpers.Tests import log_input_expected_error, skip_if_debugger_attached
 from PySubtrans.Providers.Clients.CustomClient import CustomClient
@@ -190,6 +194,25 @@ class TestCustomClientProcessApiResponse(LoggedTestCase):
             self.assertLoggedEqual("text", 'Hello world', result.get('text'))
             self.assertLoggedEqual("reasoning not set", None, result.get('reasoning'))
 
+    def test_cached_tokens_are_reported(self) -> None:
+        """Prompt tokens served from the provider cache are surfaced in the response."""
+        client = CustomClient(_create_test_settings())
+        body = json.dumps({
+            'model': 'test-model',
+            'choices': [{'message': {'role': 'assistant', 'content': 'Hello world'}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': 1000, 'completion_tokens': 20, 'total_tokens': 1020, 'prompt_tokens_details': {'cached_tokens': 768}},
+        })
+
+        mock_httpx_client = MagicMock()
+        mock_httpx_client.post.return_value = _mock_response(200, body)
+
+        with patch('httpx.Client', return_value=mock_httpx_client):
+            result = client._make_request(_create_test_request(), temperature=0.0)
+
+        self.assertLoggedIsNotNone("result", result)
+        if result:
+            self.assertLoggedEqual("cached tokens", 768, result.get('cached_tokens'))
+
     def test_reasoning_content_field_is_captured(self) -> None:
         """OpenAI-style reasoning_content field is captured into response['reasoning']."""
         client = CustomClient(_create_test_settings())
@@ -310,3 +333,117 @@ class TestCustomClientStreamingChunk(LoggedTestCase):
         self.assertLoggedEqual("text falls back to reasoning", 'The translation.', accumulated.get('text'))
         self.assertLoggedEqual("reasoning preserved", 'The translation.', accumulated.get('reasoning'))
 
+
+def _mock_async_client(handler) -> Any:
+    """Create a factory for httpx.AsyncClient that routes requests to handler."""
+    real_async_client = httpx.AsyncClient
+
+    def factory(**kwargs) -> httpx.AsyncClient:
+        kwargs.pop('proxy', None)
+        return real_async_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    return factory
+
+
+class TestCustomClientAsync(LoggedTestCase):
+    """Tests for the non-blocking request path in CustomClient."""
+
+    def test_async_non_streaming_request(self) -> None:
+        """Async requests return the processed API response."""
+        client = CustomClient(_create_test_settings())
+        body = {
+            'model': 'test-model',
+            'choices': [{'message': {'role': 'assistant', 'content': 'Hello world'}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': 10, 'completion_tokens': 20, 'total_tokens': 30},
+        }
+
+        with patch('httpx.AsyncClient', side_effect=_mock_async_client(lambda request: httpx.Response(200, json=body))):
+            result = asyncio.run(client._make_request_async(_create_test_request(), temperature=0.0))
+
+        self.assertLoggedIsNotNone("result", result)
+        if result:
+            self.assertLoggedEqual("text", 'Hello world', result.get('text'))
+            self.assertLoggedEqual("output tokens", 20, result.get('output_tokens'))
+
+    def test_async_client_is_reused(self) -> None:
+        """Async requests on the same event loop share one pooled client."""
+        client = CustomClient(_create_test_settings())
+        body = {
+            'choices': [{'message': {'role': 'assistant', 'content': 'Hello world'}, 'finish_reason': 'stop'}],
+        }
+
+        async def translate_twice() -> None:
+            await client._make_request_async(_create_test_request(), temperature=0.0)
+            await client._make_request_async(_create_test_request(), temperature=0.0)
+
+        with patch('httpx.AsyncClient', side_effect=_mock_async_client(lambda request: httpx.Response(200, json=body))) as async_client:
+            asyncio.run(translate_twice())
+
+        self.assertLoggedEqual("clients created", 1, async_client.call_count)
+
+    def test_async_abort_cancels_request(self) -> None:
+        """Aborting translation cancels requests that are waiting for the server."""
+        client = CustomClient(_create_test_settings())
+
+        async def slow_handler(http_request : httpx.Request) -> httpx.Response:
+            await asyncio.sleep(30)
+            return httpx.Response(200, json={})
+
+        async def abort_request() -> Any:
+            request = asyncio.ensure_future(client._make_request_async(_create_test_request(), temperature=0.0))
+            await asyncio.sleep(0.05)
+            abort_thread = threading.Thread(target=client.AbortTranslation)
+            abort_thread.start()
+            result = await asyncio.wait_for(request, timeout=5.0)
+            abort_thread.join()
+            return result
+
+        with patch('httpx.AsyncClient', side_effect=_mock_async_client(slow_handler)):
+            result = asyncio.run(abort_request())
+
+        self.assertLoggedIsNone("aborted request returns nothing", result)
+        self.assertLoggedEqual("no requests in flight", 0, len(client._async_requests))
+
+    def test_async_streaming_request(self) -> None:
+        """Async streaming requests accumulate SSE deltas and emit partial updates."""
+        client = CustomClient(_create_test_settings(streaming=True))
+        updates : list[str] = []
+        prompt = TranslationPrompt("Translate this", conversation=True)
+        prompt.messages = [{'role': 'user', 'content': 'Translate hello'}]
+        request = TranslationRequest(prompt, streaming_callback=lambda translation: updates.append(translation.text or ''))
+
+        chunks = [
+            {'choices': [{'delta': {'content': '#1\nHello\n\n'}}]},
+            {'choices': [{'delta': {'content': '#2\nWorld'}, 'finish_reason': 'stop'}]},
+        ]
+        sse = ''.join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+
+        def handler(http_request : httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=sse.encode('utf-8'), headers={'Content-Type': 'text/event-stream'})
+
+        with patch('httpx.AsyncClient', side_effect=_mock_async_client(handler)):
+            result = asyncio.run(client._make_request_async(request, temperature=0.0))
+
+        self.assertLoggedIsNotNone("result", result)
+        if result:
+            self.assertLoggedEqual("text", '#1\nHello\n\n#2\nWorld', result.get('text'))
+            self.assertLoggedEqual("finish reason", 'stop', result.get('finish_reason'))
+        self.assertLoggedEqual("partial updates", 1, len(updates))
+
+    @skip_if_debugger_attached
+    def test_async_5xx_is_retried(self) -> None:
+        """Async 5xx errors are retried up to max_retries, then raise TranslationImpossibleError."""
+        client = CustomClient(_create_test_settings())
+        call_count = 0
+
+        def handler(http_request : httpx.Request) -> httpx.Response:
+            nonlocal call_count
+            call_count += 1
+            return httpx.Response(500, text='{"error": "Internal Server Error"}')
+
+        with patch('httpx.AsyncClient', side_effect=_mock_async_client(handler)):
+            with self.assertLogs(level='WARNING'):
+                with self.assertRaises(TranslationImpossibleError):
+                    asyncio.run(client._make_request_async(_create_test_request(), temperature=0.0))
+
+        self.assertLoggedEqual("request count (retries)", 3, call_count)
@@ -0,0 +1,114 @@
+import os
+import tempfile
+
+from PySubtrans.Helpers.TestCases import DummyProvider, SubtitleTestCase
+from PySubtrans.Helpers.Tests import PrepareBatchedSubtitles
+from PySubtrans.JobManifest import FileState, GetOptionsFingerprint, JobManifest
+from PySubtrans.SettingsType import SettingsType
+from PySubtrans.SubtitleTranslator import SubtitleTranslator
+
+from ..TestData.chinese_dinner import chinese_dinner_data
+
+class JobManifestTests(SubtitleTestCase):
+    def __init__(self, methodName):
+        super().__init__(methodName, custom_options={
+            'max_batch_size': 100,
+        })
+
+    def test_file_state(self):
+        """Files are only reported as recorded while their content and options are unchanged"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_path = os.path.join(temp_dir, "episode1.srt")
+            with open(source_path, 'w', encoding='utf-8') as f:
+                f.write(chinese_dinner_data.get_str('original') or '')
+
+            manifest = JobManifest(os.path.join(temp_dir, "manifest.db"))
+            self.assertLoggedIsNone("unknown file", manifest.GetFileState("episode1.srt", source_path, "options"))
+            self.assertLoggedFalse("file not recorded", manifest.HasFile("episode1.srt"))
+
+            manifest.BeginFile("episode1.srt", source_path, "options")
+            self.assertLoggedEqual("file in progress", FileState.InProgress, manifest.GetFileState("episode1.srt", source_path, "options"))
+
+            manifest.CompleteFile("episode1.srt", "episode1.en.srt")
+            self.assertLoggedEqual("file completed", FileState.Completed, manifest.GetFileState("episode1.srt", source_path, "options"))
+            self.assertLoggedEqual("destination", "episode1.en.srt", manifest.GetDestination("episode1.srt"))
+            self.assertLoggedIsNone("options changed", manifest.GetFileState("episode1.srt", source_path, "other options"))
+
+            os.utime(source_path, (0, 0))
+            self.assertLoggedEqual("file touched", FileState.Completed, manifest.GetFileState("episode1.srt", source_path, "options"))
+
+            with open(source_path, 'a', encoding='utf-8') as f:
+                f.write("\n")
+            self.assertLoggedIsNone("file changed", manifest.GetFileState("episode1.srt", source_path, "options"))
+            self.assertLoggedTrue("changed file still recorded", manifest.HasFile("episode1.srt"))
+
+            manifest.Close()
+
+    def test_resume_translation(self):
+        """Recorded batches are restored to the subtitles and only the remaining batches are translated"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source_path = os.path.join(temp_dir, "episode1.srt")
+            with open(source_path, 'w', encoding='utf-8') as f:
+                f.write(chinese_dinner_data.get_str('original') or '')
+
+            reference = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+            SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data)).TranslateSubtitles(reference)
+
+            manifest = JobManifest(os.path.join(temp_dir, "manifest.db"))
+            manifest.BeginFile("episode1.srt", source_path, "options")
+            first_scene = reference.GetScene(1)
+            for batch in first_scene.batches:
+                manifest.RecordBatch("episode1.srt", batch, first_scene.summary)
+
+            # Beginning the file again keeps the batches while it is unchanged
+            manifest.BeginFile("episode1.srt", source_path, "options")
+
+            subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+            restored = manifest.RestoreBatches("episode1.srt", subtitles)
+            self.assertLoggedEqual("batches restored", len(first_scene.batches), restored)
+            self.assertLoggedTrue("first scene translated", all(batch.all_translated for batch in subtitles.GetScene(1).batches))
+            self.assertLoggedFalse("other scenes not translated", subtitles.GetScene(2).batches[0].any_translated)
+
+            translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data), resume=True)
+            translator.TranslateSubtitles(subtitles)
+            self._assert_same_as_reference(subtitles, reference)
+
+            # Changing the options discards the recorded batches
+            manifest.BeginFile("episode1.srt", source_path, "other options")
+            self.assertLoggedEqual("batches discarded", 0, manifest.RestoreBatches("episode1.srt", PrepareBatchedSubtitles(chinese_dinner_data, self.options)))
+
+            manifest.Close()
+
+    def test_options_fingerprint(self):
+        """The fingerprint only changes when settings that affect the translation change"""
+        settings = SettingsType({
+            'provider': 'Dummy Provider',
+            'target_language': 'English',
+            'max_threads': 4,
+            'provider_settings': {
+                'Dummy Provider': SettingsType({ 'model': 'dummy', 'api_key': 'secret' }),
+                'Other Provider': SettingsType({ 'model': 'other' }),
+            }
+        })
+        fingerprint = GetOptionsFingerprint(settings)
+
+        operational = SettingsType(settings)
+        operational['max_threads'] = 8
+        self.assertLoggedEqual("operational setting ignored", fingerprint, GetOptionsFingerprint(operational))
+
+        other_provider = SettingsType(settings)
+        other_provider['provider_settings'] = {
+            'Dummy Provider': SettingsType({ 'model': 'dummy', 'api_key': 'another secret' }),
+            'Other Provider': SettingsType({ 'model': 'changed' }),
+        }
+        self.assertLoggedEqual("secrets and other providers ignored", fingerprint, GetOptionsFingerprint(other_provider))
+
+        language = SettingsType(settings)
+        language['target_language'] = 'French'
+        self.assertLoggedFalse("target language included", fingerprint == GetOptionsFingerprint(language))
+
+        model = SettingsType(settings)
+        model['provider_settings'] = { 'Dummy Provider': SettingsType({ 'model': 'dummy-2' }) }
+        self.assertLoggedFalse("model included", fingerprint == GetOptionsFingerprint(model))
+
+        self.assertLoggedEqual("ignored keys", GetOptionsFingerprint(settings, ignored_keys={'target_language'}), GetOptionsFingerprint(language, ignored_keys={'target_language'}))
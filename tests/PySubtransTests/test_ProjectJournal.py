@@ -0,0 +1,172 @@
+import os
+import tempfile
+
+from PySubtrans.Helpers.TestCases import DummyProvider, PrepareSubtitles, SubtitleTestCase
+from PySubtrans.ProjectJournal import GetJournalFilepath
+from PySubtrans.SettingsType import SettingsType
+from PySubtrans.SubtitleBatcher import SubtitleBatcher
+from PySubtrans.SubtitleProject import SubtitleProject
+from PySubtrans.SubtitleSerialisation import ReadProjectData, SubtitleEncoder
+from PySubtrans.SubtitleTranslator import SubtitleTranslator
+
+from ..TestData.chinese_dinner import chinese_dinner_data
+
+def _read_file(path : str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+class ProjectJournalTests(SubtitleTestCase):
+    def __init__(self, methodName):
+        super().__init__(methodName, custom_options={
+            'max_batch_size': 20,
+        })
+
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.projectfile = os.path.join(self.temp_dir.name, "chinese_dinner.subtrans")
+        self.journalfile = GetJournalFilepath(self.projectfile)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _create_project(self, settings : SettingsType|None = None) -> SubtitleProject:
+        project = SubtitleProject(persistent=True, journaled=True)
+        project.write_translation = False
+        project.subtitles = PrepareSubtitles(chinese_dinner_data)
+        with project.GetEditor() as editor:
+            editor.AutoBatch(SubtitleBatcher(settings or self.options))
+
+        project.SaveProjectFile(self.projectfile)
+        return project
+
+    def _translate_batch(self, project : SubtitleProject, scene_number : int, batch_number : int) -> None:
+        translated = PrepareSubtitles(chinese_dinner_data, 'translated')
+        batch = project.subtitles.GetBatch(scene_number, batch_number)
+        line_numbers = { line.number for line in batch.originals }
+        batch.translated = [ line for line in translated.originals if line.number in line_numbers ]
+        batch.summary = f"Summary of scene {scene_number} batch {batch_number}"
+
+    def test_changes_appended_to_journal(self):
+        """Saving a journaled project appends the changes and leaves the snapshot untouched"""
+        project = self._create_project()
+        snapshot = _read_file(self.projectfile)
+
+        self._translate_batch(project, 1, 1)
+        project.subtitles.GetScene(1).summary = "The guests arrive"
+        project.subtitles.terminology_map = { "饺子": "Dumplings" }
+        project.needs_writing = True
+        project.SaveProjectFile()
+
+        journal_lines = _read_file(self.journalfile).splitlines()
+        self.assertLoggedEqual("snapshot not rewritten", snapshot, _read_file(self.projectfile))
+        self.assertLoggedEqual("header plus project, scene and batch changes", 4, len(journal_lines))
+
+        project.SaveProjectFile()
+        self.assertLoggedEqual("nothing appended when unchanged", 4, len(_read_file(self.journalfile).splitlines()))
+
+        loaded = SubtitleProject()
+        loaded.ReadProjectFile(self.projectfile)
+
+        self._assert_same_as_reference(loaded.subtitles, project.subtitles)
+        self.assertLoggedEqual("batch translated after replay", True, loaded.subtitles.GetBatch(1, 1).all_translated)
+        self.assertLoggedEqual("scene summary replayed", "The guests arrive", loaded.subtitles.GetScene(1).summary)
+        self.assertLoggedEqual("terminology replayed", { "饺子": "Dumplings" }, loaded.subtitles.terminology_map)
+
+    def test_translated_batches_journaled(self):
+        """Batches are appended to the journal as they are translated"""
+        # The dummy provider's responses are for batches of up to 100 lines
+        settings = SettingsType(self.options)
+        settings['max_batch_size'] = 100
+        project = self._create_project(settings)
+        translator = SubtitleTranslator(settings, translation_provider=DummyProvider(data=chinese_dinner_data))
+        batch_count = sum(scene.size for scene in project.subtitles.scenes)
+
+        project.TranslateSubtitles(translator)
+
+        journal_lines = _read_file(self.journalfile).splitlines()
+        self.assertLoggedGreater("batches journaled", len(journal_lines), batch_count)
+
+        loaded = SubtitleProject()
+        loaded.ReadProjectFile(self.projectfile)
+        self.assertLoggedTrue("translation replayed", loaded.subtitles.all_translated)
+        self._assert_same_as_reference(loaded.subtitles, project.subtitles)
+
+    def test_structure_change_writes_snapshot(self):
+        """Changes to the batch structure are saved as a new snapshot"""
+        project = self._create_project()
+        self._translate_batch(project, 1, 1)
+        project.SaveProjectFile()
+
+        with project.GetEditor() as editor:
+            editor.MergeBatches(1, [1, 2])
+
+        project.SaveProjectFile()
+
+        self.assertLoggedEqual("journal reset", 1, len(_read_file(self.journalfile).splitlines()))
+
+        loaded = SubtitleProject()
+        loaded.ReadProjectFile(self.projectfile)
+        self._assert_same_as_reference(loaded.subtitles, project.subtitles)
+
+    def test_journal_compacted(self):
+        """The journal is compacted into the snapshot when it grows too large"""
+        project = self._create_project()
+        if project.journal:
+            project.journal.compact_ratio = 0.0
+
+        self._translate_batch(project, 1, 1)
+        project.SaveProjectFile()
+
+        self.assertLoggedEqual("journal reset", 1, len(_read_file(self.journalfile).splitlines()))
+        self.assertLoggedIn("translation in snapshot", "Summary of scene 1 batch 1", _read_file(self.projectfile))
+
+    def test_incomplete_entry_ignored(self):
+        """A partial entry at the end of the journal is skipped when loading"""
+        project = self._create_project()
+        self._translate_batch(project, 1, 1)
+        project.SaveProjectFile()
+
+        with open(self.journalfile, 'a', encoding='utf-8') as f:
+            f.write('{"batch": {"_class": "SubtitleBatch", "scene"')
+
+        loaded = SubtitleProject()
+        with self.assertLogs(level='WARNING'):
+            loaded.ReadProjectFile(self.projectfile)
+
+        self.assertLoggedTrue("complete entries replayed", loaded.subtitles.GetBatch(1, 1).all_translated)
+
+    def test_mismatched_journal_ignored(self):
+        """A journal written for a different snapshot is not replayed"""
+        project = self._create_project()
+        self._translate_batch(project, 1, 1)
+        project.SaveProjectFile()
+
+        # Write the snapshot directly, leaving the journal from the earlier save in place
+        unjournaled = SubtitleProject(persistent=True)
+        unjournaled.ReadProjectFile(self.projectfile)
+        unjournaled.subtitles.GetBatch(1, 1).translated = []
+        unjournaled.WriteProjectToFile(self.projectfile, encoder_class=SubtitleEncoder)
+
+        loaded = SubtitleProject()
+        with self.assertLogs(level='WARNING'):
+            loaded.ReadProjectFile(self.projectfile)
+
+        self.assertLoggedFalse("journal not applied", loaded.subtitles.GetBatch(1, 1).any_translated)
+
+    def test_compressed_snapshot(self):
+        """A compressed project is journaled like an uncompressed one"""
+        self.projectfile = os.path.join(self.temp_dir.name, "chinese_dinner.subtransz")
+        self.journalfile = GetJournalFilepath(self.projectfile)
+
+        project = self._create_project()
+        self._translate_batch(project, 1, 1)
+        project.SaveProjectFile()
+
+        self.assertLoggedEqual("header plus batch change", 2, len(_read_file(self.journalfile).splitlines()))
+        self.assertLoggedNotIn("snapshot not rewritten", "Summary of scene 1 batch 1", ReadProjectData(self.projectfile))
+
+        loaded = SubtitleProject()
+        loaded.ReadProjectFile(self.projectfile)
+        self.assertLoggedTrue("batch translated after replay", loaded.subtitles.GetBatch(1, 1).all_translated)
+        self._assert_same_as_reference(loaded.subtitles, project.subtitles)
@@ -0,0 +1,252 @@
+import os
+import tempfile
+import threading
+from typing import cast
+from unittest.mock import patch
+
+from PySubtrans.Helpers import WriteFileAtomically
+from PySubtrans.Helpers.TestCases import DummyProvider, LoggedTestCase, PrepareSubtitles, SubtitleTestCase
+from PySubtrans.Helpers.Tests import skip_if_debugger_attached
+from PySubtrans.ProjectJournal import ProjectJournal
+from PySubtrans.ProjectWriter import ProjectWriter
+from PySubtrans.SubtitleBatch import SubtitleBatch
+from PySubtrans.SubtitleBatcher import SubtitleBatcher
+from PySubtrans.SubtitleProject import SubtitleProject
+from PySubtrans.SubtitleTranslator import SubtitleTranslator
+
+from ..TestData.chinese_dinner import chinese_dinner_data
+
+class CountingProject:
+    """ Stands in for a project, counting the saves made by the writer """
+    def __init__(self, fail : bool = False):
+        self.saves : int = 0
+        self.fail : bool = fail
+        self.save_threads : set[str] = set()
+        self.saved_batches : list[list[tuple[int, int]]|None] = []
+        self.translation_paths : list[str|None] = []
+
+    def SaveProject(self, batches : list[SubtitleBatch]|None = None):
+        self.saves += 1
+        self.saved_batches.append(sorted((batch.scene, batch.number) for batch in batches) if batches is not None else None)
+        self.save_threads.add(threading.current_thread().name)
+        if self.fail:
+            raise OSError("Disk full")
+
+    def SaveTranslation(self, outputpath : str|None = None):
+        self.translation_paths.append(outputpath)
+        self.save_threads.add(threading.current_thread().name)
+
+class WriteFileAtomicallyTests(LoggedTestCase):
+    def test_replaces_file(self):
+        """The file is replaced and no temporary files are left behind"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "project.subtrans")
+            WriteFileAtomically(path, "first")
+            WriteFileAtomically(path, "second")
+
+            with open(path, encoding='utf-8') as f:
+                self.assertLoggedEqual("file replaced", "second", f.read())
+
+            self.assertLoggedEqual("no temporary files", ["project.subtrans"], os.listdir(temp_dir))
+
+    @skip_if_debugger_attached
+    def test_failed_write_keeps_original(self):
+        """A failed write leaves the original file intact"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "project.subtrans")
+            WriteFileAtomically(path, "original")
+
+            with self.assertRaises(TypeError):
+                WriteFileAtomically(path, cast(str, None))
+
+            with open(path, encoding='utf-8') as f:
+                self.assertLoggedEqual("original content", "original", f.read())
+
+            self.assertLoggedEqual("no temporary files", ["project.subtrans"], os.listdir(temp_dir))
+
+class ProjectWriterTests(LoggedTestCase):
+    def test_requests_coalesced(self):
+        """Requests within the save delay result in a single save on the writer thread"""
+        project = CountingProject()
+        writer = ProjectWriter(cast(SubtitleProject, project), save_delay=0.2)
+
+        for _ in range(5):
+            writer.RequestSave()
+
+        self.assertLoggedEqual("nothing saved yet", 0, project.saves)
+        self.assertLoggedTrue("flush completes", writer.Flush(timeout=5.0))
+        self.assertLoggedEqual("one save", 1, project.saves)
+        self.assertLoggedEqual("saved on writer thread", {"ProjectWriter"}, project.save_threads)
+
+        writer.RequestSave()
+        writer.Stop(timeout=5.0)
+        self.assertLoggedEqual("pending save written on stop", 2, project.saves)
+        self.assertLoggedFalse("writer stopped", writer.is_running)
+
+    def test_batch_requests_coalesced(self):
+        """Requests for specific batches are combined, and a full save request takes precedence"""
+        project = CountingProject()
+        writer = ProjectWriter(cast(SubtitleProject, project), save_delay=60.0)
+
+        writer.RequestSave([ SubtitleBatch({ 'scene': 1, 'number': 1 }) ])
+        writer.RequestSave([ SubtitleBatch({ 'scene': 1, 'number': 2 }), SubtitleBatch({ 'scene': 1, 'number': 1 }) ])
+        self.assertLoggedTrue("flush completes", writer.Flush(timeout=5.0))
+        self.assertLoggedEqual("batches saved", [ [(1, 1), (1, 2)] ], project.saved_batches)
+
+        writer.RequestSave([ SubtitleBatch({ 'scene': 2, 'number': 1 }) ])
+        writer.RequestSave()
+        self.assertLoggedTrue("flush completes", writer.Flush(timeout=5.0))
+        self.assertLoggedEqual("full save", [ [(1, 1), (1, 2)], None ], project.saved_batches)
+        writer.Stop()
+
+    def test_flush_skips_delay(self):
+        """Flushing writes a pending save without waiting for the delay"""
+        project = CountingProject()
+        writer = ProjectWriter(cast(SubtitleProject, project), save_delay=60.0)
+
+        writer.RequestSave()
+        self.assertLoggedTrue("flush completes", writer.Flush(timeout=5.0))
+        self.assertLoggedEqual("one save", 1, project.saves)
+        writer.Stop()
+
+    def test_translation_saved_on_writer_thread(self):
+        """Requests to write the translation are coalesced and written on the writer thread without saving the project"""
+        project = CountingProject()
+        writer = ProjectWriter(cast(SubtitleProject, project), save_delay=60.0)
+
+        self.assertLoggedTrue("request accepted", writer.RequestSaveTranslation("first.srt"))
+        writer.RequestSaveTranslation("second.srt")
+        self.assertLoggedTrue("flush completes", writer.Flush(timeout=5.0))
+
+        self.assertLoggedEqual("translation written once", [ "second.srt" ], project.translation_paths)
+        self.assertLoggedEqual("project not saved", 0, project.saves)
+        self.assertLoggedEqual("written on writer thread", {"ProjectWriter"}, project.save_threads)
+        writer.Stop()
+
+    def test_requests_ignored_after_stop(self):
+        """Save requests made after the writer has stopped are refused instead of raising"""
+        project = CountingProject()
+        writer = ProjectWriter(cast(SubtitleProject, project), save_delay=0.0)
+        writer.Stop()
+
+        self.assertLoggedFalse("save refused", writer.RequestSave())
+        self.assertLoggedFalse("translation save refused", writer.RequestSaveTranslation())
+        self.assertLoggedEqual("nothing saved", 0, project.saves)
+
+    def test_errors_logged(self):
+        """A failed save is logged and the writer keeps running"""
+        project = CountingProject(fail=True)
+        writer = ProjectWriter(cast(SubtitleProject, project), save_delay=0.0)
+
+        with self.assertLogs(level='ERROR'):
+            writer.RequestSave()
+            writer.Flush(timeout=5.0)
+
+        self.assertLoggedTrue("writer still running", writer.is_running)
+        writer.Stop()
+
+class BackgroundSaveTests(SubtitleTestCase):
+    def __init__(self, methodName):
+        super().__init__(methodName, custom_options={
+            'max_batch_size': 100,
+        })
+
+    def test_translation_saved_in_background(self):
+        """A project with a background writer is saved during translation and complete when it finishes"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            projectfile = os.path.join(temp_dir, "chinese_dinner.subtrans")
+
+            project = SubtitleProject(persistent=True)
+            project.write_translation = False
+            project.subtitles = PrepareSubtitles(chinese_dinner_data)
+            with project.GetEditor() as editor:
+                editor.AutoBatch(SubtitleBatcher(self.options))
+            project.SaveProjectFile(projectfile)
+
+            writer = project.StartBackgroundWriter(save_delay=0.05)
+            translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data))
+            project.TranslateSubtitles(translator)
+
+            self.assertLoggedFalse("no pending writes", writer.has_pending_writes)
+            project.StopBackgroundWriter()
+            self.assertLoggedIsNone("writer removed", project.writer)
+
+            loaded = SubtitleProject()
+            loaded.ReadProjectFile(projectfile)
+            self.assertLoggedTrue("translation saved", loaded.subtitles.all_translated)
+            self._assert_same_as_reference(loaded.subtitles, project.subtitles)
+
+    def test_save_requests_after_writer_stopped(self):
+        """Save requests that race with the writer being stopped do not fail, and the project is still saved"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            projectfile = os.path.join(temp_dir, "chinese_dinner.subtrans")
+
+            project = SubtitleProject(persistent=True)
+            project.write_translation = False
+            project.subtitles = PrepareSubtitles(chinese_dinner_data)
+            with project.GetEditor() as editor:
+                editor.AutoBatch(SubtitleBatcher(self.options))
+            project.SaveProjectFile(projectfile)
+
+            # The writer stops before the project has cleared its reference to it
+            writer = project.StartBackgroundWriter(save_delay=0.0)
+            writer.Stop()
+
+            project.needs_writing = True
+            project._on_scene_translated(None, project.subtitles.GetScene(1))
+            self.assertLoggedTrue("save still pending", project.needs_writing)
+
+            project.RequestSave()
+            self.assertLoggedFalse("project saved directly", project.needs_writing)
+
+    def _translate_journaled(self, projectfile : str, background_save : bool) -> tuple[SubtitleProject, list[list[tuple[int, int]]|None]]:
+        """ Translate a journaled project, returning the batches passed to each journal save (None for a full save) """
+        project = SubtitleProject(persistent=True, journaled=True)
+        project.write_translation = False
+        project.subtitles = PrepareSubtitles(chinese_dinner_data)
+        with project.GetEditor() as editor:
+            editor.AutoBatch(SubtitleBatcher(self.options))
+        project.SaveProjectFile(projectfile)
+
+        prepared : list[list[tuple[int, int]]|None] = []
+        prepare_save = ProjectJournal.PrepareSave
+        def record_batches(journal, subtitles, encoder_class, batches=None):
+            prepared.append([ (batch.scene, batch.number) for batch in batches ] if batches is not None else None)
+            return prepare_save(journal, subtitles, encoder_class, batches=batches)
+
+        if background_save:
+            project.StartBackgroundWriter(save_delay=0.0)
+
+        translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data))
+        with patch.object(ProjectJournal, 'PrepareSave', autospec=True, side_effect=record_batches):
+            project.TranslateSubtitles(translator)
+            project.StopBackgroundWriter()
+
+        return project, prepared
+
+    def test_journaled_translation_saves_batches(self):
+        """A journaled project journals each translated batch instead of checking the whole project on every save"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            projectfile = os.path.join(temp_dir, "chinese_dinner.subtrans")
+            project, prepared = self._translate_journaled(projectfile, background_save=False)
+
+            batches = [ [(batch.scene, batch.number)] for scene in project.subtitles.scenes for batch in scene.batches ]
+            self.assertLoggedSequenceEqual("batches journaled, then a full save", batches + [ None ], prepared)
+
+            loaded = SubtitleProject(journaled=True)
+            loaded.ReadProjectFile(projectfile)
+            self.assertLoggedTrue("translation saved", loaded.subtitles.all_translated)
+            self._assert_same_as_reference(loaded.subtitles, project.subtitles)
+
+    def test_journaled_background_save(self):
+        """The background writer only journals translated batches, leaving the full save until translation finishes"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            projectfile = os.path.join(temp_dir, "chinese_dinner.subtrans")
+            project, prepared = self._translate_journaled(projectfile, background_save=True)
+
+            self.assertLoggedEqual("one full save", 1, prepared.count(None))
+
+            loaded = SubtitleProject(journaled=True)
+            loaded.ReadProjectFile(projectfile)
+            self.assertLoggedTrue("translation saved", loaded.subtitles.all_translated)
+            self._assert_same_as_reference(loaded.subtitles, project.subtitles)
@@ -0,0 +1,279 @@
+from unittest.mock import patch
+
+from PySubtrans.Helpers.TestCases import DummyTranslationClient, LoggedTestCase
+from PySubtrans.Helpers.Parse import ParseRetryAfterFromHeaders
+from PySubtrans.RateLimiter import ConcurrencyGovernor, GetConcurrencyGovernor, GetRateLimiter, GetRateLimiterKey, ResetRateLimiters, TokenBucket
+from PySubtrans.SettingsType import SettingsType
+from PySubtrans.Translation import Translation
+from PySubtrans.TranslationPrompt import TranslationPrompt
+from PySubtrans.TranslationRequest import TranslationRequest
+
+
+class TokenBucketTests(LoggedTestCase):
+    def test_requests_are_paced(self):
+        """A bucket with capacity 1 spaces reservations evenly at the configured rate"""
+        bucket = TokenBucket(60.0, capacity=1.0)
+        now = bucket.last_update
+
+        self.assertLoggedEqual("first request is immediate", 0.0, bucket.Reserve(1.0, now))
+        self.assertLoggedEqual("second request waits one interval", 1.0, bucket.Reserve(1.0, now))
+        self.assertLoggedEqual("third request waits two intervals", 2.0, bucket.Reserve(1.0, now))
+
+    def test_bucket_refills_over_time(self):
+        """Capacity is restored at rate_per_minute, up to the bucket capacity"""
+        bucket = TokenBucket(600.0)
+        now = bucket.last_update
+
+        self.assertLoggedEqual("burst within capacity", 0.0, bucket.Reserve(600.0, now))
+        self.assertLoggedEqual("empty bucket must wait", 1.0, bucket.Reserve(10.0, now))
+        self.assertLoggedEqual("refilled after waiting", 0.0, bucket.Reserve(10.0, now + 2.0))
+
+    def test_adjust_returns_unused_capacity(self):
+        """Overestimated reservations can be refunded, but not beyond capacity"""
+        bucket = TokenBucket(1000.0)
+        now = bucket.last_update
+
+        bucket.Reserve(800.0, now)
+        bucket.Adjust(-500.0, now)
+        self.assertLoggedEqual("refund applied", 700.0, bucket.available)
+
+        bucket.Adjust(-5000.0, now)
+        self.assertLoggedEqual("refund capped at capacity", 1000.0, bucket.available)
+
+
+class RateLimiterRegistryTests(LoggedTestCase):
+    def setUp(self):
+        super().setUp()
+        ResetRateLimiters()
+
+    def tearDown(self):
+        ResetRateLimiters()
+        super().tearDown()
+
+    def test_limiter_shared_by_key(self):
+        """Clients using the same provider and API key share a limiter"""
+        key = GetRateLimiterKey("Provider", "secret")
+        first = GetRateLimiter(key, 10.0)
+        second = GetRateLimiter(GetRateLimiterKey("Provider", "secret"), 10.0)
+        other = GetRateLimiter(GetRateLimiterKey("Provider", "another secret"), 10.0)
+
+        self.assertLoggedIs("same key returns the same limiter", first, second)
+        self.assertLoggedIsNot("different API key returns a different limiter", first, other)
+        self.assertLoggedNotIn("API key is not stored in the key", "secret", key)
+
+    def test_no_limiter_without_limits(self):
+        """No limiter is returned if no limits are configured"""
+        self.assertLoggedIsNone("no limits", GetRateLimiter(GetRateLimiterKey("Provider", "secret"), None, None))
+
+    def test_limits_are_updated(self):
+        """Changing the limits updates the shared limiter"""
+        key = GetRateLimiterKey("Provider", "secret")
+        limiter = GetRateLimiter(key, 10.0)
+        updated = GetRateLimiter(key, 20.0, 1000.0)
+
+        self.assertLoggedIs("limiter reused", limiter, updated)
+        if updated:
+            self.assertLoggedEqual("requests per minute updated", 20.0, updated.requests_per_minute)
+            self.assertLoggedEqual("tokens per minute updated", 1000.0, updated.tokens_per_minute)
+
+
+class ConcurrencyGovernorTests(LoggedTestCase):
+    def test_limit_blocks_extra_requests(self):
+        """Requests beyond the concurrency limit must wait for a slot to be released"""
+        governor = ConcurrencyGovernor(2)
+
+        self.assertLoggedTrue("first slot acquired", governor.Acquire(timeout=0.0))
+        self.assertLoggedTrue("second slot acquired", governor.Acquire(timeout=0.0))
+        self.assertLoggedFalse("third slot refused", governor.Acquire(timeout=0.0))
+
+        governor.Release()
+        self.assertLoggedTrue("slot acquired after release", governor.Acquire(timeout=0.0))
+
+    def test_throttle_halves_limit(self):
+        """Rate limit feedback halves the limit, once per decrease interval"""
+        governor = ConcurrencyGovernor(8, decrease_interval=60.0)
+
+        with self.assertLogs(level='INFO'):
+            governor.RecordThrottle()
+        self.assertLoggedEqual("limit halved", 4, governor.concurrency)
+
+        governor.RecordThrottle()
+        self.assertLoggedEqual("repeated throttle within interval ignored", 4, governor.concurrency)
+
+    def test_success_increases_limit_additively(self):
+        """Successful requests raise the limit by one per window, up to the maximum"""
+        governor = ConcurrencyGovernor(8, decrease_interval=0.0)
+        with self.assertLogs(level='INFO'):
+            governor.RecordThrottle()
+            governor.RecordThrottle()
+        self.assertLoggedEqual("limit reduced", 2, governor.concurrency)
+
+        for _ in range(3):
+            governor.RecordSuccess()
+        self.assertLoggedEqual("limit increased after a window of successes", 3, governor.concurrency)
+
+        for _ in range(100):
+            governor.RecordSuccess()
+        self.assertLoggedEqual("limit capped at maximum", 8, governor.concurrency)
+
+    def test_limit_rises_from_initial_concurrency(self):
+        """The limit starts at the initial concurrency and rises towards the maximum while requests succeed"""
+        governor = ConcurrencyGovernor(16, initial_concurrency=4)
+        self.assertLoggedEqual("initial limit", 4, governor.concurrency)
+
+        for _ in range(6):
+            governor.RecordSuccess()
+        self.assertLoggedEqual("limit increased after a window of successes", 5, governor.concurrency)
+
+        for _ in range(500):
+            governor.RecordSuccess()
+        self.assertLoggedEqual("limit capped at maximum", 16, governor.concurrency)
+
+    def test_retry_after_pauses_requests(self):
+        """A suggested retry delay pauses new requests"""
+        governor = ConcurrencyGovernor(4)
+        with self.assertLogs(level='INFO'):
+            governor.RecordThrottle(retry_after=60.0)
+
+        self.assertLoggedFalse("request refused while paused", governor.Acquire(timeout=0.0))
+        wait_time = governor.TryAcquire()
+        self.assertLoggedIsNotNone("wait time suggested", wait_time)
+        if wait_time is not None:
+            self.assertLoggedGreater("wait time reflects retry delay", wait_time, 50.0)
+
+    def test_governor_shared_by_key(self):
+        """Governors are shared by key and pick up changes to the maximum"""
+        ResetRateLimiters()
+        key = GetRateLimiterKey("Provider", "secret")
+        governor = GetConcurrencyGovernor(key, 4)
+        updated = GetConcurrencyGovernor(key, 2)
+        ResetRateLimiters()
+
+        self.assertLoggedIs("governor shared", governor, updated)
+        self.assertLoggedEqual("maximum updated", 2, updated.concurrency)
+
+    def test_ParseRetryAfterFromHeaders(self):
+        """Retry delays are read from Retry-After or x-ratelimit-reset headers"""
+        cases = [
+            ({'retry-after': '20'}, 20.0),
+            ({'Retry-After': '5'}, 5.0),
+            ({'x-ratelimit-reset-requests': '1500ms'}, 1.5),
+            ({'content-type': 'application/json'}, None),
+            (None, None),
+        ]
+        for headers, expected in cases:
+            with self.subTest(headers=headers):
+                self.assertLoggedEqual("retry delay", expected, ParseRetryAfterFromHeaders(headers), input_value=headers)
+
+
+class TranslationClientRateLimitTests(LoggedTestCase):
+    def setUp(self):
+        super().setUp()
+        ResetRateLimiters()
+
+    def tearDown(self):
+        ResetRateLimiters()
+        super().tearDown()
+
+    def _create_client(self, api_key : str, rate_limit : float|None, token_rate_limit : float|None = None) -> DummyTranslationClient:
+        return DummyTranslationClient(SettingsType({
+            'provider': 'Dummy Provider',
+            'api_key': api_key,
+            'instructions': 'Translate the subtitles',
+            'rate_limit': rate_limit,
+            'token_rate_limit': token_rate_limit,
+        }))
+
+    def test_clients_share_rate_limiter(self):
+        """Clients for the same account share one limiter, so their requests are paced together"""
+        first = self._create_client("key", 60.0)
+        second = self._create_client("key", 60.0)
+
+        self.assertLoggedIsNotNone("rate limiter created", first.rate_limiter)
+        self.assertLoggedIs("rate limiter shared", first.rate_limiter, second.rate_limiter)
+
+        prompt = TranslationPrompt("Translate", conversation=True)
+        prompt.messages = [{'role': 'user', 'content': 'Hello'}]
+
+        first_delay, _ = first._reserve_rate_limit(prompt)
+        second_delay, _ = second._reserve_rate_limit(prompt)
+
+        self.assertLoggedEqual("first request is immediate", 0.0, first_delay)
+        self.assertLoggedGreater("second request is delayed", second_delay, 0.5)
+
+    def test_slot_released_while_waiting_to_retry(self):
+        """Requests give up their concurrency slot while backing off, and only hold it again if translation continues"""
+        client = self._create_client("key", None)
+        governor = client.governor
+        if governor is None:
+            self.fail("Concurrency governor not created")
+
+        request = TranslationRequest(TranslationPrompt("Translate", conversation=True))
+        self.assertLoggedTrue("slot acquired", client._acquire_request_slot(request))
+
+        in_flight_while_waiting : list[int] = []
+        with patch('PySubtrans.TranslationClient.time.sleep', side_effect=lambda delay: in_flight_while_waiting.append(governor.in_flight)):
+            self.assertLoggedTrue("slot acquired after waiting", client._wait_for_retry(request, 1.0))
+
+        self.assertLoggedEqual("slot released while waiting", [0], in_flight_while_waiting)
+        self.assertLoggedEqual("slot held for the retry", 1, governor.in_flight)
+
+        def abort(delay):
+            client.aborted = True
+
+        with patch('PySubtrans.TranslationClient.time.sleep', side_effect=abort):
+            self.assertLoggedFalse("retry abandoned after abort", client._wait_for_retry(request, 1.0))
+
+        client._release_request_slot(request)
+        self.assertLoggedEqual("no slot held after abort", 0, governor.in_flight)
+        self.assertLoggedFalse("request does not hold a slot", request.holds_request_slot)
+
+    def test_concurrency_rises_above_max_threads(self):
+        """Healthy responses raise the number of concurrent requests above max_threads, up to adaptive_max_concurrency"""
+        client = DummyTranslationClient(SettingsType({
+            'provider': 'Dummy Provider',
+            'api_key': 'key',
+            'instructions': 'Translate the subtitles',
+            'max_threads': 4,
+            'adaptive_max_concurrency': 12,
+        }))
+        governor = client.governor
+        if governor is None:
+            self.fail("Concurrency governor not created")
+
+        self.assertLoggedEqual("starts at max_threads", 4, governor.concurrency)
+
+        for _ in range(200):
+            governor.RecordSuccess()
+        self.assertLoggedEqual("rises to adaptive_max_concurrency", 12, governor.concurrency)
+
+        requests = [ TranslationRequest(TranslationPrompt("Translate", conversation=True)) for _ in range(13) ]
+        acquired = [ client._acquire_request_slot(request) for request in requests[:12] ]
+        self.assertLoggedTrue("more requests in flight than max_threads", all(acquired))
+        self.assertLoggedEqual("requests in flight", 12, governor.in_flight)
+        self.assertLoggedIsNotNone("limit still applies", governor.TryAcquire())
+
+        for request in requests[:12]:
+            client._release_request_slot(request)
+
+    def test_no_rate_limiter_without_rate_limit(self):
+        """No limiter is used when no rate limit is configured"""
+        client = self._create_client("key", None)
+        self.assertLoggedIsNone("no rate limiter", client.rate_limiter)
+
+    def test_token_usage_corrects_estimate(self):
+        """Reported token usage replaces the estimate reserved for the request"""
+        client = self._create_client("key", None, token_rate_limit=10000.0)
+        limiter = client.rate_limiter
+        if limiter is None or limiter.tokens is None:
+            self.fail("Token rate limiter not created")
+
+        prompt = TranslationPrompt("Translate", conversation=True)
+        prompt.messages = [{'role': 'user', 'content': 'x' * 4000}]
+
+        _, estimated_tokens = client._reserve_rate_limit(prompt)
+        self.assertLoggedEqual("estimated tokens", 1000, estimated_tokens)
+
+        client._record_token_usage(Translation({'text': 'Translated', 'prompt_tokens': 1500, 'output_tokens': 500}), estimated_tokens)
+        self.assertLoggedLess("actual usage deducted", limiter.tokens.available, 8001.0)
+        self.assertLoggedGreater("actual usage deducted", limiter.tokens.available, 7999.0)
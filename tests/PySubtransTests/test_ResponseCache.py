@@ -0,0 +1,176 @@
+import os
+import tempfile
+
+from PySubtrans.Helpers.TestCases import DummyTranslationClient, LoggedTestCase
+from PySubtrans.ResponseCache import CloseResponseCaches, GetCacheKey, GetResponseCache, ResponseCache
+from PySubtrans.SettingsType import SettingsType
+from PySubtrans.Translation import Translation
+from PySubtrans.TranslationPrompt import TranslationPrompt
+from PySubtrans.TranslationRequest import TranslationRequest
+
+
+def _create_prompt(text : str) -> TranslationPrompt:
+    prompt = TranslationPrompt(text, conversation=True)
+    prompt.system_prompt = "Translate the subtitles"
+    prompt.messages = [{'role': 'user', 'content': text}]
+    return prompt
+
+
+class ResponseCacheTests(LoggedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, 'cache.db')
+
+    def tearDown(self):
+        CloseResponseCaches()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def test_get_and_put(self):
+        """Stored content is returned for the same key, and hits and misses are counted"""
+        cache = ResponseCache(self.cache_path)
+        self.assertLoggedIsNone("missing key", cache.Get("key"))
+
+        cache.Put("key", {'text': 'Translated', 'prompt_tokens': 100, 'output_tokens': 20})
+        content = cache.Get("key")
+        cache.Close()
+
+        self.assertLoggedIsNotNone("cached content returned", content)
+        if content:
+            self.assertLoggedEqual("text cached", 'Translated', content.get('text'))
+            self.assertLoggedEqual("token counts cached", 100, content.get('prompt_tokens'))
+
+        self.assertLoggedEqual("statistics", {'hits': 1, 'misses': 1, 'stores': 1, 'evictions': 0}, cache.statistics)
+
+    def test_cache_persists(self):
+        """Responses are still available after the cache is reopened"""
+        cache = ResponseCache(self.cache_path)
+        cache.Put("key", {'text': 'Translated'})
+        cache.Close()
+
+        reopened = ResponseCache(self.cache_path)
+        content = reopened.Get("key")
+        reopened.Close()
+
+        self.assertLoggedIsNotNone("content persisted", content)
+
+    def test_least_recently_used_entries_evicted(self):
+        """Entries that have not been used recently are evicted when the cache is full"""
+        entry = {'text': 'x' * 100}
+        cache = ResponseCache(self.cache_path, max_size=250)
+        cache.Put("first", entry)
+        cache.Put("second", entry)
+        cache.Get("first")
+        cache.Put("third", entry)
+
+        self.assertLoggedIsNotNone("recently used entry kept", cache.Get("first"))
+        self.assertLoggedIsNone("least recently used entry evicted", cache.Get("second"))
+        self.assertLoggedIsNotNone("new entry kept", cache.Get("third"))
+        self.assertLoggedEqual("eviction counted", 1, cache.statistics['evictions'])
+        cache.Close()
+
+    def test_access_times_persisted(self):
+        """Access times recorded in batches are written when the cache is closed, so eviction order survives a restart"""
+        entry = {'text': 'x' * 100}
+        cache = ResponseCache(self.cache_path)
+        cache.Put("first", entry)
+        cache.Put("second", entry)
+
+        changes = cache.connection.total_changes
+        for _i in range(10):
+            cache.Get("first")
+        self.assertLoggedEqual("access times not written on every hit", changes, cache.connection.total_changes)
+        cache.Close()
+
+        reopened = ResponseCache(self.cache_path, max_size=250)
+        reopened.Put("third", entry)
+        self.assertLoggedIsNotNone("recently used entry kept", reopened.Get("first"))
+        self.assertLoggedIsNone("least recently used entry evicted", reopened.Get("second"))
+        reopened.Close()
+
+    def test_size_tracked(self):
+        """The total size follows entries that are added, replaced, evicted and cleared"""
+        cache = ResponseCache(self.cache_path, max_size=250)
+        cache.Put("first", {'text': 'x' * 100})
+        cache.Put("first", {'text': 'x' * 50})
+        cache.Put("second", {'text': 'x' * 100})
+        cache.Put("third", {'text': 'x' * 100})
+
+        actual_size = cache.connection.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+        self.assertLoggedEqual("size matches entries", actual_size, cache.size)
+        self.assertLoggedLessEqual("size within limit", cache.size, 250)
+        cache.Close()
+
+        reopened = ResponseCache(self.cache_path)
+        self.assertLoggedEqual("size restored", actual_size, reopened.size)
+        reopened.Clear()
+        self.assertLoggedEqual("size cleared", 0, reopened.size)
+        reopened.Close()
+
+    def test_cache_key(self):
+        """Keys depend on everything that affects the response"""
+        prompt = _create_prompt("Hello")
+        key = GetCacheKey("Provider", "model", 0.0, prompt)
+
+        self.assertLoggedEqual("same request same key", key, GetCacheKey("Provider", "model", 0.0, _create_prompt("Hello")))
+        self.assertLoggedTrue("model changes key", key != GetCacheKey("Provider", "other model", 0.0, prompt))
+        self.assertLoggedTrue("temperature changes key", key != GetCacheKey("Provider", "model", 0.5, prompt))
+        self.assertLoggedTrue("prompt changes key", key != GetCacheKey("Provider", "model", 0.0, _create_prompt("Goodbye")))
+
+    def test_shared_cache(self):
+        """Caches are shared by path"""
+        first = GetResponseCache(self.cache_path)
+        second = GetResponseCache(os.path.join(self.temp_dir.name, '.', 'cache.db'))
+        self.assertLoggedIsNotNone("cache opened", first)
+        self.assertLoggedIs("cache shared", first, second)
+
+
+class TranslationClientCacheTests(LoggedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.requests : list[TranslationRequest] = []
+
+    def tearDown(self):
+        CloseResponseCaches()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def _create_client(self, retranslate : bool = False) -> DummyTranslationClient:
+        client = DummyTranslationClient(SettingsType({
+            'provider': 'Dummy Provider',
+            'model': 'dummy-model',
+            'instructions': 'Translate the subtitles',
+            'response_cache': True,
+            'response_cache_path': os.path.join(self.temp_dir.name, 'cache.db'),
+            'retranslate': retranslate,
+        }))
+
+        def request_translation(request : TranslationRequest, temperature : float|None = None) -> Translation|None:
+            self.requests.append(request)
+            return Translation({'text': 'Translated', 'prompt_tokens': 10, 'output_tokens': 5})
+
+        client._request_translation = request_translation   # type: ignore[method-assign]
+        return client
+
+    def test_identical_request_uses_cache(self):
+        """A repeated request is served from the cache without calling the provider"""
+        client = self._create_client()
+        first = client.RequestTranslation(_create_prompt("Hello"))
+        second = client.RequestTranslation(_create_prompt("Hello"))
+
+        self.assertLoggedEqual("provider called once", 1, len(self.requests))
+        self.assertLoggedIsNotNone("cached translation returned", second)
+        if first and second:
+            self.assertLoggedEqual("same text", first.text, second.text)
+            self.assertLoggedEqual("token counts preserved", first.prompt_tokens, second.prompt_tokens)
+            self.assertLoggedTrue("marked as cached", second.content.get('cached_response'))
+            self.assertLoggedIsNone("original not marked as cached", first.content.get('cached_response'))
+
+    def test_retranslate_bypasses_cache(self):
+        """Retranslation always calls the provider"""
+        self._create_client().RequestTranslation(_create_prompt("Hello"))
+        self._create_client(retranslate=True).RequestTranslation(_create_prompt("Hello"))
+
+        self.assertLoggedEqual("provider called twice", 2, len(self.requests))
@@ -0,0 +1,113 @@
+import io
+import unittest
+from datetime import timedelta
+
+from PySubtrans.Formats.SrtFileHandler import SrtFileHandler
+from PySubtrans.Helpers.TestCases import LoggedTestCase
+from PySubtrans.Helpers.Tests import skip_if_debugger_attached
+from PySubtrans.SubtitleData import SubtitleData
+from PySubtrans.SubtitleError import SubtitleParseError
+from PySubtrans.SubtitleLine import SubtitleLine
+
+from ..TestData.chinese_dinner import chinese_dinner_data
+
+def _describe(lines : list[SubtitleLine]) -> list[tuple]:
+    return [ (line.number, line.start_us, line.end_us, line.text, line.metadata) for line in lines ]
+
+class TestSrtFileHandler(LoggedTestCase):
+    """Test cases for the SRT file handler"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.handler = SrtFileHandler()
+
+    def _assert_same_as_srt_library(self, name : str, content : str) -> list[SubtitleLine]:
+        """ Parse content and check the result matches the srt library's """
+        lines = self.handler.parse_string(content).lines
+        expected = list(self.handler._parse_with_srt_library(content))
+        self.assertLoggedEqual(name, _describe(expected), _describe(lines))
+        return lines
+
+    def test_parse_well_formed(self):
+        """Well formed SRT is parsed with times built from the timestamps"""
+        content = "1\n00:00:01,500 --> 00:00:03,000\nFirst line\n\n2\n01:02:03,004 --> 01:02:05,000 X1:100 X2:200\nSecond line\nwith a break\n\n"
+        lines = self._assert_same_as_srt_library("well formed", content)
+
+        self.assertLoggedEqual("line count", 2, len(lines))
+        self.assertLoggedEqual("start", timedelta(seconds=1, milliseconds=500), lines[0].start)
+        self.assertLoggedEqual("end", timedelta(hours=1, minutes=2, seconds=5), lines[1].end)
+        self.assertLoggedEqual("multiline text", "Second line\nwith a break", lines[1].text)
+        self.assertLoggedEqual("proprietary", {"proprietary": "X1:100 X2:200"}, lines[1].metadata)
+
+    def test_parse_matches_srt_library(self):
+        """Variations in layout are parsed the same way as the srt library parses them"""
+        cases = {
+            "crlf": "1\r\n00:00:01,000 --> 00:00:02,000\r\nHello\r\n\r\n2\r\n00:00:03,000 --> 00:00:04,000\r\nWorld\r\n",
+            "bom": "\ufeff1\n00:00:01,000 --> 00:00:02,000\nHello\n",
+            "no trailing newline": "1\n00:00:01,000 --> 00:00:02,000\nHello",
+            "missing blank line": "1\n00:00:01,000 --> 00:00:02,000\nHello\n2\n00:00:03,000 --> 00:00:04,000\nWorld\n",
+            "blank line in content": "1\n00:00:01,000 --> 00:00:02,000\nHello\n\nthere\n\n2\n00:00:03,000 --> 00:00:04,000\nWorld\n",
+            "extra blank lines": "\n\n1\n00:00:01,000 --> 00:00:02,000\nHello\n\n\n\n2\n00:00:03,000 --> 00:00:04,000\nWorld\n\n\n",
+            "empty content": "1\n00:00:01,000 --> 00:00:02,000\n\n2\n00:00:03,000 --> 00:00:04,000\nWorld\n",
+            "loose timestamps": "1\n0:0:1.5 --> 0:0:2:25  X1:5\nHello\n",
+            "no milliseconds": "1\n00:00:01 --> 00:00:02\nHello\n",
+            "missing index": "00:00:01,000 --> 00:00:02,000\nHello\n\n00:00:03,000 --> 00:00:04,000\nWorld\n",
+            "decimal index": "1.5\n00:00:01,000 --> 00:00:02,000\nHello\n",
+            "no content before next block": "1\n00:00:01,000 --> 00:00:02,000\n2\n00:00:03,000 --> 00:00:04,000\nWorld\n",
+            "fullwidth delimiters": "1\n00：00：01，000 --> 00：00：02，000\nHello\n",
+        }
+
+        for name, content in cases.items():
+            with self.subTest(name=name):
+                self._assert_same_as_srt_library(name, content)
+
+    def test_parse_test_data(self):
+        """The test data is parsed the same way as the srt library parses it"""
+        content = chinese_dinner_data.get_str('original') or ''
+        lines = self._assert_same_as_srt_library("chinese dinner", content)
+        self.assertLoggedEqual("line count", 64, len(lines))
+
+    @skip_if_debugger_attached
+    def test_parse_invalid(self):
+        """Content that is not SRT raises a parse error"""
+        with self.assertRaises(SubtitleParseError):
+            self.handler.parse_string("This is not a subtitle file\n")
+
+        with self.assertRaises(SubtitleParseError):
+            self.handler.parse_string("1\r00:00:01,000 --> 00:00:02,000\rHello\r\r")
+
+    def test_compose(self):
+        """Lines are renumbered and written in SRT format"""
+        lines = [
+            SubtitleLine.Construct(5, timedelta(seconds=1, milliseconds=500), timedelta(seconds=3), "First line"),
+            SubtitleLine.Construct(6, timedelta(seconds=4), timedelta(seconds=5), ""),
+            SubtitleLine.Construct(7, timedelta(hours=1, minutes=2, seconds=3, milliseconds=4), timedelta(hours=1, minutes=2, seconds=5), "Second line\n\nwith a gap", {"proprietary": "X1:100"}),
+        ]
+
+        expected = "1\n00:00:01,500 --> 00:00:03,000\nFirst line\n\n2\n01:02:03,004 --> 01:02:05,000 X1:100\nSecond line\nwith a gap\n\n"
+        with self.assertLogs(level='WARNING'):
+            composed = self.handler.compose(SubtitleData(lines=lines, metadata={}))
+
+        self.assertLoggedEqual("composed SRT", expected, composed)
+
+    def test_compose_rtl_markers(self):
+        """Right-to-left markers are added when requested"""
+        lines = [ SubtitleLine.Construct(1, timedelta(seconds=1), timedelta(seconds=2), "שלום") ]
+        composed = self.handler.compose(SubtitleData(lines=lines, metadata={ 'add_rtl_markers': True }))
+        self.assertLoggedIn("RTL markers", "\u202bשלום\u202c", composed)
+
+    def test_write_file_matches_compose(self):
+        """Streaming to a file produces the same output as compose, which round-trips the test data"""
+        content = chinese_dinner_data.get_str('original') or ''
+        data = self.handler.parse_string(content)
+
+        with io.StringIO() as f:
+            self.handler.write_file(data, f)
+            written = f.getvalue()
+
+        composed = self.handler.compose(data)
+        self.assertLoggedEqual("written file", composed, written)
+        self.assertLoggedEqual("round trip", _describe(data.lines), _describe(self.handler.parse_string(composed).lines))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,15 +3,19 @@ import threading
 from copy import deepcopy
 from datetime import timedelta
 
-from PySubtrans.Helpers.TestCases import SubtitleTestCase, DummyTranslationClient
+from PySubtrans.Helpers.TestCases import LoggedTestCase, SubtitleTestCase, DummyTranslationClient
 from PySubtrans.Helpers.Tests import log_info, skip_if_debugger_attached
+from PySubtrans.Instructions import DEFAULT_TASK_TYPE
+from PySubtrans.Options import Options
 from PySubtrans.SettingsType import SettingsType, SettingType
 from PySubtrans.SubtitleBatch import SubtitleBatch
 from PySubtrans.SubtitleBuilder import SubtitleBuilder
 from PySubtrans.SubtitleError import TranslationError
+from PySubtrans.SubtitleLine import SubtitleLine
 from PySubtrans.SubtitleTranslator import SubtitleTranslator
 from PySubtrans.Translation import Translation
 from PySubtrans.TranslationClient import TranslationClient
+from PySubtrans.TranslationParser import StreamingTranslationParser
 from PySubtrans.TranslationPrompt import TranslationPrompt
 from PySubtrans.TranslationProvider import TranslationProvider
 from PySubtrans.TranslationRequest import TranslationRequest
@@ -430,3 +434,74 @@ class StreamingTests(SubtitleTestCase):
             f"All {num_threads} concurrent translations should succeed",
         )
 
+
+streamed_blocks = [
+    "#1\nOriginal>\nいつものように食事が終わるまでは誰も入れないでくれ.\nTranslation>\nAs usual, don't let anyone in until the meal is over.\n\n",
+    "#2\nOriginal>\nいつものやつを頼む星野だ 親父を頼む星野です.\nTranslation>\nIt's Hoshino, ordering the usual. Hoshino, asking for the boss.\n\n",
+    "#3\nOriginal>\n星野様 いつもありがとうございます.\nTranslation>\nMr. Hoshino, thank you as always.\n\n",
+]
+
+class StreamingParserTests(LoggedTestCase):
+    def _create_parser(self) -> StreamingTranslationParser:
+        return StreamingTranslationParser(DEFAULT_TASK_TYPE, Options())
+
+    def test_blocks_emitted_once(self):
+        """Each completed block is parsed once, however many updates include it"""
+        parser = self._create_parser()
+        text = ""
+        emitted : list[SubtitleLine] = []
+        for block in streamed_blocks:
+            text += block
+            new_lines = parser.ProcessStreamingText(text)
+            self.assertLoggedEqual("one new line per block", 1, len(new_lines), input_value=text)
+            emitted.extend(new_lines)
+
+        self.assertLoggedSequenceEqual("lines in order", [1, 2, 3], [line.number for line in emitted])
+        self.assertLoggedEqual("translation parsed", "Mr. Hoshino, thank you as always.", emitted[2].text)
+        self.assertLoggedEqual("cursor at end of text", len(text), parser.cursor)
+        self.assertLoggedSequenceEqual("no repeats", [], parser.ProcessStreamingText(text))
+
+    def test_incomplete_block_not_emitted(self):
+        """A block without its translation is held back until it is completed"""
+        parser = self._create_parser()
+        partial = streamed_blocks[0] + "#2\nOriginal>\nいつものやつを頼む星野だ\n\n"
+
+        new_lines = parser.ProcessStreamingText(partial)
+        self.assertLoggedSequenceEqual("only the complete block", [1], [line.number for line in new_lines])
+
+        new_lines = parser.ProcessStreamingText(streamed_blocks[0] + streamed_blocks[1])
+        self.assertLoggedSequenceEqual("completed block emitted", [2], [line.number for line in new_lines])
+        self.assertLoggedIn("translation of completed block", "Hoshino", new_lines[0].text or "")
+
+    def test_multiple_blocks_in_one_update(self):
+        """Several blocks completed in one update are all emitted"""
+        parser = self._create_parser()
+        new_lines = parser.ProcessStreamingText("<summary>Dinner</summary>\n\n" + "".join(streamed_blocks))
+        self.assertLoggedSequenceEqual("all blocks", [1, 2, 3], [line.number for line in new_lines])
+
+    def test_reset_on_new_response(self):
+        """Text that does not continue the previous response restarts parsing"""
+        parser = self._create_parser()
+        parser.ProcessStreamingText(streamed_blocks[0] + streamed_blocks[1])
+
+        new_lines = parser.ProcessStreamingText(streamed_blocks[2])
+        self.assertLoggedSequenceEqual("parsed from the start", [3], [line.number for line in new_lines])
+        self.assertLoggedEqual("cursor restarted", len(streamed_blocks[2]), parser.cursor)
+
+
+    def test_client_parsers_share_options_and_patterns(self):
+        """Parsers created by a client reuse its options and the compiled patterns for the task type"""
+        client = DummyTranslationClient(SettingsType({ 'instructions': "Translate" }))
+        first = client.GetParser(DEFAULT_TASK_TYPE)
+        second = client.GetStreamingParser(DEFAULT_TASK_TYPE)
+
+        self.assertLoggedIs("options shared", first.options, second.options)
+        with self.assertRaises(TypeError):
+            first.options['max_lines'] = 1  # type: ignore[index]
+        self.assertLoggedIsNone("options unchanged", client.parser_options.get('max_lines'))
+        self.assertLoggedIs("patterns shared", first.regex_patterns, second.regex_patterns)
+        self.assertLoggedIsNot("parsers are separate", first, second)
+
+        other_task = client.GetParser("Transcription")
+        self.assertLoggedIsNot("patterns per task type", first.regex_patterns, other_task.regex_patterns)
+        self.assertLoggedIn("task type in pattern", "Transcription>", other_task.regex_patterns[0].pattern)
@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+from PySubtrans.Helpers.TestCases import LoggedTestCase
+from PySubtrans.SettingsType import SettingsType
+from PySubtrans.SubtitleBatcher import SubtitleBatcher
+from PySubtrans.SubtitleLine import SubtitleLine
+from PySubtrans.SubtitleTimings import SubtitleTimings
+from PySubtrans.TokenEstimator import TokenEstimator
+
+def _create_lines(texts : list[str], long_gap_after : int|None = None) -> list[SubtitleLine]:
+    """ Create lines two seconds apart, with an optional long gap after one of them """
+    lines = []
+    start = timedelta(seconds=0)
+    for number, text in enumerate(texts, start=1):
+        lines.append(SubtitleLine.Construct(number, start, start + timedelta(seconds=1), text))
+        start += timedelta(seconds=2)
+        if number == long_gap_after:
+            start += timedelta(seconds=10)
+    return lines
+
+
+class TokenEstimatorTests(LoggedTestCase):
+    def test_EstimateTokens(self):
+        """Latin text is about four characters per token, CJK text about one token per character"""
+        estimator = TokenEstimator()
+        cases = [
+            ("", 0),
+            ("abcd" * 10, 10),
+            ("你好世界", 4),
+            ("こんにちは world", 7),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertLoggedEqual("estimated tokens", expected, estimator.EstimateTokens(text), input_value=text)
+
+    def test_output_estimate_exceeds_input(self):
+        """Responses repeat the original text, so expected output is larger than the input"""
+        estimator = TokenEstimator()
+        line = _create_lines(["This is a line of dialogue"])[0]
+        self.assertLoggedGreater("output larger than input", estimator.EstimateLineOutputTokens(line), estimator.EstimateLineInputTokens(line))
+
+
+class SubtitleBatcherTokenBudgetTests(LoggedTestCase):
+    def _batch(self, lines : list[SubtitleLine], **settings) -> list[list[SubtitleLine]]:
+        batcher = SubtitleBatcher(SettingsType({ 'min_batch_size': 1, 'max_batch_size': 100, **settings }))
+        return batcher._split_lines(lines)
+
+    def test_no_budget_uses_line_count(self):
+        """Without token budgets batches are only limited by line count"""
+        lines = _create_lines(["x" * 400] * 20)
+        self.assertLoggedEqual("single batch", 1, len(self._batch(lines)))
+
+    def test_output_budget_splits_dense_batch(self):
+        """Dialogue-heavy batches are split to fit the output budget"""
+        estimator = TokenEstimator()
+        lines = _create_lines(["x" * 400] * 20)
+        max_output_tokens = 1000
+        batches = self._batch(lines, max_output_tokens=max_output_tokens)
+
+        self.assertLoggedGreater("batch was split", len(batches), 1)
+        self.assertLoggedEqual("all lines batched", 20, sum(len(batch) for batch in batches))
+        for batch in batches:
+            output_tokens = estimator.response_overhead + sum(estimator.EstimateLineOutputTokens(line) for line in batch)
+            self.assertLoggedLessEqual("batch fits output budget", output_tokens, max_output_tokens)
+
+    def test_input_budget_splits_at_largest_gap(self):
+        """Batches over the input budget are split at the largest gap"""
+        lines = _create_lines(["x" * 100] * 10, long_gap_after=6)
+        batches = self._batch(lines, max_input_tokens=300)
+
+        self.assertLoggedEqual("split into two batches", 2, len(batches))
+        self.assertLoggedEqual("split at the long gap", 6, len(batches[0]))
+
+    def test_sparse_lines_fill_batch(self):
+        """Short lines are not split when they fit within the budget"""
+        lines = _create_lines(["Hi"] * 50)
+        batches = self._batch(lines, max_input_tokens=2000, max_output_tokens=2000)
+        self.assertLoggedEqual("single batch", 1, len(batches))
+
+    def test_single_line_over_budget(self):
+        """A single line that exceeds the budget is kept as its own batch"""
+        lines = _create_lines(["x" * 4000, "short"])
+        batches = self._batch(lines, max_input_tokens=100)
+        self.assertLoggedEqual("lines in separate batches", [1, 1], [len(batch) for batch in batches])
+
+
+class SubtitleTimingsTests(LoggedTestCase):
+    def test_gaps_and_scene_breaks(self):
+        """Gaps are measured from the end of the previous line, and long gaps start new scenes"""
+        timings = SubtitleTimings.FromLines(_create_lines(["a", "b", "c", "d"], long_gap_after=2))
+
+        self.assertLoggedSequenceEqual("gaps in microseconds", [0, 1_000_000, 11_000_000, 1_000_000], list(timings.gaps))
+        self.assertLoggedEqual("scene break after long gap", [2], timings.FindSceneBreaks(timedelta(seconds=5)))
+        self.assertLoggedEqual("longest gap in range", 2, timings.FindLongestGap(1, 4))
+        self.assertLoggedEqual("first index when range is empty", 3, timings.FindLongestGap(3, 3))
+
+    def test_fix_overlaps(self):
+        """Overlapping lines are moved to start just after the previous line ends"""
+        lines = _create_lines(["a", "b", "c"])
+        lines[1].start = timedelta(milliseconds=500)
+        timings = SubtitleTimings.FromLines(lines)
+
+        fixed = timings.FixOverlaps(lines, timedelta(milliseconds=10))
+
+        self.assertLoggedEqual("one line fixed", 1, fixed)
+        self.assertLoggedEqual("line start moved", timedelta(milliseconds=1010), lines[1].start)
+        self.assertLoggedEqual("gap recalculated", 10_000, timings.gaps[1])
+
+    def test_batches_match_scene_slices(self):
+        """Batching the whole file gives the same batches as splitting each scene separately"""
+        lines = _create_lines([f"Line {number}" for number in range(1, 41)], long_gap_after=25)
+        batcher = SubtitleBatcher(SettingsType({ 'min_batch_size': 3, 'max_batch_size': 8, 'scene_threshold': 5.0 }))
+
+        scenes = batcher.BatchSubtitles(lines)
+        expected = batcher._split_lines(lines[:25]) + batcher._split_lines(lines[25:])
+
+        self.assertLoggedEqual("two scenes", 2, len(scenes))
+        self.assertLoggedSequenceEqual("same batches", [ [ line.number for line in batch ] for batch in expected ],
+                                       [ [ line.number for line in batch.originals ] for scene in scenes for batch in scene.batches ])
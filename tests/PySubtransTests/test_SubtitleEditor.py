@@ -2,12 +2,14 @@ import os
 import tempfile
 import unittest
 from datetime import timedelta
+from unittest.mock import PropertyMock, patch
 
 from PySubtrans.Helpers.TestCases import BuildSubtitlesFromLineCounts, SubtitleTestCase
 from PySubtrans.Helpers.Tests import (
     skip_if_debugger_attached,
 )
 from PySubtrans.SettingsType import SettingsType
+from PySubtrans.SubtitleBatch import SubtitleBatch
 from PySubtrans.SubtitleBatcher import SubtitleBatcher
 from PySubtrans.SubtitleEditor import SubtitleEditor
 from PySubtrans.SubtitleLine import SubtitleLine
@@ -944,5 +946,78 @@ class SubtitleEditorTests(SubtitleTestCase):
             )
 
 
+    def test_line_lookups_after_edits(self):
+        """Lines are found in the right batch after scenes are merged and split"""
+        subtitles = BuildSubtitlesFromLineCounts([[3, 2], [4], [2, 2, 1]])
+
+        with SubtitleEditor(subtitles) as editor:
+            editor.MergeScenes([1, 2])
+            editor.SplitScene(2, 2)
+
+        for scene in subtitles.scenes:
+            for batch in scene.batches:
+                for line in batch.originals:
+                    found = subtitles.GetBatchContainingLine(line.number)
+                    self.assertLoggedIs(f"batch containing line {line.number}", batch, found)
+                    self.assertLoggedIs(f"original line {line.number}", line, subtitles.GetOriginalLine(line.number))
+
+        last_line_number = subtitles.originals[-1].number if subtitles.originals else 0
+        self.assertLoggedIsNone("line after the end", subtitles.GetBatchContainingLine(last_line_number + 1))
+        self.assertLoggedIsNone("missing original line", subtitles.GetOriginalLine(last_line_number + 1))
+
+
+    def test_translation_status_tracking(self):
+        """Translated counts and status follow translations added to and deleted from batches"""
+        subtitles = BuildSubtitlesFromLineCounts([[2], [2]])
+        self.assertLoggedFalse("nothing translated", subtitles.any_translated)
+
+        first_batch = subtitles.scenes[0].batches[0]
+        for line in first_batch.originals:
+            first_batch.AddTranslatedLine(SubtitleLine.Construct(line.number, line.start, line.end, f"Translated {line.number}"))
+
+        self.assertLoggedEqual("batch translated count", 2, first_batch.translated_count)
+        self.assertLoggedEqual("batch untranslated count", 0, first_batch.untranslated_count)
+        self.assertLoggedTrue("some lines translated", subtitles.any_translated)
+        self.assertLoggedFalse("not all lines translated", subtitles.all_translated)
+
+        second_batch = subtitles.scenes[1].batches[0]
+        second_batch.MergeTranslations([ SubtitleLine.Construct(line.number, line.start, line.end, "Translated") for line in second_batch.originals ])
+        self.assertLoggedEqual("scene translated count", 2, subtitles.scenes[1].translated_count)
+        self.assertLoggedTrue("all lines translated", subtitles.all_translated)
+
+        with SubtitleEditor(subtitles) as editor:
+            editor.DeleteLines([ second_batch.originals[0].number ])
+            second_batch.AddLine(SubtitleLine.Construct(99, "00:01:00,000", "00:01:01,000", "New line"))
+
+        self.assertLoggedFalse("new line is untranslated", subtitles.all_translated)
+        self.assertLoggedEqual("untranslated count", 1, second_batch.untranslated_count)
+        self.assertLoggedEqual("scene untranslated count", 1, subtitles.scenes[1].untranslated_count)
+        self.assertLoggedEqual("subtitles translated count", 3, subtitles.translated_count)
+        self.assertLoggedEqual("subtitles untranslated count", 1, subtitles.untranslated_count)
+
+        first_batch.translated = []
+        self.assertLoggedFalse("first scene not translated", subtitles.scenes[0].any_translated)
+        self.assertLoggedEqual("translations cleared", 1, subtitles.translated_count)
+
+        with SubtitleEditor(subtitles) as editor:
+            editor.MergeScenes([1, 2])
+
+        self.assertLoggedEqual("merged scene translated count", 1, subtitles.scenes[0].translated_count)
+        self.assertLoggedEqual("merged untranslated count", 3, subtitles.untranslated_count)
+
+    def test_translation_status_not_recalculated(self):
+        """Scene and subtitles status are read from running totals without checking every batch"""
+        subtitles = BuildSubtitlesFromLineCounts([[2, 2], [2]])
+        first_batch = subtitles.scenes[0].batches[0]
+        first_batch.MergeTranslations([ SubtitleLine.Construct(line.number, line.start, line.end, "Translated") for line in first_batch.originals ])
+
+        with patch.object(SubtitleBatch, 'all_translated', new_callable=PropertyMock) as all_translated, \
+             patch.object(SubtitleBatch, 'any_translated', new_callable=PropertyMock) as any_translated:
+            self.assertLoggedTrue("first scene partly translated", subtitles.scenes[0].any_translated and not subtitles.scenes[0].all_translated)
+            self.assertLoggedFalse("second scene not translated", subtitles.scenes[1].any_translated)
+            self.assertLoggedTrue("subtitles partly translated", subtitles.any_translated and not subtitles.all_translated)
+            self.assertLoggedEqual("batches not checked", 0, all_translated.call_count + any_translated.call_count)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,7 +4,7 @@ import unittest
 from typing import TextIO
 from unittest.mock import MagicMock, patch
 
-from PySubtrans.SubtitleFileHandler import SubtitleFileHandler
+from PySubtrans.SubtitleFileHandler import SubtitleFileHandler, decode_subtitle_bytes, read_subtitle_file
 from PySubtrans.SubtitleFormatRegistry import SubtitleFormatRegistry
 from PySubtrans.Formats.SrtFileHandler import SrtFileHandler
 from PySubtrans.SubtitleData import SubtitleData
@@ -130,32 +130,61 @@ class TestSubtitleFormatRegistry(LoggedTestCase):
         finally:
             os.unlink(temp_path)
 
-    @patch('pysubs2.load')
+    @patch('PySubtrans.SubtitleFormatRegistry.read_subtitle_file')
     @skip_if_debugger_attached
-    def test_DetectFormatAndLoadFileError(self, mock_load):
-        mock_load.side_effect = Exception("Parse error")
+    def test_DetectFormatAndLoadFileError(self, mock_read):
+        mock_read.side_effect = OSError("Read error")
 
         with self.assertRaises(SubtitleParseError) as e:
             SubtitleFormatRegistry.detect_format_and_load_file("nonexistent.srt")
         log_input_expected_error("nonexistent.srt", SubtitleParseError, e.exception)
 
-    @patch('pysubs2.load')
-    @skip_if_debugger_attached
-    def test_DetectFormatAndLoadFileUnicodeError(self, mock_load):
-        
-        mock_subs = MagicMock()
-        mock_subs.format = "srt"
-        
-        mock_load.side_effect = [UnicodeDecodeError('utf-8', b'', 0, 1, 'invalid'), mock_subs]
-        
+    def test_DetectFormatParsesDecodedContent(self):
+        srt_content = "1\n00:00:01,000 --> 00:00:02,000\nTest subtitle\n"
+
         with patch.object(SubtitleFormatRegistry, 'create_handler') as mock_create:
             mock_handler = MagicMock()
-            mock_handler.load_file.return_value = SubtitleData(lines=[], metadata={})
+            mock_handler.parse_string.return_value = SubtitleData(lines=[], metadata={})
             mock_create.return_value = mock_handler
-            
-            data = SubtitleFormatRegistry.detect_format_and_load_file("test.srt")
-            self.assertLoggedEqual('fallback encoding used', 2, mock_load.call_count)
-            self.assertIsInstance(data, SubtitleData)
+
+            data = SubtitleFormatRegistry.detect_format_and_parse(srt_content)
+            self.assertLoggedEqual('handler created for detected format', '.srt', mock_create.call_args.args[0])
+            self.assertLoggedEqual('content passed to handler', srt_content, mock_handler.parse_string.call_args.args[0])
+            self.assertLoggedEqual('detected_format', '.srt', data.metadata.get('detected_format'))
+            mock_handler.load_file.assert_not_called()
+
+    def test_LoadFileReadsOnce(self):
+        srt_content = "1\n00:00:01,000 --> 00:00:02,000\nTest subtitle\n\n2\n00:00:03,000 --> 00:00:04,000\nAnother line\n"
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.vtt', delete=False, encoding='utf-8') as f:
+            f.write(srt_content)
+            temp_path = f.name
+
+        try:
+            with patch('PySubtrans.SubtitleFormatRegistry.read_subtitle_file', wraps=read_subtitle_file) as mock_read:
+                with self.assertLogs(level='INFO'):
+                    data = SubtitleFormatRegistry.load_file(temp_path)
+
+            self.assertLoggedEqual('file read once', 1, mock_read.call_count)
+            self.assertLoggedEqual('fell back to detected format', '.srt', data.metadata.get('detected_format'))
+            self.assertLoggedEqual('lines parsed', 2, len(data.lines))
+        finally:
+            os.unlink(temp_path)
+
+    def test_DecodeSubtitleBytes(self):
+        text = "1\n00:00:01,000 --> 00:00:02,000\nCafé à Paris\n"
+
+        cases = {
+            'utf-8': text.encode('utf-8'),
+            'utf-8 with BOM': b'\xef\xbb\xbf' + text.encode('utf-8'),
+            'utf-16 LE with BOM': b'\xff\xfe' + text.encode('utf-16-le'),
+            'utf-16 BE with BOM': b'\xfe\xff' + text.encode('utf-16-be'),
+            'fallback encoding': text.encode('iso-8859-1'),
+        }
+
+        for name, data in cases.items():
+            with self.subTest(name=name):
+                self.assertLoggedEqual(name, text, decode_subtitle_bytes(data))
 
     def test_ClearMethod(self):
         
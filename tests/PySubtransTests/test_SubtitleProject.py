@@ -9,9 +9,12 @@ from PySubtrans.SettingsType import SettingsType
 from PySubtrans.SubtitleBatcher import SubtitleBatcher
 from PySubtrans.SubtitleProject import SubtitleProject
 from PySubtrans.SubtitleScene import SubtitleScene
+from PySubtrans.SubtitleSerialisation import SubtitleEncoder
 from PySubtrans.SubtitleTranslator import SubtitleTranslator
 from PySubtrans.Subtitles import Subtitles
+from PySubtrans.Translation import Translation
 from PySubtrans.TranslationEvents import TranslationEvents
+from PySubtrans.TranslationPrompt import TranslationPrompt
 from ..TestData.chinese_dinner import chinese_dinner_data
 
 
@@ -548,6 +551,160 @@ Modified subtitle line 2
         actual_path = os.path.normpath(project_path)
         self.assertLoggedEqual("no extension to subtrans", expected_path, actual_path)
 
+    def test_get_compressed_project_filepath(self):
+        """Test GetProjectFilepath for compressed projects"""
+
+        project = SubtitleProject(compressed=True)
+
+        project_path = project.GetProjectFilepath(self.test_srt_file)
+        expected_path = os.path.join(self.temp_dir, "test.subtransz")
+        self.assertLoggedEqual("SRT to subtransz", expected_path, project_path)
+
+        subtrans_path = os.path.join(self.temp_dir, "movie.subtrans")
+        self.assertLoggedEqual("subtrans unchanged", subtrans_path, project.GetProjectFilepath(subtrans_path))
+
+        # An existing uncompressed project is used rather than starting a new one
+        with open(self.test_project_file, 'w', encoding='utf-8') as f:
+            f.write("{}")
+
+        project_path = project.GetProjectFilepath(self.test_srt_file)
+        self.assertLoggedEqual("existing project used", self.test_project_file, project_path)
+
+        backup_path = project.GetBackupFilepath(os.path.join(self.temp_dir, "test.subtransz"))
+        self.assertLoggedEqual("backup keeps format", os.path.join(self.temp_dir, "test.subtransz-backup"), backup_path)
+
+    def test_compressed_project_round_trip(self):
+        """A compressed project loads the same subtitles as an uncompressed one, and is smaller"""
+        project = SubtitleProject(persistent=True)
+        project.InitialiseProject(self.test_srt_file)
+
+        with project.GetEditor() as editor:
+            editor.AutoBatch(SubtitleBatcher(self.options))
+
+        project.subtitles.terminology_map = {"饺子": "Dumplings"}
+
+        compressed_file = os.path.join(self.temp_dir, "test.subtransz")
+        project.SaveProjectFile(self.test_project_file)
+        project.WriteProjectToFile(compressed_file, encoder_class=SubtitleEncoder)
+
+        with open(compressed_file, 'rb') as f:
+            self.assertLoggedEqual("gzip header", b'\x1f\x8b', f.read(2))
+
+        self.assertLoggedLess("compressed project is smaller", os.path.getsize(compressed_file), os.path.getsize(self.test_project_file))
+
+        uncompressed = SubtitleProject()
+        uncompressed.ReadProjectFile(self.test_project_file)
+        compressed = SubtitleProject()
+        compressed.ReadProjectFile(compressed_file)
+
+        self._assert_same_as_reference(compressed.subtitles, uncompressed.subtitles)
+        self.assertLoggedEqual("terminology preserved", {"饺子": "Dumplings"}, compressed.subtitles.terminology_map)
+
+        # The format is detected from the content rather than the extension
+        renamed_file = os.path.join(self.temp_dir, "renamed.subtrans")
+        os.replace(compressed_file, renamed_file)
+        renamed = SubtitleProject()
+        renamed.ReadProjectFile(renamed_file)
+        self.assertLoggedEqual("compressed content detected", uncompressed.subtitles.linecount, renamed.subtitles.linecount)
+
+    def test_repeated_instructions_stored_once(self):
+        """Instructions repeated in every batch prompt are written once and restored on load"""
+        project = SubtitleProject(persistent=True)
+        project.InitialiseProject(self.test_srt_file)
+
+        with project.GetEditor() as editor:
+            editor.AutoBatch(SubtitleBatcher(SettingsType({ 'max_batch_size': 10 })))
+
+        instructions = "Translate the subtitles into French, keeping each line short enough to read. " * 10
+        batches = [ batch for scene in project.subtitles.scenes for batch in scene.batches ]
+        for batch in batches:
+            batch.prompt = TranslationPrompt("Translate these subtitles", conversation=True)
+            batch.prompt.supports_system_messages = True
+            batch.prompt.GenerateMessages(instructions, batch.originals, {})
+
+        project.SaveProjectFile(self.test_project_file)
+
+        with open(self.test_project_file, 'r', encoding='utf-8') as f:
+            project_json = f.read()
+
+        self.assertLoggedGreater("several batches", len(batches), 1)
+        self.assertLoggedEqual("instructions written once", 1, project_json.count(instructions))
+
+        new_project = SubtitleProject()
+        new_project.ReadProjectFile(self.test_project_file)
+
+        loaded_batches = [ batch for scene in new_project.subtitles.scenes for batch in scene.batches ]
+        for batch, loaded in zip(batches, loaded_batches):
+            loaded_messages = loaded.prompt.messages if loaded.prompt else None
+            self.assertLoggedEqual(f"batch {batch.number} messages restored", batch.prompt.messages if batch.prompt else None, loaded_messages)
+
+        first_prompt, last_prompt = loaded_batches[0].prompt, loaded_batches[-1].prompt
+        if first_prompt and last_prompt:
+            self.assertLoggedIs("instructions shared", first_prompt.messages[0]['content'], last_prompt.messages[0]['content'])
+
+    def test_lazy_load_defers_prompts_and_translations(self):
+        """A lazily loaded project decodes batch prompts and translations when they are accessed"""
+        project = SubtitleProject(persistent=True)
+        project.InitialiseProject(self.test_srt_file)
+
+        with project.GetEditor() as editor:
+            editor.AutoBatch(SubtitleBatcher(self.options))
+
+        batch = project.subtitles.GetBatch(1, 1)
+        batch.prompt = TranslationPrompt("Translate these subtitles", conversation=True)
+        batch.prompt.GenerateMessages("Translate the subtitles into French", batch.originals, {})
+        batch.translation = Translation({ 'text': "#1\nOriginal>\nHello\nTranslation>\nBonjour\n\n<summary>Greetings</summary>" })
+        project.SaveProjectFile(self.test_project_file)
+
+        lazy_project = SubtitleProject(lazy_load=True)
+        lazy_project.ReadProjectFile(self.test_project_file)
+        lazy_batch = lazy_project.subtitles.GetBatch(1, 1)
+
+        self._assert_same_as_reference(lazy_project.subtitles, project.subtitles)
+        self.assertLoggedTrue("translation deferred", callable(lazy_batch._translation))
+        self.assertLoggedTrue("prompt deferred", callable(lazy_batch._prompt))
+
+        self.assertLoggedEqual("summary decoded on access", "Greetings", lazy_batch.translation.summary if lazy_batch.translation else None)
+        self.assertLoggedIsInstance("translation decoded", lazy_batch._translation, Translation)
+        self.assertLoggedEqual("prompt decoded on access", batch.prompt.messages, lazy_batch.prompt.messages if lazy_batch.prompt else None)
+
+        self.assertLoggedIsNone("batch without prompt", lazy_project.subtitles.GetBatch(2, 1).prompt)
+
+    def test_lazy_project_saved_without_decoding_prompts(self):
+        """Saving a lazily loaded project keeps repeated instructions stored once without decoding the prompts"""
+        project = SubtitleProject(persistent=True)
+        project.InitialiseProject(self.test_srt_file)
+
+        with project.GetEditor() as editor:
+            editor.AutoBatch(SubtitleBatcher(SettingsType({ 'max_batch_size': 10 })))
+
+        instructions = "Translate the subtitles into French, keeping each line short enough to read. " * 10
+        batches = [ batch for scene in project.subtitles.scenes for batch in scene.batches ]
+        for batch in batches:
+            batch.prompt = TranslationPrompt("Translate these subtitles", conversation=True)
+            batch.prompt.supports_system_messages = True
+            batch.prompt.GenerateMessages(instructions, batch.originals, {})
+
+        project.SaveProjectFile(self.test_project_file)
+
+        lazy_project = SubtitleProject(lazy_load=True)
+        lazy_project.ReadProjectFile(self.test_project_file)
+        lazy_project.SaveProjectFile(self.test_project_file)
+
+        lazy_batches = [ batch for scene in lazy_project.subtitles.scenes for batch in scene.batches ]
+        self.assertLoggedTrue("prompts not decoded", all(callable(batch._prompt) for batch in lazy_batches))
+
+        with open(self.test_project_file, 'r', encoding='utf-8') as f:
+            self.assertLoggedEqual("instructions written once", 1, f.read().count(instructions))
+
+        new_project = SubtitleProject()
+        new_project.ReadProjectFile(self.test_project_file)
+
+        loaded_batches = [ batch for scene in new_project.subtitles.scenes for batch in scene.batches ]
+        for batch, loaded in zip(batches, loaded_batches):
+            loaded_messages = loaded.prompt.messages if loaded.prompt else None
+            self.assertLoggedEqual(f"batch {batch.number} messages restored", batch.prompt.messages if batch.prompt else None, loaded_messages)
+
     def test_get_backup_filepath(self):
         """Test GetBackupFilepath method"""
 
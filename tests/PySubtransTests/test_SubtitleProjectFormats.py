@@ -133,6 +133,21 @@ Dialogue: 0,0:00:01.00,0:00:03.00,Default,,0,0,0,,Hello World!
         self.assertLoggedEqual("line.start", 1.0, line.start.total_seconds())
         self.assertLoggedEqual("line.end", 3.0, line.end.total_seconds())
 
+    def test_SrtOutOfOrderIndices(self):
+        """Lines with indices out of order are renumbered so that they can be found by number"""
+        srt_content = "1\n00:00:01,000 --> 00:00:02,000\nFirst\n\n3\n00:00:03,000 --> 00:00:04,000\nSecond\n\n2\n00:00:05,000 --> 00:00:06,000\nThird\n"
+
+        subtitles = Subtitles()
+        subtitles.LoadSubtitlesFromString(srt_content, SrtFileHandler())
+
+        assert subtitles.originals is not None
+        self.assertLoggedSequenceEqual("lines renumbered", [1, 2, 3], [ line.number for line in subtitles.originals ])
+        self.assertLoggedSequenceEqual("file order kept", ["First", "Second", "Third"], [ line.text for line in subtitles.originals ])
+
+        line = subtitles.GetOriginalLine(3)
+        self.assertLoggedIsNotNone("line found", line)
+        self.assertLoggedEqual("line text", "Third", line.text if line else None)
+
     def test_AssHandlerBasicFunctionality(self):
         
         ass_content = """[Script Info]
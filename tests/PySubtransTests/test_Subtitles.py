@@ -2,11 +2,12 @@ import unittest
 import regex
 from datetime import timedelta
 
+from PySubtrans.SubtitleBatch import SubtitleBatch
 from PySubtrans.SubtitleLine import SubtitleLine
 from PySubtrans.Helpers.Text import split_sequences, standard_filler_words
 from PySubtrans.Helpers.TestCases import LoggedTestCase
 from PySubtrans.Helpers.Tests import log_info
-from PySubtrans.Helpers.SubtitleHelpers import MergeSubtitles, MergeTranslations, FindSplitPoint, GetProportionalDuration
+from PySubtrans.Helpers.SubtitleHelpers import AddOrUpdateLine, FindLineIndex, MergeSubtitles, MergeTranslations, FindSplitPoint, GetProportionalDuration
 from PySubtrans.SubtitleProcessor import SubtitleProcessor
 
 
@@ -86,6 +87,62 @@ class TestSubtitles(LoggedTestCase):
                     merged_lines,
                 )
 
+    def test_FindLineIndex(self):
+        lines = [ self.example_line_1, self.example_line_2, self.example_line_4, self.example_line_11 ]
+        cases = [ (1, 0), (4, 2), (11, 3), (3, None), (12, None), (0, None) ]
+        for line_number, expected in cases:
+            with self.subTest(line_number=line_number):
+                self.assertLoggedEqual(f"index of line {line_number}", expected, FindLineIndex(lines, line_number))
+
+        # Batches keep their lines sorted so that they can be searched
+        batch = SubtitleBatch({ 'scene': 1, 'number': 1 })
+        batch.originals = [ self.example_line_4, self.example_line_1, self.example_line_11, self.example_line_2 ]
+        self.assertLoggedSequenceEqual("batch lines sorted", [1, 2, 4, 11], [ line.number for line in batch.originals ])
+        self.assertLoggedEqual("line in batch", 1, FindLineIndex(batch.originals, 2))
+
+    def test_AddOrUpdateLine(self):
+        lines = [ self.example_line_1, self.example_line_4 ]
+        self.assertLoggedEqual("append", 2, AddOrUpdateLine(lines, self.example_line_5))
+        self.assertLoggedEqual("insert", 1, AddOrUpdateLine(lines, self.example_line_2))
+        self.assertLoggedEqual("replace", 0, AddOrUpdateLine(lines, self.alternative_line_1))
+        self.assertLoggedSequenceEqual("line order", [1, 2, 4, 5], [ line.number for line in lines ])
+        self.assertLoggedEqual("replaced text", self.alternative_line_1.text, lines[0].text)
+
+    def test_SubtitleLine_timing(self):
+        line = SubtitleLine.Construct(1, "00:00:01,250", "00:00:03,000", "Timing")
+        self.assertLoggedEqual("start", timedelta(seconds=1.25), line.start)
+        self.assertLoggedEqual("start_ms", 1250, line.start_ms)
+        self.assertLoggedEqual("duration_ms", 1750, line.duration_ms)
+
+        line.duration = timedelta(seconds=2)
+        self.assertLoggedEqual("end follows duration", timedelta(seconds=3.25), line.end)
+
+        line.end = timedelta(microseconds=3_500_500)
+        self.assertLoggedEqual("sub-millisecond precision kept", timedelta(microseconds=2_250_500), line.duration)
+        self.assertLoggedFalse("no instance dictionary", hasattr(line, '__dict__'))
+
+    def test_SubtitleLine_metadata_copy_on_write(self):
+        line = SubtitleLine.Construct(1, "00:00:01,000", "00:00:02,000", "Metadata", { 'speaker': 'Alice' })
+        copy = line.copy()
+        translated = line.translated
+
+        copy.metadata['speaker'] = 'Bob'
+        self.assertLoggedEqual("original metadata unchanged", 'Alice', line.metadata['speaker'])
+        self.assertLoggedEqual("copy metadata changed", 'Bob', copy.metadata['speaker'])
+        self.assertLoggedIsNone("no translation", translated)
+
+        line.translation = "Métadonnées"
+        translated = line.translated
+        self.assertLoggedIsNotNone("translated line", translated)
+        if translated:
+            self.assertLoggedEqual("translated metadata", 'Alice', translated.metadata['speaker'])
+            self.assertLoggedEqual("translated timing", line.end, translated.end)
+
+        empty = SubtitleLine.Construct(2, "00:00:03,000", "00:00:04,000", "No metadata")
+        self.assertLoggedFalse("no metadata", empty.has_metadata)
+        empty.metadata['speaker'] = 'Carol'
+        self.assertLoggedFalse("new lines are unaffected", SubtitleLine.Construct(3, "00:00:05,000", "00:00:06,000", "Empty").has_metadata)
+
     split_point_cases = [
         ("1\n00:00:01,000 --> 00:00:05,000\nThis is a test subtitle, break after comma.", "This is a test subtitle,"),
         ("2\n00:00:06,000 --> 00:00:10,000\nSecond test subtitle. Break after period.", "Second test subtitle."),
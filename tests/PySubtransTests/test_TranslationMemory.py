@@ -0,0 +1,205 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+from PySubtrans.Helpers.TestCases import DummyProvider, DummyTranslationClient, LoggedTestCase, SubtitleTestCase
+from PySubtrans.Helpers.Tests import PrepareBatchedSubtitles
+from PySubtrans.SubtitleTranslator import SubtitleTranslator
+from PySubtrans.Subtitles import Subtitles
+from PySubtrans.Translation import Translation
+from PySubtrans.TranslationPrompt import TranslationPrompt
+from PySubtrans.TranslationMemory import CloseTranslationMemories, GetTranslationMemory, TranslationMemory
+
+from ..TestData.chinese_dinner import chinese_dinner_data
+
+class TranslationMemoryTests(LoggedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.memory_path = os.path.join(self.temp_dir.name, 'memory.db')
+
+    def tearDown(self):
+        CloseTranslationMemories()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def test_lookup_and_store(self):
+        """Stored translations are found for the same text in the same languages, ignoring differences in whitespace"""
+        memory = TranslationMemory(self.memory_path)
+        memory.Store('Japanese', 'English', [ ("前回までの あらすじ", "Previously on..."), ("ありがとう", "Thank you") ])
+
+        found = memory.Lookup('Japanese', 'English', [ "前回までの\nあらすじ", " ありがとう\n", "さようなら" ])
+        self.assertLoggedEqual("matches found", { "前回までの\nあらすじ": "Previously on...", " ありがとう\n": "Thank you" }, found)
+        self.assertLoggedEqual("other languages not matched", {}, memory.Lookup('Japanese', 'French', [ "ありがとう" ]))
+
+        memory.Store('Japanese', 'English', [ ("ありがとう", "Thanks") ])
+        self.assertLoggedEqual("translation replaced", { "ありがとう": "Thanks" }, memory.Lookup('Japanese', 'English', [ "ありがとう" ]))
+        self.assertLoggedEqual("entry count", 2, memory.count)
+
+        statistics = memory.statistics
+        self.assertLoggedEqual("lookups counted", 5, statistics['lookups'])
+        self.assertLoggedEqual("hits counted", 3, statistics['hits'])
+        memory.Close()
+
+    def test_find_similar(self):
+        """Lines that share most of their text with a stored line are found, and unrelated lines are not"""
+        memory = TranslationMemory(self.memory_path)
+        memory.Store('', 'English', [
+            ("Previously, the heroes escaped from the castle.", "Auparavant, les héros se sont échappés du château."),
+            ("Where did you put the keys?", "Où as-tu mis les clés ?"),
+        ])
+
+        similar = memory.FindSimilar('', 'English', "Previously, the heroes escaped from the tower.", threshold=0.6)
+        self.assertLoggedEqual("similar line found", 1, len(similar))
+        if similar:
+            source, translation, similarity = similar[0]
+            self.assertLoggedEqual("similar source", "Previously, the heroes escaped from the castle.", source)
+            self.assertLoggedEqual("similar translation", "Auparavant, les héros se sont échappés du château.", translation)
+            self.assertLoggedGreaterEqual("similarity above threshold", similarity, 0.6)
+
+        self.assertLoggedEqual("unrelated line", [], memory.FindSimilar('', 'English', "The weather is lovely today.", threshold=0.6))
+        self.assertLoggedEqual("identical line excluded", [], memory.FindSimilar('', 'English', "Where did you put the keys?", threshold=0.6))
+        self.assertLoggedEqual("similar matches counted", 1, memory.statistics['similar'])
+        memory.Close()
+
+    def test_memory_persists(self):
+        """Translations are available after the memory is reopened, and memories are shared by path"""
+        memory = TranslationMemory(self.memory_path)
+        memory.Store('', 'English', [ ("こんにちは", "Hello") ])
+        memory.Close()
+
+        shared = GetTranslationMemory(self.memory_path)
+        self.assertLoggedIsNotNone("memory opened", shared)
+        self.assertLoggedIs("memory shared", shared, GetTranslationMemory(os.path.join(self.temp_dir.name, '.', 'memory.db')))
+        if shared:
+            self.assertLoggedEqual("translation persisted", { "こんにちは": "Hello" }, shared.Lookup('', 'English', [ "こんにちは" ]))
+
+class TranslatorMemoryTests(SubtitleTestCase):
+    def __init__(self, methodName):
+        super().__init__(methodName, custom_options={
+            'max_batch_size': 100,
+        })
+
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.options['translation_memory'] = True
+        self.options['translation_memory_path'] = os.path.join(self.temp_dir.name, 'memory.db')
+
+    def tearDown(self):
+        CloseTranslationMemories()
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def _translate(self, subtitles : Subtitles) -> int:
+        """ Translate the subtitles, returning the number of requests sent to the provider """
+        translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data))
+        with patch.object(DummyTranslationClient, '_request_translation', autospec=True, side_effect=DummyTranslationClient._request_translation) as request:
+            translator.TranslateSubtitles(subtitles)
+            return request.call_count
+
+    def test_repeated_lines_reused(self):
+        """Lines that were translated before are filled in from the memory without being sent to the provider"""
+        reference = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        first_requests = self._translate(reference)
+        self.assertLoggedEqual("first translation requests", reference.scenecount, first_requests)
+
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        self.assertLoggedEqual("repeat translation requests", 0, self._translate(subtitles))
+        self.assertLoggedTrue("all lines translated", subtitles.all_translated)
+
+        translations = [ (line.number, line.text) for line in subtitles.translated ]
+        reference_translations = [ (line.number, line.text) for line in reference.translated ]
+        self.assertLoggedSequenceEqual("translations reused", reference_translations, translations)
+
+    def test_partial_batch_reused(self):
+        """Lines in the memory are removed from the request and the rest of the batch is translated"""
+        reference = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data)).TranslateSubtitles(reference)
+        remembered = self._remember_first_lines(3)
+
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data))
+        batch = subtitles.GetScene(1).batches[0]
+        originals, _context = translator.PreprocessBatch(batch, {})
+        self.assertLoggedEqual("remembered lines removed from request", len(batch.originals) - len(remembered), len(originals))
+        self.assertLoggedEqual("remembered lines translated", sorted(remembered), sorted(line.number for line in batch.translated))
+
+        translator.TranslateSubtitles(subtitles)
+        self.assertLoggedTrue("all lines translated", subtitles.all_translated)
+        self.assertLoggedEqual("no errors", [], translator.errors)
+        self.assertLoggedSequenceEqual("same translation", [ line.text for line in reference.translated ], [ line.text for line in subtitles.translated ])
+
+    def _remember_first_lines(self, count : int) -> set[int]:
+        """ Translate the subtitles and forget everything except the first lines of the first batch, returning their line numbers """
+        reference = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data)).TranslateSubtitles(reference)
+
+        memory = GetTranslationMemory(self.options.get_str('translation_memory_path') or '')
+        if not memory:
+            self.fail("Translation memory could not be opened")
+
+        first_batch = reference.GetScene(1).batches[0]
+        remembered = { line.number for line in first_batch.originals[:count] }
+        memory.Clear()
+        memory.Store('', self.options.target_language, [ (line.text or '', line.translation or '') for line in first_batch.originals if line.number in remembered ])
+        return remembered
+
+    def test_preview_leaves_subtitles_unchanged(self):
+        """Previews remove remembered lines from the request without adding their translations to the subtitles"""
+        remembered = self._remember_first_lines(3)
+
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        self.options['preview'] = True
+        translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data))
+        batch = subtitles.GetScene(1).batches[0]
+        originals, _context = translator.PreprocessBatch(batch, {})
+        self.assertLoggedEqual("remembered lines removed from request", len(batch.originals) - len(remembered), len(originals))
+        self.assertLoggedFalse("no lines translated", batch.any_translated)
+        self.assertLoggedEqual("no translations added", [], [ line.number for line in batch.originals if line.translation ])
+
+    def test_retry_excludes_remembered_lines(self):
+        """Retrying a truncated batch without context does not send the remembered lines again"""
+        remembered = self._remember_first_lines(3)
+        self.options['split_on_error'] = False
+
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data))
+
+        requested : list[list[int]] = []
+        generate_messages = TranslationPrompt.GenerateMessages
+        request_translation = DummyTranslationClient._request_translation
+        def record_lines(prompt, instructions, lines, context):
+            requested.append([ line.number for line in lines ])
+            return generate_messages(prompt, instructions, lines, context)
+
+        def truncated_response(client, request, temperature=None):
+            if len(requested) == 1:
+                return Translation({'text': "#1\nOriginal>\nTruncated", 'finish_reason': 'length'})
+            return request_translation(client, request, temperature)
+
+        with patch.object(TranslationPrompt, 'GenerateMessages', autospec=True, side_effect=record_lines), \
+             patch.object(DummyTranslationClient, '_request_translation', autospec=True, side_effect=truncated_response):
+            translator.TranslateSubtitles(subtitles)
+
+        self.assertLoggedEqual("first batch retried", subtitles.scenecount + 1, len(requested))
+        for index, line_numbers in enumerate(requested):
+            self.assertLoggedEqual(f"request {index + 1} excludes remembered lines", [], sorted(remembered.intersection(line_numbers)))
+
+    def test_similar_lines_suggested(self):
+        """Previous translations of similar lines are added to the context"""
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        batch = subtitles.GetScene(1).batches[0]
+        line = next(line for line in batch.originals if line.text and len(line.text) > 12)
+        similar = f"{line.text}!!"
+
+        memory = GetTranslationMemory(self.options.get_str('translation_memory_path') or '')
+        self.assertLoggedIsNotNone("memory opened", memory)
+        if not memory:
+            return
+
+        memory.Store('', self.options.target_language, [ (similar, "A previous translation") ])
+
+        translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data))
+        _originals, context = translator.PreprocessBatch(batch, {})
+        self.assertLoggedIn("similar translation suggested", "A previous translation", context.get('previous_translations') or '')
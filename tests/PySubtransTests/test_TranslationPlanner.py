@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+
+from PySubtrans.Helpers.TestCases import DummyProvider, LoggedTestCase, SubtitleTestCase
+from PySubtrans.Helpers.Tests import PrepareBatchedSubtitles, skip_if_debugger_attached
+from PySubtrans.SettingsType import SettingsType
+from PySubtrans.SubtitleError import TranslationError
+from PySubtrans.SubtitleLine import SubtitleLine
+from PySubtrans.SubtitleTranslator import SubtitleTranslator
+from PySubtrans.TranslationPlanner import GetModelPricing, LoadPricingTable, ModelPricing, TranslationPlanner
+
+from ..TestData.chinese_dinner import chinese_dinner_data
+
+class TranslationPlannerTests(SubtitleTestCase):
+    def __init__(self, methodName):
+        super().__init__(methodName, custom_options={
+            'max_batch_size': 20,
+            'preview': True,
+        })
+
+    def test_PlanTranslation(self):
+        """Planning builds prompts for every batch without translating anything"""
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data))
+        planner = TranslationPlanner(self.options, pricing=ModelPricing(1.0, 4.0))
+
+        plan = planner.PlanTranslation(translator, subtitles, "chinese_dinner")
+
+        batch_count = sum(len(scene.batches) for scene in subtitles.scenes)
+        self.assertLoggedEqual("one request per batch", batch_count, plan.requests)
+        self.assertLoggedEqual("all lines planned", subtitles.linecount, plan.lines)
+        self.assertLoggedTrue("every batch has input tokens", all(batch.input_tokens > 0 for batch in plan.batches))
+        self.assertLoggedFalse("nothing translated", any(batch.any_translated for scene in subtitles.scenes for batch in scene.batches))
+
+        expected_cost = (plan.input_tokens * 1.0 + plan.output_tokens * 4.0) / 1_000_000
+        self.assertLoggedEqual("cost from pricing", round(expected_cost, 9), round(plan.cost or 0.0, 9))
+        self.assertLoggedIn("summary names the file", "chinese_dinner", plan.FormatSummary())
+
+    def test_PlanTranslation_skips_translated_batches(self):
+        """Batches that would not be sent to the translator are not included in the plan"""
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        first_scene = subtitles.GetScene(1)
+        for batch in first_scene.batches:
+            batch.translated = [ SubtitleLine.Construct(line.number, line.start, line.end, "Translated") for line in batch.originals ]
+
+        translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data), resume=True)
+        planner = TranslationPlanner(self.options)
+
+        plan = planner.PlanTranslation(translator, subtitles)
+
+        batch_count = sum(len(scene.batches) for scene in subtitles.scenes)
+        self.assertLoggedEqual("translated batches skipped", batch_count - len(first_scene.batches), plan.requests)
+        self.assertLoggedEqual("only untranslated lines planned", subtitles.linecount - first_scene.linecount, plan.lines)
+        self.assertLoggedEqual("same plan without prompt lines", plan.requests, planner.PlanSubtitles(subtitles).requests)
+
+    @skip_if_debugger_attached
+    def test_PlanTranslation_requires_preview(self):
+        """Planning refuses to run a real translation"""
+        options = SettingsType(self.options)
+        options['preview'] = False
+        translator = SubtitleTranslator(options, translation_provider=DummyProvider(data=chinese_dinner_data))
+        planner = TranslationPlanner(options)
+
+        with self.assertRaises(TranslationError):
+            planner.PlanTranslation(translator, PrepareBatchedSubtitles(chinese_dinner_data, self.options))
+
+    def test_concurrency_and_rate_limits(self):
+        """Concurrent scenes reduce the projected time, rate limits increase it"""
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        planner = TranslationPlanner(SettingsType())
+
+        sequential = planner.PlanSubtitles(subtitles, concurrency=1)
+        concurrent = planner.PlanSubtitles(subtitles, concurrency=4)
+        self.assertLoggedLess("concurrency reduces time", concurrent.duration, sequential.duration)
+
+        rate_limited = TranslationPlanner(SettingsType({'rate_limit': 1.0})).PlanSubtitles(subtitles)
+        expected_minimum = (rate_limited.requests - 1) * 60.0
+        self.assertLoggedGreaterEqual("rate limit bounds time", rate_limited.duration, expected_minimum)
+
+        totals = planner.PlanSubtitles(subtitles, "Total")
+        totals.Add(sequential)
+        self.assertLoggedEqual("totals accumulate requests", sequential.requests * 2, totals.requests)
+
+    def test_CombinePlans(self):
+        """Files translated concurrently are scheduled across the jobs, within the shared rate limits"""
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+        planner = TranslationPlanner(SettingsType())
+        file_plans = [ planner.PlanSubtitles(subtitles, f"episode{number}") for number in range(4) ]
+        file_duration = file_plans[0].duration
+
+        sequential = planner.CombinePlans(file_plans, "Total", jobs=1)
+        self.assertLoggedEqual("files counted", 4, sequential.files)
+        self.assertLoggedEqual("requests accumulated", file_plans[0].requests * 4, sequential.requests)
+        self.assertLoggedEqual("sequential files add up", round(file_duration * 4, 6), round(sequential.duration, 6))
+
+        concurrent = planner.CombinePlans(file_plans, "Total", jobs=4)
+        self.assertLoggedEqual("concurrent files overlap", round(file_duration, 6), round(concurrent.duration, 6))
+        self.assertLoggedEqual("more jobs than files", round(file_duration, 6), round(planner.CombinePlans(file_plans, jobs=8).duration, 6))
+
+        rate_limited = TranslationPlanner(SettingsType({'rate_limit': 1.0}))
+        limited = rate_limited.CombinePlans(file_plans, jobs=4)
+        self.assertLoggedGreaterEqual("shared rate limit bounds time", limited.duration, (limited.requests - 1) * 60.0)
+
+
+class ModelPricingTests(LoggedTestCase):
+    def test_LoadPricingTable(self):
+        """Pricing tables are loaded from JSON, and dated model names match their base model"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'pricing.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'model': {'input': 1.0, 'output': 2.0}, 'model-large': {'input': 3.0, 'output': 6.0}, 'broken': {}}, f)
+
+            with self.assertLogs(level='WARNING'):
+                table = LoadPricingTable(path)
+
+        self.assertLoggedEqual("invalid entries skipped", 2, len(table))
+
+        pricing = GetModelPricing(table, 'model-large-2025-01-01')
+        self.assertLoggedIsNotNone("prefix match", pricing)
+        if pricing:
+            self.assertLoggedEqual("longest prefix wins", 3.0, pricing.input_cost)
+
+        self.assertLoggedIsNone("unknown model", GetModelPricing(table, 'other'))
@@ -0,0 +1,77 @@
+from PySubtrans.Helpers.TestCases import LoggedTestCase
+from PySubtrans.SubtitleLine import SubtitleLine
+from PySubtrans.TranslationPrompt import TranslationPrompt
+
+instructions = "Translate these subtitles into French."
+
+context_batch_1 = {
+    'description': 'A film about a dinner party',
+    'names': ['Alice', 'Bob'],
+    'history': ['Alice arrives at the party'],
+    'scene': 'Guests arrive',
+    'batch': 'Scene 1 batch 1',
+}
+
+context_batch_2 = {
+    'description': 'A film about a dinner party',
+    'names': ['Alice', 'Bob'],
+    'history': ['Alice arrives at the party', 'Bob spills the wine'],
+    'scene': 'Dinner is served',
+    'batch': 'Scene 2 batch 1',
+}
+
+def _create_lines(first_number : int) -> list[SubtitleLine]:
+    return [
+        SubtitleLine.Construct(first_number, "00:00:01,000", "00:00:02,000", "Hello"),
+        SubtitleLine.Construct(first_number + 1, "00:00:03,000", "00:00:04,000", "Goodbye"),
+    ]
+
+def _create_prompt(cache_friendly : bool, supports_system_prompt : bool = False, supports_system_messages : bool = False) -> TranslationPrompt:
+    prompt = TranslationPrompt("Translate the lines", conversation=True)
+    prompt.cache_friendly = cache_friendly
+    prompt.supports_system_prompt = supports_system_prompt
+    prompt.supports_system_messages = supports_system_messages
+    return prompt
+
+def _get_prompt_text(prompt : TranslationPrompt) -> str:
+    return '\n'.join(filter(None, [prompt.system_prompt] + [ message['content'] for message in prompt.messages ]))
+
+
+class TranslationPromptCacheLayoutTests(LoggedTestCase):
+    def test_default_layout_includes_static_context_in_batch(self):
+        """Without cache-friendly layout all context is included in the batch prompt"""
+        prompt = _create_prompt(cache_friendly=False, supports_system_prompt=True)
+        prompt.GenerateMessages(instructions, _create_lines(1), context_batch_1)
+
+        self.assertLoggedEqual("system prompt is the instructions", instructions, prompt.system_prompt)
+        self.assertLoggedIn("description in batch prompt", "<description>", prompt.batch_prompt or "")
+
+    def test_static_context_moved_to_system_prompt(self):
+        """Static context follows the instructions, volatile context stays in the batch prompt"""
+        prompt = _create_prompt(cache_friendly=True, supports_system_prompt=True)
+        prompt.GenerateMessages(instructions, _create_lines(1), context_batch_1)
+
+        system_prompt = prompt.system_prompt or ""
+        batch_prompt = prompt.batch_prompt or ""
+        self.assertLoggedTrue("system prompt starts with instructions", system_prompt.startswith(instructions))
+        self.assertLoggedIn("description in system prompt", "<description>A film about a dinner party</description>", system_prompt)
+        self.assertLoggedIn("names in system prompt", "<names>Alice, Bob</names>", system_prompt)
+        self.assertLoggedNotIn("description not in batch prompt", "<description>", batch_prompt)
+        self.assertLoggedIn("history in batch prompt", "<history>", batch_prompt)
+        self.assertLoggedIn("lines in batch prompt", "Goodbye", batch_prompt)
+
+    def test_cache_friendly_prompts_share_prefix(self):
+        """Prompts for different batches start with the same instructions and static context"""
+        for supports_system_prompt, supports_system_messages in [(True, False), (False, True), (False, False)]:
+            with self.subTest(system_prompt=supports_system_prompt, system_messages=supports_system_messages):
+                first = _create_prompt(True, supports_system_prompt, supports_system_messages)
+                first.GenerateMessages(instructions, _create_lines(1), context_batch_1)
+                second = _create_prompt(True, supports_system_prompt, supports_system_messages)
+                second.GenerateMessages(instructions, _create_lines(3), context_batch_2)
+
+                first_text = _get_prompt_text(first)
+                second_text = _get_prompt_text(second)
+                static_end = first_text.index("</names>") + len("</names>")
+
+                self.assertLoggedEqual("shared prefix", first_text[:static_end], second_text[:static_end])
+                self.assertLoggedLess("volatile context after static context", static_end, first_text.index("<history>"))
@@ -1,4 +1,6 @@
+import asyncio
 from copy import deepcopy
+import threading
 from datetime import timedelta
 from unittest.mock import patch
 
@@ -7,8 +9,8 @@ from PySubtrans.Helpers.Parse import ParseNames
 from PySubtrans.Helpers.TestCases import LoggedTestCase
 from PySubtrans.Translation import Translation
 from PySubtrans.Helpers.SubtitleHelpers import FindBestSplitIndex
-from PySubtrans.Helpers.TestCases import DummyProvider, PrepareSubtitles, SubtitleTestCase
-from PySubtrans.Helpers.Tests import log_info, log_test_name
+from PySubtrans.Helpers.TestCases import DummyProvider, DummyTranslationClient, PrepareSubtitles, SubtitleTestCase
+from PySubtrans.Helpers.Tests import PrepareBatchedSubtitles, log_info, log_test_name
 from PySubtrans.SettingsType import SettingsType
 from PySubtrans.SubtitleBatch import SubtitleBatch
 from PySubtrans.SubtitleBatcher import SubtitleBatcher
@@ -373,6 +375,228 @@ class SplitBatchTranslationTests(SubtitleTestCase):
         self.assertLoggedEqual("Retry not triggered when split succeeded", 0, mock_retry.call_count)
 
 
+class ConcurrentTranslationTests(SubtitleTestCase):
+    def __init__(self, methodName):
+        super().__init__(methodName, custom_options={
+            'max_batch_size': 100,
+            'max_threads': 4,
+            'multithreaded_translation': True,
+        })
+
+    def _translate(self, multithreaded : bool) -> tuple[Subtitles, list[tuple[str,int]], set[str]]:
+        provider = DummyProvider(data=chinese_dinner_data)
+        options = deepcopy(self.options)
+        options.add('multithreaded_translation', multithreaded)
+
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, options)
+
+        events : list[tuple[str,int]] = []
+        threads : set[str] = set()
+
+        with patch.object(provider, '_allow_multithreaded_translation', return_value=True):
+            translator = SubtitleTranslator(options, translation_provider=provider)
+
+        self.assertLoggedEqual("Translator multithreaded", multithreaded, translator.multithreaded)
+
+        translator.events.batch_translated.connect(lambda sender, batch: events.append(('batch', batch.scene)), weak=False)
+        translator.events.scene_translated.connect(lambda sender, scene: events.append(('scene', scene.number)), weak=False)
+
+        original_request = translator.client.RequestTranslation
+
+        def record_thread(prompt, temperature=None, streaming_callback=None):
+            threads.add(threading.current_thread().name)
+            return original_request(prompt, temperature, streaming_callback)
+
+        with patch.object(translator.client, 'RequestTranslation', side_effect=record_thread):
+            translator.TranslateSubtitles(subtitles)
+
+        return subtitles, events, threads
+
+    def test_concurrent_translation_matches_sequential(self):
+        sequential, sequential_events, _ = self._translate(multithreaded=False)
+        concurrent, concurrent_events, threads = self._translate(multithreaded=True)
+
+        self.assertLoggedGreater("Scenes to translate", sequential.scenecount, 1)
+        self.assertLoggedTrue("Requests made on worker threads", all(name.startswith("SubtitleTranslator") for name in threads))
+        self.assertLoggedEqual("Translated line count", len(sequential.translated or []), len(concurrent.translated or []))
+        self.assertLoggedSequenceEqual("Translated text",
+            [line.text for line in sequential.translated or []],
+            [line.text for line in concurrent.translated or []])
+
+    def test_concurrent_events_in_scene_order(self):
+        sequential, sequential_events, _ = self._translate(multithreaded=False)
+        concurrent, concurrent_events, _ = self._translate(multithreaded=True)
+
+        self.assertLoggedSequenceEqual("Events replayed in order", sequential_events, concurrent_events)
+
+    def test_unexpected_error_stops_queued_scenes(self):
+        provider = DummyProvider(data=chinese_dinner_data)
+        options = deepcopy(self.options)
+        options.add('max_threads', 2)
+
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, options)
+
+        with patch.object(provider, '_allow_multithreaded_translation', return_value=True):
+            translator = SubtitleTranslator(options, translation_provider=provider)
+
+        original_request = translator.client.RequestTranslation
+        requested_scenes : list[str] = []
+        released = threading.Event()
+
+        def fail_first_scene(prompt, temperature=None, streaming_callback=None):
+            requested_scenes.append(prompt.user_prompt)
+            if "scene 1 " in prompt.user_prompt:
+                raise RuntimeError("Unexpected failure")
+
+            # Keep the other worker busy until the failure has been handled
+            released.wait(timeout=5.0)
+            return original_request(prompt, temperature, streaming_callback)
+
+        timer = threading.Timer(0.2, released.set)
+        timer.start()
+        try:
+            with patch.object(translator.client, 'RequestTranslation', side_effect=fail_first_scene):
+                with self.assertRaises(RuntimeError):
+                    translator.TranslateSubtitles(subtitles)
+        finally:
+            timer.cancel()
+            released.set()
+
+        self.assertLoggedGreater("Scenes to translate", subtitles.scenecount, 2)
+        self.assertLoggedLessEqual("Queued scenes not translated", len(requested_scenes), 2)
+        self.assertLoggedEqual("Scenes requested", [], [ prompt for prompt in requested_scenes if "scene 1 " not in prompt and "scene 2 " not in prompt ])
+
+    def test_batches_updated_under_subtitles_lock(self):
+        provider = DummyProvider(data=chinese_dinner_data)
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+
+        with patch.object(provider, '_allow_multithreaded_translation', return_value=True):
+            translator = SubtitleTranslator(self.options, translation_provider=provider)
+
+        unlocked : list[str] = []
+
+        def record_unlocked(name : str):
+            # The subtitles lock cannot be taken from another thread while a worker holds it
+            acquired : list[bool] = []
+            def try_lock():
+                if subtitles.lock.acquire(blocking=False):
+                    subtitles.lock.release()
+                    acquired.append(True)
+
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+            if acquired:
+                unlocked.append(name)
+
+        merge_translations = SubtitleBatch.MergeTranslations
+        update_context = SubtitleBatch.UpdateContext
+
+        def checked_merge(batch, lines):
+            record_unlocked('MergeTranslations')
+            return merge_translations(batch, lines)
+
+        def checked_update(batch, context):
+            record_unlocked('UpdateContext')
+            return update_context(batch, context)
+
+        with patch.object(SubtitleBatch, 'MergeTranslations', autospec=True, side_effect=checked_merge), \
+             patch.object(SubtitleBatch, 'UpdateContext', autospec=True, side_effect=checked_update):
+            translator.TranslateSubtitles(subtitles)
+
+        self.assertLoggedTrue("All lines translated", subtitles.all_translated)
+        self.assertLoggedEqual("Batches updated without the subtitles lock", [], unlocked)
+
+    def test_multithreading_requires_provider_support(self):
+        provider = DummyProvider(data=chinese_dinner_data)
+        translator = SubtitleTranslator(self.options, translation_provider=provider)
+        self.assertLoggedFalse("Multithreading disabled for provider", translator.multithreaded)
+
+
+class AsyncTranslationTests(SubtitleTestCase):
+    def __init__(self, methodName):
+        super().__init__(methodName, custom_options={
+            'max_batch_size': 100,
+        })
+
+    def _prepare(self) -> tuple[Subtitles, SubtitleTranslator, list[tuple[str,int]]]:
+        subtitles = PrepareBatchedSubtitles(chinese_dinner_data, self.options)
+
+        translator = SubtitleTranslator(self.options, translation_provider=DummyProvider(data=chinese_dinner_data))
+
+        events : list[tuple[str,int]] = []
+        translator.events.batch_translated.connect(lambda sender, batch: events.append(('batch', batch.scene)), weak=False)
+        translator.events.scene_translated.connect(lambda sender, scene: events.append(('scene', scene.number)), weak=False)
+        return subtitles, translator, events
+
+    def test_TranslateSubtitlesAsync_matches_sequential(self):
+        sequential, sequential_translator, sequential_events = self._prepare()
+        sequential_translator.TranslateSubtitles(sequential)
+
+        subtitles, translator, events = self._prepare()
+        asyncio.run(translator.TranslateSubtitlesAsync(subtitles, max_concurrency=4))
+
+        self.assertLoggedEqual("No errors", 0, len(translator.errors))
+        self.assertLoggedSequenceEqual("Translated text",
+            [line.text for line in sequential.translated or []],
+            [line.text for line in subtitles.translated or []])
+        self.assertLoggedSequenceEqual("Events replayed in order", sequential_events, events)
+
+    def test_TranslateSubtitlesAsync_respects_max_lines(self):
+        subtitles, translator, _ = self._prepare()
+        translator.max_lines = 10
+
+        asyncio.run(translator.TranslateSubtitlesAsync(subtitles, max_concurrency=1))
+
+        self.assertLoggedEqual("Lines processed", 10, translator.lines_processed)
+
+    def test_TranslateSubtitlesAsync_cancellation_stops_requests(self):
+        subtitles, translator, _ = self._prepare()
+        self.assertLoggedGreater("Several scenes", subtitles.scenecount, 2)
+
+        requests : list[int] = []
+        request_started = asyncio.Event()
+
+        async def slow_request(client, request, temperature=None):
+            requests.append(len(requests))
+            request_started.set()
+            await asyncio.sleep(10.0)
+            return None
+
+        async def translate_and_cancel():
+            task = asyncio.create_task(translator.TranslateSubtitlesAsync(subtitles, max_concurrency=2))
+            await request_started.wait()
+            await asyncio.sleep(0.05)
+            task.cancel()
+            try:
+                await asyncio.wait_for(task, timeout=1.0)
+            except asyncio.CancelledError:
+                return True
+            return False
+
+        with patch.object(DummyTranslationClient, '_request_translation_async', autospec=True, side_effect=slow_request):
+            cancelled = asyncio.run(translate_and_cancel())
+
+        self.assertLoggedTrue("Translation cancelled", cancelled)
+        self.assertLoggedEqual("No requests after cancellation", 2, len(requests))
+        self.assertLoggedFalse("No lines translated", subtitles.any_translated)
+
+    def test_RequestTranslationAsync_falls_back_to_blocking_client(self):
+        subtitles, translator, _ = self._prepare()
+        scene = subtitles.GetScene(1)
+        if scene is None:
+            self.fail("Scene 1 not found in test data")
+        batch = scene.batches[0]
+
+        context = GetBatchContext(subtitles, scene.number, batch.number)
+        prompt = translator.client.BuildTranslationPrompt(translator.user_prompt, translator.system_instructions, batch.originals, context)
+
+        translation = asyncio.run(translator.client.RequestTranslationAsync(prompt))
+
+        self.assertLoggedIsNotNone("Translation returned", translation)
+        self.assertLoggedTrue("Translation has text", bool(translation and translation.has_translation))
+
+
 class TerminologyMapParsingTests(LoggedTestCase):
     """Tests for Translation.terminology property and <terminology> tag extraction"""
 
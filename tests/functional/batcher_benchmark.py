@@ -0,0 +1,77 @@
+from datetime import timedelta
+import random
+import timeit
+
+from PySubtrans.SettingsType import SettingsType
+from PySubtrans.SubtitleBatcher import SubtitleBatcher
+from PySubtrans.SubtitleLine import SubtitleLine
+
+def legacy_split_lines(batcher : SubtitleBatcher, lines : list[SubtitleLine]) -> list[list[SubtitleLine]]:
+    """ The previous batch splitting, rescanning each range with timedelta arithmetic """
+    if len(lines) <= batcher.max_batch_size:
+        return [ lines ]
+
+    longest_gap = timedelta(seconds=0)
+    split_index = batcher.min_batch_size
+    for i in range(batcher.min_batch_size, len(lines) - batcher.min_batch_size):
+        gap = lines[i].start - lines[i - 1].end
+        if gap > longest_gap:
+            longest_gap = gap
+            split_index = i
+
+    return legacy_split_lines(batcher, lines[:split_index]) + legacy_split_lines(batcher, lines[split_index:])
+
+def legacy_batch_subtitles(batcher : SubtitleBatcher, lines : list[SubtitleLine]) -> list[list[list[SubtitleLine]]]:
+    """ The previous scene detection, comparing each line with the last """
+    scenes = []
+    current_lines = []
+    last_endtime = None
+    for line in lines:
+        if batcher.fix_overlaps and last_endtime and line.start < last_endtime:
+            line.start = last_endtime + timedelta(milliseconds=10)
+
+        if last_endtime is not None and line.start - last_endtime > batcher.scene_threshold and current_lines:
+            scenes.append(legacy_split_lines(batcher, current_lines))
+            current_lines = []
+
+        current_lines.append(line)
+        last_endtime = line.end
+
+    if current_lines:
+        scenes.append(legacy_split_lines(batcher, current_lines))
+
+    return scenes
+
+def build_corpus(line_count : int, seed : int = 1) -> list[SubtitleLine]:
+    rng = random.Random(seed)
+    lines = []
+    time = 0
+    for number in range(1, line_count + 1):
+        time += 45000 if rng.random() < 0.002 else rng.choice([ -200, 100, 300, 800, 2500 ])
+        duration = rng.randint(800, 4000)
+        lines.append(SubtitleLine.Construct(number, timedelta(milliseconds=time), timedelta(milliseconds=time + duration), f"Line {number}"))
+        time += duration
+    return lines
+
+def run_benchmark(line_count : int = 100_000):
+    settings = SettingsType({ 'min_batch_size': 10, 'max_batch_size': 30, 'scene_threshold': 30.0, 'prevent_overlapping_times': True })
+    batcher = SubtitleBatcher(settings)
+
+    legacy_scenes = legacy_batch_subtitles(batcher, build_corpus(line_count))
+    scenes = batcher.BatchSubtitles(build_corpus(line_count))
+
+    legacy_numbers = [ [ [ line.number for line in batch ] for batch in scene ] for scene in legacy_scenes ]
+    numbers = [ [ [ line.number for line in batch.originals ] for batch in scene.batches ] for scene in scenes ]
+    if legacy_numbers != numbers:
+        raise Exception("Batches differ from the legacy batcher")
+
+    legacy_time = min(timeit.repeat(lambda: legacy_batch_subtitles(batcher, build_corpus(line_count)), number=1, repeat=3))
+    corpus_time = min(timeit.repeat(lambda: build_corpus(line_count), number=1, repeat=3))
+    batch_time = min(timeit.repeat(lambda: batcher.BatchSubtitles(build_corpus(line_count)), number=1, repeat=3))
+
+    print(f"{line_count} lines, {len(scenes)} scenes, {sum(len(scene.batches) for scene in scenes)} batches (identical)")
+    print(f"{'Legacy batcher':<25}{(legacy_time - corpus_time) * 1000:>10.2f} ms")
+    print(f"{'SubtitleBatcher':<25}{(batch_time - corpus_time) * 1000:>10.2f} ms")
+
+if __name__ == "__main__":
+    run_benchmark()
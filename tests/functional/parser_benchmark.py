@@ -0,0 +1,44 @@
+import timeit
+
+import regex
+
+from PySubtrans.Helpers.TestCases import DummyTranslationClient
+from PySubtrans.Instructions import DEFAULT_TASK_TYPE
+from PySubtrans.Options import Options
+from PySubtrans.SettingsType import SettingsType
+from PySubtrans.Translation import Translation
+from PySubtrans.TranslationParser import TranslationParser, default_pattern, fallback_patterns
+
+def build_response(line_count : int) -> str:
+    return "".join(f"#{number}\nOriginal>\nOriginal line {number}\nTranslation>\nTranslated line {number}\n\n" for number in range(1, line_count + 1))
+
+def legacy_streaming(response_chunks : list[str]):
+    """ Rebuild the options, patterns and parser for every chunk and re-parse the whole response """
+    settings = SettingsType({ 'instructions': "Translate" })
+    for chunk in response_chunks:
+        parser = TranslationParser(DEFAULT_TASK_TYPE, Options(settings))
+        parser.regex_patterns = [ regex.compile(pattern, regex.MULTILINE) for pattern in [default_pattern] + fallback_patterns ]
+        parser.ProcessTranslation(Translation({ 'text': chunk }), validate=False)
+
+def incremental_streaming(client : DummyTranslationClient, response_chunks : list[str]):
+    """ Reuse the client's options and patterns and only parse newly completed blocks """
+    parser = client.GetStreamingParser(DEFAULT_TASK_TYPE)
+    for chunk in response_chunks:
+        parser.ProcessStreamingText(chunk)
+
+def run_benchmark(line_count : int = 100, repeat : int = 5):
+    response = build_response(line_count)
+    blocks = response.split("\n\n")
+    response_chunks = [ "\n\n".join(blocks[:count]) + "\n\n" for count in range(1, line_count + 1) ]
+    client = DummyTranslationClient(SettingsType({ 'instructions': "Translate" }))
+
+    legacy = min(timeit.repeat(lambda: legacy_streaming(response_chunks), number=1, repeat=repeat))
+    incremental = min(timeit.repeat(lambda: incremental_streaming(client, response_chunks), number=1, repeat=repeat))
+
+    print(f"Streaming {line_count} lines in {len(response_chunks)} chunks")
+    print(f"{'Per-chunk parser':<25}{legacy * 1000:>10.2f} ms ({legacy / len(response_chunks) * 1_000_000:.0f} us per chunk)")
+    print(f"{'Cached incremental':<25}{incremental * 1000:>10.2f} ms ({incremental / len(response_chunks) * 1_000_000:.0f} us per chunk)")
+    print(f"{'Speedup':<25}{legacy / incremental:>10.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
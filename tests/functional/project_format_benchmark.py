@@ -0,0 +1,76 @@
+from datetime import timedelta
+import os
+import random
+import tempfile
+import timeit
+
+from PySubtrans.Subtitles import Subtitles
+from PySubtrans.SubtitleBatch import SubtitleBatch
+from PySubtrans.SubtitleLine import SubtitleLine
+from PySubtrans.SubtitleProject import SubtitleProject
+from PySubtrans.SubtitleScene import SubtitleScene
+from PySubtrans.SubtitleSerialisation import SubtitleEncoder
+from PySubtrans.Translation import Translation
+from PySubtrans.TranslationPrompt import TranslationPrompt
+
+def build_subtitles(line_count : int, batch_size : int = 30, seed : int = 1) -> Subtitles:
+    """ Build a fully translated project with scenes of ten batches, including the prompts and responses """
+    rng = random.Random(seed)
+    words = [ "dinner", "guests", "dumplings", "tea", "table", "family", "toast", "noodles", "kitchen", "laughter" ]
+    subtitles = Subtitles("benchmark.srt")
+
+    scenes : list[SubtitleScene] = []
+    batches : list[SubtitleBatch] = []
+    instructions = "Translate the subtitles, keeping each line short enough to read on screen. " * 20
+    time = 0
+    for first in range(1, line_count + 1, batch_size):
+        originals = []
+        translated = []
+        for number in range(first, min(first + batch_size, line_count + 1)):
+            start, end = timedelta(milliseconds=time), timedelta(milliseconds=time + rng.randint(800, 4000))
+            text = ' '.join(rng.choice(words) for _ in range(rng.randint(3, 12)))
+            originals.append(SubtitleLine.Construct(number, start, end, text))
+            translated.append(SubtitleLine.Construct(number, start, end, text.upper()))
+            time += 5000
+
+        prompt = TranslationPrompt("Translate these subtitles", conversation=True)
+        prompt.supports_system_messages = True
+        prompt.GenerateMessages(instructions, originals, {})
+        response = '\n\n'.join(f"#{line.number}\nOriginal>\n{line.text}\nTranslation>\n{line.text.upper()}" for line in originals if line.text)
+        translation = Translation({ 'text': f"{response}\n\n<summary>Batch {first}</summary>", 'reasoning': "Thinking about the translation. " * 50 })
+
+        batch = SubtitleBatch({ 'scene': len(scenes) + 1, 'number': len(batches) + 1, 'originals': originals, 'translated': translated,
+                               'summary': f"Batch {first}", 'prompt': prompt, 'translation': translation })
+        batches.append(batch)
+        if len(batches) == 10:
+            scenes.append(SubtitleScene({ 'number': len(scenes) + 1, 'batches': batches, 'summary': "A scene" }))
+            batches = []
+
+    if batches:
+        scenes.append(SubtitleScene({ 'number': len(scenes) + 1, 'batches': batches, 'summary': "A scene" }))
+
+    subtitles.scenes = scenes
+    return subtitles
+
+def run_benchmark(line_count : int = 50_000):
+    project = SubtitleProject()
+    project.subtitles = build_subtitles(line_count)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print(f"{line_count} lines")
+        for extension in [ '.subtrans', '.subtransz' ]:
+            projectfile = os.path.join(temp_dir, f"benchmark{extension}")
+            save_time = min(timeit.repeat(lambda: project.WriteProjectToFile(projectfile, encoder_class=SubtitleEncoder), number=1, repeat=3))
+            load_time = min(timeit.repeat(lambda: SubtitleProject().ReadProjectFile(projectfile), number=1, repeat=3))
+            lazy_time = min(timeit.repeat(lambda: SubtitleProject(lazy_load=True).ReadProjectFile(projectfile), number=1, repeat=3))
+
+            loaded = SubtitleProject()
+            loaded.ReadProjectFile(projectfile)
+            if loaded.subtitles.linecount != line_count:
+                raise Exception(f"{extension} project did not round-trip")
+
+            size = os.path.getsize(projectfile) / (1024 * 1024)
+            print(f"{extension:<12}{size:>10.2f} MB{save_time * 1000:>12.2f} ms save{load_time * 1000:>12.2f} ms load{lazy_time * 1000:>12.2f} ms lazy load")
+
+if __name__ == "__main__":
+    run_benchmark()
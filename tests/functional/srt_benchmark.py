@@ -0,0 +1,73 @@
+from datetime import timedelta
+import io
+import random
+import timeit
+
+import srt # type: ignore
+
+from PySubtrans.Formats.SrtFileHandler import SrtFileHandler
+from PySubtrans.SubtitleData import SubtitleData
+from PySubtrans.SubtitleLine import SubtitleLine
+
+def legacy_parse(content : str) -> list[SubtitleLine]:
+    """ The previous parser, rebuilding each item from the srt library """
+    lines = []
+    for item in list(srt.parse(content)):
+        metadata = {"proprietary": item.proprietary} if item.proprietary else {}
+        lines.append(SubtitleLine.Construct(item.index, item.start, item.end, item.content, metadata))
+    return lines
+
+def legacy_compose(data : SubtitleData) -> str:
+    """ The previous composer, copying every line and converting it to an srt.Subtitle """
+    output_lines = []
+    line_number = data.start_line_number or 1
+    for line in data.lines:
+        if line.text and line.start is not None and line.end is not None:
+            output_lines.append(SubtitleLine.Construct(line_number, line.start, line.end, line.text, line.metadata))
+            line_number += 1
+
+    srt_items = [ srt.Subtitle(index=line.number, start=line.start, end=line.end, content=line.text, proprietary=line.metadata.get('proprietary', '')) for line in output_lines ]
+    return srt.compose(srt_items, reindex=False)
+
+def build_srt(cue_count : int, seed : int = 1) -> str:
+    rng = random.Random(seed)
+    words = [ "dinner", "guests", "dumplings", "tea", "table", "family", "toast", "noodles", "kitchen", "laughter" ]
+    lines = []
+    time = 0
+    for number in range(1, cue_count + 1):
+        start, end = timedelta(milliseconds=time), timedelta(milliseconds=time + rng.randint(800, 4000))
+        text = '\n'.join(' '.join(rng.choice(words) for _ in range(rng.randint(2, 8))) for _ in range(rng.randint(1, 2)))
+        lines.append(srt.Subtitle(number, start, end, text))
+        time += 5000
+    return srt.compose(lines, reindex=False)
+
+def run_benchmark(cue_count : int = 100_000):
+    handler = SrtFileHandler()
+    content = build_srt(cue_count)
+
+    data = handler.parse_string(content)
+    legacy_lines = legacy_parse(content)
+    if [ (line.number, line.start_us, line.end_us, line.text) for line in data.lines ] != [ (line.number, line.start_us, line.end_us, line.text) for line in legacy_lines ]:
+        raise Exception("Parsed lines differ from the legacy parser")
+
+    if handler.compose(data) != legacy_compose(data) or handler.compose(data) != content:
+        raise Exception("Composed SRT differs from the legacy composer")
+
+    def write_file():
+        with io.StringIO() as f:
+            handler.write_file(data, f)
+
+    timings = {
+        "Legacy parse": min(timeit.repeat(lambda: legacy_parse(content), number=1, repeat=3)),
+        "SrtFileHandler parse": min(timeit.repeat(lambda: handler.parse_string(content), number=1, repeat=3)),
+        "Legacy compose": min(timeit.repeat(lambda: legacy_compose(data), number=1, repeat=3)),
+        "SrtFileHandler compose": min(timeit.repeat(lambda: handler.compose(data), number=1, repeat=3)),
+        "SrtFileHandler write_file": min(timeit.repeat(write_file, number=1, repeat=3)),
+    }
+
+    print(f"{cue_count} cues, {len(content) / (1024 * 1024):.2f} MB (identical output)")
+    for name, seconds in timings.items():
+        print(f"{name:<30}{seconds * 1000:>10.2f} ms")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,59 @@
+from copy import deepcopy
+from datetime import timedelta
+import timeit
+import tracemalloc
+from typing import Any
+
+from PySubtrans.SubtitleLine import SubtitleLine
+
+class LegacySubtitleLine:
+    """ The previous layout of SubtitleLine, with a __dict__, timedelta fields and a metadata dictionary per line """
+    def __init__(self, number : int, start : timedelta, end : timedelta, text : str, metadata : dict[str, Any]|None = None):
+        self._index = number
+        self._start = start
+        self._end = end
+        self.content = text
+        self.metadata = deepcopy(metadata or {})
+        self.translation = None
+        self.original = None
+        self._duration = None
+
+def build_corpus(line_count : int) -> list[tuple[int, int, int, str]]:
+    return [ (number, number * 2000, number * 2000 + 1500, f"Line {number} of the corpus") for number in range(1, line_count + 1) ]
+
+def measure_memory(factory) -> tuple[list, int]:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    lines = factory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return lines, size
+
+def run_benchmark(line_count : int = 50_000):
+    corpus = build_corpus(line_count)
+
+    def build_legacy():
+        return [ LegacySubtitleLine(number, timedelta(milliseconds=start), timedelta(milliseconds=end), text) for number, start, end, text in corpus ]
+
+    def build_lines():
+        return [ SubtitleLine.Construct(number, timedelta(milliseconds=start), timedelta(milliseconds=end), text) for number, start, end, text in corpus ]
+
+    legacy_lines, legacy_memory = measure_memory(build_legacy)
+    lines, memory = measure_memory(build_lines)
+
+    legacy_time = min(timeit.repeat(build_legacy, number=1, repeat=3))
+    construct_time = min(timeit.repeat(build_lines, number=1, repeat=3))
+    copy_time = min(timeit.repeat(lambda: [ line.copy() for line in lines ], number=1, repeat=3))
+
+    print(f"{line_count} lines")
+    print(f"{'Legacy memory':<25}{legacy_memory / 1024 / 1024:>10.2f} MB ({legacy_memory // line_count} bytes per line)")
+    print(f"{'SubtitleLine memory':<25}{memory / 1024 / 1024:>10.2f} MB ({memory // line_count} bytes per line)")
+    print(f"{'Legacy construction':<25}{legacy_time * 1000:>10.2f} ms")
+    print(f"{'SubtitleLine.Construct':<25}{construct_time * 1000:>10.2f} ms")
+    print(f"{'SubtitleLine.copy':<25}{copy_time * 1000:>10.2f} ms")
+
+    del legacy_lines, lines
+
+if __name__ == "__main__":
+    run_benchmark()